@@ -0,0 +1,124 @@
+"""
+Memory and per-step latency of the parameter agent's Q-tables for each
+[agent].q_table_backend on synthetic specifications with many optional parameters.
+A step is what the learning loop does per request: a best action (or a random one
+with probability epsilon) and a Q-table update.
+
+    python benchmarks/action_tables.py --optional 8 12 16 24 --operations 100
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from autoresttest.agents import ParameterAgent  # noqa: E402
+from autoresttest.agents.action_table import (  # noqa: E402
+    action_table_stats,
+    create_action_table,
+)
+from autoresttest.models import ParameterProperties  # noqa: E402
+from autoresttest.utils import (  # noqa: E402
+    get_param_combination_space,
+    get_param_combinations,
+    get_required_params,
+)
+
+BACKENDS = ("dict", "array", "lazy")
+
+
+def synthetic_graph(operations: int, optional: int):
+    """Operations with one required path parameter and ``optional`` query parameters."""
+    nodes = {}
+    for idx in range(operations):
+        parameters = {
+            ("id", "path"): ParameterProperties(
+                name="id", in_value="path", required=True
+            )
+        }
+        for param in range(optional):
+            parameters[(f"filter{param}", "query")] = ParameterProperties(
+                name=f"filter{param}", in_value="query", required=False
+            )
+        nodes[f"op{idx}"] = SimpleNamespace(
+            operation_properties=SimpleNamespace(parameters=parameters)
+        )
+    return SimpleNamespace(operation_nodes=nodes)
+
+
+def build_agent(graph, backend: str) -> ParameterAgent:
+    """ParameterAgent.initialize_q_table for ``backend``, which it reads from the config."""
+    agent = ParameterAgent(graph)  # type: ignore[arg-type]
+    combinations = (
+        get_param_combination_space if backend == "lazy" else get_param_combinations
+    )
+    for operation_id, node in graph.operation_nodes.items():
+        parameters = node.operation_properties.parameters
+        required = get_required_params(parameters)
+        params = create_action_table(
+            backend,
+            combinations(parameters, required_params=required, seed=operation_id),
+            required=required,
+        )
+        params["None"] = 0
+        agent.q_table[operation_id] = {"params": params, "body": {}}
+    return agent
+
+
+def run_steps(agent: ParameterAgent, steps: int, epsilon: float, seed: int) -> float:
+    """Mean seconds per learning step."""
+    rng = random.Random(seed)
+    random.seed(seed)
+    operation_ids = list(agent.q_table)
+    start = time.perf_counter()
+    for _ in range(steps):
+        operation_id = rng.choice(operation_ids)
+        if rng.random() < epsilon:
+            action = agent.get_random_action(operation_id)
+        else:
+            action = agent.get_best_action(operation_id)
+        agent.update_q_table(operation_id, action, rng.choice([-1, 1, 2]))
+    return (time.perf_counter() - start) / steps
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--optional", type=int, nargs="+", default=[8, 12, 16, 24])
+    parser.add_argument("--operations", type=int, default=100)
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--epsilon", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(
+        f"{'optional':>8}{'backend':>8}{'actions':>10}{'allocated':>11}"
+        f"{'table MiB':>11}{'traced MiB':>12}{'step us':>10}"
+    )
+    for optional in args.optional:
+        graph = synthetic_graph(args.operations, optional)
+        for backend in BACKENDS:
+            tracemalloc.start()
+            agent = build_agent(graph, backend)
+            traced, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            stats = action_table_stats(
+                tables["params"] for tables in agent.q_table.values()
+            )
+            step = run_steps(agent, args.steps, args.epsilon, args.seed)
+            print(
+                f"{optional:>8}{backend:>8}{stats['actions']:>10}"
+                f"{stats['allocated']:>11}{stats['bytes'] / 2**20:>11.1f}"
+                f"{traced / 2**20:>12.1f}{step * 1e6:>10.1f}",
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
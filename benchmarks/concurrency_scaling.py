@@ -0,0 +1,169 @@
+"""
+Request throughput of the Q-learning loop as [request_generation].concurrency grows,
+against a local stand-in server that answers every request after a fixed latency.
+Concurrency 1 runs the sequential loop (QLearning.execute_operations); higher values
+run AsyncExecutionEngine. Agents are replaced by a stand-in learner that counts
+responses, so the table shows what the scheduling and send path sustain.
+
+    python benchmarks/concurrency_scaling.py --concurrency 1 2 4 8 16 --latency 0.02
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from requests.adapters import HTTPAdapter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from autoresttest.marl.async_engine import AsyncExecutionEngine  # noqa: E402
+from autoresttest.marl.marl import QLearning  # noqa: E402
+from autoresttest.transport import (  # noqa: E402
+    close_http_sessions,
+    get_http_method,
+    get_http_session,
+)
+from autoresttest.utils import dispatch_request  # noqa: E402
+
+
+def start_server(latency: float) -> ThreadingHTTPServer:
+    """A keep-alive JSON server on a free local port, one thread per connection."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Small responses otherwise wait for the client's delayed ACK.
+        disable_nagle_algorithm = True
+
+        def do_GET(self) -> None:
+            time.sleep(latency)
+            body = json.dumps({"id": 1, "path": self.path}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@dataclass
+class Step:
+    operation_id: str
+    path: str
+    latency: float = 0.0
+
+
+class StandInLearner:
+    """
+    The parts of QLearning the scheduling loops call. Sends go through the real
+    pooled session, rate limiter, and dispatch_request; selection and learning are
+    replaced by picking a random operation and counting responses.
+    """
+
+    reserve_send = QLearning.reserve_send
+    _wait_to_send = QLearning._wait_to_send
+    execute_operations = QLearning.execute_operations
+
+    def __init__(self, api_url: str, duration: float, operations: int) -> None:
+        self.api_url = api_url
+        self.time_duration = duration
+        self.step_hooks: list = []
+        self.operation_ids = [f"op{idx}" for idx in range(operations)]
+        self.rng = random.Random(0)
+        self.ok = 0
+        self.failed = 0
+        self.elapsed_time = 0.0
+
+    def determine_complete_body_mappings(self) -> dict:
+        return {}
+
+    def _epsilon_decay_rate(self) -> float:
+        return 0.0
+
+    def epsilon_decay(self, epsilon_decay_rate: float) -> None:
+        pass
+
+    def prepare_step(self, complete_body_mappings, start_time) -> Step:
+        operation_id = self.rng.choice(self.operation_ids)
+        return Step(operation_id, f"/{operation_id}/{self.rng.randrange(1000)}")
+
+    def send_step(self, step: Step):
+        sent_at = time.perf_counter()
+        response = dispatch_request(
+            select_method=get_http_method(self.api_url, "get"),
+            full_url=self.api_url + step.path,
+            params={"limit": 10},
+            body=None,
+            accept="application/json",
+            max_retries=0,
+            operation_id=step.operation_id,
+            paced=False,
+        )
+        step.latency = time.perf_counter() - sent_at
+        return response
+
+    def learn_step(self, step: Step, response) -> None:
+        if response is not None and response.ok:
+            self.ok += 1
+        else:
+            self.failed += 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument(
+        "--latency", type=float, default=0.02, help="server seconds per request"
+    )
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per run")
+    parser.add_argument("--operations", type=int, default=20)
+    args = parser.parse_args()
+
+    server = start_server(args.latency)
+    api_url = f"http://127.0.0.1:{server.server_address[1]}"
+    # [http].pool_maxsize defaults to 10; size the pool for the largest run so
+    # connections are reused rather than opened and discarded.
+    pool = max(args.concurrency)
+    get_http_session(api_url).mount(
+        "http://", HTTPAdapter(pool_connections=1, pool_maxsize=pool)
+    )
+
+    print(
+        f"{'concurrency':>12}{'requests':>10}{'failed':>8}"
+        f"{'req/s':>10}{'speedup':>10}{'ideal req/s':>13}"
+    )
+    baseline = None
+    for concurrency in args.concurrency:
+        learner = StandInLearner(api_url, args.duration, args.operations)
+        if concurrency > 1:
+            AsyncExecutionEngine(learner, concurrency).run()  # type: ignore[arg-type]
+        else:
+            learner.execute_operations()
+        rate = learner.ok / learner.elapsed_time
+        baseline = baseline or rate
+        print(
+            f"{concurrency:>12}{learner.ok:>10}{learner.failed:>8}{rate:>10.1f}"
+            f"{rate / baseline:>9.1f}x{concurrency / args.latency:>13.1f}",
+            flush=True,
+        )
+
+    close_http_sessions()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Per-call latency of DependencyAgent's BEST and EXPLORE selection on dense synthetic
+dependency graphs, against the Q-table scan it replaced.
+
+    python benchmarks/dependency_selection.py --operations 50 200 500
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from autoresttest.agents import DependencyAgent  # noqa: E402
+
+LOCATIONS = ("params", "body", "response")
+STORES = {
+    "params": "successful_parameters",
+    "body": "successful_bodies",
+    "response": "successful_responses",
+}
+
+
+class Learner:
+    """The successful-value stores the scan reads."""
+
+    def __init__(self) -> None:
+        self.successful_parameters: dict = {}
+        self.successful_bodies: dict = {}
+        self.successful_responses: dict = {}
+
+
+def build(operations: int, params: int, names: int, available: float, seed: int):
+    """Every parameter of every operation may depend on every name of every other operation."""
+    rng = random.Random(seed)
+    operation_ids = [f"op{idx}" for idx in range(operations)]
+    dependent_names = [f"field{idx}" for idx in range(names)]
+    agent = DependencyAgent(None)  # type: ignore[arg-type]
+    agent.q_table = {
+        operation_id: {
+            "params": {
+                (f"param{idx}", "query"): {
+                    dependent_op: {
+                        location: {name: rng.uniform(-1, 1) for name in dependent_names}
+                        for location in LOCATIONS
+                    }
+                    for dependent_op in operation_ids
+                    if dependent_op != operation_id
+                }
+                for idx in range(params)
+            },
+            "body": {},
+        }
+        for operation_id in operation_ids
+    }
+    learner = Learner()
+    for dependent_op in operation_ids:
+        for location in LOCATIONS:
+            for name in dependent_names:
+                if rng.random() < available:
+                    getattr(learner, STORES[location]).setdefault(dependent_op, {})[
+                        name
+                    ] = ["value"]
+                    agent.mark_available(location, dependent_op, name)
+    return agent, learner, operation_ids
+
+
+def scan_best(agent: DependencyAgent, learner: Learner, operation_id: str) -> dict:
+    """The selection before the candidate index: a scan of the parameter's Q-table entries."""
+    best = {}
+    for param, dependent_ops in agent.q_table[operation_id]["params"].items():
+        choice = {
+            "dependent_val": None,
+            "dependent_operation": None,
+            "value": float("-inf"),
+            "in_value": None,
+        }
+        for dependent_op, value_dict in dependent_ops.items():
+            for location, loc_params in value_dict.items():
+                store = getattr(learner, STORES[location])
+                for dependent_param, value in loc_params.items():
+                    if (
+                        value > choice["value"]
+                        and dependent_op in store
+                        and store[dependent_op].get(dependent_param)
+                    ):
+                        choice = {
+                            "dependent_val": dependent_param,
+                            "dependent_operation": dependent_op,
+                            "value": value,
+                            "in_value": location,
+                        }
+        best[param] = choice
+    return best
+
+
+def scan_random(agent: DependencyAgent, learner: Learner, operation_id: str) -> dict:
+    chosen = {}
+    for param, dependent_ops in agent.q_table[operation_id]["params"].items():
+        options = []
+        for dependent_op, value_dict in dependent_ops.items():
+            for location, loc_params in value_dict.items():
+                store = getattr(learner, STORES[location])
+                for dependent_param, value in loc_params.items():
+                    if dependent_op in store and store[dependent_op].get(
+                        dependent_param
+                    ):
+                        options.append((dependent_param, dependent_op, value, location))
+        chosen[param] = random.choice(options) if options else None
+    return chosen
+
+
+def td_update(
+    agent: DependencyAgent, operation_id: str, best: dict, rng: random.Random
+) -> None:
+    """One Q update of the selected dependencies, as the learning loop applies after each request."""
+    used = {param: info for param, info in best.items() if info["dependent_operation"]}
+    agent.update_Q_item(operation_id, used, None, rng.uniform(-1, 1))
+
+
+def time_calls(call, operation_ids, calls: int, rng: random.Random) -> list[float]:
+    samples = []
+    for _ in range(calls):
+        operation_id = rng.choice(operation_ids)
+        start = time.perf_counter()
+        call(operation_id)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(label: str, samples: list[float]) -> str:
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    mean, median = statistics.mean(samples), statistics.median(samples)
+    return f"{label:<16}{mean * 1e6:>12.1f}{median * 1e6:>12.1f}{p99 * 1e6:>12.1f}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--operations", type=int, nargs="+", default=[50, 200, 500])
+    parser.add_argument(
+        "--params", type=int, default=4, help="parameters per operation"
+    )
+    parser.add_argument(
+        "--names",
+        type=int,
+        default=4,
+        help="dependent names per operation and location",
+    )
+    parser.add_argument(
+        "--available", type=float, default=0.3, help="share of sources holding a value"
+    )
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for operations in args.operations:
+        agent, learner, operation_ids = build(
+            operations, args.params, args.names, args.available, args.seed
+        )
+        candidates = args.params * (operations - 1) * len(LOCATIONS) * args.names
+        print(f"\n{operations} operations, {candidates} candidates per operation")
+        print(f"{'':<16}{'mean us':>12}{'median us':>12}{'p99 us':>12}")
+
+        rng = random.Random(args.seed)
+        for operation_id in operation_ids:
+            # Build the index outside the timed calls, as the first request of a run does.
+            agent.get_best_action(operation_id, None)
+
+        def indexed_best(operation_id: str) -> None:
+            _, best, _ = agent.get_best_action(operation_id, None)
+            td_update(agent, operation_id, best, rng)
+
+        def scanned_best(operation_id: str) -> None:
+            td_update(agent, operation_id, scan_best(agent, learner, operation_id), rng)
+
+        # The scans are slow on large graphs; fewer calls give the same averages.
+        scan_calls = max(10, args.calls // max(1, operations // 50))
+        for label, call, calls in (
+            ("best (index)", indexed_best, args.calls),
+            ("best (scan)", scanned_best, scan_calls),
+            (
+                "random (index)",
+                lambda op: agent.get_random_action(op, None),
+                args.calls,
+            ),
+            ("random (scan)", lambda op: scan_random(agent, learner, op), scan_calls),
+        ):
+            print(report(label, time_calls(call, operation_ids, calls, rng)))
+
+        mismatches = 0
+        for operation_id in operation_ids[:50]:
+            _, best, _ = agent.get_best_action(operation_id, None)
+            mismatches += best != scan_best(agent, learner, operation_id)
+        print(f"best selections differing from the scan: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
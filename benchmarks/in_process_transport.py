@@ -0,0 +1,166 @@
+"""
+Requests per second against a toy JSON API served two ways: called in-process by
+the [transport] "wsgi"/"asgi" adapters, and over a localhost keep-alive socket.
+The socket server parses each request with http.server and hands it to the same
+adapter, so both paths run the app identically and the difference is the socket
+round trip plus HTTP serialization and parsing on both sides.
+
+    python benchmarks/in_process_transport.py --requests 5000
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from autoresttest.transport import ASGIAdapter, WSGIAdapter  # noqa: E402
+
+ITEMS = {
+    idx: {"id": idx, "name": f"item-{idx}", "tags": ["a", "b"]} for idx in range(100)
+}
+
+
+def handle(method: str, path: str, body: bytes) -> tuple[int, dict]:
+    """The toy API: GET /items/<id> and POST /items."""
+    if method == "POST" and path == "/items":
+        item = json.loads(body or b"{}")
+        return 201, {"id": len(ITEMS), **item}
+    if method == "GET" and path.startswith("/items/"):
+        item = ITEMS.get(int(path.rsplit("/", 1)[1]))
+        return (200, item) if item else (404, {"detail": "not found"})
+    return 404, {"detail": "not found"}
+
+
+def wsgi_app(environ, start_response):
+    length = int(environ.get("CONTENT_LENGTH") or 0)
+    status, payload = handle(
+        environ["REQUEST_METHOD"],
+        environ["PATH_INFO"],
+        environ["wsgi.input"].read(length),
+    )
+    body = json.dumps(payload).encode()
+    start_response(
+        f"{status} {'Created' if status == 201 else 'OK'}",
+        [("Content-Type", "application/json"), ("Content-Length", str(len(body)))],
+    )
+    return [body]
+
+
+async def asgi_app(scope, receive, send):
+    if scope["type"] != "http":
+        return
+    message = await receive()
+    status, payload = handle(scope["method"], scope["path"], message.get("body", b""))
+    body = json.dumps(payload).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+def serve_over_socket(adapter) -> ThreadingHTTPServer:
+    """A keep-alive localhost server in front of ``adapter``, one thread per connection."""
+    skipped = {"content-length", "connection", "transfer-encoding"}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Small responses otherwise wait for the client's delayed ACK.
+        disable_nagle_algorithm = True
+
+        def _forward(self) -> None:
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            prepared = requests.Request(
+                self.command,
+                f"http://{self.headers.get('Host', 'localhost')}{self.path}",
+                headers=dict(self.headers),
+                data=body,
+            ).prepare()
+            response = adapter.send(prepared)
+            self.send_response(response.status_code, response.reason)
+            for name, value in response.headers.items():
+                if name.lower() not in skipped:
+                    self.send_header(name, value)
+            self.send_header("Content-Length", str(len(response.content)))
+            self.end_headers()
+            self.wfile.write(response.content)
+
+        do_GET = do_POST = _forward
+
+        def log_message(self, format, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def requests_per_second(session: requests.Session, base_url: str, count: int) -> float:
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for _ in range(count):
+        if rng.random() < 0.7:
+            response = session.get(f"{base_url}/items/{rng.randrange(120)}")
+        else:
+            response = session.post(
+                f"{base_url}/items", json={"name": "new", "tags": []}
+            )
+        response.json()
+    return count / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument(
+        "--mode", choices=["wsgi", "asgi"], nargs="+", default=["wsgi", "asgi"]
+    )
+    args = parser.parse_args()
+
+    print(f"{'mode':>6}{'in-process req/s':>18}{'socket req/s':>14}{'speedup':>9}")
+    for mode in args.mode:
+        adapter = ASGIAdapter(asgi_app) if mode == "asgi" else WSGIAdapter(wsgi_app)
+
+        in_process = requests.Session()
+        in_process.mount("http://", adapter)
+        in_process_rate = requests_per_second(
+            in_process, "http://sut.invalid", args.requests
+        )
+
+        server = serve_over_socket(adapter)
+        with requests.Session() as over_socket:
+            socket_rate = requests_per_second(
+                over_socket,
+                f"http://127.0.0.1:{server.server_address[1]}",
+                args.requests,
+            )
+        server.shutdown()
+        if isinstance(adapter, ASGIAdapter):
+            adapter.shutdown()
+
+        print(
+            f"{mode:>6}{in_process_rate:>18.1f}{socket_rate:>14.1f}"
+            f"{in_process_rate / socket_rate:>8.1f}x",
+            flush=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Send-path overhead per request with the network stubbed out: the compiled
+OperationDispatchPlan against the per-request preparation it replaced (deepcopy,
+split_parameter_values, str.replace per path parameter, header merge, and
+get_accept_header). "prepare" times only turning the chosen values into a path,
+query, headers, and cookies; "send" adds QLearning.send_operation's call through
+dispatch_request and the pooled session, whose adapter answers without a socket.
+
+    python benchmarks/send_path.py --parameters 2 8 32 --iterations 20000
+"""
+
+import argparse
+import copy
+import random
+import sys
+import time
+from pathlib import Path
+
+import requests
+from requests.adapters import BaseAdapter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from autoresttest.config import get_config  # noqa: E402
+from autoresttest.marl.marl import QLearning  # noqa: E402
+from autoresttest.models import (  # noqa: E402
+    OperationProperties,
+    ParameterProperties,
+    ResponseProperties,
+    SchemaProperties,
+)
+from autoresttest.transport import get_http_method, get_http_session  # noqa: E402
+from autoresttest.utils import (  # noqa: E402
+    OperationDispatchPlan,
+    dispatch_request,
+    get_accept_header,
+    split_parameter_values,
+)
+
+CONFIG = get_config()
+API_URL = "http://sut.invalid"
+
+
+class StubAdapter(BaseAdapter):
+    """Answers every request with a small JSON body, so only client-side work is timed."""
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.headers["Content-Type"] = "application/json"
+        response._content = b'{"id": 1}'
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def synthetic_operation(count: int, seed: int):
+    """An operation with ``count`` parameters spread over every location, and values for them."""
+    rng = random.Random(seed)
+    locations = ["path", "query", "query", "header", "cookie"]
+    parameters = {}
+    values = {}
+    segments = ["/api", "v1"]
+    for idx in range(count):
+        location = locations[idx % len(locations)]
+        name = f"param{idx}"
+        parameters[(name, location)] = ParameterProperties(
+            name=name, in_value=location, schema=SchemaProperties(type="string")
+        )
+        if location == "path":
+            segments += [f"items{idx}", "{" + name + "}"]
+            values[(name, location)] = rng.randrange(10_000)
+        elif location == "query" and rng.random() < 0.5:
+            values[(name, location)] = [rng.randrange(100) for _ in range(4)]
+        else:
+            values[(name, location)] = f"value-{rng.randrange(10_000)}"
+    operation = OperationProperties(
+        operation_id=f"operation{count}",
+        endpoint_path="/".join(segments),
+        http_method="get",
+        parameters=parameters,
+        responses={
+            "200": ResponseProperties(
+                status_code=200,
+                content={
+                    "application/json": SchemaProperties(type="object"),
+                    "application/xml": SchemaProperties(type="object"),
+                },
+            ),
+            "404": ResponseProperties(status_code=404),
+        },
+    )
+    return operation, values
+
+
+def legacy_prepare(operation_properties, parameters, header):
+    """QLearning.send_operation's preparation before dispatch plans."""
+    endpoint_path = operation_properties.endpoint_path
+    processed_parameters = copy.deepcopy(parameters) or {}
+    path_params, query_params, header_params, cookie_params = split_parameter_values(
+        operation_properties.parameters, processed_parameters
+    )
+    for name, value in path_params.items():
+        endpoint_path = endpoint_path.replace("{" + name + "}", str(value))
+    merged_headers = header_params.copy()
+    merged_headers.update(CONFIG.static_headers)
+    if header:
+        merged_headers.update(header)
+    accept_header = get_accept_header(operation_properties.responses)
+    return endpoint_path, query_params, merged_headers, cookie_params, accept_header
+
+
+def plan_prepare(plans, operation_properties, parameters, header):
+    """The same result from the plan cached per operation, as send_operation does now."""
+    plan = plans.get(operation_properties.operation_id)
+    if plan is None:
+        plan = OperationDispatchPlan(operation_properties)
+        plans[operation_properties.operation_id] = plan
+    return (*plan.bind(parameters, header), plan.accept)
+
+
+def legacy_send(operation_properties, parameters, header):
+    endpoint_path, query_params, headers, cookies, accept = legacy_prepare(
+        operation_properties, parameters, header
+    )
+    return dispatch_request(
+        select_method=get_http_method(API_URL, operation_properties.http_method),
+        full_url=API_URL + endpoint_path,
+        params=query_params,
+        body=None,
+        header=headers,
+        cookies=cookies,
+        accept=accept,
+        max_retries=0,
+        operation_id=operation_properties.operation_id,
+        paced=False,
+    )
+
+
+def per_call_us(function, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--parameters", type=int, nargs="+", default=[2, 8, 32])
+    parser.add_argument("--iterations", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    get_http_session(API_URL).mount("http://", StubAdapter())
+    # Only the attributes send_operation reads; the agents are not needed here.
+    q_learning = QLearning.__new__(QLearning)
+    q_learning.api_url = API_URL
+    q_learning._dispatch_plans = {}
+    header = {"Authorization": "Bearer token"}
+
+    print(
+        f"{'parameters':>10}{'prepare legacy us':>19}{'prepare plan us':>17}"
+        f"{'speedup':>9}{'send legacy us':>16}{'send plan us':>14}{'speedup':>9}"
+    )
+    for count in args.parameters:
+        operation, values = synthetic_operation(count, args.seed)
+        plans: dict = {}
+        # Both paths must produce the same request before their timings mean anything.
+        assert legacy_prepare(operation, values, header) == plan_prepare(
+            plans, operation, values, header
+        )
+
+        prepare_legacy = per_call_us(
+            lambda: legacy_prepare(operation, values, header), args.iterations
+        )
+        prepare_plan = per_call_us(
+            lambda: plan_prepare(plans, operation, values, header), args.iterations
+        )
+        send_legacy = per_call_us(
+            lambda: legacy_send(operation, values, header), args.iterations
+        )
+        send_plan = per_call_us(
+            lambda: q_learning.send_operation(operation, values, None, header),
+            args.iterations,
+        )
+        print(
+            f"{count:>10}{prepare_legacy:>19.2f}{prepare_plan:>17.2f}"
+            f"{prepare_legacy / prepare_plan:>8.1f}x"
+            f"{send_legacy:>16.1f}{send_plan:>14.1f}"
+            f"{send_legacy / send_plan:>8.2f}x",
+            flush=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Requests per second against a localhost server: module-level requests.* calls, as
+every sender used before the pooled sessions, against the keep-alive session that
+autoresttest.transport shares per host. Module-level calls build a new session,
+and so a new connection, for every request.
+
+    python benchmarks/session_pooling.py --requests 2000
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from autoresttest.transport import close_http_sessions, get_http_method  # noqa: E402
+
+
+def start_server() -> ThreadingHTTPServer:
+    """A keep-alive JSON server on a free local port, one thread per connection."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Small responses otherwise wait for the client's delayed ACK.
+        disable_nagle_algorithm = True
+
+        def _reply(self) -> None:
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            body = json.dumps({"id": 1, "path": self.path}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_GET = do_POST = _reply
+
+        def log_message(self, format, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def requests_per_second(resolve, base_url: str, count: int) -> float:
+    """Alternate GET and POST requests, resolving the method the way a sender does."""
+    start = time.perf_counter()
+    for idx in range(count):
+        if idx % 2:
+            response = resolve("post")(f"{base_url}/items", json={"name": "item"})
+        else:
+            response = resolve("get")(f"{base_url}/items/{idx}", params={"limit": 10})
+        response.json()
+    return count / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per path")
+    args = parser.parse_args()
+
+    server = start_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    print(f"{'run':>4}{'module-level req/s':>20}{'pooled req/s':>14}{'speedup':>9}")
+    for run in range(1, args.repeat + 1):
+        module_rate = requests_per_second(
+            lambda method: getattr(requests, method), base_url, args.requests
+        )
+        pooled_rate = requests_per_second(
+            lambda method: get_http_method(base_url, method), base_url, args.requests
+        )
+        print(
+            f"{run:>4}{module_rate:>20.1f}{pooled_rate:>14.1f}"
+            f"{pooled_rate / module_rate:>8.1f}x",
+            flush=True,
+        )
+
+    close_http_sessions()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Dependency-graph construction on synthetic specifications: the shared embedding
+matrix (OperationGraph.determine_dependencies) against the per-pair cosine path it
+replaced. The per-pair path is timed on a sample of operation pairs and
+extrapolated to all of them.
+
+    python benchmarks/similarity_matrix.py --operations 100 500 2000
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from autoresttest.graph.generate_graph import OperationGraph  # noqa: E402
+from autoresttest.models import (  # noqa: E402
+    OperationProperties,
+    ParameterProperties,
+    ResponseProperties,
+    SchemaProperties,
+)
+from autoresttest.utils import EmbeddingModel  # noqa: E402
+
+
+def build_model(words: list[str], dimensions: int, seed: int) -> EmbeddingModel:
+    """Random vectors for ``words``, standing in for the GloVe store."""
+    rng = np.random.default_rng(seed)
+    model = EmbeddingModel()
+    model._model = {  # type: ignore[assignment]
+        word: rng.normal(size=dimensions).astype(np.float32) for word in words
+    }
+    return model
+
+
+def synthetic_operations(
+    count: int, words: list[str], seed: int
+) -> dict[str, OperationProperties]:
+    """Operations with 0-4 parameters, an optional body, and an object-list response."""
+    rng = random.Random(seed)
+
+    def name() -> str:
+        parts = rng.sample(words, rng.randint(1, 2))
+        return parts[0] + "".join(part.capitalize() for part in parts[1:])
+
+    def schema(size: int) -> SchemaProperties:
+        return SchemaProperties(
+            type="object",
+            properties={name(): SchemaProperties(type="string") for _ in range(size)},
+        )
+
+    operations = {}
+    for idx in range(count):
+        parameters = {}
+        for _ in range(rng.randint(0, 4)):
+            parameter = name()
+            location = rng.choice(["query", "path"])
+            parameters[(parameter, location)] = ParameterProperties(
+                name=parameter, in_value=location
+            )
+        operation_id = f"op{idx}"
+        operations[operation_id] = OperationProperties(
+            operation_id=operation_id,
+            endpoint_path=f"/{operation_id}",
+            http_method=rng.choice(["get", "post", "put", "delete"]),
+            parameters=parameters,
+            request_body=(
+                {"application/json": schema(rng.randint(2, 6))}
+                if rng.random() < 0.5
+                else None
+            ),
+            responses={
+                "200": ResponseProperties(
+                    status_code=200,
+                    content={
+                        "application/json": SchemaProperties(
+                            type="array", items=schema(rng.randint(3, 8))
+                        )
+                    },
+                )
+            },
+        )
+    return operations
+
+
+def new_graph(operations, model: EmbeddingModel) -> OperationGraph:
+    graph = OperationGraph("spec.yaml", "synthetic", None, model)  # type: ignore[arg-type]
+    for operation_properties in operations.values():
+        graph.add_operation_node(operation_properties)
+    return graph
+
+
+def time_matrix(operations, model: EmbeddingModel) -> float:
+    graph = new_graph(operations, model)
+    start = time.perf_counter()
+    # Silence the progress bar and the build summary.
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(
+        io.StringIO()
+    ):
+        graph.determine_dependencies(operations)
+    return time.perf_counter() - start
+
+
+def time_per_pair(operations, model: EmbeddingModel, pairs: int, seed: int) -> float:
+    """Seconds per compare_cosine call (no matrix), over a sample of ordered pairs."""
+    graph = new_graph(operations, model)
+    comparator = graph.dependency_comparator
+    rng = random.Random(seed)
+    operation_ids = list(operations)
+    sample = []
+    while len(sample) < pairs:
+        first, second = rng.sample(operation_ids, 2)
+        sample.append((operations[first], operations[second]))
+    start = time.perf_counter()
+    for first, second in sample:
+        comparator.compare_cosine(first, second)
+    return (time.perf_counter() - start) / pairs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--operations", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--words", type=int, default=400, help="vocabulary size")
+    parser.add_argument("--dimensions", type=int, default=50)
+    parser.add_argument(
+        "--pairs", type=int, default=2000, help="sampled pairs for the per-pair path"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Names are split on case and separators and digits are dropped, so use letters only.
+    letters = random.Random(args.seed)
+    words = sorted(
+        {
+            "".join(letters.choices("abcdefghijklmnopqrstuvwxyz", k=6))
+            for _ in range(args.words)
+        }
+    )
+    print(
+        f"{'operations':>10}{'pairs':>12}{'matrix s':>12}"
+        f"{'per-pair s (est.)':>20}{'speedup':>10}"
+    )
+    for count in args.operations:
+        operations = synthetic_operations(count, words, args.seed)
+        pairs = count * (count - 1)
+        # Each path gets a fresh model so neither reuses the other's embedding cache.
+        matrix_seconds = time_matrix(
+            operations, build_model(words, args.dimensions, args.seed)
+        )
+        per_pair_seconds = pairs * time_per_pair(
+            operations,
+            build_model(words, args.dimensions, args.seed),
+            min(args.pairs, pairs),
+            args.seed,
+        )
+        print(
+            f"{count:>10}{pairs:>12}{matrix_seconds:>12.2f}"
+            f"{per_pair_seconds:>20.2f}{per_pair_seconds / matrix_seconds:>10.1f}x",
+            flush=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Soak test of capped value stores: resident memory and per-append latency over a
+long stream of harvested values, printed once per interval. Run it for hours to
+check that memory stays flat once every bucket is full.
+
+    python benchmarks/value_store_soak.py --duration 14400 --eviction diverse
+    python benchmarks/value_store_soak.py --duration 60 --scan   # previous eviction
+"""
+
+import argparse
+import random
+import resource
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from autoresttest.utils import ValueBucket, store_stats  # noqa: E402
+from autoresttest.utils.value_store import value_shape  # noqa: E402
+
+LATENCY_SAMPLES = 10_000
+
+
+class ScanBucket(ValueBucket):
+    """The eviction before the shape index: a shape scan per append, and no evicted filter."""
+
+    def _eviction_index(self) -> Optional[int]:
+        if self.eviction == "diverse":
+            shapes = [value_shape(value) for value in self]
+            common, _ = Counter(shapes).most_common(1)[0]
+            return random.choice(
+                [idx for idx, shape in enumerate(shapes) if shape == common]
+            )
+        return super()._eviction_index()
+
+    def _remember(self, key: bytes) -> None:
+        pass
+
+
+def rss_mib() -> float:
+    """Current resident memory, or the peak where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as fh:
+            pages = int(fh.read().split()[1])
+        return pages * resource.getpagesize() / (1024 * 1024)
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Bytes on macOS, KiB elsewhere.
+        return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def harvested_value(rng: random.Random, step: int, recurring: float):
+    """A response value: often one seen before, otherwise a new id, name, or object."""
+    if rng.random() < recurring:
+        ident = rng.randrange(1000)
+    else:
+        ident = step
+    kind = rng.random()
+    if kind < 0.6:
+        return ident
+    if kind < 0.85:
+        return f"item-{ident}"
+    if kind < 0.97:
+        return {"id": ident, "name": f"item-{ident}", "tags": ["a", "b"]}
+    return [ident, ident + 1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--duration", type=float, default=60.0, help="seconds to run (4 h = 14400)"
+    )
+    parser.add_argument("--interval", type=float, default=10.0, help="seconds per row")
+    parser.add_argument("--buckets", type=int, default=500, help="stored properties")
+    parser.add_argument("--capacity", type=int, default=200, help="[value_store] cap")
+    parser.add_argument(
+        "--eviction", choices=["reservoir", "diverse"], default="diverse"
+    )
+    parser.add_argument(
+        "--recurring", type=float, default=0.5, help="share of values seen before"
+    )
+    parser.add_argument(
+        "--scan", action="store_true", help="use the previous scan-based eviction"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    random.seed(args.seed)
+    bucket_class = ScanBucket if args.scan else ValueBucket
+    buckets = [
+        bucket_class(capacity=args.capacity, eviction=args.eviction)
+        for _ in range(args.buckets)
+    ]
+
+    print(
+        f"{'elapsed s':>10}{'appends':>12}{'RSS MiB':>10}{'mean us':>10}"
+        f"{'p99 us':>10}{'retained':>10}{'seen':>12}{'evicted':>12}"
+    )
+    start = time.perf_counter()
+    step = 0
+    while True:
+        # A fixed-size sample of the latencies, so the benchmark's own memory stays flat.
+        samples: list[float] = []
+        total, appends = 0.0, 0
+        interval_end = time.perf_counter() + args.interval
+        while time.perf_counter() < interval_end:
+            bucket = buckets[rng.randrange(len(buckets))]
+            value = harvested_value(rng, step, args.recurring)
+            before = time.perf_counter()
+            bucket.append(value)
+            latency = time.perf_counter() - before
+            total += latency
+            appends += 1
+            if len(samples) < LATENCY_SAMPLES:
+                samples.append(latency)
+            else:
+                slot = rng.randrange(appends)
+                if slot < LATENCY_SAMPLES:
+                    samples[slot] = latency
+            step += 1
+        samples.sort()
+        stats = store_stats(*buckets)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{elapsed:>10.0f}{step:>12}{rss_mib():>10.1f}"
+            f"{total / appends * 1e6:>10.1f}"
+            f"{samples[int(len(samples) * 0.99)] * 1e6:>10.1f}"
+            f"{stats['retained']:>10}{stats['seen']:>12}{stats['evicted']:>12}",
+            flush=True,
+        )
+        if elapsed >= args.duration:
+            break
+
+
+if __name__ == "__main__":
+    main()
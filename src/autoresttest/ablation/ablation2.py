@@ -27,7 +27,9 @@ from autoresttest.graph import RequestGenerator
 from autoresttest.utils import construct_basic_token, get_body_params, \
     get_response_params, get_response_param_mappings, remove_nulls, encode_dictionary, EmbeddingModel, get_api_url, \
     dispatch_request, get_q_table_cache_path
+from autoresttest.transport import get_http_method
 from autoresttest.llm import identify_generator, randomize_string, random_generator, randomize_object
+from autoresttest.marl.sampling_pool import SuccessfulValuePool
 
 
 CONFIG = get_config()
@@ -58,11 +60,22 @@ class Ablation2:
         self.successful_bodies = {}
         self.successful_responses = {}
         self.successful_primitives = {}
+        self.successful_pool = SuccessfulValuePool()
         self.operation_response_counter = {}
+        self.has_successful_response = False
         self._init_parameter_tracking()
         self._init_body_tracking()
         self._init_response_tracking()
 
+    def _mark_successful(self, location, operation_id, key):
+        # Keeps the RANDOM dependency pool current; dependency candidates only become
+        # selectable once their source holds a value.
+        stores = {"params": self.successful_parameters, "body": self.successful_bodies, "response": self.successful_responses}
+        bucket = stores[location][operation_id][key]
+        if bucket:
+            self.successful_pool.update(location, operation_id, key, bucket)
+            self.dependency_agent.mark_available(location, operation_id, key)
+
     def print_q_tables(self):
         print("OPERATION Q-TABLE: ", self.operation_agent.q_table)
         print("HEADER Q-TABLE: ", self.header_agent.q_table)
@@ -290,7 +303,7 @@ class Ablation2:
         #self._test_send_operation(operation_properties, parameters, body, header, specific_method)
 
         try:
-            select_method = getattr(requests, http_method)
+            select_method = get_http_method(self.api_url, http_method)
             full_url = self.api_url + endpoint_path
             response = dispatch_request(
                 select_method=select_method,
@@ -606,7 +619,7 @@ class Ablation2:
                 parameters = self.get_mapping(select_params.req_params, param_mappings) if select_params.req_params else None
                 body = self.get_mapping([select_params.mime_type], body_mappings) if select_params.mime_type else None
             elif data_source == "DEPENDENCY":
-                dependency_type, parameter_dependencies, request_body_dependencies = self.dependency_agent.get_action(operation_id, self)
+                dependency_type, parameter_dependencies, request_body_dependencies = self.dependency_agent.get_action(operation_id, self, has_success=self.has_successful_response)
 
                 llm_select_values = self.value_agent.get_best_action(operation_id)
 
@@ -715,6 +728,7 @@ class Ablation2:
                     for param_name, param_val in parameters.items():
                         if param_name in self.successful_parameters[operation_id] and param_val not in self.successful_parameters[operation_id][param_name]:
                             self.successful_parameters[operation_id][param_name].append(param_val)
+                            self._mark_successful("params", operation_id, param_name)
                 if body and self.successful_bodies[operation_id]:
                     for mime, body_properties in body.items():
                         deconstructed_body = self._deconstruct_body(body_properties)
@@ -722,6 +736,7 @@ class Ablation2:
                             for prop_name, prop_val in deconstructed_body.items():
                                 if prop_name in self.successful_bodies[operation_id] and prop_val not in self.successful_bodies[operation_id][prop_name]:
                                     self.successful_bodies[operation_id][prop_name].append(prop_val)
+                                    self._mark_successful("body", operation_id, prop_name)
                 if response.content and self.successful_responses[operation_id] is not None:
                     try:
                         response_content = json.loads(response.content)
@@ -739,8 +754,10 @@ class Ablation2:
                                 for response_val in response_vals:
                                     if response_val not in self.successful_responses[operation_id][response_prop]:
                                         self.successful_responses[operation_id][response_prop].append(response_val)
+                                self._mark_successful("response", operation_id, response_prop)
                             else:
                                 self.successful_responses[operation_id][response_prop] = response_vals
+                                self._mark_successful("response", operation_id, response_prop)
                                 if self.dependency_agent.add_undocumented_responses(operation_id, response_prop) and "DEPENDENCY" not in self.data_source_agent.available_data_sources:
                                     self.data_source_agent.initialize_dependency_source()
 
@@ -756,6 +773,8 @@ class Ablation2:
 
             if response is not None:
                 self.responses[response.status_code] += 1
+                if response.status_code // 100 == 2:
+                    self.has_successful_response = True
                 if operation_id not in self.operation_response_counter:
                     self.operation_response_counter[operation_id] = {response.status_code: 1}
                 elif response.status_code not in self.operation_response_counter[operation_id]:
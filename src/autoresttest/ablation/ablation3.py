@@ -27,6 +27,7 @@ from autoresttest.graph import RequestGenerator
 from autoresttest.utils import construct_basic_token, get_body_params, \
     get_response_params, get_response_param_mappings, remove_nulls, encode_dictionary, EmbeddingModel, get_api_url, \
     dispatch_request, get_q_table_cache_path
+from autoresttest.transport import get_http_method
 from autoresttest.llm import identify_generator, randomize_string, random_generator, randomize_object
 
 
@@ -290,7 +291,7 @@ class Ablation3:
         #self._test_send_operation(operation_properties, parameters, body, header, specific_method)
 
         try:
-            select_method = getattr(requests, http_method)
+            select_method = get_http_method(self.api_url, http_method)
             full_url = self.api_url + endpoint_path
             response = dispatch_request(
                 select_method=select_method,
@@ -27,6 +27,7 @@ from autoresttest.graph import RequestGenerator
 from autoresttest.utils import construct_basic_token, get_body_params, \
     get_response_params, get_response_param_mappings, remove_nulls, encode_dictionary, EmbeddingModel, get_api_url, \
     dispatch_request, get_q_table_cache_path
+from autoresttest.transport import get_http_method
 from autoresttest.llm import identify_generator, randomize_string, random_generator, randomize_object
 
 
@@ -63,6 +64,12 @@ class Ablation4:
         self._init_body_tracking()
         self._init_response_tracking()
 
+    def _mark_successful(self, location, operation_id, key):
+        # Dependency candidates only become selectable once their source holds a value.
+        stores = {"params": self.successful_parameters, "body": self.successful_bodies, "response": self.successful_responses}
+        if stores[location][operation_id][key]:
+            self.dependency_agent.mark_available(location, operation_id, key)
+
     def print_q_tables(self):
         print("OPERATION Q-TABLE: ", self.operation_agent.q_table)
         print("HEADER Q-TABLE: ", self.header_agent.q_table)
@@ -290,7 +297,7 @@ class Ablation4:
         #self._test_send_operation(operation_properties, parameters, body, header, specific_method)
 
         try:
-            select_method = getattr(requests, http_method)
+            select_method = get_http_method(self.api_url, http_method)
             full_url = self.api_url + endpoint_path
             response = dispatch_request(
                 select_method=select_method,
@@ -787,6 +794,7 @@ class Ablation4:
                     for param_name, param_val in parameters.items():
                         if param_name in self.successful_parameters[operation_id] and param_val not in self.successful_parameters[operation_id][param_name]:
                             self.successful_parameters[operation_id][param_name].append(param_val)
+                            self._mark_successful("params", operation_id, param_name)
                 if body and self.successful_bodies[operation_id]:
                     for mime, body_properties in body.items():
                         deconstructed_body = self._deconstruct_body(body_properties)
@@ -794,6 +802,7 @@ class Ablation4:
                             for prop_name, prop_val in deconstructed_body.items():
                                 if prop_name in self.successful_bodies[operation_id] and prop_val not in self.successful_bodies[operation_id][prop_name]:
                                     self.successful_bodies[operation_id][prop_name].append(prop_val)
+                                    self._mark_successful("body", operation_id, prop_name)
                 if response.content and self.successful_responses[operation_id] is not None:
                     try:
                         response_content = json.loads(response.content)
@@ -811,8 +820,10 @@ class Ablation4:
                                 for response_val in response_vals:
                                     if response_val not in self.successful_responses[operation_id][response_prop]:
                                         self.successful_responses[operation_id][response_prop].append(response_val)
+                                self._mark_successful("response", operation_id, response_prop)
                             else:
                                 self.successful_responses[operation_id][response_prop] = response_vals
+                                self._mark_successful("response", operation_id, response_prop)
                                 if self.dependency_agent.add_undocumented_responses(operation_id, response_prop) and "DEPENDENCY" not in self.data_source_agent.available_data_sources:
                                     self.data_source_agent.initialize_dependency_source()
 
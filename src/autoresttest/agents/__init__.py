@@ -1,3 +1,4 @@
+from .action_table import ArrayActionTable
 from .base_agent import BaseAgent
 from .body_obj_agent import BodyObjAgent
 from .data_source_agent import DataSourceAgent
@@ -5,6 +6,7 @@ from .dependency_agent import DependencyAgent
 from .header_agent import HeaderAgent
 from .operation_agent import OperationAgent
 from .parameter_agent import ParameterAction, ParameterAgent
+from .parameter_index import ParameterEmbeddingIndex, ParameterIndexSnapshot
 from .value_agent import ValueAgent
 from autoresttest.models import ValueAction
 
@@ -19,4 +21,7 @@ __all__ = [
     "BodyObjAgent",
     "DataSourceAgent",
     "DependencyAgent",
+    "ArrayActionTable",
+    "ParameterEmbeddingIndex",
+    "ParameterIndexSnapshot",
 ]
@@ -0,0 +1,324 @@
+import bisect
+import random
+import sys
+from collections.abc import Iterable, Mapping, MutableMapping, Sequence
+from typing import Any, Dict, Hashable, Iterator, List, Optional
+
+import numpy as np
+
+
+class ArrayActionTable(MutableMapping):
+    """
+    Q-values for one operation's action combinations, stored in a NumPy array.
+
+    Behaves like the ``{action: q_value}`` dict it replaces (same keys, same
+    insertion order, plain Python numbers as values) so JSON output, sharding merges and
+    the exploration counters are unchanged. Actions are interned to integer ids
+    and a boolean mask records which actions contain every ``required`` item, so
+    the best feasible action is a masked argmax instead of a subset test per key.
+    """
+
+    def __init__(
+        self,
+        actions: Iterable[Hashable] = (),
+        required: Optional[Iterable[Any]] = None,
+        initial: float = 0.0,
+    ) -> None:
+        self.required = frozenset(required or ())
+        self._ids: Dict[Hashable, int] = {}
+        self._actions: List[Hashable] = []
+        self._values = np.zeros(0, dtype=np.float64)
+        self._feasible = np.zeros(0, dtype=bool)
+        # Actions last assigned an int, returned as int so JSON output matches the dict tables.
+        self._int_actions: set = set()
+        for action in actions:
+            self[action] = initial
+
+    def _is_feasible(self, action: Hashable) -> bool:
+        if not self.required:
+            return True
+        return isinstance(action, tuple) and self.required.issubset(action)
+
+    def _grow(self) -> None:
+        capacity = max(8, 2 * len(self._values))
+        values = np.zeros(capacity, dtype=np.float64)
+        values[: len(self._actions)] = self._values[: len(self._actions)]
+        feasible = np.zeros(capacity, dtype=bool)
+        feasible[: len(self._actions)] = self._feasible[: len(self._actions)]
+        self._values, self._feasible = values, feasible
+
+    def __getitem__(self, action: Hashable) -> float:
+        value = float(self._values[self._ids[action]])
+        return int(value) if action in self._int_actions else value
+
+    def __setitem__(self, action: Hashable, value: float) -> None:
+        idx = self._ids.get(action)
+        if idx is None:
+            idx = len(self._actions)
+            if idx == len(self._values):
+                self._grow()
+            self._ids[action] = idx
+            self._actions.append(action)
+            self._feasible[idx] = self._is_feasible(action)
+        self._values[idx] = value
+        if isinstance(value, int) and not isinstance(value, bool):
+            self._int_actions.add(action)
+        else:
+            self._int_actions.discard(action)
+
+    def __delitem__(self, action: Hashable) -> None:
+        idx = self._ids.pop(action)
+        self._int_actions.discard(action)
+        count = len(self._actions)
+        self._values[idx : count - 1] = self._values[idx + 1 : count]
+        self._feasible[idx : count - 1] = self._feasible[idx + 1 : count]
+        del self._actions[idx]
+        for position in range(idx, count - 1):
+            self._ids[self._actions[position]] = position
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(list(self._actions))
+
+    def __len__(self) -> int:
+        return len(self._actions)
+
+    def __contains__(self, action: object) -> bool:
+        return action in self._ids
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+    @property
+    def values_array(self) -> np.ndarray:
+        """View of the Q-values in action-id order."""
+        return self._values[: len(self._actions)]
+
+    @property
+    def nbytes(self) -> int:
+        return self._values.nbytes + self._feasible.nbytes
+
+    def max_value(self) -> float:
+        return float(self.values_array.max()) if self._actions else 0.0
+
+    def best_action(self, feasible_only: bool = True) -> Optional[Hashable]:
+        """First action with the highest Q-value, optionally among feasible actions."""
+        count = len(self._actions)
+        if not count:
+            return None
+        if not feasible_only:
+            return self._actions[int(np.argmax(self._values[:count]))]
+        feasible = self._feasible[:count]
+        if not feasible.any():
+            return None
+        masked = np.where(feasible, self._values[:count], -np.inf)
+        return self._actions[int(np.argmax(masked))]
+
+
+class LazyActionTable(MutableMapping):
+    """
+    Q-values over a combination space (e.g. a ``CombinationSpace``) that are only
+    allocated once an action is assigned; every other combination reads as
+    ``initial``.
+
+    Iteration (and so ``items()``, ``values()`` and JSON output) yields only the
+    assigned actions: those in the space in combination order, then keys outside the
+    space (such as ``"None"``) in insertion order. ``iter_all()`` walks every
+    combination, unranking each one. ``len()`` still counts the whole space, and
+    lookups of unassigned combinations return ``initial``. Best-action selection
+    and the maximum only look at the assigned values and the first unassigned
+    combination, so their cost does not grow with the size of the space.
+    """
+
+    def __init__(
+        self,
+        space: Sequence,
+        required: Optional[Iterable[Any]] = None,
+        initial: float = 0.0,
+    ) -> None:
+        self.space = space
+        self.required = frozenset(required or ())
+        self.initial = initial
+        self._values: Dict[Hashable, Any] = {}
+        # Iteration position of each assigned action, and the sorted positions inside the space.
+        self._positions: Dict[Hashable, int] = {}
+        self._assigned: List[int] = []
+        self._extra: List[Hashable] = []
+
+    def _is_feasible(self, action: Hashable) -> bool:
+        if not self.required:
+            return True
+        return isinstance(action, tuple) and self.required.issubset(action)
+
+    def __getitem__(self, action: Hashable) -> Any:
+        if action in self._values:
+            return self._values[action]
+        if action in self.space:
+            return self.initial
+        raise KeyError(action)
+
+    def __setitem__(self, action: Hashable, value: Any) -> None:
+        if action not in self._values:
+            try:
+                position = self.space.index(action)
+                bisect.insort(self._assigned, position)
+            except ValueError:
+                position = len(self.space) + len(self._extra)
+                self._extra.append(action)
+            self._positions[action] = position
+        self._values[action] = value
+
+    def __delitem__(self, action: Hashable) -> None:
+        if action not in self._extra:
+            raise TypeError("Combinations of a LazyActionTable cannot be removed")
+        position = self._positions.pop(action)
+        del self._values[action]
+        self._extra.remove(action)
+        for other, other_position in self._positions.items():
+            if other_position > position:
+                self._positions[other] = other_position - 1
+
+    def __iter__(self) -> Iterator[Hashable]:
+        for position in list(self._assigned):
+            yield self.space[position]
+        yield from list(self._extra)
+
+    def iter_all(self) -> Iterator[Hashable]:
+        """Every combination of the space, then the keys outside it."""
+        yield from self.space
+        yield from list(self._extra)
+
+    def __len__(self) -> int:
+        return len(self.space) + len(self._extra)
+
+    def __contains__(self, action: object) -> bool:
+        return action in self._values or action in self.space
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+    def assigned(self) -> Dict[Hashable, Any]:
+        """Actions that hold their own Q-value."""
+        return self._values
+
+    @property
+    def nbytes(self) -> int:
+        space_bytes = getattr(self.space, "nbytes", sys.getsizeof(self.space))
+        return (
+            space_bytes
+            + sys.getsizeof(self._values)
+            + sys.getsizeof(self._positions)
+            + sys.getsizeof(self._assigned)
+        )
+
+    def _first_unassigned(self) -> Optional[int]:
+        """Position of the first combination still at ``initial``."""
+        for expected, position in enumerate(self._assigned):
+            if position != expected:
+                return expected
+        return len(self._assigned) if len(self._assigned) < len(self.space) else None
+
+    def random_action(self) -> Optional[Hashable]:
+        if not len(self):
+            return None
+        idx = random.randrange(len(self))
+        if idx < len(self.space):
+            return self.space[idx]
+        return self._extra[idx - len(self.space)]
+
+    def max_value(self) -> float:
+        values = list(self._values.values())
+        if len(self._assigned) < len(self.space):
+            values.append(self.initial)
+        return max(values) if values else 0.0
+
+    def count_equal(self, value: Any) -> int:
+        matches = sum(1 for assigned in self._values.values() if assigned == value)
+        if self.initial == value:
+            matches += len(self.space) - len(self._assigned)
+        return matches
+
+    def best_action(self, feasible_only: bool = True) -> Optional[Hashable]:
+        """First action with the highest Q-value, optionally among feasible actions."""
+        best: Optional[Hashable] = None
+        best_key = None
+        for action, value in self._values.items():
+            if feasible_only and not self._is_feasible(action):
+                continue
+            key = (value, -self._positions[action])
+            if best_key is None or key > best_key:
+                best, best_key = action, key
+        unassigned = self._first_unassigned()
+        if unassigned is not None:
+            action = self.space[unassigned]
+            if not feasible_only or self._is_feasible(action):
+                key = (self.initial, -unassigned)
+                if best_key is None or key > best_key:
+                    best = action
+        return best
+
+
+def create_action_table(
+    backend: str,
+    actions: Iterable[Hashable],
+    required: Optional[Iterable[Any]] = None,
+    initial: float = 0.0,
+) -> MutableMapping:
+    """Build a per-operation action table for the configured ``q_table_backend``."""
+    if backend == "array":
+        return ArrayActionTable(actions, required=required, initial=initial)
+    if backend == "lazy":
+        space = actions if isinstance(actions, Sequence) else list(actions)
+        return LazyActionTable(space, required=required, initial=initial)
+    return {action: initial for action in actions}
+
+
+def max_q(table: Mapping) -> float:
+    """Highest Q-value in an action table, ``0.0`` when it is empty."""
+    if isinstance(table, (ArrayActionTable, LazyActionTable)):
+        return table.max_value()
+    return max(table.values()) if table else 0.0
+
+
+def random_action(table: Mapping) -> Hashable:
+    """Uniformly chosen action of a non-empty action table."""
+    if isinstance(table, LazyActionTable):
+        return table.random_action()
+    return random.choice(list(table.keys()))
+
+
+def count_zeros(table: Mapping) -> int:
+    """Number of actions whose Q-value is 0, counting unassigned lazy combinations."""
+    if isinstance(table, LazyActionTable):
+        return table.count_equal(0)
+    return sum(1 for value in table.values() if value == 0)
+
+
+def action_table_stats(tables: Iterable[Mapping]) -> Dict[str, int]:
+    """Actions represented, Q-values allocated, and approximate bytes over action tables."""
+    stats = {"actions": 0, "allocated": 0, "bytes": 0}
+    for table in tables:
+        stats["actions"] += len(table)
+        if isinstance(table, LazyActionTable):
+            stats["allocated"] += len(table.assigned())
+            stats["bytes"] += table.nbytes + sum(
+                sys.getsizeof(action) for action in table.assigned()
+            )
+            continue
+        stats["allocated"] += len(table)
+        if isinstance(table, ArrayActionTable):
+            stats["bytes"] += table.nbytes + sys.getsizeof(table._ids)
+        else:
+            stats["bytes"] += sys.getsizeof(table)
+        stats["bytes"] += sum(sys.getsizeof(action) for action in table)
+    return stats
+
+
+__all__ = [
+    "ArrayActionTable",
+    "LazyActionTable",
+    "action_table_stats",
+    "count_zeros",
+    "create_action_table",
+    "max_q",
+    "random_action",
+]
@@ -1,8 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Tuple
 
 
 class BaseAgent(ABC):
+    q_table: Any
+
+    def __init__(self) -> None:
+        self._counters: dict[str, list[int]] = {}
+        self._counted_table: Any = None
+
     @abstractmethod
     def initialize_q_table(self) -> None:
         """Populate the agent's Q-table before use."""
@@ -30,3 +36,58 @@ class BaseAgent(ABC):
     @abstractmethod
     def update_Q_item(self, *args: Any, **kwargs: Any) -> None:
         """Apply a TD-error update to part of the Q-table."""
+
+    @abstractmethod
+    def _scan_zeros(self, operation_id: str) -> Tuple[int, int]:
+        """Full scan of the operation's Q-values: (entries equal to 0, total entries)."""
+
+    # Exploration counters: per operation, [entries still at 0, total entries].
+    # Built by one _scan_zeros call on first use, then kept current by the update
+    # methods. They are rebuilt if the Q-table object is replaced (cache load, merges).
+
+    def _exploration_counters(self) -> dict[str, list[int]]:
+        if self._counted_table is not self.q_table:
+            self._counters = {}
+            self._counted_table = self.q_table
+        return self._counters
+
+    def _operation_counter(self, operation_id: str) -> list[int]:
+        counters = self._exploration_counters()
+        counter = counters.get(operation_id)
+        if counter is None:
+            counter = list(self._scan_zeros(operation_id))
+            counters[operation_id] = counter
+        return counter
+
+    def _track_q_change(self, operation_id: str, old_value: Any, new_value: Any) -> None:
+        counter = self._exploration_counters().get(operation_id)
+        if counter is None:
+            return
+        if old_value == 0 and new_value != 0:
+            counter[0] -= 1
+        elif old_value != 0 and new_value == 0:
+            counter[0] += 1
+
+    def _track_new_entry(self, operation_id: str, value: Any) -> None:
+        counter = self._exploration_counters().get(operation_id)
+        if counter is None:
+            return
+        counter[1] += 1
+        if value == 0:
+            counter[0] += 1
+
+    def _invalidate_counters(self, operation_id: str | None = None) -> None:
+        counters = self._exploration_counters()
+        if operation_id is None:
+            counters.clear()
+        else:
+            counters.pop(operation_id, None)
+
+    def number_of_zeros(self, operation_id: str) -> int:
+        """Number of Q-table entries of the operation that were never updated."""
+        return self._operation_counter(operation_id)[0]
+
+    def exploration_state(self, operation_id: str) -> Tuple[int, int]:
+        """Returns (unexplored, explored) Q-table entry counts for the operation."""
+        zeros, total = self._operation_counter(operation_id)
+        return zeros, total - zeros
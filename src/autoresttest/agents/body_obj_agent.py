@@ -1,11 +1,26 @@
 import random
+import time
+from typing import Tuple
 
 import numpy as np
 
+from .action_table import (
+    ArrayActionTable,
+    LazyActionTable,
+    count_zeros,
+    create_action_table,
+    max_q,
+    random_action,
+)
 from .base_agent import BaseAgent
 
+from autoresttest.config import get_config
 from autoresttest.graph import OperationGraph
-from autoresttest.utils import get_combinations, get_required_body_params
+from autoresttest.utils import (
+    get_combination_space,
+    get_combinations,
+    get_required_body_params,
+)
 
 
 class BodyObjAgent(BaseAgent):
@@ -16,14 +31,22 @@ class BodyObjAgent(BaseAgent):
         gamma: float = 0.9,
         epsilon: float = 0.1,
     ):
+        super().__init__()
         # Q-table maps the operation ID to a dictionary that maps the MIME type to a dictionary where the key is the body property combinations, or "None", and the value is a float
         self.q_table: dict[str, dict[str, dict[tuple[str, ...] | str, float]]] = {}
         self.operation_graph = operation_graph
         self.alpha = alpha
         self.gamma = gamma
         self.epsilon = epsilon
+        self.init_seconds = 0.0
 
     def initialize_q_table(self) -> None:
+        start_time = time.perf_counter()
+        backend = get_config().agent.q_table_backend
+        # The lazy backend keeps combinations as ranks instead of tuples.
+        combinations = (
+            get_combination_space if backend == "lazy" else get_combinations
+        )
         for (
             operation_id,
             operation_node,
@@ -37,15 +60,19 @@ class BodyObjAgent(BaseAgent):
                 ) in operation_node.operation_properties.request_body.items():
                     if body_properties.type == "object" and body_properties.properties:
                         required_body = get_required_body_params(body_properties)
-                        body_obj_combinations = get_combinations(
+                        body_obj_combinations = combinations(
                             body_properties.properties.keys(),
                             required=required_body,
                             seed=f"{operation_id}:{mime}",
                         )
-                        self.q_table[operation_id][mime] = {
-                            body_obj: 0.0 for body_obj in body_obj_combinations
-                        }
+                        self.q_table[operation_id][mime] = create_action_table(
+                            backend,
+                            body_obj_combinations,
+                            required=required_body,
+                        )
                         self.q_table[operation_id][mime]["None"] = 0.0
+        self._invalidate_counters()
+        self.init_seconds = time.perf_counter() - start_time
 
     def get_action(self, operation_id: str, mime: str) -> tuple[str, ...] | None:
         if operation_id not in self.q_table:
@@ -68,7 +95,16 @@ class BodyObjAgent(BaseAgent):
             return None
         required_obj_params = get_required_body_params(request_body[mime])
         result: tuple[str, ...] | None = None
-        if required_obj_params:
+        if isinstance(
+            self.q_table[operation_id][mime], (ArrayActionTable, LazyActionTable)
+        ):
+            # Feasibility against the required properties is precomputed per action.
+            best_key = self.q_table[operation_id][mime].best_action(
+                feasible_only=bool(required_obj_params)
+            )
+            if isinstance(best_key, tuple):
+                result = best_key
+        elif required_obj_params:
             best_value = -np.inf
             for body_obj, value in self.q_table[operation_id][mime].items():
                 if (
@@ -90,7 +126,7 @@ class BodyObjAgent(BaseAgent):
     def get_random_action(self, operation_id: str, mime: str) -> tuple[str, ...] | None:
         if not self.q_table[operation_id][mime]:
             return None
-        action = random.choice(list(self.q_table[operation_id][mime].keys()))
+        action = random_action(self.q_table[operation_id][mime])
         if isinstance(action, tuple):
             return action
         return None
@@ -108,12 +144,12 @@ class BodyObjAgent(BaseAgent):
             if self.q_table[operation_id][mime]
             else 0.0
         )
-        best_next_q = (
-            max(self.q_table[operation_id][mime].values())
-            if self.q_table[operation_id][mime]
-            else 0.0
-        )
+        best_next_q = max_q(self.q_table[operation_id][mime])
         new_q = current_q + self.alpha * (reward + self.gamma * best_next_q - current_q)
+        if key in self.q_table[operation_id][mime]:
+            self._track_q_change(operation_id, current_q, new_q)
+        else:
+            self._track_new_entry(operation_id, new_q)
         self.q_table[operation_id][mime][key] = new_q
 
     def get_Q_next(self, operation_id: str, mime: str) -> float:
@@ -121,11 +157,7 @@ class BodyObjAgent(BaseAgent):
             operation_id, {}
         ):
             return 0.0
-        return (
-            max(self.q_table[operation_id][mime].values())
-            if self.q_table[operation_id][mime]
-            else 0.0
-        )
+        return max_q(self.q_table[operation_id][mime])
 
     def get_Q_curr(
         self, operation_id: str, mime: str, action: tuple[str, ...] | None
@@ -155,12 +187,15 @@ class BodyObjAgent(BaseAgent):
             return
         if key not in self.q_table[operation_id][mime]:
             return
+        current_q = self.q_table[operation_id][mime][key]
         self.q_table[operation_id][mime][key] += self.alpha * td_error
+        self._track_q_change(
+            operation_id, current_q, self.q_table[operation_id][mime][key]
+        )
 
-    def number_of_zeros(self, operation_id: str) -> int:
-        zeros = 0
+    def _scan_zeros(self, operation_id: str) -> Tuple[int, int]:
+        zeros, total = 0, 0
         for body_obj_mappings in self.q_table.get(operation_id, {}).values():
-            for value in body_obj_mappings.values():
-                if value == 0:
-                    zeros += 1
-        return zeros
+            total += len(body_obj_mappings)
+            zeros += count_zeros(body_obj_mappings)
+        return zeros, total
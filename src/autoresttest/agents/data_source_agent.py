@@ -1,5 +1,5 @@
 import random
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 from .base_agent import BaseAgent
 
@@ -14,6 +14,7 @@ class DataSourceAgent(BaseAgent):
         gamma: float = 0.9,
         epsilon: float = 0.1,
     ):
+        super().__init__()
         self.q_table: Dict[str, Dict[str, float]] = {}
         self.operation_graph = operation_graph
         self.alpha = alpha
@@ -31,10 +32,15 @@ class DataSourceAgent(BaseAgent):
                 self.q_table[operation_id] = {
                     data_source: 0 for data_source in self.available_data_sources
                 }
+        self._invalidate_counters()
 
     def initialize_dependency_source(self) -> None:
         if "DEPENDENCY" not in self.available_data_sources:
-            for data_sources in self.q_table.values():
+            for operation_id, data_sources in self.q_table.items():
+                if "DEPENDENCY" not in data_sources:
+                    self._track_new_entry(operation_id, 0)
+                else:
+                    self._track_q_change(operation_id, data_sources["DEPENDENCY"], 0)
                 data_sources["DEPENDENCY"] = 0
             self.available_data_sources.append("DEPENDENCY")
 
@@ -60,6 +66,7 @@ class DataSourceAgent(BaseAgent):
         best_next_q = self.get_Q_next(operation_id)
         new_q = current_q + self.alpha * (reward + self.gamma * best_next_q - current_q)
         self.q_table[operation_id][action] = new_q
+        self._track_q_change(operation_id, current_q, new_q)
 
     def get_Q_next(self, operation_id: str) -> float:
         if operation_id not in self.q_table or not self.q_table[operation_id]:
@@ -76,13 +83,17 @@ class DataSourceAgent(BaseAgent):
             return
         if action not in self.q_table[operation_id]:
             return
+        current_q = self.q_table[operation_id][action]
         self.q_table[operation_id][action] += self.alpha * td_error
+        self._track_q_change(
+            operation_id, current_q, self.q_table[operation_id][action]
+        )
 
-    def number_of_zeros(self, operation_id: str) -> int:
+    def _scan_zeros(self, operation_id: str) -> Tuple[int, int]:
         if operation_id not in self.q_table:
-            return 0
+            return 0, 0
         zeros = 0
         for value in self.q_table[operation_id].values():
             if value == 0:
                 zeros += 1
-        return zeros
+        return zeros, len(self.q_table[operation_id])
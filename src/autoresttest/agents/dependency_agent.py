@@ -1,10 +1,15 @@
+import heapq
 import random
 from typing import TYPE_CHECKING, Any, TypedDict, cast
 
 import numpy as np
-from scipy.spatial.distance import cosine
 
 from .base_agent import BaseAgent
+from .parameter_index import (
+    ParameterEmbeddingIndex,
+    ParameterEntry,
+    ParameterIndexSnapshot,
+)
 
 from autoresttest.graph import OperationGraph
 from autoresttest.models import ParameterKey, is_parameter_key
@@ -33,6 +38,110 @@ DepOpDict = dict[str, LocBucketDict]
 # Type alias for parameter level: ParameterKey|str -> {operation_id -> ...}
 ParamLevelDict = dict[ParameterKey | str, DepOpDict]
 
+# (Q-values of the location bucket, dependent parameter, dependent operation, location)
+Candidate = tuple[DepParamDict, ParameterKey | str, str, str]
+# (location, dependent operation, dependent parameter): where a candidate's values come from
+Source = tuple[str, str, Any]
+
+
+class _ParameterCandidates:
+    """
+    Dependency candidates of one parameter, numbered in Q-table order. The ones whose
+    source holds a value are listed for random draws and kept in a heap of
+    (-Q-value, position) for best draws. A Q update pushes a new entry; entries it
+    left behind are refreshed once they reach the top of the heap.
+    """
+
+    def __init__(self) -> None:
+        self.candidates: list[Candidate] = []
+        self.positions: dict[Source, int] = {}
+        self.available: list[int] = []
+        self._is_available: list[bool] = []
+        self._heap: list[tuple[float, int]] = []
+
+    def add(self, candidate: Candidate) -> int:
+        position = len(self.candidates)
+        self.candidates.append(candidate)
+        self._is_available.append(False)
+        _, dependent_param, dependent_op, location = candidate
+        self.positions[(location, dependent_op, dependent_param)] = position
+        return position
+
+    def _value(self, position: int) -> float:
+        loc_params, dependent_param, _, _ = self.candidates[position]
+        return loc_params[dependent_param]
+
+    def make_available(self, position: int) -> None:
+        if self._is_available[position]:
+            return
+        self._is_available[position] = True
+        self.available.append(position)
+        self._push(position)
+
+    def reprioritize(self, position: int) -> None:
+        if self._is_available[position]:
+            self._push(position)
+
+    def _push(self, position: int) -> None:
+        heapq.heappush(self._heap, (-self._value(position), position))
+        if len(self._heap) > 2 * len(self.available) + 8:
+            self._heap = [(-self._value(idx), idx) for idx in self.available]
+            heapq.heapify(self._heap)
+
+    def best(self) -> Candidate | None:
+        """Highest Q-value; ties go to the earliest candidate, as in a Q-table scan."""
+        heap = self._heap
+        while heap:
+            negated, position = heap[0]
+            value = self._value(position)
+            if -negated == value:
+                return self.candidates[position]
+            heapq.heapreplace(heap, (-value, position))
+        return None
+
+    def random(self) -> Candidate | None:
+        if not self.available:
+            return None
+        return self.candidates[random.choice(self.available)]
+
+
+class _OperationCandidates:
+    """Dependency candidates of one operation, flattened from its Q-table entry."""
+
+    def __init__(
+        self, operation_table: dict[str, ParamLevelDict], available_sources: set[Source]
+    ) -> None:
+        self.params: dict[str, dict[ParameterKey | str, _ParameterCandidates]] = {}
+        # Candidates whose source has no value yet, by source.
+        self.waiting: dict[Source, list[tuple[_ParameterCandidates, int]]] = {}
+        # Number of entries of the agent's availability log already applied.
+        self.applied = 0
+        for param_location in ("params", "body"):
+            by_param: dict[ParameterKey | str, _ParameterCandidates] = {}
+            self.params[param_location] = by_param
+            for param, dependent_ops in operation_table.get(param_location, {}).items():
+                candidates = _ParameterCandidates()
+                by_param[param] = candidates
+                for dependent_op, value_dict in dependent_ops.items():
+                    for location, loc_params in value_dict.items():
+                        for dependent_param in loc_params:
+                            position = candidates.add(
+                                (loc_params, dependent_param, dependent_op, location)
+                            )
+                            source = (location, dependent_op, dependent_param)
+                            if source in available_sources:
+                                candidates.make_available(position)
+                            else:
+                                self.waiting.setdefault(source, []).append(
+                                    (candidates, position)
+                                )
+
+    def promote(self, sources: list[Source]) -> None:
+        """Make the candidates of newly available ``sources`` selectable."""
+        for source in sources:
+            for candidates, position in self.waiting.pop(source, ()):
+                candidates.make_available(position)
+
 
 class DependencyAgent(BaseAgent):
     """
@@ -51,11 +160,20 @@ class DependencyAgent(BaseAgent):
         gamma: float = 0.9,
         epsilon: float = 0.1,
     ) -> None:
+        super().__init__()
         self.q_table: dict[str, dict[str, ParamLevelDict]] = {}
         self.operation_graph = operation_graph
         self.alpha = alpha
         self.gamma = gamma
         self.epsilon = epsilon
+        # (location, operation_id, parameter) sources holding at least one successful value,
+        # and the order they became available in, replayed by each operation's candidates.
+        self.available_sources: set[Source] = set()
+        self._availability_log: list[Source] = []
+        self._candidates: dict[str, _OperationCandidates] = {}
+        self._indexed_table: dict[str, dict[str, ParamLevelDict]] | None = None
+        self._parameter_index: ParameterEmbeddingIndex | None = None
+        self._embedded_table: dict[str, dict[str, ParamLevelDict]] | None = None
 
     @staticmethod
     def _bucket_location(location: str, is_source: bool = False) -> str:
@@ -153,19 +271,17 @@ class DependencyAgent(BaseAgent):
                             self.q_table[operation_id]["body"][parameter][destination][
                                 dest_bucket
                             ][dependent_parameter] = 0
+        self._invalidate_counters()
+        self._invalidate_candidates()
 
     def get_action(
-        self, operation_id: str, qlearning: "QLearning"
+        self, operation_id: str, qlearning: "QLearning", has_success: bool
     ) -> tuple[str, dict[ParameterKey, Any], dict[str, Any]]:
+        """``has_success`` tells whether any request has succeeded so far."""
         if operation_id not in self.q_table:
             raise ValueError(
                 f"Operation '{operation_id}' not found in the Q-table for DependencyAgent."
             )
-        has_success = any(
-            status_code // 100 == 2
-            for status_codes in qlearning.operation_response_counter.values()
-            for status_code in status_codes
-        )
 
         if random.random() < self.epsilon:
             if has_success and random.random() < 0.3:
@@ -180,115 +296,21 @@ class DependencyAgent(BaseAgent):
         self, operation_id: str, qlearning: "QLearning"
     ) -> tuple[str, dict[ParameterKey, Any], dict[str, Any]]:
         """ "Returns 'BEST', the parameter mapping, and body mapping."""
-        successful_responses = qlearning.successful_responses
-        successful_params = qlearning.successful_parameters
-        successful_body = qlearning.successful_bodies
+        index = self._operation_candidates(operation_id)
 
         best_params: dict[ParameterKey, DependentInfo] = {}
-        for param, dependent_ops in self.q_table[operation_id]["params"].items():
-            best_dependent: DependentInfo = {
-                "dependent_val": None,
-                "dependent_operation": None,
-                "value": float(-np.inf),
-                "in_value": None,
-            }
-            for dependent_op, value_dict in dependent_ops.items():
-                for location, loc_params in value_dict.items():
-                    for dependent_param, value in loc_params.items():
-                        if (
-                            value > best_dependent["value"]
-                            and location == "response"
-                            and dependent_op in successful_responses
-                            and dependent_param in successful_responses[dependent_op]
-                            and successful_responses[dependent_op][dependent_param]
-                        ):
-                            best_dependent = {
-                                "dependent_val": dependent_param,
-                                "dependent_operation": dependent_op,
-                                "value": value,
-                                "in_value": location,
-                            }
-                        elif (
-                            value > best_dependent["value"]
-                            and location == "params"
-                            and dependent_op in successful_params
-                            and dependent_param in successful_params[dependent_op]
-                            and successful_params[dependent_op][dependent_param]
-                        ):
-                            best_dependent = {
-                                "dependent_val": dependent_param,
-                                "dependent_operation": dependent_op,
-                                "value": value,
-                                "in_value": location,
-                            }
-                        elif (
-                            value > best_dependent["value"]
-                            and location == "body"
-                            and dependent_op in successful_body
-                            and dependent_param in successful_body[dependent_op]
-                            and successful_body[dependent_op][dependent_param]
-                        ):
-                            best_dependent = {
-                                "dependent_val": dependent_param,
-                                "dependent_operation": dependent_op,
-                                "value": value,
-                                "in_value": location,
-                            }
+        for param, candidates in index.params["params"].items():
             # Param for "params" should always be ParameterKey type
-            best_params[cast(ParameterKey, param)] = best_dependent
+            best_params[cast(ParameterKey, param)] = self._dependent_info(
+                candidates.best(), float(-np.inf)
+            )
 
         best_body: dict[str, DependentInfo] = {}
-        for param, dependent_ops in self.q_table[operation_id]["body"].items():
-            best_dependent_body: DependentInfo = {
-                "dependent_val": None,
-                "dependent_operation": None,
-                "value": float(-np.inf),
-                "in_value": None,
-            }
-            for dependent_op, value_dict in dependent_ops.items():
-                for location, loc_params in value_dict.items():
-                    for dependent_param, value in loc_params.items():
-                        if (
-                            value > best_dependent_body["value"]
-                            and location == "response"
-                            and dependent_op in successful_responses
-                            and dependent_param in successful_responses[dependent_op]
-                            and successful_responses[dependent_op][dependent_param]
-                        ):
-                            best_dependent_body = {
-                                "dependent_val": dependent_param,
-                                "dependent_operation": dependent_op,
-                                "value": value,
-                                "in_value": location,
-                            }
-                        elif (
-                            value > best_dependent_body["value"]
-                            and location == "params"
-                            and dependent_op in successful_params
-                            and dependent_param in successful_params[dependent_op]
-                            and successful_params[dependent_op][dependent_param]
-                        ):
-                            best_dependent_body = {
-                                "dependent_val": dependent_param,
-                                "dependent_operation": dependent_op,
-                                "value": value,
-                                "in_value": location,
-                            }
-                        elif (
-                            value > best_dependent_body["value"]
-                            and location == "body"
-                            and dependent_op in successful_body
-                            and dependent_param in successful_body[dependent_op]
-                            and successful_body[dependent_op][dependent_param]
-                        ):
-                            best_dependent_body = {
-                                "dependent_val": dependent_param,
-                                "dependent_operation": dependent_op,
-                                "value": value,
-                                "in_value": location,
-                            }
+        for param, candidates in index.params["body"].items():
             # param for body should always be string
-            best_body[cast(str, param)] = best_dependent_body
+            best_body[cast(str, param)] = self._dependent_info(
+                candidates.best(), float(-np.inf)
+            )
 
         return "BEST", best_params, best_body
 
@@ -296,131 +318,116 @@ class DependencyAgent(BaseAgent):
         self, operation_id: str, qlearning: "QLearning"
     ) -> tuple[str, dict[ParameterKey, Any], dict[str, Any]]:
         """ "Returns 'EXPLORE', the parameter mapping, and body mapping."""
-        successful_responses = qlearning.successful_responses
-        successful_params = qlearning.successful_parameters
-        successful_body = qlearning.successful_bodies
+        index = self._operation_candidates(operation_id)
 
         random_params: dict[ParameterKey, DependentInfo] = {}
-        for param, dependent_ops in self.q_table[operation_id]["params"].items():
-            random_dependencies: list[DependentInfo] = []
-            for dependent_op, value_dict in dependent_ops.items():
-                for location, loc_params in value_dict.items():
-                    for dependent_param, value in loc_params.items():
-                        if (
-                            location == "response"
-                            and dependent_op in successful_responses
-                            and dependent_param in successful_responses[dependent_op]
-                            and successful_responses[dependent_op][dependent_param]
-                        ):
-                            random_dependencies.append(
-                                {
-                                    "dependent_val": dependent_param,
-                                    "dependent_operation": dependent_op,
-                                    "value": value,
-                                    "in_value": location,
-                                }
-                            )
-                        elif (
-                            location == "params"
-                            and dependent_op in successful_params
-                            and dependent_param in successful_params[dependent_op]
-                            and successful_params[dependent_op][dependent_param]
-                        ):
-                            random_dependencies.append(
-                                {
-                                    "dependent_val": dependent_param,
-                                    "dependent_operation": dependent_op,
-                                    "value": value,
-                                    "in_value": location,
-                                }
-                            )
-                        elif (
-                            location == "body"
-                            and dependent_op in successful_body
-                            and dependent_param in successful_body[dependent_op]
-                            and successful_body[dependent_op][dependent_param]
-                        ):
-                            random_dependencies.append(
-                                {
-                                    "dependent_val": dependent_param,
-                                    "dependent_operation": dependent_op,
-                                    "value": value,
-                                    "in_value": location,
-                                }
-                            )
-            default_dep: DependentInfo = {
-                "dependent_val": None,
-                "dependent_operation": None,
-                "value": 0.0,
-                "in_value": None,
-            }
-            random_params[cast(ParameterKey, param)] = (
-                random.choice(random_dependencies)
-                if random_dependencies
-                else default_dep
+        for param, candidates in index.params["params"].items():
+            random_params[cast(ParameterKey, param)] = self._dependent_info(
+                candidates.random(), 0.0
             )
 
         random_body: dict[str, DependentInfo] = {}
-        for param, dependent_ops in self.q_table[operation_id]["body"].items():
-            random_dependencies_body: list[DependentInfo] = []
-            for dependent_op, value_dict in dependent_ops.items():
-                for location, loc_params in value_dict.items():
-                    for dependent_param, value in loc_params.items():
-                        if (
-                            location == "response"
-                            and dependent_op in successful_responses
-                            and dependent_param in successful_responses[dependent_op]
-                            and successful_responses[dependent_op][dependent_param]
-                        ):
-                            random_dependencies_body.append(
-                                {
-                                    "dependent_val": dependent_param,
-                                    "dependent_operation": dependent_op,
-                                    "value": value,
-                                    "in_value": location,
-                                }
-                            )
-                        elif (
-                            location == "params"
-                            and dependent_op in successful_params
-                            and dependent_param in successful_params[dependent_op]
-                            and successful_params[dependent_op][dependent_param]
-                        ):
-                            random_dependencies_body.append(
-                                {
-                                    "dependent_val": dependent_param,
-                                    "dependent_operation": dependent_op,
-                                    "value": value,
-                                    "in_value": location,
-                                }
-                            )
-                        elif (
-                            location == "body"
-                            and dependent_op in successful_body
-                            and dependent_param in successful_body[dependent_op]
-                            and successful_body[dependent_op][dependent_param]
-                        ):
-                            random_dependencies_body.append(
-                                {
-                                    "dependent_val": dependent_param,
-                                    "dependent_operation": dependent_op,
-                                    "value": value,
-                                    "in_value": location,
-                                }
-                            )
-            default_dep_body: DependentInfo = {
+        for param, candidates in index.params["body"].items():
+            random_body[cast(str, param)] = self._dependent_info(
+                candidates.random(), 0.0
+            )
+
+        return "EXPLORE", random_params, random_body
+
+    # Candidate index: per operation and parameter, the flattened (dependent operation,
+    # location, dependent parameter) entries of the Q-table. Entries read their Q-value
+    # from the Q-table's own dicts; Q updates reorder them through _reprioritize, new
+    # sources are replayed from the availability log, and adding dependencies or
+    # replacing the Q-table rebuilds the operation's index.
+
+    def mark_available(
+        self, location: str, dependent_operation: str, dependent_param: Any
+    ) -> None:
+        """Record that a successful value now exists for this dependency source."""
+        key = (location, dependent_operation, dependent_param)
+        if key not in self.available_sources:
+            self.available_sources.add(key)
+            self._availability_log.append(key)
+
+    def rebuild_availability(self, qlearning: "QLearning") -> None:
+        """Recompute the available sources from the learner's successful values."""
+        self.available_sources = {
+            (location, dependent_operation, dependent_param)
+            for location, stores in (
+                ("params", qlearning.successful_parameters),
+                ("body", qlearning.successful_bodies),
+                ("response", qlearning.successful_responses),
+            )
+            for dependent_operation, values in stores.items()
+            if values
+            for dependent_param, bucket in values.items()
+            if bucket
+        }
+        self._availability_log = []
+        self._invalidate_candidates()
+
+    def _candidate_index(self) -> dict[str, _OperationCandidates]:
+        if self._indexed_table is not self.q_table:
+            self._candidates = {}
+            self._indexed_table = self.q_table
+        return self._candidates
+
+    def _invalidate_candidates(self, operation_id: str | None = None) -> None:
+        index = self._candidate_index()
+        if operation_id is None:
+            index.clear()
+        else:
+            index.pop(operation_id, None)
+
+    def _operation_candidates(self, operation_id: str) -> _OperationCandidates:
+        index = self._candidate_index()
+        candidates = index.get(operation_id)
+        log = self._availability_log
+        if candidates is None:
+            candidates = _OperationCandidates(
+                self.q_table[operation_id], self.available_sources
+            )
+            candidates.applied = len(log)
+            index[operation_id] = candidates
+        elif candidates.applied < len(log):
+            candidates.promote(log[candidates.applied :])
+            candidates.applied = len(log)
+        return candidates
+
+    def _reprioritize(
+        self,
+        operation_id: str,
+        param_location: str,
+        param: ParameterKey | str,
+        source: Source,
+    ) -> None:
+        """Reorder a candidate after its Q-value changed."""
+        operation_candidates = self._candidate_index().get(operation_id)
+        if operation_candidates is None:
+            return
+        candidates = operation_candidates.params[param_location].get(param)
+        if candidates is None:
+            return
+        position = candidates.positions.get(source)
+        if position is not None:
+            candidates.reprioritize(position)
+
+    @staticmethod
+    def _dependent_info(candidate: Candidate | None, default: float) -> DependentInfo:
+        if candidate is None:
+            return {
                 "dependent_val": None,
                 "dependent_operation": None,
-                "value": 0.0,
+                "value": default,
                 "in_value": None,
             }
-            random_body[cast(str, param)] = (
-                random.choice(random_dependencies_body)
-                if random_dependencies_body
-                else default_dep_body
-            )
-
-        return "EXPLORE", random_params, random_body
+        loc_params, dependent_param, dependent_op, location = candidate
+        return {
+            "dependent_val": dependent_param,
+            "dependent_operation": dependent_op,
+            "value": loc_params[dependent_param],
+            "in_value": location,
+        }
 
     def update_q_table(
         self,
@@ -458,9 +465,16 @@ class DependencyAgent(BaseAgent):
                 for location, loc_params in dep_op_dict.items():
                     for dependent_param, value in loc_params.items():
                         if dependent_param == dependent["dependent_val"]:
+                            self._track_q_change(operation_id, value, new_q)
                             self.q_table[operation_id]["params"][param][
                                 dependent["dependent_operation"]
                             ][location][dependent_param] = new_q
+                            self._reprioritize(
+                                operation_id,
+                                "params",
+                                param,
+                                (location, dependent["dependent_operation"], dependent_param),
+                            )
 
         if dependent_body:
             for param, dependent in dependent_body.items():
@@ -489,9 +503,16 @@ class DependencyAgent(BaseAgent):
                 for location, loc_params in dep_op_dict.items():
                     for dependent_param, value in loc_params.items():
                         if dependent_param == dependent["dependent_val"]:
+                            self._track_q_change(operation_id, value, new_q)
                             self.q_table[operation_id]["body"][param][
                                 dependent["dependent_operation"]
                             ][location][dependent_param] = new_q
+                            self._reprioritize(
+                                operation_id,
+                                "body",
+                                param,
+                                (location, dependent["dependent_operation"], dependent_param),
+                            )
 
     def get_Q_next(
         self,
@@ -629,9 +650,16 @@ class DependencyAgent(BaseAgent):
                 for location, loc_params in dep_op_dict.items():
                     for dependent_param, value in loc_params.items():
                         if dependent_param == dependent["dependent_val"]:
-                            self.q_table[operation_id]["params"][param][
-                                dependent["dependent_operation"]
-                            ][location][dependent_param] += (self.alpha * td_error)
+                            loc_params[dependent_param] += self.alpha * td_error
+                            self._track_q_change(
+                                operation_id, value, loc_params[dependent_param]
+                            )
+                            self._reprioritize(
+                                operation_id,
+                                "params",
+                                param,
+                                (location, dependent["dependent_operation"], dependent_param),
+                            )
 
         if dependent_body:
             for param, dependent in dependent_body.items():
@@ -650,53 +678,83 @@ class DependencyAgent(BaseAgent):
                 for location, loc_params in dep_op_dict.items():
                     for dependent_param, value in loc_params.items():
                         if dependent_param == dependent["dependent_val"]:
-                            self.q_table[operation_id]["body"][param][
-                                dependent["dependent_operation"]
-                            ][location][dependent_param] += (self.alpha * td_error)
+                            loc_params[dependent_param] += self.alpha * td_error
+                            self._track_q_change(
+                                operation_id, value, loc_params[dependent_param]
+                            )
+                            self._reprioritize(
+                                operation_id,
+                                "body",
+                                param,
+                                (location, dependent["dependent_operation"], dependent_param),
+                            )
+
+    def parameter_index(self) -> ParameterEmbeddingIndex:
+        """
+        Embedding index of every parameter and body property in the Q-table, built on
+        first use and rebuilt if the Q-table object is replaced.
+        """
+        index = self._parameter_index
+        if index is None or self._embedded_table is not self.q_table:
+            index = ParameterEmbeddingIndex(self.operation_graph.embedding_model)
+            for operation_id, operation_props in self.q_table.items():
+                for location, param_values in operation_props.items():
+                    for param in param_values:
+                        index.add(operation_id, location, param, self._param_label(param))
+            self._parameter_index = index
+            self._embedded_table = self.q_table
+        return index
+
+    def match_undocumented_response(
+        self, new_property: str, index: ParameterIndexSnapshot | None = None
+    ) -> list[ParameterEntry]:
+        """
+        Q-table parameters semantically similar to an undocumented response property.
+        ``index`` is a snapshot of ``parameter_index()`` taken on the learning thread,
+        for matching on another thread; without it the current index is used.
+        """
+        if index is None:
+            index = self.parameter_index().snapshot()
+        return index.match(
+            new_property, self.operation_graph.dependency_comparator.threshold
+        )
 
     def add_undocumented_responses(
-        self, new_operation_response_id: str, new_property: str
+        self,
+        new_operation_response_id: str,
+        new_property: str,
+        matches: list[ParameterEntry] | None = None,
     ) -> bool:
+        """
+        Adds a response dependency for every parameter matching ``new_property``.
+        ``matches`` can be computed beforehand (e.g. off the learning thread) with
+        ``match_undocumented_response``.
+        """
+        if matches is None:
+            matches = self.match_undocumented_response(new_property)
         updated_tables = False
-        dependency_comparator = self.operation_graph.dependency_comparator
-        embedding_model = self.operation_graph.embedding_model
-        for operation_id, operation_props in self.q_table.items():
-            for location, param_values in operation_props.items():
-                for param, dependent_values in param_values.items():
-                    processed_param = embedding_model.handle_word_cases(
-                        self._param_label(param)
-                    )
-                    processed_response = embedding_model.handle_word_cases(new_property)
-                    param_embedding = embedding_model.encode_sentence_or_word(
-                        processed_param
-                    )
-                    response_embedding = embedding_model.encode_sentence_or_word(
-                        processed_response
-                    )
-                    if param_embedding is not None and response_embedding is not None:
-                        similarity = 1 - cosine(param_embedding, response_embedding)
-                        if similarity > dependency_comparator.threshold:
-                            if new_operation_response_id not in dependent_values:
-                                dependent_values[new_operation_response_id] = {}
-                            if (
-                                "response"
-                                not in dependent_values[new_operation_response_id]
-                            ):
-                                dependent_values[new_operation_response_id][
-                                    "response"
-                                ] = {}
-                            dependent_values[new_operation_response_id]["response"][
-                                new_property
-                            ] = 0
-                            updated_tables = True
-                            print(
-                                "New dependency discovered between operation {} and operation {} with parameter {} and response {}".format(
-                                    operation_id,
-                                    new_operation_response_id,
-                                    param,
-                                    new_property,
-                                )
-                            )
+        for operation_id, location, param in matches:
+            dependent_values = (
+                self.q_table.get(operation_id, {}).get(location, {}).get(param)
+            )
+            if dependent_values is None:
+                continue
+            if new_operation_response_id not in dependent_values:
+                dependent_values[new_operation_response_id] = {}
+            if "response" not in dependent_values[new_operation_response_id]:
+                dependent_values[new_operation_response_id]["response"] = {}
+            dependent_values[new_operation_response_id]["response"][new_property] = 0
+            self._invalidate_counters(operation_id)
+            self._invalidate_candidates(operation_id)
+            updated_tables = True
+            print(
+                "New dependency discovered between operation {} and operation {} with parameter {} and response {}".format(
+                    operation_id,
+                    new_operation_response_id,
+                    param,
+                    new_property,
+                )
+            )
         return updated_tables
 
     def add_new_dependency(
@@ -707,21 +765,30 @@ class DependencyAgent(BaseAgent):
         dependent_operation_id: str,
         dependent_location: str,
         dependent_param: str,
-    ) -> None:
+    ) -> bool:
+        """Returns whether a new response dependency was recorded, which changes the harvested properties."""
         # Validate type matches location to maintain Q-table invariants
         if param_location == "params" and not is_parameter_key(operation_param):
             print(
                 f"Warning: Expected ParameterKey for 'params', got {type(operation_param).__name__}. Skipping dependency."
             )
-            return
+            return False
         if param_location == "body" and not isinstance(operation_param, str):
             print(
                 f"Warning: Expected str for 'body', got {type(operation_param).__name__}. Skipping dependency."
             )
-            return
+            return False
 
         if operation_param not in self.q_table[operation_id][param_location]:
             self.q_table[operation_id][param_location][operation_param] = {}
+            index = self._parameter_index
+            if index is not None and self._embedded_table is self.q_table:
+                index.add(
+                    operation_id,
+                    param_location,
+                    operation_param,
+                    self._param_label(operation_param),
+                )
         if (
             dependent_operation_id
             not in self.q_table[operation_id][param_location][operation_param]
@@ -735,7 +802,7 @@ class DependencyAgent(BaseAgent):
             print(
                 f"Warning: Invalid dependent_location '{dependent_location}'. Skipping dependency."
             )
-            return
+            return False
 
         # Ensure the dependent_location key exists in the structure
         if (
@@ -757,70 +824,39 @@ class DependencyAgent(BaseAgent):
             self.q_table[operation_id][param_location][operation_param][
                 dependent_operation_id
             ][dependent_location][dependent_param] = 0
+            self._track_new_entry(operation_id, 0)
+            self._invalidate_candidates(operation_id)
+            added = dependent_location == "response"
+        else:
+            added = False
         print(
             "New dependency discovered between operation {} and operation {} with operation parameter {} and dependent parameter {}".format(
                 operation_id, dependent_operation_id, operation_param, dependent_param
             )
         )
+        return added
 
     # Get a random value from the successful operations to test dependencies
     def assign_random_dependency_from_successful(
         self, operation_id: str, qlearning: "QLearning"
     ) -> tuple[str, dict[ParameterKey, Any], dict[str, Any]]:
         """Returns 'RANDOM', the parameter mapping, and body mapping"""
-        possible_options = []
-
-        for (
-            operation_idx,
-            operation_parameters,
-        ) in qlearning.successful_parameters.items():
-            if operation_idx == operation_id:
-                continue
-            for parameter_key, parameter_values in operation_parameters.items():
-                for parameter_value in parameter_values:
-                    possible_options.append(
-                        {
-                            "dependent_val": parameter_key,
-                            "dependent_operation": operation_idx,
-                            "value": parameter_value,
-                            "in_value": "params",
-                        }
-                    )
-
-        for operation_idx, operation_body_parms in qlearning.successful_bodies.items():
-            if operation_idx == operation_id:
-                continue
-            for body_name, body_values in operation_body_parms.items():
-                for body_value in body_values:
-                    possible_options.append(
-                        {
-                            "dependent_val": body_name,
-                            "dependent_operation": operation_idx,
-                            "value": body_value,
-                            "in_value": "body",
-                        }
-                    )
-
-        for (
-            operation_idx,
-            operation_responses,
-        ) in qlearning.successful_responses.items():
-            if operation_idx == operation_id:
-                continue
-            for response_name, response_values in operation_responses.items():
-                for response_value in response_values:
-                    possible_options.append(
-                        {
-                            "dependent_val": response_name,
-                            "dependent_operation": operation_idx,
-                            "value": response_value,
-                            "in_value": "response",
-                        }
-                    )
-
-        if not possible_options:
+        # Drawn from an index over the stored values, so nothing is listed per call.
+        pool = qlearning.successful_pool
+        if not pool.size(exclude=operation_id):
             return "RANDOM", {}, {}
 
+        def random_option() -> dict[str, Any]:
+            in_value, operation_idx, dependent_val, value = cast(
+                tuple, pool.sample(exclude=operation_id)
+            )
+            return {
+                "dependent_val": dependent_val,
+                "dependent_operation": operation_idx,
+                "value": value,
+                "in_value": in_value,
+            }
+
         parameter_dependency_assignment = {}
         op_props = qlearning.operation_graph.operation_nodes[
             operation_id
@@ -831,28 +867,27 @@ class DependencyAgent(BaseAgent):
                 parameter_properties,
             ) in op_props.parameters.items():
                 if parameter_properties.schema:
-                    parameter_dependency_assignment[parameter_name] = random.choice(
-                        possible_options
-                    )
+                    parameter_dependency_assignment[parameter_name] = random_option()
 
         body_dependency_assignment = {}
         if op_props.request_body:
             for mime, body_properties in op_props.request_body.items():
                 possible_body_params = get_body_params(body_properties)
                 for prop in possible_body_params:
-                    body_dependency_assignment[prop] = random.choice(possible_options)
+                    body_dependency_assignment[prop] = random_option()
 
         return "RANDOM", parameter_dependency_assignment, body_dependency_assignment
 
-    def number_of_zeros(self, operation_id: str) -> int:
+    def _scan_zeros(self, operation_id: str) -> tuple[int, int]:
         if operation_id not in self.q_table:
-            return 0
-        zeros = 0
+            return 0, 0
+        zeros, total = 0, 0
         for location, param_values in self.q_table[operation_id].items():
             for param, dependent_values in param_values.items():
                 for dependent_op, dependent_props in dependent_values.items():
                     for dependent_location, dependent_params in dependent_props.items():
+                        total += len(dependent_params)
                         for dependent_param, value in dependent_params.items():
                             if value == 0:
                                 zeros += 1
-        return zeros
+        return zeros, total
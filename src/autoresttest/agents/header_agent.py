@@ -1,5 +1,5 @@
 import random
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 
@@ -17,6 +17,7 @@ class HeaderAgent(BaseAgent):
         gamma: float = 0.9,
         epsilon: float = 0.1,
     ):
+        super().__init__()
         self.q_table: Dict[str, List[List]] = {}
         self.operation_graph = operation_graph
         self.alpha = alpha
@@ -39,6 +40,7 @@ class HeaderAgent(BaseAgent):
             for i in range(min(9, len(token_list))):
                 self.q_table[operation_id].append([token_list[i], 0])
             self.q_table[operation_id].append([None, 0])
+        self._invalidate_counters()
 
     def get_action(self, operation_id: str) -> Optional[str]:
         if operation_id not in self.q_table:
@@ -69,6 +71,7 @@ class HeaderAgent(BaseAgent):
         new_q = current_q + self.alpha * (reward + self.gamma * best_next_q - current_q)
         for mapping in self.q_table[operation_id]:
             if mapping[0] == action:
+                self._track_q_change(operation_id, mapping[1], new_q)
                 mapping[1] = new_q
 
     def get_Q_next(self, operation_id: str) -> float:
@@ -95,11 +98,13 @@ class HeaderAgent(BaseAgent):
             return
         for mapping in self.q_table[operation_id]:
             if mapping[0] == token:
+                current_q = mapping[1]
                 mapping[1] += self.alpha * td_error
+                self._track_q_change(operation_id, current_q, mapping[1])
 
-    def number_of_zeros(self, operation_id: str) -> int:
+    def _scan_zeros(self, operation_id: str) -> Tuple[int, int]:
         zeros = 0
         for mapping in self.q_table.get(operation_id, []):
             if mapping[1] == 0:
                 zeros += 1
-        return zeros
+        return zeros, len(self.q_table.get(operation_id, []))
@@ -1,4 +1,5 @@
 import random
+from typing import List, Optional, Tuple
 
 from .base_agent import BaseAgent
 
@@ -13,6 +14,7 @@ class OperationAgent(BaseAgent):
         gamma: float = 0.9,
         epsilon: float = 0.1,
     ):
+        super().__init__()
         self.alpha = alpha
         self.gamma = gamma
         self.epsilon = epsilon
@@ -22,24 +24,30 @@ class OperationAgent(BaseAgent):
     def initialize_q_table(self) -> None:
         operation_ids = self.operation_graph.operation_nodes.keys()
         self.q_table = {operation_id: 0 for operation_id in operation_ids}
+        self._invalidate_counters()
 
-    def get_action(self) -> str:
+    def get_action(self, operation_ids: Optional[List[str]] = None) -> str:
+        """Epsilon-greedy choice, among ``operation_ids`` when given."""
         if random.random() < self.epsilon:
-            return self.get_random_action()
-        return self.get_best_action()
+            return self.get_random_action(operation_ids)
+        return self.get_best_action(operation_ids)
 
-    def get_best_action(self) -> str:
+    def get_best_action(self, operation_ids: Optional[List[str]] = None) -> str:
         if not self.q_table:
             raise ValueError(
                 "No operations were parsed from the specification for OperationAgent."
             )
+        if operation_ids is not None:
+            return max(operation_ids, key=lambda x: self.q_table[x])
         return max(self.q_table.items(), key=lambda x: x[1])[0]
 
-    def get_random_action(self) -> str:
+    def get_random_action(self, operation_ids: Optional[List[str]] = None) -> str:
         if not self.q_table:
             raise ValueError(
                 "No operations were parsed from the specification for OperationAgent."
             )
+        if operation_ids is not None:
+            return random.choice(operation_ids)
         return random.choice(list(self.q_table.keys()))
 
     def update_q_table(self, operation_id: str, reward: float) -> None:
@@ -49,6 +57,7 @@ class OperationAgent(BaseAgent):
         best_next_q = self.get_Q_next(operation_id)
         new_q = current_q + self.alpha * (reward + self.gamma * best_next_q - current_q)
         self.q_table[operation_id] = new_q
+        self._track_q_change(operation_id, current_q, new_q)
 
     def get_Q_next(self, operation_id: str) -> float:
         return max(self.q_table.values()) if self.q_table else 0.0
@@ -59,6 +68,11 @@ class OperationAgent(BaseAgent):
     def update_Q_item(self, operation_id: str, td_error: float) -> None:
         if operation_id not in self.q_table:
             return
-        self.q_table[operation_id] = (
-            self.q_table.get(operation_id, 0.0) + self.alpha * td_error
-        )
+        current_q = self.q_table[operation_id]
+        self.q_table[operation_id] = current_q + self.alpha * td_error
+        self._track_q_change(operation_id, current_q, self.q_table[operation_id])
+
+    def _scan_zeros(self, operation_id: str) -> Tuple[int, int]:
+        if operation_id not in self.q_table:
+            return 0, 0
+        return int(self.q_table[operation_id] == 0), 1
@@ -1,14 +1,28 @@
 import random
+import time
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 
+from .action_table import (
+    ArrayActionTable,
+    LazyActionTable,
+    count_zeros,
+    create_action_table,
+    max_q,
+    random_action,
+)
 from .base_agent import BaseAgent
 
+from autoresttest.config import get_config
 from autoresttest.graph import OperationGraph
 from autoresttest.models import ParameterKey
-from autoresttest.utils import get_param_combinations, get_required_params
+from autoresttest.utils import (
+    get_param_combination_space,
+    get_param_combinations,
+    get_required_params,
+)
 
 
 @dataclass
@@ -25,6 +39,7 @@ class ParameterAgent(BaseAgent):
         gamma: float = 0.9,
         epsilon: float = 0.1,
     ):
+        super().__init__()
         # Q-table maps the operation IDs to a dictionary containing a location key (e.g., "params") mapped to the parameter combinations
         self.q_table: dict[
             str, dict[str, dict[tuple[ParameterKey, ...] | str, float]]
@@ -33,8 +48,17 @@ class ParameterAgent(BaseAgent):
         self.alpha = alpha
         self.gamma = gamma
         self.epsilon = epsilon
+        self.init_seconds = 0.0
 
     def initialize_q_table(self) -> None:
+        start_time = time.perf_counter()
+        backend = get_config().agent.q_table_backend
+        # The lazy backend keeps combinations as ranks instead of tuples.
+        combinations = (
+            get_param_combination_space
+            if backend == "lazy"
+            else get_param_combinations
+        )
         for (
             operation_id,
             operation_node,
@@ -44,12 +68,14 @@ class ParameterAgent(BaseAgent):
             required = get_required_params(
                 operation_node.operation_properties.parameters
             )
-            params = get_param_combinations(
+            params = combinations(
                 operation_node.operation_properties.parameters,
                 required_params=required,
                 seed=operation_id,
             )
-            self.q_table[operation_id]["params"] = {param: 0.0 for param in params}
+            self.q_table[operation_id]["params"] = create_action_table(
+                backend, params, required=required
+            )
             mimes = (
                 list(operation_node.operation_properties.request_body.keys())
                 if operation_node.operation_properties.request_body
@@ -58,6 +84,8 @@ class ParameterAgent(BaseAgent):
             self.q_table[operation_id]["body"] = {mime: 0 for mime in mimes}
             self.q_table[operation_id]["params"]["None"] = 0
             self.q_table[operation_id]["body"]["None"] = 0
+        self._invalidate_counters()
+        self.init_seconds = time.perf_counter() - start_time
 
     def get_action(self, operation_id: str) -> ParameterAction:
         if operation_id not in self.q_table:
@@ -75,7 +103,7 @@ class ParameterAgent(BaseAgent):
     def get_random_action(self, operation_id: str) -> ParameterAction:
         random_params: tuple[ParameterKey, ...] | None = None
         if self.q_table[operation_id]["params"]:
-            key = random.choice(list(self.q_table[operation_id]["params"].keys()))
+            key = random_action(self.q_table[operation_id]["params"])
             if key != "None" and isinstance(key, tuple):
                 random_params = key
 
@@ -97,7 +125,16 @@ class ParameterAgent(BaseAgent):
         best_params: tuple[ParameterKey, ...] | None = None
         best_params_score: float = -np.inf
 
-        if self.q_table[operation_id]["params"] and required_params:
+        if isinstance(
+            self.q_table[operation_id]["params"], (ArrayActionTable, LazyActionTable)
+        ):
+            # Feasibility against the required parameters is precomputed per action.
+            best_key = self.q_table[operation_id]["params"].best_action(
+                feasible_only=bool(required_params)
+            )
+            if best_key != "None" and isinstance(best_key, tuple):
+                best_params = best_key
+        elif self.q_table[operation_id]["params"] and required_params:
             for params, score in self.q_table[operation_id]["params"].items():
                 if (
                     params != "None"
@@ -128,11 +165,7 @@ class ParameterAgent(BaseAgent):
     def get_Q_next(self, operation_id: str) -> Tuple[float, float]:
         if operation_id not in self.q_table:
             return 0.0, 0.0
-        best_next_q_params = (
-            max(self.q_table[operation_id]["params"].values())
-            if self.q_table[operation_id]["params"]
-            else 0.0
-        )
+        best_next_q_params = max_q(self.q_table[operation_id]["params"])
         best_next_q_body = (
             max(self.q_table[operation_id]["body"].values())
             if self.q_table[operation_id]["body"]
@@ -170,14 +203,26 @@ class ParameterAgent(BaseAgent):
             self.q_table[operation_id]["params"]
             and req_params_key in self.q_table[operation_id]["params"]
         ):
+            current_q = self.q_table[operation_id]["params"][req_params_key]
             self.q_table[operation_id]["params"][req_params_key] += (
                 self.alpha * td_error
             )
+            self._track_q_change(
+                operation_id,
+                current_q,
+                self.q_table[operation_id]["params"][req_params_key],
+            )
         if (
             self.q_table[operation_id]["body"]
             and mime_type_key in self.q_table[operation_id]["body"]
         ):
+            current_q = self.q_table[operation_id]["body"][mime_type_key]
             self.q_table[operation_id]["body"][mime_type_key] += self.alpha * td_error
+            self._track_q_change(
+                operation_id,
+                current_q,
+                self.q_table[operation_id]["body"][mime_type_key],
+            )
 
     def update_q_table(
         self, operation_id: str, action: ParameterAction, reward: float
@@ -196,11 +241,7 @@ class ParameterAgent(BaseAgent):
             if self.q_table[operation_id]["body"]
             else 0.0
         )
-        best_next_q_params = (
-            max(self.q_table[operation_id]["params"].values())
-            if self.q_table[operation_id]["params"]
-            else 0.0
-        )
+        best_next_q_params = max_q(self.q_table[operation_id]["params"])
         best_next_q_body = (
             max(self.q_table[operation_id]["body"].values())
             if self.q_table[operation_id]["body"]
@@ -217,20 +258,21 @@ class ParameterAgent(BaseAgent):
             and req_params_key in self.q_table[operation_id]["params"]
         ):
             self.q_table[operation_id]["params"][req_params_key] = new_q_params
+            self._track_q_change(operation_id, current_q_params, new_q_params)
         if (
             self.q_table[operation_id]["body"]
             and mime_type_key in self.q_table[operation_id]["body"]
         ):
             self.q_table[operation_id]["body"][mime_type_key] = new_q_body
+            self._track_q_change(operation_id, current_q_body, new_q_body)
 
-    def number_of_zeros(self, operation_id: str) -> int:
+    def _scan_zeros(self, operation_id: str) -> Tuple[int, int]:
         if operation_id not in self.q_table:
-            return 0
-        zeros = 0
-        for value in self.q_table[operation_id]["params"].values():
-            if value == 0:
-                zeros += 1
+            return 0, 0
+        zeros = count_zeros(self.q_table[operation_id]["params"])
         for value in self.q_table[operation_id]["body"].values():
             if value == 0:
                 zeros += 1
-        return zeros
+        return zeros, len(self.q_table[operation_id]["params"]) + len(
+            self.q_table[operation_id]["body"]
+        )
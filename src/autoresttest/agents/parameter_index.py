@@ -0,0 +1,107 @@
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from autoresttest.utils import EmbeddingModel
+
+# (operation_id, "params" | "body", parameter key or body property)
+ParameterEntry = tuple[str, str, Any]
+
+
+class ParameterIndexSnapshot:
+    """
+    The rows of a ``ParameterEmbeddingIndex`` at one point in time. Nothing in it
+    changes afterwards, so it can be matched against on another thread while the
+    index keeps growing.
+    """
+
+    def __init__(
+        self,
+        embedding_model: "EmbeddingModel",
+        matrix: np.ndarray | None,
+        entries: tuple[tuple[ParameterEntry, ...], ...],
+    ) -> None:
+        self.embedding_model = embedding_model
+        self.matrix = matrix
+        self.norms = None if matrix is None else np.linalg.norm(matrix, axis=1)
+        self.entries = entries
+
+    def match(self, name: str, threshold: float) -> list[ParameterEntry]:
+        """Indexed parameters whose cosine similarity to ``name`` exceeds ``threshold``."""
+        if self.matrix is None or self.norms is None:
+            return []
+        embedding = self.embedding_model.encode_sentence_or_word(
+            self.embedding_model.handle_word_cases(name)
+        )
+        if embedding is None:
+            return []
+        vector = np.asarray(embedding, dtype=np.float64)
+        # Same formula as scipy's cosine distance; zero vectors give NaN and never match.
+        with np.errstate(divide="ignore", invalid="ignore"):
+            distances = np.clip(
+                1.0 - (self.matrix @ vector) / (self.norms * np.linalg.norm(vector)),
+                0.0,
+                2.0,
+            )
+        rows = np.flatnonzero(1.0 - distances > threshold)
+        return [entry for row in rows for entry in self.entries[row]]
+
+
+class ParameterEmbeddingIndex:
+    """
+    Embeddings of the parameter and body property names in the dependency Q-table,
+    one row per distinct processed name, so a new response property is compared
+    with all of them in one matrix-vector product. Rows are added, on the learning
+    thread, as dependencies introduce new parameters; other threads match against a
+    ``snapshot``.
+    """
+
+    def __init__(self, embedding_model: "EmbeddingModel") -> None:
+        self.embedding_model = embedding_model
+        # Processed name -> row, or -1 for names without an embedding.
+        self._rows: dict[str, int] = {}
+        self._entries: list[list[ParameterEntry]] = []
+        self._indexed: set[ParameterEntry] = set()
+        self._vectors: list[np.ndarray] = []
+        self._snapshot: ParameterIndexSnapshot | None = None
+
+    def __len__(self) -> int:
+        return len(self._indexed)
+
+    def add(self, operation_id: str, location: str, param: Any, label: str) -> None:
+        entry = (operation_id, location, param)
+        if entry in self._indexed:
+            return
+        self._indexed.add(entry)
+        processed = self.embedding_model.handle_word_cases(label)
+        row = self._rows.get(processed)
+        if row is None:
+            embedding = self.embedding_model.encode_sentence_or_word(processed)
+            if embedding is None:
+                row = -1
+            else:
+                row = len(self._vectors)
+                self._vectors.append(np.asarray(embedding, dtype=np.float64))
+                self._entries.append([])
+            self._rows[processed] = row
+        if row >= 0:
+            self._entries[row].append(entry)
+            self._snapshot = None
+
+    def snapshot(self) -> ParameterIndexSnapshot:
+        """The current rows, kept until the next ``add`` changes them."""
+        if self._snapshot is None:
+            self._snapshot = ParameterIndexSnapshot(
+                self.embedding_model,
+                np.vstack(self._vectors) if self._vectors else None,
+                tuple(tuple(entries) for entries in self._entries),
+            )
+        return self._snapshot
+
+    def match(self, name: str, threshold: float) -> list[ParameterEntry]:
+        """Indexed parameters whose cosine similarity to ``name`` exceeds ``threshold``."""
+        return self.snapshot().match(name, threshold)
+
+
+__all__ = ["ParameterEmbeddingIndex", "ParameterEntry", "ParameterIndexSnapshot"]
@@ -1,6 +1,7 @@
 import random
+import time
 from collections import defaultdict
-from typing import Any, Dict, List, Optional, Union, cast
+from typing import Any, Dict, List, Optional, Tuple, Union, cast
 
 import numpy as np
 
@@ -26,6 +27,7 @@ class ValueAgent(BaseAgent):
         gamma: float = 0.9,
         epsilon: float = 0.1,
     ):
+        super().__init__()
         self.q_table: ValueQTable = {}
         self.operation_graph = operation_graph
         self.alpha = alpha
@@ -39,6 +41,15 @@ class ValueAgent(BaseAgent):
         if request_generator is None:
             raise Exception("Request generator failed to initialize...")
 
+        if request_generator.value_checkpoint is not None:
+            restored = request_generator.value_checkpoint.load()
+            self.q_table.update(restored)
+            if restored:
+                print(
+                    f"Resuming value table generation: restored {len(restored)} of "
+                    f"{len(self.operation_graph.operation_nodes)} operations from the checkpoint."
+                )
+
         if config.parallelize_value_generation:
             # Parallel processing using thread pool
             request_generator.generate_value_tables_parallel(
@@ -48,6 +59,10 @@ class ValueAgent(BaseAgent):
             )
         else:
             # Original sequential DFS traversal
+            start_time = time.perf_counter()
+            request_generator.begin_value_generation(
+                self.operation_graph.operation_nodes
+            )
             responses = defaultdict(list)
             visited = set()
             for (
@@ -58,6 +73,10 @@ class ValueAgent(BaseAgent):
                     request_generator.value_depth_traversal(
                         operation_node, self.q_table, responses, visited
                     )
+            request_generator.print_value_generation_stats(
+                time.perf_counter() - start_time
+            )
+        self._invalidate_counters()
 
     def get_action(self, operation_id: str) -> ValueAction:
         if operation_id not in self.q_table:
@@ -134,6 +153,7 @@ class ValueAgent(BaseAgent):
                 )
                 for mapping in self.q_table[operation_id]["params"][param]:
                     if mapping[0] == value:
+                        self._track_q_change(operation_id, mapping[1], new_q)
                         mapping[1] = new_q
         if filtered_action.body_mappings:
             for mime, body in filtered_action.body_mappings.items():
@@ -150,6 +170,7 @@ class ValueAgent(BaseAgent):
                 )
                 for mapping in self.q_table[operation_id]["body"][mime]:
                     if mapping[0] == body:
+                        self._track_q_change(operation_id, mapping[1], new_q)
                         mapping[1] = new_q
 
     def get_Q_next(
@@ -215,23 +236,29 @@ class ValueAgent(BaseAgent):
                     continue
                 for mapping in self.q_table[operation_id]["params"][param]:
                     if mapping[0] == value:
+                        current_q = mapping[1]
                         mapping[1] += self.alpha * td_error
+                        self._track_q_change(operation_id, current_q, mapping[1])
         if action.body_mappings:
             for mime, body in action.body_mappings.items():
                 if mime not in self.q_table[operation_id].get("body", {}):
                     continue
                 for mapping in self.q_table[operation_id]["body"][mime]:
                     if mapping[0] == body:
+                        current_q = mapping[1]
                         mapping[1] += self.alpha * td_error
+                        self._track_q_change(operation_id, current_q, mapping[1])
 
-    def number_of_zeros(self, operation_id: str) -> int:
-        zeros = 0
+    def _scan_zeros(self, operation_id: str) -> Tuple[int, int]:
+        zeros, total = 0, 0
         for param_mappings in self.q_table[operation_id].get("params", {}).values():
+            total += len(param_mappings)
             for mapping in param_mappings:
                 if mapping[1] == 0:
                     zeros += 1
         for body_mappings in self.q_table[operation_id].get("body", {}).values():
+            total += len(body_mappings)
             for mapping in body_mappings:
                 if mapping[1] == 0:
                     zeros += 1
-        return zeros
+        return zeros, total
@@ -1,11 +1,16 @@
 import argparse
+import contextlib
 import json
+import multiprocessing
 import shelve
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Union
+from typing import Any, Dict, List, Union
 
 from autoresttest.graph.generate_graph import OperationGraph
-from autoresttest.marl import QLearning
+from autoresttest.marl import QLearning, SamplingProfiler
 from autoresttest.graph import RequestGenerator
 
 from dotenv import load_dotenv
@@ -19,10 +24,18 @@ from autoresttest.utils import (
     get_api_url,
     get_graph_cache_path,
     get_q_table_cache_path,
+    get_value_checkpoint_path,
+    ValueTableCheckpoint,
 )
 from autoresttest.models import to_dict_helper
 
 from autoresttest.config import get_config
+from autoresttest.transport import get_rate_limiter
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 
 load_dotenv()
 
@@ -45,8 +58,11 @@ def parse_args():
     )
     parser.add_argument(
         "num_specs",
+        nargs="?",
+        default="one",
         choices=["one", "many"],
-        help="Specifies the number of specifications: 'one' or 'many'",
+        help="Specifies the number of specifications: 'one' (default) or 'many' "
+        "(every specification in the directory of [spec].location)",
     )
     parser.add_argument(
         "-s",
@@ -55,6 +71,25 @@ def parse_args():
         default=None,
         help="Optional name of the specification",
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="Specifications run in parallel with 'many' (overrides [run_all].workers)",
+    )
+    parser.add_argument(
+        "-q",
+        "--quiet",
+        action="store_true",
+        help="Do not print the live dashboard during request generation (overrides [dashboard].quiet)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Run request generation for [profiling].profile_seconds under a sampling "
+        "profiler and write data/<spec>/profile.folded",
+    )
     return parser.parse_args()
 
 
@@ -71,6 +106,7 @@ def output_q_table(q_learning: QLearning, spec_name):
         else "Disabled"
     )
 
+    # Lazy action tables iterate only the combinations that were assigned a Q-value.
     simplified_param_table = {}
     for operation, operation_values in parameter_table.items():
         simplified_param_table[operation] = {"params": {}, "body": {}}
@@ -135,6 +171,31 @@ def output_errors(q_learning: QLearning, spec_name: str):
     with (output_dir / "server_errors.json").open("w") as f:
         json.dump(seriable_errors, f, indent=2)
 
+    if CONFIG.errors.cluster:
+        error_classes = [
+            {
+                "fingerprint": fingerprint,
+                "count": q_learning.error_class_counts.get(fingerprint, 0),
+                **to_dict_helper(error_class),
+            }
+            for fingerprint, error_class in q_learning.error_classes.items()
+        ]
+        error_classes.sort(key=lambda error_class: -error_class["count"])
+        with (output_dir / "error_classes.json").open("w") as f:
+            json.dump(error_classes, f, indent=2)
+
+
+def output_phase_timings(q_learning: QLearning, spec_name: str):
+    if not q_learning.phase_timer.enabled:
+        return
+    output_dir = ensure_output_dir(spec_name)
+
+    with (output_dir / "phase_timings.json").open("w") as f:
+        json.dump(q_learning.phase_timer.summary(), f, indent=2)
+
+    with (output_dir / "phase_timings.prom").open("w") as f:
+        f.write(q_learning.phase_timer.openmetrics())
+
 
 def output_operation_status_codes(q_learning: QLearning, spec_name: str):
     output_dir = ensure_output_dir(spec_name)
@@ -162,11 +223,15 @@ def output_report(
         unique_errors += len(q_learning.unique_errors[operation_idx])
 
     total_requests = sum(q_learning.responses.values())
+    rate_limit_stats = get_rate_limiter().stats
 
     report_content = {
         "Title": "AutoRestTest Report for " + title,
         "Duration": f"{q_learning.time_duration} seconds",
         "Total Requests Sent": total_requests,
+        "Requests Per Second": round(
+            total_requests / max(q_learning.elapsed_time, 1e-9), 2
+        ),
         "Status Code Distribution": dict(q_learning.responses),
         "Number of Total Operations": len(q_learning.operation_agent.q_table),
         "Number of Successfully Processed Operations": len(unique_processed_200s),
@@ -180,22 +245,79 @@ def output_report(
         )
         + "%",
         "Number of Unique Server Errors": unique_errors,
+        "Number of Server Error Classes": len(q_learning.error_classes),
         "Operations with Server Errors": q_learning.errors,
+        "Rate Limiting": {
+            "Throttled Seconds": round(rate_limit_stats["throttled_seconds"], 2),
+            "Rate Limited Responses (429)": rate_limit_stats["rate_limited_responses"],
+        },
+        "Value Store": q_learning.value_store_stats(),
+        "Response Harvesting": {
+            "Bodies": q_learning.response_harvester.stats["bodies"],
+            "Streamed Bodies": q_learning.response_harvester.stats["streamed"],
+            "Truncated Bodies": q_learning.response_harvester.stats["truncated"],
+            "Undocumented Properties Matched": q_learning.undocumented_matcher.submitted,
+        },
+        "Action Spaces": q_learning.action_space_stats(),
     }
 
     with (output_dir / "report.json").open("w") as f:
         json.dump(report_content, f, indent=2)
 
 
+def output_run_summary(results: List[Dict[str, Any]], wall_clock: float) -> Path:
+    """Write ``data/summary.json`` for a multi-specification run."""
+    completed = [result for result in results if result["Status"] == "completed"]
+    total_requests = sum(result["Total Requests Sent"] for result in completed)
+    summary = {
+        "Specifications": len(results),
+        "Completed": len(completed),
+        "Failed": len(results) - len(completed),
+        "Wall Clock Seconds": round(wall_clock, 2),
+        "Total Requests Sent": total_requests,
+        "Aggregate Requests Per Second": round(
+            total_requests / max(wall_clock, 1e-9), 2
+        ),
+        "Runs": sorted(results, key=lambda result: result["Specification"]),
+    }
+    DATA_ROOT.mkdir(parents=True, exist_ok=True)
+    summary_path = DATA_ROOT / "summary.json"
+    with summary_path.open("w") as f:
+        json.dump(summary, f, indent=2)
+    return summary_path
+
+
+def _run_spec_in_worker(
+    spec_dir: str, spec_name: str, ext: str, quiet: bool = False, profile: bool = False
+) -> Dict[str, Any]:
+    """Process pool entry point: one specification, logged to data/<spec>/run.log."""
+    log_path = ensure_output_dir(spec_name) / "run.log"
+    with log_path.open("w") as log, contextlib.redirect_stdout(
+        log
+    ), contextlib.redirect_stderr(log):
+        return AutoRestTest(spec_dir=spec_dir, quiet=quiet, profile=profile).run_spec(
+            spec_name, ext
+        )
+
+
 def parse_specification_location(spec_loc: str):
     spec_path = Path(spec_loc).expanduser()
     return spec_path.parent, spec_path.stem, spec_path.suffix
 
 
 class AutoRestTest:
-    def __init__(self, spec_dir: Union[Path, str]):
+    def __init__(
+        self,
+        spec_dir: Union[Path, str],
+        quiet: bool | None = None,
+        profile: bool = False,
+    ):
         self.spec_dir = Path(spec_dir).expanduser()
         self.is_naive = False
+        # Suppresses the live dashboard during request generation.
+        self.quiet = CONFIG.dashboard.quiet if quiet is None else quiet
+        # Bounded request generation under the sampling profiler.
+        self.profile = profile
         construct_db_dir()
         self.use_cached_graph = CONFIG.cache.use_cached_graph
         self.use_cached_table = CONFIG.cache.use_cached_table
@@ -209,7 +331,10 @@ class AutoRestTest:
 
         print(f"Parsing OpenAPI specification: {spec_path}...")
         spec_parser = SpecificationParser(spec_path=str(spec_path), spec_name=spec_name)
-        print("Specification parsed successfully!")
+        if spec_parser.from_cache:
+            print("Specification loaded from the parse cache!")
+        else:
+            print("Specification parsed successfully!")
 
         if CONFIG.api.override_url:
             api_url = CONFIG.custom_api_url
@@ -243,26 +368,36 @@ class AutoRestTest:
 
         with shelve.open(str(db_graph)) as db:
             loaded_from_shelf = False
+            previous_graph = None
 
             if spec_name in db and self.use_cached_graph:
                 print(f"Loading graph for {spec_name} from shelve.")
                 try:
                     graph_properties = db[spec_name]
-                    operation_graph.operation_edges = graph_properties["edges"]
-                    operation_graph.operation_nodes = graph_properties["nodes"]
-                    print(f"Loaded graph for {spec_name} from shelve.")
-                    loaded_from_shelf = True
+                    if "operation_hashes" in graph_properties:
+                        # Rebuilt against the current spec; unchanged pairs are reused.
+                        previous_graph = graph_properties
+                    else:
+                        operation_graph.operation_edges = graph_properties["edges"]
+                        operation_graph.operation_nodes = graph_properties["nodes"]
+                        print(f"Loaded graph for {spec_name} from shelve.")
+                        loaded_from_shelf = True
                 except Exception as e:
                     print(f"Error loading graph from shelve: {e}")
                     # Fall through to create new graph
 
             if not loaded_from_shelf:
-                print(f"Initializing new graph for {spec_name}.")
-                operation_graph.create_graph()
+                if previous_graph is not None:
+                    print(f"Updating cached graph for {spec_name}.")
+                else:
+                    print(f"Initializing new graph for {spec_name}.")
+                operation_graph.create_graph(previous=previous_graph)
 
                 graph_properties = {
                     "edges": operation_graph.operation_edges,
                     "nodes": operation_graph.operation_nodes,
+                    "operation_hashes": operation_graph.operation_hashes,
+                    "settings": operation_graph.comparison_settings(),
                 }
 
                 try:
@@ -285,6 +420,7 @@ class AutoRestTest:
             time_duration=CONFIG.request_generation.time_duration,
             mutation_rate=CONFIG.request_generation.mutation_rate,
         )
+        q_learning.show_progress = not self.quiet
         db_q_table = get_q_table_cache_path(spec_name)
 
         q_learning.operation_agent.initialize_q_table()
@@ -333,7 +469,17 @@ class AutoRestTest:
                         print("Error loading header agent from shelve.")
                         loaded_header_from_shelf = False
 
+            value_checkpoint = None
             if not loaded_value_from_shelf:
+                # Each finished operation is committed here, so an interrupted run resumes.
+                value_checkpoint = ValueTableCheckpoint(
+                    get_value_checkpoint_path(spec_name),
+                    operation_graph.operation_hashes,
+                )
+                if not self.use_cached_table:
+                    value_checkpoint.clear()
+                assert operation_graph.request_generator is not None
+                operation_graph.request_generator.value_checkpoint = value_checkpoint
                 q_learning.value_agent.initialize_q_table()
                 print(f"Initialized new value agent Q-table for {spec_name}.")
                 token_counter = OpenAILanguageModel.get_tokens()
@@ -356,6 +502,9 @@ class AutoRestTest:
                     "value": q_learning.value_agent.q_table,
                     "header": q_learning.header_agent.q_table,
                 }
+                if value_checkpoint is not None:
+                    # The complete table is in shelve now.
+                    value_checkpoint.clear()
             except Exception as e:
                 print("Error saving Q-tables to shelve.")
 
@@ -363,24 +512,153 @@ class AutoRestTest:
         print("Q-TABLES INITIALIZED...")
 
         print("BEGINNING Q-LEARNING...")
-        q_learning.run()
+        if self.profile:
+            self.profile_q_learning(q_learning, spec_name)
+        else:
+            q_learning.run()
         print("Q-LEARNING COMPLETED!!!")
         return q_learning
 
+    def profile_q_learning(self, q_learning: QLearning, spec_name: str) -> None:
+        """
+        Runs request generation for at most ``[profiling].profile_seconds`` while
+        sampling every thread's stack, and writes the samples to
+        ``data/<spec>/profile.folded``.
+        """
+        q_learning.time_duration = min(
+            q_learning.time_duration, CONFIG.profiling.profile_seconds
+        )
+        q_learning.run_stats.time_duration = q_learning.time_duration
+        profiler = SamplingProfiler(CONFIG.profiling.sample_interval)
+        print(f"Profiling request generation for {q_learning.time_duration} seconds...")
+        profiler.start()
+        try:
+            q_learning.run()
+        finally:
+            profiler.stop()
+            profile_path = ensure_output_dir(spec_name) / "profile.folded"
+            profiler.write_folded(profile_path)
+            print(f"Collected {profiler.samples} profiler samples in {profile_path}")
+            print("Most sampled functions:")
+            for function, samples in profiler.top_functions():
+                print(f"  {samples:>7}  {function}")
+
     def print_performance(self):
         token_counter = OpenAILanguageModel.get_tokens()
         print(f"Total input tokens used: {token_counter.input_tokens}")
         print(f"Total output tokens used: {token_counter.output_tokens}")
-
-    def run_all(self):
-        for spec_file in self.spec_dir.iterdir():
-            if not spec_file.is_file():
+        cache_stats = OpenAILanguageModel.get_cache_stats()
+        print(
+            f"LLM cache - Hits: {cache_stats.hits}, Misses: {cache_stats.misses}, "
+            f"Bytes read: {cache_stats.bytes_read}, Bytes written: {cache_stats.bytes_written}, "
+            f"Evictions: {cache_stats.evictions}"
+        )
+        if resource is not None:
+            peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            if sys.platform != "darwin":
+                peak_rss *= 1024  # Linux reports kilobytes, macOS bytes.
+            print(f"Peak resident memory: {peak_rss / (1024 * 1024):.1f} MiB")
+
+    def spec_files(self) -> List[Path]:
+        """Specification files in ``spec_dir``; each name (stem) must be unique."""
+        spec_files: Dict[str, Path] = {}
+        for spec_file in sorted(self.spec_dir.iterdir()):
+            if not spec_file.is_file() or spec_file.suffix.lower() not in (
+                ".yaml",
+                ".yml",
+                ".json",
+            ):
                 continue
-            spec_name = spec_file.stem
-            print(f"Running tests for {spec_name}")
-            self.run_single(spec_name, spec_file.suffix)
-
-    def run_single(self, spec_name: str, ext: str):
+            if spec_file.stem in spec_files:
+                # Outputs and caches are keyed by name, so a second file would overwrite them.
+                print(
+                    f"Skipping {spec_file.name}: another specification is named {spec_file.stem}."
+                )
+                continue
+            spec_files[spec_file.stem] = spec_file
+        return list(spec_files.values())
+
+    def run_all(self, workers: int | None = None):
+        """
+        Runs every specification in ``spec_dir`` with up to ``workers`` (default
+        ``[run_all].workers``) at once, each in its own process, and writes
+        ``data/summary.json``.
+        """
+        workers = max(1, workers if workers is not None else CONFIG.run_all.workers)
+        spec_files = self.spec_files()
+        start_time = time.time()
+        results: List[Dict[str, Any]] = []
+
+        if workers == 1 or len(spec_files) < 2:
+            for spec_file in spec_files:
+                print(f"Running tests for {spec_file.stem}")
+                results.append(self.run_spec(spec_file.stem, spec_file.suffix))
+        else:
+            # Workers share the memory-mapped embedding store and the SQLite LLM cache.
+            context = multiprocessing.get_context(
+                "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+            )
+            print(
+                f"Running {len(spec_files)} specifications with {workers} parallel workers; "
+                "each run logs to data/<spec>/run.log."
+            )
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(spec_files)), mp_context=context
+            ) as executor:
+                futures = {
+                    executor.submit(
+                        _run_spec_in_worker,
+                        str(self.spec_dir),
+                        spec_file.stem,
+                        spec_file.suffix,
+                        self.quiet,
+                        self.profile,
+                    ): spec_file.stem
+                    for spec_file in spec_files
+                }
+                for future in as_completed(futures):
+                    spec_name = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {
+                            "Specification": spec_name,
+                            "Status": "failed",
+                            "Error": str(e),
+                        }
+                    print(f"Finished {spec_name}: {result['Status']}")
+                    results.append(result)
+
+        summary_path = output_run_summary(results, time.time() - start_time)
+        print(f"Summary of {len(results)} specifications written to {summary_path}")
+
+    def run_spec(self, spec_name: str, ext: str) -> Dict[str, Any]:
+        """``run_single`` that reports failures instead of raising, for run summaries."""
+        start_time = time.time()
+        try:
+            q_learning = self.run_single(spec_name, ext)
+        except Exception as e:
+            print(f"Run for {spec_name} failed: {e}")
+            return {
+                "Specification": spec_name,
+                "Status": "failed",
+                "Error": str(e),
+                "Wall Clock Seconds": round(time.time() - start_time, 2),
+            }
+        total_requests = sum(q_learning.responses.values())
+        return {
+            "Specification": spec_name,
+            "Status": "completed",
+            "Wall Clock Seconds": round(time.time() - start_time, 2),
+            "Total Requests Sent": total_requests,
+            "Requests Per Second": round(
+                total_requests / max(q_learning.elapsed_time, 1e-9), 2
+            ),
+            "Number of Total Operations": len(q_learning.operation_agent.q_table),
+            "Output Directory": str(DATA_ROOT / spec_name),
+        }
+
+    def run_single(self, spec_name: str, ext: str) -> QLearning:
         print("BEGINNING AUTO-REST-TEST...")
         embedding_model = EmbeddingModel()
         operation_graph = self.generate_graph(spec_name, ext, embedding_model)
@@ -390,15 +668,37 @@ class AutoRestTest:
         output_successes(q_learning, spec_name)
         output_errors(q_learning, spec_name)
         output_operation_status_codes(q_learning, spec_name)
+        output_phase_timings(q_learning, spec_name)
         output_report(q_learning, spec_name, operation_graph.spec_parser)
         print("AUTO-REST-TEST COMPLETED!!!")
+        return q_learning
 
 
 def main():
+    args = parse_args()
     specification_directory, specification_name, ext = parse_specification_location(
         str(PROJECT_ROOT / CONFIG.specification_location)
     )
-    auto_rest_test = AutoRestTest(spec_dir=specification_directory)
+    auto_rest_test = AutoRestTest(
+        spec_dir=specification_directory,
+        quiet=args.quiet or None,
+        profile=args.profile,
+    )
+    if args.num_specs == "many":
+        auto_rest_test.run_all(workers=args.workers)
+        return
+    if args.spec_name:
+        matches = [
+            spec_file
+            for spec_file in auto_rest_test.spec_files()
+            if spec_file.stem == args.spec_name
+        ]
+        if not matches:
+            print(
+                f"No specification named {args.spec_name} in {specification_directory}"
+            )
+            return
+        specification_name, ext = matches[0].stem, matches[0].suffix
     auto_rest_test.run_single(specification_name, ext)
 
 
@@ -1,5 +1,5 @@
 """Configuration helpers for AutoRestTest."""
 
-from .config import Config, get_config
+from .config import PROJECT_ROOT, Config, get_config
 
-__all__ = ["Config", "get_config"]
+__all__ = ["Config", "PROJECT_ROOT", "get_config"]
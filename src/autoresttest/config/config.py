@@ -4,7 +4,7 @@ import os
 import re
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Literal
 
 import tomli as tomllib
 from dotenv import load_dotenv
@@ -25,12 +25,24 @@ class SpecConfig(BaseModel):
     location: str
     recursion_limit: int = 50
     strict_validation: bool = True
+    parse_cache: bool = True
+
+
+class LLMCacheConfig(BaseModel):
+    """Persistent LLM response cache. Sizes of 0 mean unbounded, a TTL of 0 never expires."""
+
+    backend: Literal["sqlite", "memory"] = "sqlite"
+    path: str = "cache/llm/responses.sqlite3"
+    max_bytes: int = 256 * 1024 * 1024
+    max_entries: int = 0
+    ttl_seconds: float = 0
 
 
 class LLMConfig(BaseModel):
     engine: str
     creative_temperature: float
     strict_temperature: float
+    cache: LLMCacheConfig = LLMCacheConfig()
 
 
 class HeaderAgentConfig(BaseModel):
@@ -51,6 +63,7 @@ class AgentCombinationConfig(BaseModel):
     max_total_combinations: int = 3000
     base_samples_per_size: int = 200
     combination_seed: int = 42
+    q_table_backend: Literal["dict", "array", "lazy"] = "dict"
     value: ValueAgentConfig = ValueAgentConfig()
 
 
@@ -68,6 +81,102 @@ class QLearningConfig(BaseModel):
 class RequestGenerationConfig(BaseModel):
     time_duration: int
     mutation_rate: float
+    concurrency: int = 1
+
+
+class ValueStoreConfig(BaseModel):
+    """Bounds on the successful values and unique errors kept in memory during a run."""
+
+    max_values: int = 0
+    max_errors: int = 0
+    eviction: Literal["reservoir", "diverse"] = "reservoir"
+    spill_dir: str = ""
+
+
+class ResponseHarvestConfig(BaseModel):
+    """Which values are extracted from successful response bodies, and how much is parsed."""
+
+    needed_only: bool = True
+    max_values_per_property: int = 50
+    exploration_samples: int = 3
+    max_depth: int = 16
+    max_array_items: int = 1000
+    stream_threshold: int = 1024 * 1024
+    max_bytes: int = 8 * 1024 * 1024
+    background_matching: bool = True
+
+
+class DashboardConfig(BaseModel):
+    """Live progress output during request generation."""
+
+    quiet: bool = False
+    refresh_seconds: float = 1.0
+
+
+class ProfilingConfig(BaseModel):
+    """Phase timings of the Q-learning loop and the ``--profile`` sampling profiler."""
+
+    phase_timings: bool = True
+    metrics_port: int = 0
+    profile_seconds: int = 60
+    sample_interval: float = 0.005
+
+
+class ErrorsConfig(BaseModel):
+    """Grouping of server errors into failure classes for the report."""
+
+    cluster: bool = True
+    max_message_length: int = 300
+
+
+class EmbeddingsConfig(BaseModel):
+    """Word embeddings used to match parameters across operations."""
+
+    backend: Literal["mmap", "gensim"] = "mmap"
+    model: str = "glove-wiki-gigaword-50"
+    prune_to_spec: bool = False
+
+
+class RunAllConfig(BaseModel):
+    """Running every specification in a directory (``autoresttest many``)."""
+
+    workers: int = 1
+
+
+class ShardingConfig(BaseModel):
+    """Split Q-learning across forked worker processes that periodically merge state."""
+
+    workers: int = 1
+    merge_interval: float = 30.0
+    mode: Literal["disjoint", "overlapping"] = "disjoint"
+
+
+class RateLimitConfig(BaseModel):
+    """Request pacing per API host, learned from rate-limit response headers."""
+
+    enabled: bool = True
+    requests_per_second: float = 0.0
+    burst: int = 10
+    max_wait: float = 60.0
+    operation_overrides: Dict[str, float] = {}
+
+
+class HttpConfig(BaseModel):
+    """Connection pooling for the HTTP sessions shared by all request senders."""
+
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    keep_alive: bool = True
+    max_retries: int = 0
+    backoff_factor: float = 0.0
+
+
+class TransportConfig(BaseModel):
+    """Send requests over sockets, or call a Python ASGI/WSGI app in-process."""
+
+    mode: Literal["http", "asgi", "wsgi"] = "http"
+    app: str = ""
+    app_dir: str = ""
 
 
 class ApiConfig(BaseModel):
@@ -102,7 +211,18 @@ class Config(BaseModel):
     cache: CacheConfig
     q_learning: QLearningConfig
     request_generation: RequestGenerationConfig
+    value_store: ValueStoreConfig = ValueStoreConfig()
+    response_harvest: ResponseHarvestConfig = ResponseHarvestConfig()
+    errors: ErrorsConfig = ErrorsConfig()
+    dashboard: DashboardConfig = DashboardConfig()
+    profiling: ProfilingConfig = ProfilingConfig()
     api: ApiConfig = ApiConfig()
+    embeddings: EmbeddingsConfig = EmbeddingsConfig()
+    run_all: RunAllConfig = RunAllConfig()
+    sharding: ShardingConfig = ShardingConfig()
+    http: HttpConfig = HttpConfig()
+    transport: TransportConfig = TransportConfig()
+    rate_limit: RateLimitConfig = RateLimitConfig()
     custom_headers: CustomHeadersConfig = CustomHeadersConfig()
 
     model_config = ConfigDict(frozen=True)
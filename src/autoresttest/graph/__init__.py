@@ -1,7 +1,7 @@
 """Graph package exports."""
 
 from .request_generator import RequestGenerator
-from .generate_graph import OperationGraph
+from .generate_graph import OperationGraph, operation_fingerprint
 from autoresttest.models import (
     SchemaProperties,
     ParameterProperties,
@@ -11,6 +11,7 @@ from autoresttest.models import (
 __all__ = [
     "RequestGenerator",
     "OperationGraph",
+    "operation_fingerprint",
     "SchemaProperties",
     "ParameterProperties",
     "OperationProperties",
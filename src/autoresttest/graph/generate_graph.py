@@ -1,16 +1,33 @@
+import hashlib
 import heapq
+import json
 import logging
+from typing import Any
 
 from tqdm import tqdm
 
 from .request_generator import RequestGenerator
 from .similarity_comparator import OperationDependencyComparator
 
-from autoresttest.models import OperationProperties, SimilarityValue, ParameterKey
+from autoresttest.config import get_config
+from autoresttest.models import (
+    OperationProperties,
+    SimilarityValue,
+    ParameterKey,
+    to_dict_helper,
+)
 from autoresttest.specification import SpecificationParser
 from autoresttest.utils import EmbeddingModel
 
 
+def operation_fingerprint(operation_properties: OperationProperties) -> str:
+    """Content hash of an operation; edges touching it are recomputed when it changes."""
+    serialized = json.dumps(
+        to_dict_helper(operation_properties), sort_keys=True, default=str
+    )
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
 class OperationNode:
     def __init__(self, operation_properties: OperationProperties):
         self.operation_id = operation_properties.operation_id
@@ -54,6 +71,12 @@ class OperationGraph:
         self.dependency_comparator = OperationDependencyComparator(
             model=embedding_model
         )
+        # Per-operation content hashes of the operations the edges were computed from.
+        self.operation_hashes: dict[str, str] = {}
+
+    def comparison_settings(self) -> str:
+        """Settings that affect every comparison; a change invalidates the whole graph cache."""
+        return f"{self.dependency_comparator.threshold}|{get_config().embeddings.model}"
 
     def print_graph(self):
         for operation_id, operation_node in self.operation_nodes.items():
@@ -179,31 +202,85 @@ class OperationGraph:
             self.operation_edges.remove(edge_to_remove)
 
     def determine_dependencies(
-        self, operations: dict[str, OperationProperties]
+        self,
+        operations: dict[str, OperationProperties],
+        previous: dict[str, Any] | None = None,
     ) -> None:
+        """
+        Compares every pair of operations. With ``previous`` (a cached graph with
+        ``operation_hashes``), pairs whose operations are both unchanged reuse the
+        cached edges and only pairs touching added or modified operations are compared.
+        """
+        changed = set(operations)
+        cached_pairs: dict[tuple[str, str], dict] = {}
+        cached_tentative: dict[str, list[OperationEdge]] = {}
+        removed: set[str] = set()
+        if previous is not None:
+            previous_hashes = previous["operation_hashes"]
+            changed = {
+                operation_id
+                for operation_id in operations
+                if previous_hashes.get(operation_id) != self.operation_hashes[operation_id]
+            }
+            removed = set(previous_hashes) - set(operations)
+            for edge in previous["edges"]:
+                cached_pairs[
+                    (edge.source.operation_id, edge.destination.operation_id)
+                ] = edge.similar_parameters
+            for operation_id, node in previous["nodes"].items():
+                if node.tentative_edges:
+                    cached_tentative[operation_id] = node.tentative_edges
+
+        if changed:
+            self.dependency_comparator.build_embedding_matrix(operations)
+        compared, reused = 0, 0
         for operation_id, operation_properties in tqdm(
             operations.items(),
             desc="Building operation dependency graph",
             unit="operations",
         ):
+            # Tentative edges keep only the top candidates, so a row that had them is
+            # recomputed whenever any other operation changed.
+            recompute_row = operation_id in changed or (
+                operation_id in cached_tentative and bool(changed or removed)
+            )
             for (
                 dependent_operation_id,
                 dependent_operation_properties,
             ) in operations.items():
                 if operation_id == dependent_operation_id:
                     continue
-                # Note: Matches parameters and request body properties of each operation with the parameters, request body properties, and response properties of another operation
-                parameter_similarities, next_closest_similarities = (
-                    self.dependency_comparator.compare_cosine(
-                        operation_properties, dependent_operation_properties
+                if recompute_row or dependent_operation_id in changed:
+                    # Note: Matches parameters and request body properties of each operation with the parameters, request body properties, and response properties of another operation
+                    parameter_similarities, next_closest_similarities = (
+                        self.dependency_comparator.compare_operations(
+                            operation_id, dependent_operation_id
+                        )
                     )
-                )
+                    compared += 1
+                else:
+                    parameter_similarities = cached_pairs.get(
+                        (operation_id, dependent_operation_id), {}
+                    )
+                    next_closest_similarities = []
+                    reused += 1
                 self.update_operation_dependencies(
                     operation_id,
                     dependent_operation_id,
                     parameter_similarities,
                     next_closest_similarities,
                 )
+            if not recompute_row and operation_id in cached_tentative:
+                self.operation_nodes[operation_id].tentative_edges = [
+                    OperationEdge(
+                        source=self.operation_nodes[operation_id],
+                        destination=self.operation_nodes[
+                            edge.destination.operation_id
+                        ],
+                        similar_parameters=edge.similar_parameters,
+                    )
+                    for edge in cached_tentative[operation_id]
+                ]
             if (
                 self.operation_nodes[operation_id].tentative_edges
                 and not self.operation_nodes[operation_id].outgoing_edges
@@ -212,15 +289,37 @@ class OperationGraph:
                 self.operation_nodes[operation_id].outgoing_edges = (
                     self.operation_nodes[operation_id].tentative_edges
                 )
+        if previous is not None:
+            print(
+                f"Incremental graph rebuild: {len(changed)} added or modified and "
+                f"{len(removed)} removed operations; {compared} comparisons recomputed, "
+                f"{reused} skipped."
+            )
 
-    def create_graph(self, auto_validate: bool = True) -> None:
+    def create_graph(
+        self, auto_validate: bool = True, previous: dict[str, Any] | None = None
+    ) -> None:
+        """
+        Builds the graph from the specification. ``previous`` is a cached graph
+        (``edges``, ``nodes``, ``operation_hashes``, ``settings``) to rebuild from
+        incrementally; it is ignored if it was built with other comparison settings.
+        """
         operations: dict[str, OperationProperties] = (
             self.spec_parser.parse_specification()
         )
         print(f"Parsed specification ({len(operations)} operations)")
         for operation_id, operation_properties in operations.items():
             self.add_operation_node(operation_properties)
-        self.determine_dependencies(operations)
+        self.operation_hashes = {
+            operation_id: operation_fingerprint(operation_properties)
+            for operation_id, operation_properties in operations.items()
+        }
+        if previous is not None and (
+            "operation_hashes" not in previous
+            or previous.get("settings") != self.comparison_settings()
+        ):
+            previous = None
+        self.determine_dependencies(operations, previous)
         print("Graph construction complete!")
 
 
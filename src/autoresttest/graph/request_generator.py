@@ -1,3 +1,4 @@
+import contextlib
 import copy
 import random
 import threading
@@ -35,14 +36,65 @@ from autoresttest.utils import (
     get_body_object_combinations,
     dispatch_request,
     get_accept_header,
+    ValueTableCheckpoint,
 )
 from autoresttest.llm import NaiveValueGenerator, SmartValueGenerator
+from autoresttest.transport import get_http_method
 
 if TYPE_CHECKING:
     from .generate_graph import OperationGraph, OperationNode, OperationEdge
 
 CONFIG = get_config()
 
+# Upstream responses added to one value-generation prompt.
+MAX_UPSTREAM_RESPONSES = 3
+
+
+def _strongly_connected_components(graph: Dict[str, List[str]]) -> List[List[str]]:
+    """
+    Tarjan's algorithm, without recursion so large specifications cannot hit the
+    recursion limit. A component is emitted after every component it has edges to.
+    """
+    index: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack: Set[str] = set()
+    components: List[List[str]] = []
+
+    for root in graph:
+        if root in index:
+            continue
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph[root]))]
+        while work:
+            node, successors = work[-1]
+            for successor in successors:
+                if successor not in index:
+                    index[successor] = lowlink[successor] = len(index)
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(graph[successor])))
+                    break
+                if successor in on_stack:
+                    lowlink[node] = min(lowlink[node], index[successor])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    return components
+
 
 @dataclass
 class StatusCode:
@@ -65,6 +117,11 @@ class RequestGenerator:
             {}
         )  # Dictionary to store responses for each operation_id
         self.allowed_retries = 1
+        self.value_generation_stats = {"operations": 0, "informed": 0, "upstream": 0}
+        self._value_generation_lock = threading.Lock()
+        # When set, each finished value table is committed to it and completed operations are skipped.
+        self.value_checkpoint: Optional[ValueTableCheckpoint] = None
+        self._value_progress = {"total": 0, "done": 0, "start": 0.0}
 
     @staticmethod
     def generate_naive_values(
@@ -419,9 +476,9 @@ class RequestGenerator:
             endpoint_path = endpoint_path.replace("{" + name + "}", str(value))
 
         try:
-            select_method = getattr(
-                requests, http_method
-            )  # selects correct http method
+            select_method = get_http_method(
+                self.api_url, http_method
+            )  # selects correct http method on the pooled session
             full_url = f"{self.api_url}{endpoint_path}"
 
             # Merge custom headers from config
@@ -439,6 +496,7 @@ class RequestGenerator:
                 header=merged_headers,
                 cookies=cookie_params,
                 accept=accept_header,
+                operation_id=request_data.operation_properties.operation_id,
             )
             if response is not None:
                 if not response.ok and retry_nums < permitted_retries and allow_retry:
@@ -527,152 +585,249 @@ class RequestGenerator:
                 #        parameter_mappings[operation_id]['body'][mime][body_param][value] = 0
                 #        occurrences[body_param] = occurrences.get(body_param, 0) + 1
 
-    def value_depth_traversal(
+    def _upstream_responses(
         self,
-        curr_node: "OperationNode",
+        operation_node: "OperationNode",
+        responses: Dict[str, List[RequestResponse]],
+    ) -> List[RequestResponse]:
+        """One successful response from each finished operation this one depends on."""
+        upstream: List[RequestResponse] = []
+        for edge in operation_node.outgoing_edges:
+            for request_response in responses.get(edge.destination.operation_id, []):
+                if request_response.response.ok:
+                    upstream.append(request_response)
+                    break
+            if len(upstream) >= MAX_UPSTREAM_RESPONSES:
+                break
+        return upstream
+
+    def _generate_operation_values(
+        self,
+        operation_node: "OperationNode",
         parameter_mappings: Dict,
-        responses: Dict[str, List],
-        visited: Set,
-    ):
-        visited.add(curr_node.operation_id)
-
-        for edge in curr_node.outgoing_edges:
-            if edge.destination.operation_id not in visited:
-                self.value_depth_traversal(
-                    edge.destination, parameter_mappings, responses, visited
-                )
-
-        print("Building value table generation for operation: ", curr_node.operation_id)
-
-        occurrences = {}
-        # self.handle_dependent_values(curr_node, dependent_responses, occurrences, parameter_mappings, responses)
+        responses: Dict[str, List[RequestResponse]],
+        mappings_lock: Optional[threading.Lock] = None,
+    ) -> None:
+        """
+        Probes the operation, asks the value generator for values (informed by the
+        probe responses and by upstream responses when there are any), and adds them
+        to ``parameter_mappings``. The probe responses are stored in ``responses``.
+        """
+        operation_id = operation_node.operation_id
+        if (
+            self.value_checkpoint is not None
+            and operation_id in self.value_checkpoint.completed
+        ):
+            # Operations that depend on this one still read its probe responses.
+            responses[operation_id] = self.value_checkpoint.responses.get(
+                operation_id, []
+            )
+            return
+        print(f"Building value table generation for operation: {operation_id}")
 
+        occurrences: Dict[str, int] = {}
         desired_size = 10
         lowest_occurrences = min(occurrences.values()) if occurrences else 0
+
         if lowest_occurrences < desired_size:
-            possible_responses = []
+            possible_responses: List[RequestResponse] = []
             # Use two samples with two retries each to gather server responses for augmenting value generation
             for _ in range(2):
                 response = self.create_and_send_request(
-                    curr_node, allow_retry=True, permitted_retries=2
+                    operation_node, allow_retry=True, permitted_retries=2
                 )
                 if response is not None:
                     possible_responses.append(response)
+            responses[operation_id] = possible_responses
+            upstream_responses = self._upstream_responses(operation_node, responses)
 
             value_generator = SmartValueGenerator(
-                operation_properties=curr_node.operation_properties
+                operation_properties=operation_node.operation_properties
             )
-            if possible_responses:
+            if possible_responses or upstream_responses:
                 parameters, request_body = (
                     value_generator.generate_informed_value_agent_params(
                         num_values=desired_size - lowest_occurrences,
                         responses=possible_responses,
+                        upstream_responses=upstream_responses,
                     ),
                     value_generator.generate_informed_value_agent_body(
                         num_values=desired_size - lowest_occurrences,
                         responses=possible_responses,
+                        upstream_responses=upstream_responses,
                     ),
                 )
             else:
-                parameters, request_body = value_generator.generate_value_agent_params(
-                    num_values=desired_size - lowest_occurrences
-                ), value_generator.generate_value_agent_body(
-                    num_values=desired_size - lowest_occurrences
+                parameters, request_body = (
+                    value_generator.generate_value_agent_params(
+                        num_values=desired_size - lowest_occurrences
+                    ),
+                    value_generator.generate_value_agent_body(
+                        num_values=desired_size - lowest_occurrences
+                    ),
+                )
+
+            with mappings_lock or contextlib.nullcontext():
+                self._validate_value_mappings(
+                    operation_node,
+                    parameter_mappings,
+                    parameters,
+                    request_body,
+                    occurrences,
                 )
-            self._validate_value_mappings(
-                curr_node, parameter_mappings, parameters, request_body, occurrences
+            with self._value_generation_lock:
+                self.value_generation_stats["informed"] += bool(
+                    possible_responses or upstream_responses
+                )
+                self.value_generation_stats["upstream"] += bool(upstream_responses)
+
+        if self.value_checkpoint is not None:
+            with mappings_lock or contextlib.nullcontext():
+                table = copy.deepcopy(
+                    parameter_mappings.get(operation_id, {"params": {}, "body": {}})
+                )
+            self.value_checkpoint.record(
+                operation_id, table, responses.get(operation_id, [])
+            )
+
+        with self._value_generation_lock:
+            self.value_generation_stats["operations"] += 1
+            self._value_progress["done"] += 1
+            done, total = self._value_progress["done"], self._value_progress["total"]
+            elapsed = time.perf_counter() - self._value_progress["start"]
+        print(f"Completed value table generation for operation: {operation_id}")
+        if total:
+            eta = elapsed / done * max(total - done, 0)
+            print(
+                f"Value table progress: {done}/{total} operations "
+                f"({done / total * 100:.1f}%), elapsed {elapsed:.0f}s, ETA {eta:.0f}s"
             )
 
+    def begin_value_generation(self, operation_nodes: Dict[str, "OperationNode"]) -> None:
+        """Resets progress reporting for the operations that still need a value table."""
+        completed = self.value_checkpoint.completed if self.value_checkpoint else set()
+        self._value_progress = {
+            "total": sum(
+                1 for operation_id in operation_nodes if operation_id not in completed
+            ),
+            "done": 0,
+            "start": time.perf_counter(),
+        }
+
+    def print_value_generation_stats(
+        self, elapsed: float, waves: Optional[int] = None
+    ) -> None:
+        stats = self.value_generation_stats
+        wave_info = f" in {waves} dependency waves" if waves is not None else ""
         print(
-            "Completed value table generation for operation: ", curr_node.operation_id
+            f"Generated value tables for {stats['operations']} operations{wave_info} "
+            f"in {elapsed:.2f}s; {stats['informed']} used informed prompts, "
+            f"{stats['upstream']} of them with upstream responses."
         )
 
+    def value_depth_traversal(
+        self,
+        curr_node: "OperationNode",
+        parameter_mappings: Dict,
+        responses: Dict[str, List],
+        visited: Set,
+    ):
+        visited.add(curr_node.operation_id)
+
+        for edge in curr_node.outgoing_edges:
+            if edge.destination.operation_id not in visited:
+                self.value_depth_traversal(
+                    edge.destination, parameter_mappings, responses, visited
+                )
+
+        self._generate_operation_values(curr_node, parameter_mappings, responses)
+
+    @staticmethod
+    def dependency_waves(operation_nodes: Dict[str, "OperationNode"]) -> List[List[str]]:
+        """
+        Groups operations into waves so each operation comes after the operations it
+        depends on (the destinations of its outgoing edges). Operations that depend on
+        each other through a cycle form one strongly connected component and share a
+        wave, so a dense, mostly mutual similarity graph still takes few waves. Waves
+        keep specification order.
+        """
+        order = {operation_id: idx for idx, operation_id in enumerate(operation_nodes)}
+        dependencies: Dict[str, List[str]] = {
+            operation_id: list(
+                dict.fromkeys(
+                    edge.destination.operation_id
+                    for edge in node.outgoing_edges
+                    if edge.destination.operation_id in operation_nodes
+                    and edge.destination.operation_id != operation_id
+                )
+            )
+            for operation_id, node in operation_nodes.items()
+        }
+
+        component_of: Dict[str, int] = {}
+        levels: List[int] = []
+        waves: List[List[str]] = []
+        # Components come out after every component they depend on.
+        for component in _strongly_connected_components(dependencies):
+            idx = len(levels)
+            for operation_id in component:
+                component_of[operation_id] = idx
+            level = 0
+            for operation_id in component:
+                for dependency in dependencies[operation_id]:
+                    dependency_idx = component_of[dependency]
+                    if dependency_idx != idx:
+                        level = max(level, levels[dependency_idx] + 1)
+            levels.append(level)
+            while len(waves) <= level:
+                waves.append([])
+            waves[level].extend(component)
+
+        for wave in waves:
+            wave.sort(key=order.__getitem__)
+        return waves
+
     def generate_value_tables_parallel(
         self,
         operation_nodes: Dict[str, "OperationNode"],
         parameter_mappings: Dict,
         max_workers: int = 4,
     ) -> None:
-        """Generate value tables for all operations in parallel using a thread pool."""
+        """
+        Generate value tables in dependency waves: every operation in a wave runs in
+        parallel, and a wave starts once the operations it depends on are finished so
+        their responses can inform its prompts.
+        """
         # parameter_mappings corresponds to q_table
-        visited_lock = threading.Lock()
+        start_time = time.perf_counter()
         mappings_lock = threading.Lock()
-        visited: Set[str] = set()
-
-        def process_operation(operation_node: "OperationNode") -> None:
-            operation_id = operation_node.operation_id
-
-            # Check if already processed (with lock)
-            with visited_lock:
-                if operation_id in visited:
-                    return
-                visited.add(operation_id)
-
-            print(f"Building value table generation for operation: {operation_id}")
+        responses: Dict[str, List[RequestResponse]] = {}
+        waves = self.dependency_waves(operation_nodes)
+        self.begin_value_generation(operation_nodes)
 
-            # Generate values (I/O bound - HTTP + LLM calls)
-            occurrences: Dict[str, int] = {}
-            desired_size = 10
-            lowest_occurrences = min(occurrences.values()) if occurrences else 0
-
-            if lowest_occurrences < desired_size:
-                possible_responses: List[RequestResponse] = []
-                for _ in range(2):
-                    response = self.create_and_send_request(
-                        operation_node, allow_retry=True, permitted_retries=2
-                    )
-                    if response is not None:
-                        possible_responses.append(response)
-
-                value_generator = SmartValueGenerator(
-                    operation_properties=operation_node.operation_properties
-                )
-                if possible_responses:
-                    parameters, request_body = (
-                        value_generator.generate_informed_value_agent_params(
-                            num_values=desired_size - lowest_occurrences,
-                            responses=possible_responses,
-                        ),
-                        value_generator.generate_informed_value_agent_body(
-                            num_values=desired_size - lowest_occurrences,
-                            responses=possible_responses,
-                        ),
-                    )
-                else:
-                    parameters, request_body = (
-                        value_generator.generate_value_agent_params(
-                            num_values=desired_size - lowest_occurrences
-                        ),
-                        value_generator.generate_value_agent_body(
-                            num_values=desired_size - lowest_occurrences
-                        ),
-                    )
-
-                # Thread-safe update to parameter_mappings
-                with mappings_lock:
-                    self._validate_value_mappings(
-                        operation_node,
-                        parameter_mappings,
-                        parameters,
-                        request_body,
-                        occurrences,
-                    )
-
-            print(f"Completed value table generation for operation: {operation_id}")
-
-        # Submit all operations to thread pool
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {
-                executor.submit(process_operation, node): op_id
-                for op_id, node in operation_nodes.items()
-            }
-
-            for future in as_completed(futures):
-                op_id = futures[future]
-                try:
-                    future.result()
-                except Exception as e:
-                    print(f"Error processing operation {op_id}: {e}")
+            for wave in waves:
+                futures = {
+                    executor.submit(
+                        self._generate_operation_values,
+                        operation_nodes[op_id],
+                        parameter_mappings,
+                        responses,
+                        mappings_lock,
+                    ): op_id
+                    for op_id in wave
+                }
+
+                for future in as_completed(futures):
+                    op_id = futures[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        print(f"Error processing operation {op_id}: {e}")
+
+        self.print_value_generation_stats(
+            time.perf_counter() - start_time, waves=len(waves)
+        )
 
     def create_and_send_request(
         self,
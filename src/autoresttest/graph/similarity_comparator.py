@@ -1,5 +1,6 @@
 import logging
 import os
+import time
 from collections.abc import Sequence
 
 import numpy as np
@@ -17,10 +18,113 @@ from autoresttest.models import (
 from autoresttest.utils import EmbeddingModel
 
 
+OperationValues = list[tuple[str, ParameterKey | str, str]]
+
+
 class OperationDependencyComparator:
     def __init__(self, model: EmbeddingModel):
         self.model = model
         self.threshold = 0.8
+        # Populated by build_embedding_matrix: one row per distinct processed name.
+        self._vocabulary: dict[str, int] = {}
+        self._matrix: np.ndarray | None = None
+        self._squared_norms: np.ndarray | None = None
+        self._operation_values: dict[
+            str, tuple[OperationValues, OperationValues, OperationValues]
+        ] = {}
+        self._row_cache: tuple[tuple[str, ...], np.ndarray] | None = None
+
+    def build_embedding_matrix(
+        self, operations: dict[str, OperationProperties]
+    ) -> None:
+        """
+        Embeds every distinct processed parameter, body, and response name once so
+        similarities can be computed with matrix products instead of per-pair calls.
+        """
+        start_time = time.perf_counter()
+        self._operation_values = {
+            operation_id: (
+                self.get_parameter_list(operation_properties),
+                self.get_request_body_list(operation_properties),
+                self.get_response_list(operation_properties),
+            )
+            for operation_id, operation_properties in operations.items()
+        }
+        self.model.restrict_vocabulary(
+            word
+            for operation_lists in self._operation_values.values()
+            for operation_vals in operation_lists
+            for processed_name, _, _ in operation_vals
+            for word in processed_name.split(" ")
+        )
+        self._vocabulary = {}
+        vectors: list[np.ndarray] = []
+        for operation_lists in self._operation_values.values():
+            for operation_vals in operation_lists:
+                for processed_name, _, _ in operation_vals:
+                    if processed_name in self._vocabulary:
+                        continue
+                    embedding = self.model.encode_sentence_or_word(processed_name)
+                    if embedding is None:
+                        self._vocabulary[processed_name] = -1
+                    else:
+                        self._vocabulary[processed_name] = len(vectors)
+                        vectors.append(embedding)
+        if vectors:
+            self._matrix = np.vstack(vectors)
+            self._squared_norms = np.einsum("ij,ij->i", self._matrix, self._matrix)
+        else:
+            self._matrix = None
+            self._squared_norms = None
+        self._row_cache = None
+        print(
+            f"Built embedding matrix for {len(vectors)} of {len(self._vocabulary)} distinct names "
+            f"in {time.perf_counter() - start_time:.2f}s"
+        )
+
+    def _rows(self, operation_vals: Sequence[tuple[str, ParameterKey | str, str]]):
+        return np.array(
+            [self._vocabulary.get(processed, -1) for processed, _, _ in operation_vals],
+            dtype=np.intp,
+        )
+
+    def _similarity_block(
+        self,
+        operation1_vals: Sequence[tuple[str, ParameterKey | str, str]],
+        operation2_vals: Sequence[tuple[str, ParameterKey | str, str]],
+    ) -> np.ndarray:
+        """
+        Returns a len(operation1_vals) x len(operation2_vals) similarity block, NaN where
+        either name has no embedding. Uses the same formula as scipy's cosine distance.
+        """
+        assert self._matrix is not None and self._squared_norms is not None
+        names1 = tuple(processed for processed, _, _ in operation1_vals)
+        if self._row_cache is None or self._row_cache[0] != names1:
+            # Similarities of operation1's names against the whole vocabulary; reused
+            # while operation1 is compared with every other operation.
+            rows1 = self._rows(operation1_vals)
+            valid1 = rows1 >= 0
+            similarities = np.full((len(rows1), self._matrix.shape[0]), np.nan)
+            if valid1.any():
+                dot_products = (self._matrix[rows1[valid1]] @ self._matrix.T).astype(
+                    np.float64
+                )
+                norms = np.sqrt(
+                    np.outer(
+                        self._squared_norms[rows1[valid1]].astype(np.float64),
+                        self._squared_norms.astype(np.float64),
+                    )
+                )
+                distances = np.clip(1.0 - dot_products / norms, 0.0, 2.0)
+                similarities[valid1] = 1.0 - distances
+            self._row_cache = (names1, similarities)
+
+        rows2 = self._rows(operation2_vals)
+        block = np.full((len(names1), len(rows2)), np.nan)
+        valid2 = rows2 >= 0
+        if valid2.any():
+            block[:, valid2] = self._row_cache[1][:, rows2[valid2]]
+        return block
 
     def get_parameter_list(
         self, operation: OperationProperties
@@ -110,16 +214,34 @@ class OperationDependencyComparator:
         Returns parameters or body properties (str or ParameterKey) that might map to parameters or body properties or responses (str or ParameterKey) in other operations.
         """
         param_param_similarity: dict[str | ParameterKey, list[SimilarityValue]] = {}
+        if self._matrix is not None and operation1_vals and operation2_vals:
+            block = self._similarity_block(operation1_vals, operation2_vals)
+            for idx, (_, parameter_key, parameter_loc) in enumerate(operation1_vals):
+                param_param_similarity.setdefault(parameter_key, [])
+                for jdx in np.flatnonzero(~np.isnan(block[idx])):
+                    _, dependency_key, dependency_loc = operation2_vals[jdx]
+                    param_param_similarity[parameter_key].append(
+                        SimilarityValue(
+                            dependent_val=dependency_key,
+                            in_value=f"{parameter_loc} to {dependency_loc}",
+                            similarity=float(block[idx, jdx]),
+                        )
+                    )
+            return param_param_similarity
+
+        dependency_embeddings = [
+            self.model.encode_sentence_or_word(processed_dependency)
+            for processed_dependency, _, _ in operation2_vals
+        ]
         for processed_parameter, parameter_key, parameter_loc in operation1_vals:
             param_param_similarity.setdefault(parameter_key, [])
-            for processed_dependency, dependency_key, dependency_loc in operation2_vals:
-                param_embedding = self.model.encode_sentence_or_word(
-                    processed_parameter
-                )
-                dependency_embedding = self.model.encode_sentence_or_word(
-                    processed_dependency
-                )
-                if param_embedding is not None and dependency_embedding is not None:
+            param_embedding = self.model.encode_sentence_or_word(processed_parameter)
+            if param_embedding is None:
+                continue
+            for (_, dependency_key, dependency_loc), dependency_embedding in zip(
+                operation2_vals, dependency_embeddings
+            ):
+                if dependency_embedding is not None:
                     similarity: float = 1.0 - float(
                         cosine(param_embedding, dependency_embedding)
                     )
@@ -133,6 +255,72 @@ class OperationDependencyComparator:
 
         return param_param_similarity
 
+    def compare_operations(
+        self, operation1_id: str, operation2_id: str
+    ) -> tuple[
+        dict[str | ParameterKey, list[SimilarityValue]],
+        list[tuple[str | ParameterKey, SimilarityValue]],
+    ]:
+        """
+        Matrix-backed equivalent of compare_cosine for operations passed to
+        build_embedding_matrix, using one similarity block per operation pair.
+
+        Only similarities above the threshold are materialized. The next-closest
+        list is always empty: below-threshold pairs only become tentative edges when
+        no parameter has a comparable counterpart, in which case there are none.
+        """
+        params1, body1, _ = self._operation_values[operation1_id]
+        params2, body2, responses2 = self._operation_values[operation2_id]
+        operation1_groups = [params1, body1]
+        operation2_groups = [params2, body2, responses2]
+        if self._matrix is None:
+            # No name in the specification has an embedding, so nothing is comparable.
+            return {}, []
+        if not (params1 or body1) or not (params2 or body2 or responses2):
+            return {}, []
+
+        block = self._similarity_block(params1 + body1, params2 + body2 + responses2)
+        comparable = ~np.isnan(block)
+
+        # Same key order and value order as the section-by-section loops in compare_cosine.
+        comparable_counts: dict[str | ParameterKey, int] = {}
+        matchings: dict[str | ParameterKey, list[SimilarityValue]] = {}
+        row_start = 0
+        for operation1_vals in operation1_groups:
+            row_end = row_start + len(operation1_vals)
+            for _, parameter_key, _ in operation1_vals:
+                comparable_counts.setdefault(parameter_key, 0)
+                matchings.setdefault(parameter_key, [])
+            col_start = 0
+            for operation2_vals in operation2_groups:
+                col_end = col_start + len(operation2_vals)
+                if operation1_vals and operation2_vals:
+                    section_counts = comparable[row_start:row_end, col_start:col_end].sum(
+                        axis=1
+                    )
+                    for idx, count in enumerate(section_counts):
+                        comparable_counts[operation1_vals[idx][1]] += int(count)
+                    section = block[row_start:row_end, col_start:col_end]
+                    for idx, jdx in np.argwhere(section > self.threshold):
+                        _, parameter_key, parameter_loc = operation1_vals[idx]
+                        _, dependency_key, dependency_loc = operation2_vals[jdx]
+                        matchings[parameter_key].append(
+                            SimilarityValue(
+                                dependent_val=dependency_key,
+                                in_value=f"{parameter_loc} to {dependency_loc}",
+                                similarity=float(section[idx, jdx]),
+                            )
+                        )
+                col_start = col_end
+            row_start = row_end
+
+        similar_parameters = {
+            parameter_key: matchings[parameter_key]
+            for parameter_key, count in comparable_counts.items()
+            if count
+        }
+        return similar_parameters, []
+
     def compare_cosine(
         self, operation1: OperationProperties, operation2: OperationProperties
     ) -> tuple[
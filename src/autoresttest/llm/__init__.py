@@ -1,3 +1,4 @@
+from .cache import CacheStats, get_response_cache
 from .llm import OpenAILanguageModel
 from .value_generator import (
     NaiveValueGenerator,
@@ -16,6 +17,8 @@ from .value_generator import (
 )
 
 __all__ = [
+    "CacheStats",
+    "get_response_cache",
     "OpenAILanguageModel",
     "NaiveValueGenerator",
     "PromptData",
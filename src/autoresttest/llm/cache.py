@@ -0,0 +1,282 @@
+"""Persistent LLM response cache shared across runs and value-generation threads."""
+
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from autoresttest.config import PROJECT_ROOT, get_config
+
+CONFIG = get_config()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    evictions: int = 0
+
+
+class ResponseCache(ABC):
+    """
+    Base class for LLM response caches keyed by ``OpenAILanguageModel._generate_cache_key``.
+
+    Entries are grouped by namespace (the engine name). ``max_bytes`` and
+    ``max_entries`` bound the cache with least-recently-used eviction (``0`` means
+    unbounded) and ``ttl_seconds`` expires entries by age (``0`` keeps them forever).
+    """
+
+    def __init__(
+        self, max_bytes: int = 0, max_entries: int = 0, ttl_seconds: float = 0
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._lock = threading.RLock()
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    @abstractmethod
+    def get(self, namespace: str, key: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def set(self, namespace: str, key: str, value: str) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryResponseCache(ResponseCache):
+    """In-process LRU cache; entries are lost when the process exits."""
+
+    def __init__(
+        self, max_bytes: int = 0, max_entries: int = 0, ttl_seconds: float = 0
+    ) -> None:
+        super().__init__(max_bytes, max_entries, ttl_seconds)
+        self._entries: OrderedDict[tuple[str, str], tuple[str, float]] = OrderedDict()
+        self._total_bytes = 0
+
+    def get(self, namespace: str, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            value, created_at = entry
+            if self._expired(created_at, time.time()):
+                self._remove((namespace, key))
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end((namespace, key))
+            self.stats.hits += 1
+            self.stats.bytes_read += len(value.encode("utf-8"))
+            return value
+
+    def set(self, namespace: str, key: str, value: str) -> None:
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            if (namespace, key) in self._entries:
+                self._remove((namespace, key))
+            self._entries[(namespace, key)] = (value, time.time())
+            self._total_bytes += size
+            self.stats.bytes_written += size
+            while self._entries and (
+                (self.max_bytes and self._total_bytes > self.max_bytes)
+                or (self.max_entries and len(self._entries) > self.max_entries)
+            ):
+                self._remove(next(iter(self._entries)))
+                self.stats.evictions += 1
+
+    def _remove(self, entry_key: tuple[str, str]) -> None:
+        value, _ = self._entries.pop(entry_key)
+        self._total_bytes -= len(value.encode("utf-8"))
+
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    SQLite-backed cache that survives restarts. A single connection is shared by
+    all threads and serialized with a lock; WAL mode lets concurrent AutoRestTest
+    processes read while another writes.
+
+    The entry count and total size are tracked as entries are written and removed.
+    Every ``RECOUNT_EVERY`` writes they are recounted from the table, which picks up
+    entries written by other processes, and expired entries are swept.
+    """
+
+    RECOUNT_EVERY = 256
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = 0,
+        max_entries: int = 0,
+        ttl_seconds: float = 0,
+    ) -> None:
+        super().__init__(max_bytes, max_entries, ttl_seconds)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._connection = sqlite3.connect(
+            str(path), check_same_thread=False, timeout=30
+        )
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)"
+            )
+            self._entries, self._total_bytes = self._count()
+        self._writes = 0
+
+    def _count(self) -> tuple[int, int]:
+        return self._connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+
+    def get(self, namespace: str, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT value, size, created_at FROM responses WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            value, size, created_at = row
+            if self._expired(created_at, now):
+                self._connection.execute(
+                    "DELETE FROM responses WHERE namespace = ? AND key = ?",
+                    (namespace, key),
+                )
+                self._entries -= 1
+                self._total_bytes -= size
+                self.stats.misses += 1
+                return None
+            self._connection.execute(
+                "UPDATE responses SET last_access = ? WHERE namespace = ? AND key = ?",
+                (now, namespace, key),
+            )
+            self.stats.hits += 1
+            self.stats.bytes_read += size
+            return value
+
+    def set(self, namespace: str, key: str, value: str) -> None:
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        with self._lock, self._connection:
+            previous = self._connection.execute(
+                "SELECT size FROM responses WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(namespace, key, value, size, created_at, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+                (namespace, key, value, size, now, now),
+            )
+            if previous is None:
+                self._entries += 1
+            else:
+                self._total_bytes -= previous[0]
+            self._total_bytes += size
+            self.stats.bytes_written += size
+            self._writes += 1
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        if self._writes % self.RECOUNT_EVERY == 0:
+            # Reads already treat expired entries as misses, so sweeping them can wait.
+            if self.ttl_seconds > 0:
+                expired = self._connection.execute(
+                    "DELETE FROM responses WHERE created_at < ?",
+                    (now - self.ttl_seconds,),
+                ).rowcount
+                self.stats.evictions += max(expired, 0)
+            self._entries, self._total_bytes = self._count()
+        if not self.max_bytes and not self.max_entries:
+            return
+        excess_entries = self._entries - self.max_entries if self.max_entries else 0
+        excess_bytes = self._total_bytes - self.max_bytes if self.max_bytes else 0
+        if excess_entries <= 0 and excess_bytes <= 0:
+            return
+        # Walk the least recently used entries until both bounds hold again.
+        to_delete = []
+        for namespace, key, size in self._connection.execute(
+            "SELECT namespace, key, size FROM responses ORDER BY last_access ASC"
+        ):
+            if excess_entries <= 0 and excess_bytes <= 0:
+                break
+            to_delete.append((namespace, key))
+            excess_entries -= 1
+            excess_bytes -= size
+            self._total_bytes -= size
+        self._connection.executemany(
+            "DELETE FROM responses WHERE namespace = ? AND key = ?", to_delete
+        )
+        self._entries -= len(to_delete)
+        self.stats.evictions += len(to_delete)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+_response_cache: ResponseCache | None = None
+_response_cache_pid: int | None = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache configured under ``[llm.cache]``."""
+    global _response_cache, _response_cache_pid
+    with _response_cache_lock:
+        # SQLite connections must not be shared with forked worker processes.
+        if _response_cache is None or _response_cache_pid != os.getpid():
+            _response_cache_pid = os.getpid()
+            cache_config = CONFIG.llm.cache
+            if cache_config.backend == "sqlite":
+                _response_cache = SQLiteResponseCache(
+                    PROJECT_ROOT / cache_config.path,
+                    max_bytes=cache_config.max_bytes,
+                    max_entries=cache_config.max_entries,
+                    ttl_seconds=cache_config.ttl_seconds,
+                )
+            else:
+                _response_cache = MemoryResponseCache(
+                    max_bytes=cache_config.max_bytes,
+                    max_entries=cache_config.max_entries,
+                    ttl_seconds=cache_config.ttl_seconds,
+                )
+        return _response_cache
+
+
+__all__ = [
+    "CacheStats",
+    "ResponseCache",
+    "MemoryResponseCache",
+    "SQLiteResponseCache",
+    "get_response_cache",
+]
@@ -13,6 +13,8 @@ from autoresttest.utils import (
     encode_dictionary,
 )
 
+from .cache import CacheStats, get_response_cache
+
 CONFIG = get_config()
 
 load_dotenv()
@@ -30,10 +32,8 @@ class OpenAILanguageModel:
 
     input_tokens = 0
     output_tokens = 0
-    cache = {}
 
-    # Thread-safety locks for parallel value generation
-    _cache_lock = threading.RLock()
+    # Thread-safety lock for parallel value generation (the response cache locks itself)
     _token_lock = threading.RLock()
 
     @staticmethod
@@ -48,6 +48,10 @@ class OpenAILanguageModel:
             output_tokens=OpenAILanguageModel.output_tokens,
         )
 
+    @staticmethod
+    def get_cache_stats() -> CacheStats:
+        return get_response_cache().stats
+
     def __init__(
         self,
         engine=CONFIG.openai_llm_engine,
@@ -90,10 +94,10 @@ class OpenAILanguageModel:
     ) -> str:
         cache_key = self._generate_cache_key(user_message, system_message, json_mode)
 
-        # Thread-safe cache read
-        with OpenAILanguageModel._cache_lock:
-            if cache_key in OpenAILanguageModel.cache:
-                return OpenAILanguageModel.cache[cache_key]
+        response_cache = get_response_cache()
+        cached = response_cache.get(self.engine, cache_key)
+        if cached is not None:
+            return cached
 
         messages = [
             {"role": "system", "content": system_message},
@@ -158,8 +162,6 @@ class OpenAILanguageModel:
         content = response.choices[0].message.content
         result = content.strip() if content else ""
 
-        # Thread-safe cache write
-        with OpenAILanguageModel._cache_lock:
-            OpenAILanguageModel.cache[cache_key] = result
+        response_cache.set(self.engine, cache_key, result)
 
         return result
@@ -30,6 +30,7 @@ from autoresttest.prompts import (
     VALUE_AGENT_PARAMS_FEWSHOT_PROMPT,
     get_informed_agent_body_prompt,
     get_informed_agent_params_prompt,
+    get_upstream_responses_prompt,
     get_value_agent_body_prompt,
     get_value_agent_params_prompt,
     template_gen_prompt,
@@ -351,7 +352,10 @@ class SmartValueGenerator:
         return prompt
 
     def compose_informed_value_prompt(
-        self, prompt_data: PromptData, responses: List[RequestResponse]
+        self,
+        prompt_data: PromptData,
+        responses: List[RequestResponse],
+        upstream_responses: Optional[List[RequestResponse]] = None,
     ):
         GEN_PROMPT = prompt_data.GEN_PROMPT
         schema = prompt_data.schema
@@ -380,6 +384,14 @@ class SmartValueGenerator:
                     prompt += f"STATUS CODE: {request_response.response.status_code}\n"
                     prompt += f"RESPONSE: {request_response.response.text[:1000]}\n\n"
 
+        if upstream_responses:
+            prompt += get_upstream_responses_prompt(is_request_body) + "\n"
+            for request_response in upstream_responses:
+                operation_id = request_response.request.operation_properties.operation_id
+                prompt += f"OPERATION: {operation_id}\n"
+                prompt += f"STATUS CODE: {request_response.response.status_code}\n"
+                prompt += f"RESPONSE: {request_response.response_text[:1000]}\n\n"
+
         prompt += "Regardless of the past responses:"
         prompt += ENUM_EXAMPLE_CONSTRAINT_PROMPT + "\n"
 
@@ -735,7 +747,10 @@ class SmartValueGenerator:
         return request_body
 
     def generate_informed_value_agent_body(
-        self, num_values: int, responses: List[RequestResponse]
+        self,
+        num_values: int,
+        responses: List[RequestResponse],
+        upstream_responses: Optional[List[RequestResponse]] = None,
     ) -> dict[str, Any]:
         if self.request_body is None or len(self.request_body) == 0:
             return {}
@@ -750,7 +765,7 @@ class SmartValueGenerator:
                 is_request_body=True,
             )
             request_body_prompt = self.compose_informed_value_prompt(
-                prompt_data, responses
+                prompt_data, responses, upstream_responses
             )
             generated_request_body = self.language_model.query(
                 user_message=request_body_prompt,
@@ -769,7 +784,10 @@ class SmartValueGenerator:
         return request_body
 
     def generate_informed_value_agent_params(
-        self, num_values: int, responses: List[RequestResponse]
+        self,
+        num_values: int,
+        responses: List[RequestResponse],
+        upstream_responses: Optional[List[RequestResponse]] = None,
     ) -> Dict[ParameterKey, List[Any]]:
         if self.parameters is None or len(self.parameters) == 0:
             return {}
@@ -781,7 +799,9 @@ class SmartValueGenerator:
             select_params=self._isolate_nonreq_params(self.parameters),
             is_request_body=False,
         )
-        parameter_prompt = self.compose_informed_value_prompt(prompt_data, responses)
+        parameter_prompt = self.compose_informed_value_prompt(
+            prompt_data, responses, upstream_responses
+        )
         generated_parameters = self.language_model.query(
             user_message=parameter_prompt,
             system_message=PARAMETERS_GEN_SYSTEM_MESSAGE,
@@ -1,3 +1,4 @@
 from .marl import QLearning
+from .profiling import PhaseTimer, SamplingProfiler
 
-__all__ = ["QLearning"]
+__all__ = ["QLearning", "PhaseTimer", "SamplingProfiler"]
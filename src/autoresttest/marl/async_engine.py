@@ -0,0 +1,110 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from autoresttest.transport import get_rate_limiter
+
+if TYPE_CHECKING:
+    from .marl import OperationStep, QLearning
+
+
+class AsyncExecutionEngine:
+    """
+    Runs the Q-learning loop with up to ``concurrency`` requests in flight.
+
+    Action selection and learning happen on the event loop only, so the agents
+    are never touched concurrently; sends are offloaded to a thread pool that
+    shares the pooled HTTP session. Results are learned in completion order.
+    A step the rate limiter holds back waits on the event loop while responses
+    already in flight are learned, so sender threads never sleep. Steps answered
+    with 429 are not learned; they wait the same way and are sent again.
+    """
+
+    def __init__(self, q_learning: "QLearning", concurrency: int) -> None:
+        self.q_learning = q_learning
+        self.concurrency = max(1, concurrency)
+
+    def run(self) -> None:
+        asyncio.run(self._learn())
+
+    def _send(self, step: "OperationStep"):
+        return step, self.q_learning.send_step(step)
+
+    async def _learn(self) -> None:
+        q_learning = self.q_learning
+        loop = asyncio.get_running_loop()
+
+        start_time = time.time()
+        complete_body_mappings = q_learning.determine_complete_body_mappings()
+        epsilon_decay_rate = q_learning._epsilon_decay_rate()
+
+        in_flight: set[asyncio.Future] = set()
+        # A prepared step the rate limiter has not let through yet.
+        pending: "OperationStep | None" = None
+        # Steps answered with 429, resent once the rate limiter allows them.
+        deferred: list["OperationStep"] = []
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="autoresttest-send"
+        ) as executor:
+            while True:
+                waits = []
+                still_deferred = []
+                for step in deferred:
+                    if (
+                        len(in_flight) >= self.concurrency
+                        or time.time() - start_time >= q_learning.time_duration
+                    ):
+                        still_deferred.append(step)
+                        continue
+                    step_wait = q_learning.reserve_send(step)
+                    if step_wait > 0:
+                        waits.append(step_wait)
+                        still_deferred.append(step)
+                    else:
+                        in_flight.add(loop.run_in_executor(executor, self._send, step))
+                deferred = still_deferred
+
+                while (
+                    len(in_flight) < self.concurrency
+                    and time.time() - start_time < q_learning.time_duration
+                ):
+                    if pending is None:
+                        q_learning.epsilon_decay(epsilon_decay_rate)
+                        pending = q_learning.prepare_step(
+                            complete_body_mappings, start_time
+                        )
+                    step_wait = q_learning.reserve_send(pending)
+                    if step_wait > 0:
+                        waits.append(step_wait)
+                        break
+                    in_flight.add(loop.run_in_executor(executor, self._send, pending))
+                    pending = None
+
+                wait = min(waits, default=0.0)
+                remaining = q_learning.time_duration - (time.time() - start_time)
+                if not in_flight:
+                    if wait <= 0 or remaining <= 0:
+                        break
+                    # Nothing to learn from meanwhile: wait here, not in a sender thread.
+                    wait = min(wait, remaining)
+                    await asyncio.sleep(wait)
+                    get_rate_limiter().record_wait(wait)
+                    continue
+
+                done, in_flight = await asyncio.wait(
+                    in_flight,
+                    timeout=min(wait, remaining) if wait > 0 else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for future in done:
+                    step, response = future.result()
+                    if q_learning.defer_rate_limited(step, response):
+                        if step.rate_limited <= q_learning.RATE_LIMIT_RESENDS:
+                            deferred.append(step)
+                        continue
+                    q_learning.learn_step(step, response)
+                    for hook in q_learning.step_hooks:
+                        hook()
+
+        q_learning.elapsed_time = time.time() - start_time
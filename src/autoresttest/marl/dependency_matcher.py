@@ -0,0 +1,94 @@
+import os
+import queue
+import threading
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from autoresttest.agents import DependencyAgent
+    from autoresttest.agents.parameter_index import ParameterEntry
+
+# (operation_id, response property, matching Q-table parameters)
+MatchResult = tuple[str, str, list["ParameterEntry"]]
+
+
+class UndocumentedResponseMatcher:
+    """
+    Matches response properties missing from the specification against the
+    dependency Q-table's parameters. With ``background``, the embedding work runs on
+    a daemon thread and the learning loop applies finished matches through
+    ``completed``, so a response never waits for it. The Q-table and its embedding
+    index are only built and changed on the learning thread; the daemon thread
+    matches against the index snapshot taken when the property was submitted. An
+    error raised while matching is raised again by ``completed`` or ``flush``.
+    """
+
+    def __init__(
+        self, dependency_agent: "DependencyAgent", background: bool = True
+    ) -> None:
+        self.dependency_agent = dependency_agent
+        self.background = background
+        self.submitted = 0
+        self._pending: queue.Queue = queue.Queue()
+        self._done: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._pid = os.getpid()
+
+    def submit(self, operation_id: str, new_property: str) -> None:
+        self.submitted += 1
+        # Built or rebuilt here, on the learning thread, never on the matcher thread.
+        index = self.dependency_agent.parameter_index().snapshot()
+        if not self.background:
+            matches = self.dependency_agent.match_undocumented_response(
+                new_property, index
+            )
+            self._done.put((operation_id, new_property, matches))
+            return
+        self._ensure_thread()
+        self._pending.put((operation_id, new_property, index))
+
+    def completed(self) -> list[MatchResult]:
+        """Matches finished since the last call, without waiting."""
+        results = []
+        while True:
+            try:
+                result = self._done.get_nowait()
+            except queue.Empty:
+                return results
+            if isinstance(result, BaseException):
+                raise result
+            results.append(result)
+
+    def flush(self) -> list[MatchResult]:
+        """Waits for every submitted property, then returns the unclaimed matches."""
+        if self._thread is not None and self._pid == os.getpid():
+            self._pending.join()
+        return self.completed()
+
+    def _ensure_thread(self) -> None:
+        # Forked shard workers inherit the queues but not the thread.
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._pending = queue.Queue()
+        self._done = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run, name="autoresttest-matcher", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            operation_id, new_property, index = self._pending.get()
+            try:
+                matches = self.dependency_agent.match_undocumented_response(
+                    new_property, index
+                )
+                self._done.put((operation_id, new_property, matches))
+            except Exception as e:
+                # Handed to the learning thread, which raises it from completed().
+                self._done.put(e)
+            finally:
+                self._pending.task_done()
+
+
+__all__ = ["MatchResult", "UndocumentedResponseMatcher"]
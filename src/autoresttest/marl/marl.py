@@ -1,21 +1,23 @@
-import copy
 import json
 import os
 import random
+import re
 import time
 from collections import defaultdict
-from dataclasses import asdict
-from typing import Any, Dict, List
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable
 
 import numpy as np
 import requests
 import shelve
 
-from autoresttest.config import get_config
+from autoresttest.config import PROJECT_ROOT, get_config
 from autoresttest.graph import OperationGraph, OperationProperties
+from autoresttest.agents.action_table import action_table_stats
 from autoresttest.agents import (
     OperationAgent,
     HeaderAgent,
+    ParameterAction,
     ParameterAgent,
     ValueAgent,
     ValueAction,
@@ -30,11 +32,14 @@ from autoresttest.utils import (
     get_response_params,
     get_response_param_mappings,
     make_param_key,
+    param_key_to_label,
     remove_nulls,
     encode_dictionary,
-    split_parameter_values,
     dispatch_request,
-    get_accept_header,
+    OperationDispatchPlan,
+    ValueBucket,
+    store_stats,
+    classify_error,
 )
 from autoresttest.llm import (
     identify_generator,
@@ -43,11 +48,49 @@ from autoresttest.llm import (
     randomize_object,
 )
 from autoresttest.models import ParameterKey
+from autoresttest.transport import get_http_method, get_rate_limiter
+
+from .async_engine import AsyncExecutionEngine
+from .dependency_matcher import UndocumentedResponseMatcher
+from .response_harvester import ResponseHarvester
+from .sampling_pool import SuccessfulValuePool
+from .run_statistics import Dashboard, RunStatistics
+from .profiling import PhaseTimer, serve_metrics
+from .sharding import ShardCoordinator
 
 CONFIG = get_config()
 
 
+@dataclass
+class OperationStep:
+    """Actions selected for one request, carried from selection to learning."""
+
+    operation_id: str
+    operation_props: OperationProperties
+    select_params: ParameterAction
+    select_header: str | None
+    data_source: str
+    select_values: ValueAction | None
+    dependency_type: str | None
+    parameter_dependencies: dict[Any, Any] | None
+    request_body_dependencies: dict[str, Any] | None
+    unconstructed_body: dict[str, Any] = field(default_factory=dict)
+    select_body_properties: dict[str, Any] = field(default_factory=dict)
+    parameters: dict[ParameterKey, Any] | None = None
+    body: dict[str, Any] | None = None
+    header: dict[str, str] | None = None
+    specific_method: str | None = None
+    mutate_operation: bool = False
+    mutated_parameter_names: bool = False
+    latency: float = 0.0
+    # Times the SUT answered this step with 429 and it was sent again.
+    rate_limited: int = 0
+
+
 class QLearning:
+    # Resends of a step answered with 429, as dispatch_request retried before.
+    RATE_LIMIT_RESENDS = 3
+
     def __init__(
         self,
         operation_graph: OperationGraph,
@@ -74,15 +117,33 @@ class QLearning:
         self.body_object_agent = BodyObjAgent(operation_graph, alpha, gamma, epsilon)
         self.data_source_agent = DataSourceAgent(operation_graph, alpha, gamma, 0.7)
         self.dependency_agent = DependencyAgent(operation_graph, alpha, gamma, epsilon)
+        self.response_harvester = ResponseHarvester(
+            self.dependency_agent, CONFIG.response_harvest
+        )
+        self.undocumented_matcher = UndocumentedResponseMatcher(
+            self.dependency_agent, CONFIG.response_harvest.background_matching
+        )
         self.time_duration = time_duration
+        self.elapsed_time: float = 0.0
+        self.show_progress = not CONFIG.dashboard.quiet
+        self.run_stats = RunStatistics(len(operation_graph.operation_nodes), time_duration)
+        self.phase_timer = PhaseTimer(CONFIG.profiling.phase_timings)
+        # Called after every learned step (used by sharded workers to merge state).
+        self.step_hooks: list[Callable[[], None]] = []
+        self._dispatch_plans: dict[str, OperationDispatchPlan] = {}
         self.responses: dict[int, int] = defaultdict(int)
 
         self.errors: dict[str, int] = {}
-        self.unique_errors: dict[str, list[dict[str, Any]]] = {}
-        self.successful_parameters: dict[str, dict[ParameterKey, list[Any]]] = {}
-        self.successful_bodies: dict[str, dict[str, list[Any]]] = {}
-        self.successful_responses: dict[str, dict[str, list[Any]]] = {}
-        self.successful_primitives: dict[str, list[Any]] = {}
+        self.unique_errors: dict[str, ValueBucket] = {}
+        # Failure classes by fingerprint, with a count and the first request seen for each.
+        self.error_classes: dict[str, dict[str, Any]] = {}
+        self.error_class_counts: dict[str, int] = {}
+        self.successful_parameters: dict[str, dict[ParameterKey, ValueBucket]] = {}
+        self.successful_bodies: dict[str, dict[str, ValueBucket]] = {}
+        self.successful_responses: dict[str, dict[str, ValueBucket]] = {}
+        self.successful_primitives: dict[str, ValueBucket] = {}
+        # Index over the successful parameter, body, and response values, for random draws.
+        self.successful_pool = SuccessfulValuePool()
         self.operation_response_counter: dict[str, dict[int, int]] = {}
         self._init_parameter_tracking()
         self._init_body_tracking()
@@ -129,7 +190,7 @@ class QLearning:
         operation_id: str,
     ) -> tuple[dict[ParameterKey, Any] | None, dict[str, Any] | None]:
         possible_options = [
-            val
+            list(val)
             for key, val in self.successful_primitives.items()
             if key != operation_id
         ]
@@ -167,43 +228,16 @@ class QLearning:
 
         # DEPRECATED
 
-        possible_options = []
-
-        # Add all parameters with name: value
-        for operation_idx, operation_parameters in self.successful_parameters.items():
-            if operation_idx == operation_id:
-                continue
-            for parameter_name, parameter_values in operation_parameters.items():
-                for parameter_value in parameter_values:
-                    possible_options.append(
-                        {"name": parameter_name, "value": parameter_value}
-                    )
-
-        for operation_idx, operation_body_parms in self.successful_bodies.items():
-            if operation_idx == operation_id:
-                continue
-            for body_name, body_values in operation_body_parms.items():
-                for body_value in body_values:
-                    possible_options.append({"name": body_name, "value": body_value})
-
-        for operation_idx, operation_responses in self.successful_responses.items():
-            if operation_idx == operation_id:
-                continue
-            for response_name, response_values in operation_responses.items():
-                for response_value in response_values:
-                    possible_options.append(
-                        {"name": response_name, "value": response_value}
-                    )
+        def random_option():
+            _, _, name, value = self.successful_pool.sample(exclude=operation_id)
+            return {"name": name, "value": value}
 
-        for operation_idx, operation_primitives in self.successful_primitives.items():
-            if operation_idx == operation_id:
-                continue
-            # .extend(operation_primitives)
+        has_options = self.successful_pool.size(exclude=operation_id) > 0
 
         if parameters:
             for parameter in parameters:
-                if random.random() < 0.7 and possible_options:
-                    parameters[parameter] = random.choice(possible_options)
+                if random.random() < 0.7 and has_options:
+                    parameters[parameter] = random_option()
 
         if body:
             for mime, body_properties in body.items():
@@ -214,8 +248,8 @@ class QLearning:
                     if body_mappings:
                         new_obj = {}
                         for prop in body_mappings:
-                            if random.random() < 0.5 and possible_options:
-                                new_obj[prop] = random.choice(possible_options)
+                            if random.random() < 0.5 and has_options:
+                                new_obj[prop] = random_option()
                             else:
                                 new_obj[prop] = body_mappings[prop]
                         body[mime] = self._construct_body(new_obj, operation_id, mime)
@@ -471,34 +505,21 @@ class QLearning:
         header,
         specific_method=None,
     ):
-        endpoint_path = operation_properties.endpoint_path
-        http_method = (
-            specific_method
-            if specific_method
-            else operation_properties.http_method.lower()
+        plan = self._dispatch_plans.get(operation_properties.operation_id)
+        if plan is None:
+            plan = OperationDispatchPlan(operation_properties)
+            self._dispatch_plans[operation_properties.operation_id] = plan
+        http_method = specific_method if specific_method else plan.http_method
+
+        endpoint_path, query_params, merged_headers, cookie_params = plan.bind(
+            parameters, header
         )
-        processed_parameters = copy.deepcopy(parameters) or {}
-
-        path_params, query_params, header_params, cookie_params = (
-            split_parameter_values(
-                operation_properties.parameters, processed_parameters
-            )
-        )
-
-        for name, value in path_params.items():
-            endpoint_path = endpoint_path.replace("{" + name + "}", str(value))
-
-        merged_headers = header_params.copy()
-        merged_headers.update(CONFIG.static_headers)  # Add custom headers from config
-        if header:
-            merged_headers.update(header)
 
         # self._test_send_operation(operation_properties, parameters, body, header, specific_method)
 
         try:
-            select_method = getattr(requests, http_method)
+            select_method = get_http_method(self.api_url, http_method)
             full_url = self.api_url + endpoint_path
-            accept_header = get_accept_header(operation_properties.responses)
             response = dispatch_request(
                 select_method=select_method,
                 full_url=full_url,
@@ -506,7 +527,12 @@ class QLearning:
                 body=body,
                 header=merged_headers,
                 cookies=cookie_params,
-                accept=accept_header,
+                accept=plan.accept,
+                # The scheduling loops take the rate limiter's token (reserve_send)
+                # and resend 429 responses themselves (defer_rate_limited).
+                max_retries=0,
+                operation_id=operation_properties.operation_id,
+                paced=False,
             )
             return response
         except requests.exceptions.RequestException as err:
@@ -516,7 +542,7 @@ class QLearning:
             print(
                 f"Unexpected error with operation {operation_properties.operation_id}: {err}"
             )
-            print("Parameters: ", processed_parameters)
+            print("Parameters: ", parameters)
             print("Body: ", body)
             return None
 
@@ -608,6 +634,92 @@ class QLearning:
         else:
             return -5
 
+    def _value_bucket(
+        self, operation_id: str, label: str, values=(), errors: bool = False
+    ) -> ValueBucket:
+        """Deduplicated store for one parameter, property, or error list, capped per [value_store]."""
+        settings = CONFIG.value_store
+        spill_path = None
+        if settings.spill_dir:
+            file_name = re.sub(r"[^\w.-]", "_", operation_id) + ".jsonl"
+            spill_path = PROJECT_ROOT / settings.spill_dir / file_name
+        return ValueBucket(
+            values,
+            capacity=settings.max_errors if errors else settings.max_values,
+            eviction=settings.eviction,
+            spill_path=spill_path,
+            label=label,
+        )
+
+    def apply_undocumented_matches(self, results) -> None:
+        """Add the response dependencies found for undocumented response properties."""
+        updated_tables = False
+        for operation_id, response_prop, matches in results:
+            if self.dependency_agent.add_undocumented_responses(
+                operation_id, response_prop, matches
+            ):
+                updated_tables = True
+        if updated_tables:
+            self.response_harvester.invalidate()
+            if "DEPENDENCY" not in self.data_source_agent.available_data_sources:
+                self.data_source_agent.initialize_dependency_source()
+
+    def _keep_successful(
+        self, location: str, operation_id: str, key, values
+    ) -> None:
+        """Store successful values, keeping the sampling pool and dependency sources current."""
+        stores = {
+            "params": self.successful_parameters,
+            "body": self.successful_bodies,
+            "response": self.successful_responses,
+        }
+        bucket = stores[location][operation_id][key]
+        size = len(bucket)
+        bucket.extend(values)
+        if len(bucket) != size:
+            self.successful_pool.update(location, operation_id, key, bucket)
+            if not size:
+                self.dependency_agent.mark_available(location, operation_id, key)
+
+    def value_store_stats(self) -> dict[str, dict[str, int]]:
+        return {
+            "values": store_stats(
+                self.successful_parameters,
+                self.successful_bodies,
+                self.successful_responses,
+                self.successful_primitives,
+            ),
+            "errors": store_stats(self.unique_errors),
+        }
+
+    def action_space_stats(self) -> dict[str, Any]:
+        """Initialization time and size of the combination Q-tables, per agent."""
+        stats: dict[str, Any] = {"Backend": CONFIG.agent.q_table_backend}
+        for name, agent, tables in (
+            (
+                "Parameter Agent",
+                self.parameter_agent,
+                [tables["params"] for tables in self.parameter_agent.q_table.values()],
+            ),
+            (
+                "Body Object Agent",
+                self.body_object_agent,
+                [
+                    table
+                    for tables in self.body_object_agent.q_table.values()
+                    for table in tables.values()
+                ],
+            ),
+        ):
+            table_stats = action_table_stats(tables)
+            stats[name] = {
+                "Init Seconds": round(agent.init_seconds, 4),
+                "Combinations": table_stats["actions"],
+                "Allocated Q-Values": table_stats["allocated"],
+                "Approximate Bytes": table_stats["bytes"],
+            }
+        return stats
+
     def _init_parameter_tracking(self):
         for (
             operation_id,
@@ -619,7 +731,11 @@ class QLearning:
                 for (
                     parameter_key
                 ) in operation_node.operation_properties.parameters.keys():
-                    self.successful_parameters[operation_id][parameter_key] = []
+                    self.successful_parameters[operation_id][parameter_key] = (
+                        self._value_bucket(
+                            operation_id, param_key_to_label(parameter_key)
+                        )
+                    )
 
     def _init_body_tracking(self):
         for (
@@ -635,7 +751,10 @@ class QLearning:
                 ) in operation_node.operation_properties.request_body.items():
                     body_params = get_body_params(body_properties)
                     self.successful_bodies[operation_id].update(
-                        {param: [] for param in body_params}
+                        {
+                            param: self._value_bucket(operation_id, f"body.{param}")
+                            for param in body_params
+                        }
                     )
 
     def _init_response_tracking(self):
@@ -658,7 +777,12 @@ class QLearning:
                             response_params = []
                             get_response_params(response_details, response_params)
                             self.successful_responses[operation_id].update(
-                                {param: [] for param in response_params}
+                                {
+                                    param: self._value_bucket(
+                                        operation_id, f"response.{param}"
+                                    )
+                                    for param in response_params
+                                }
                             )
 
     def _construct_body_property(self, body_property, unconstructed_body):
@@ -704,20 +828,6 @@ class QLearning:
         else:
             return None
 
-    def _deconstruct_response(self, response, response_mappings: Dict[str, List]):
-        if response is None:
-            return
-        if type(response) == dict:
-            for prop, val in response.items():
-                if prop not in response_mappings:
-                    response_mappings[prop] = []
-                if val not in response_mappings[prop]:
-                    response_mappings[prop].append(val)
-                self._deconstruct_response(val, response_mappings)
-        elif type(response) == list:
-            for item in response:
-                self._deconstruct_response(item, response_mappings)
-
     def generate_default_values(self, operation_id):
         default_assignments = {
             "integer": 1,
@@ -903,108 +1013,248 @@ class QLearning:
             0.1, self.header_agent.epsilon - epsilon_decay_rate
         )
 
-    def execute_operations(self):
-
-        start_time = time.time()
-
-        complete_body_mappings = self.determine_complete_body_mappings()
-
+    def _epsilon_decay_rate(self) -> float:
         # Goal: Decay epsilon to 0.1 at 70% of the time duration
         target_epsilon = 0.1
-        epsilon_decay_rate = (
+        return (
             (self.epsilon - target_epsilon) / (self.time_duration * 0.7)
             if target_epsilon < self.epsilon
             else 0
         )
 
-        while time.time() - start_time < self.time_duration:
-            self.epsilon_decay(epsilon_decay_rate)
-
-            operation_id = self.operation_agent.get_action()
-
-            self.tui_output(start_time, operation_id)
-
-            select_params = self.parameter_agent.get_action(operation_id)
-
-            # Determine header
-            if CONFIG.enable_header_agent:
-                select_header = self.header_agent.get_action(operation_id)
-            else:
-                select_header = None
+    def _avoid_throttled(self, operation_id: str) -> str:
+        """
+        Swap a rate-limited operation for one that can be sent right away, chosen by
+        the operation agent's usual epsilon-greedy selection over those operations.
+        When every operation is throttled, pick the one that frees up first. A paused
+        host delays every operation alike, so only operation-level throttles count.
+        """
+        delays = get_rate_limiter().throttled_operations()
+        if operation_id not in delays:
+            return operation_id
+        available = [
+            candidate
+            for candidate in self.operation_agent.q_table
+            if candidate not in delays
+        ]
+        if available:
+            return self.operation_agent.get_action(available)
+        return min(delays, key=lambda candidate: delays[candidate])
 
-            data_source = self.data_source_agent.get_action(operation_id)
+    def reserve_send(self, step: OperationStep) -> float:
+        """
+        Take the rate limiter's token for ``step`` and return ``0``, or return the
+        seconds until it may be sent. The scheduling loops wait on this, so no time
+        is spent sleeping in the send path.
+        """
+        return get_rate_limiter().acquire(self.api_url, step.operation_id)
 
-            # Determine value assignments
-            (
-                parameter_dependencies,
-                request_body_dependencies,
-                unconstructed_body,
-                select_values,
-                dependency_type,
-            ) = (None, None, {}, None, None)
-            # Declare parameters and body with union types to handle all branches
-            parameters: dict[ParameterKey, Any] | None = None
-            body: dict[str, Any] | None = None
-            if data_source == "LLM":
-                select_values = self.value_agent.get_action(operation_id)
-                parameters = (
-                    self.get_mapping(
-                        select_params.req_params, select_values.param_mappings
-                    )
-                    if select_params.req_params
-                    else None
-                )
-                body = (
-                    self.get_body_mapping(
-                        [select_params.mime_type], select_values.body_mappings
-                    )
-                    if select_params.mime_type
-                    else None
-                )
-            elif data_source == "DEFAULT":
-                param_mappings, body_mappings = self.generate_default_values(
-                    operation_id
-                )
-                parameters = (
-                    self.get_mapping(select_params.req_params, param_mappings)
-                    if select_params.req_params
-                    else None
+    def defer_rate_limited(self, step: OperationStep, response) -> bool:
+        """
+        Whether ``step`` was answered with 429 and should be sent again instead of
+        learned from. A 429 reflects the SUT's rate limit, not the request, so the
+        agents never see it: the limiter has already blocked the operation, and the
+        scheduling loops resend the step once ``reserve_send`` lets it through. After
+        ``RATE_LIMIT_RESENDS`` attempts the step is dropped without learning.
+        """
+        if response is None or response.status_code != 429:
+            return False
+        step.rate_limited += 1
+        return True
+
+    def _wait_to_send(self, step: OperationStep, start_time: float) -> bool:
+        """Wait until ``step`` may be sent; ``False`` if the time budget runs out first."""
+        rate_limiter = get_rate_limiter()
+        while True:
+            wait = self.reserve_send(step)
+            if wait <= 0:
+                return True
+            remaining = self.time_duration - (time.time() - start_time)
+            if remaining <= 0:
+                return False
+            wait = min(wait, remaining)
+            time.sleep(wait)
+            rate_limiter.record_wait(wait)
+
+    def prepare_step(self, complete_body_mappings, start_time) -> OperationStep:
+        """Select every agent's action for one request without sending it."""
+        lap = self.phase_timer.laps()
+
+        operation_id = self._avoid_throttled(self.operation_agent.get_action())
+        lap("operation_agent")
+
+        self.run_stats.current_operation = operation_id
+
+        select_params = self.parameter_agent.get_action(operation_id)
+        lap("parameter_agent")
+
+        # Determine header
+        if CONFIG.enable_header_agent:
+            select_header = self.header_agent.get_action(operation_id)
+        else:
+            select_header = None
+        lap("header_agent")
+
+        data_source = self.data_source_agent.get_action(operation_id)
+        lap("data_source_agent")
+
+        # Determine value assignments
+        (
+            parameter_dependencies,
+            request_body_dependencies,
+            unconstructed_body,
+            select_values,
+            dependency_type,
+        ) = (None, None, {}, None, None)
+        # Declare parameters and body with union types to handle all branches
+        parameters: dict[ParameterKey, Any] | None = None
+        body: dict[str, Any] | None = None
+        if data_source == "LLM":
+            select_values = self.value_agent.get_action(operation_id)
+            parameters = (
+                self.get_mapping(
+                    select_params.req_params, select_values.param_mappings
                 )
-                body = (
-                    self.get_body_mapping([select_params.mime_type], body_mappings)
-                    if select_params.mime_type
-                    else None
+                if select_params.req_params
+                else None
+            )
+            body = (
+                self.get_body_mapping(
+                    [select_params.mime_type], select_values.body_mappings
                 )
-            elif data_source == "DEPENDENCY":
-                dependency_type, parameter_dependencies, request_body_dependencies = (
-                    self.dependency_agent.get_action(operation_id, self)
+                if select_params.mime_type
+                else None
+            )
+        elif data_source == "DEFAULT":
+            param_mappings, body_mappings = self.generate_default_values(
+                operation_id
+            )
+            parameters = (
+                self.get_mapping(select_params.req_params, param_mappings)
+                if select_params.req_params
+                else None
+            )
+            body = (
+                self.get_body_mapping([select_params.mime_type], body_mappings)
+                if select_params.mime_type
+                else None
+            )
+        elif data_source == "DEPENDENCY":
+            dependency_type, parameter_dependencies, request_body_dependencies = (
+                self.dependency_agent.get_action(
+                    operation_id,
+                    self,
+                    has_success=bool(self.run_stats.successful_operations),
                 )
+            )
 
-                supplement_select_values = self.value_agent.get_best_action(
-                    operation_id
-                )
+            supplement_select_values = self.value_agent.get_best_action(
+                operation_id
+            )
 
-                supplement_parameters = (
-                    self.get_mapping(
-                        select_params.req_params,
-                        supplement_select_values.param_mappings,
-                    )
-                    if select_params.req_params
-                    else None
+            supplement_parameters = (
+                self.get_mapping(
+                    select_params.req_params,
+                    supplement_select_values.param_mappings,
                 )
-                supplement_body = (
-                    self.get_body_mapping(
-                        [select_params.mime_type],
-                        supplement_select_values.body_mappings,
-                    )
-                    if select_params.mime_type
-                    else None
+                if select_params.req_params
+                else None
+            )
+            supplement_body = (
+                self.get_body_mapping(
+                    [select_params.mime_type],
+                    supplement_select_values.body_mappings,
                 )
+                if select_params.mime_type
+                else None
+            )
 
-                parameters = {}
-                if select_params.req_params and parameter_dependencies:
-                    for parameter, dependency in parameter_dependencies.items():
-                        if parameter in select_params.req_params:
+            parameters = {}
+            if select_params.req_params and parameter_dependencies:
+                for parameter, dependency in parameter_dependencies.items():
+                    if parameter in select_params.req_params:
+                        if (
+                            dependency["in_value"] == "params"
+                            and dependency["dependent_operation"]
+                            in self.successful_parameters
+                            and dependency["dependent_val"]
+                            in self.successful_parameters[
+                                dependency["dependent_operation"]
+                            ]
+                        ):
+                            if self.successful_parameters[
+                                dependency["dependent_operation"]
+                            ][dependency["dependent_val"]]:
+                                parameters[parameter] = random.choice(
+                                    self.successful_parameters[
+                                        dependency["dependent_operation"]
+                                    ][dependency["dependent_val"]]
+                                )
+
+                        elif (
+                            dependency["in_value"] == "body"
+                            and dependency["dependent_operation"]
+                            in self.successful_bodies
+                            and dependency["dependent_val"]
+                            in self.successful_bodies[
+                                dependency["dependent_operation"]
+                            ]
+                        ):
+                            if self.successful_bodies[
+                                dependency["dependent_operation"]
+                            ][dependency["dependent_val"]]:
+                                parameters[parameter] = random.choice(
+                                    self.successful_bodies[
+                                        dependency["dependent_operation"]
+                                    ][dependency["dependent_val"]]
+                                )
+
+                        elif (
+                            dependency["in_value"] == "response"
+                            and dependency["dependent_operation"]
+                            in self.successful_responses
+                            and dependency["dependent_val"]
+                            in self.successful_responses[
+                                dependency["dependent_operation"]
+                            ]
+                        ):
+                            if self.successful_responses[
+                                dependency["dependent_operation"]
+                            ][dependency["dependent_val"]]:
+                                parameters[parameter] = random.choice(
+                                    self.successful_responses[
+                                        dependency["dependent_operation"]
+                                    ][dependency["dependent_val"]]
+                                )
+                if select_params.req_params:
+                    for param in select_params.req_params:
+                        if param not in parameters or not parameters[param]:
+                            parameters[param] = (
+                                supplement_parameters[param]
+                                if supplement_parameters
+                                and param in supplement_parameters
+                                else random_generator()()
+                            )
+
+            body = {}
+            dep_request_body = self.operation_graph.operation_nodes[
+                operation_id
+            ].operation_properties.request_body
+            if (
+                select_params.mime_type
+                and dep_request_body
+                and select_params.mime_type in dep_request_body
+            ):
+                unconstructed_body = {}
+                possible_body_properties = get_body_params(
+                    dep_request_body[select_params.mime_type]
+                )
+                if request_body_dependencies:
+                    for (
+                        body_property,
+                        dependency,
+                    ) in request_body_dependencies.items():
+                        if body_property in possible_body_properties:
                             if (
                                 dependency["in_value"] == "params"
                                 and dependency["dependent_operation"]
@@ -1017,10 +1267,12 @@ class QLearning:
                                 if self.successful_parameters[
                                     dependency["dependent_operation"]
                                 ][dependency["dependent_val"]]:
-                                    parameters[parameter] = random.choice(
-                                        self.successful_parameters[
-                                            dependency["dependent_operation"]
-                                        ][dependency["dependent_val"]]
+                                    unconstructed_body[body_property] = (
+                                        random.choice(
+                                            self.successful_parameters[
+                                                dependency["dependent_operation"]
+                                            ][dependency["dependent_val"]]
+                                        )
                                     )
 
                             elif (
@@ -1035,10 +1287,12 @@ class QLearning:
                                 if self.successful_bodies[
                                     dependency["dependent_operation"]
                                 ][dependency["dependent_val"]]:
-                                    parameters[parameter] = random.choice(
-                                        self.successful_bodies[
-                                            dependency["dependent_operation"]
-                                        ][dependency["dependent_val"]]
+                                    unconstructed_body[body_property] = (
+                                        random.choice(
+                                            self.successful_bodies[
+                                                dependency["dependent_operation"]
+                                            ][dependency["dependent_val"]]
+                                        )
                                     )
 
                             elif (
@@ -1053,323 +1307,288 @@ class QLearning:
                                 if self.successful_responses[
                                     dependency["dependent_operation"]
                                 ][dependency["dependent_val"]]:
-                                    parameters[parameter] = random.choice(
-                                        self.successful_responses[
-                                            dependency["dependent_operation"]
-                                        ][dependency["dependent_val"]]
+                                    unconstructed_body[body_property] = (
+                                        random.choice(
+                                            self.successful_responses[
+                                                dependency["dependent_operation"]
+                                            ][dependency["dependent_val"]]
+                                        )
                                     )
-                    if select_params.req_params:
-                        for param in select_params.req_params:
-                            if param not in parameters or not parameters[param]:
-                                parameters[param] = (
-                                    supplement_parameters[param]
-                                    if supplement_parameters
-                                    and param in supplement_parameters
-                                    else random_generator()()
-                                )
 
-                body = {}
-                dep_request_body = self.operation_graph.operation_nodes[
-                    operation_id
-                ].operation_properties.request_body
-                if (
-                    select_params.mime_type
-                    and dep_request_body
-                    and select_params.mime_type in dep_request_body
-                ):
-                    unconstructed_body = {}
-                    possible_body_properties = get_body_params(
-                        dep_request_body[select_params.mime_type]
+                deconstructed_supplement_body = (
+                    self._deconstruct_body(supplement_body[select_params.mime_type])
+                    if supplement_body
+                    and select_params.mime_type in supplement_body
+                    else None
+                )
+                if deconstructed_supplement_body:
+                    for prop in possible_body_properties:
+                        if prop not in unconstructed_body:
+                            unconstructed_body[prop] = (
+                                deconstructed_supplement_body[prop]
+                                if prop in deconstructed_supplement_body
+                                else random_generator()()
+                            )
+                body = {
+                    select_params.mime_type: self._construct_body(
+                        unconstructed_body, operation_id, select_params.mime_type
                     )
-                    if request_body_dependencies:
-                        for (
-                            body_property,
-                            dependency,
-                        ) in request_body_dependencies.items():
-                            if body_property in possible_body_properties:
-                                if (
-                                    dependency["in_value"] == "params"
-                                    and dependency["dependent_operation"]
-                                    in self.successful_parameters
-                                    and dependency["dependent_val"]
-                                    in self.successful_parameters[
-                                        dependency["dependent_operation"]
-                                    ]
-                                ):
-                                    if self.successful_parameters[
-                                        dependency["dependent_operation"]
-                                    ][dependency["dependent_val"]]:
-                                        unconstructed_body[body_property] = (
-                                            random.choice(
-                                                self.successful_parameters[
-                                                    dependency["dependent_operation"]
-                                                ][dependency["dependent_val"]]
-                                            )
-                                        )
+                }
+        else:
+            parameters = None
+            body = None
+        lap(f"values_{data_source.lower()}")
 
-                                elif (
-                                    dependency["in_value"] == "body"
-                                    and dependency["dependent_operation"]
-                                    in self.successful_bodies
-                                    and dependency["dependent_val"]
-                                    in self.successful_bodies[
-                                        dependency["dependent_operation"]
-                                    ]
-                                ):
-                                    if self.successful_bodies[
-                                        dependency["dependent_operation"]
-                                    ][dependency["dependent_val"]]:
-                                        unconstructed_body[body_property] = (
-                                            random.choice(
-                                                self.successful_bodies[
-                                                    dependency["dependent_operation"]
-                                                ][dependency["dependent_val"]]
-                                            )
-                                        )
+        # Assign header token if header agent is enabled and header is assigned
+        header = {"Authorization": select_header} if select_header else None
 
-                                elif (
-                                    dependency["in_value"] == "response"
-                                    and dependency["dependent_operation"]
-                                    in self.successful_responses
-                                    and dependency["dependent_val"]
-                                    in self.successful_responses[
-                                        dependency["dependent_operation"]
-                                    ]
-                                ):
-                                    if self.successful_responses[
-                                        dependency["dependent_operation"]
-                                    ][dependency["dependent_val"]]:
-                                        unconstructed_body[body_property] = (
-                                            random.choice(
-                                                self.successful_responses[
-                                                    dependency["dependent_operation"]
-                                                ][dependency["dependent_val"]]
-                                            )
-                                        )
-
-                    deconstructed_supplement_body = (
-                        self._deconstruct_body(supplement_body[select_params.mime_type])
-                        if supplement_body
-                        and select_params.mime_type in supplement_body
-                        else None
-                    )
-                    if deconstructed_supplement_body:
-                        for prop in possible_body_properties:
-                            if prop not in unconstructed_body:
-                                unconstructed_body[prop] = (
-                                    deconstructed_supplement_body[prop]
-                                    if prop in deconstructed_supplement_body
-                                    else random_generator()()
-                                )
-                    body = {
-                        select_params.mime_type: self._construct_body(
-                            unconstructed_body, operation_id, select_params.mime_type
+        # Use body agent to select properties based on assigned parameters for body
+        select_body_properties = {}
+        if body:
+            for mime, body_properties in body.items():
+                if type(body_properties) == dict:
+                    # Only call body_object_agent if mime type is in its Q-table
+                    if mime in self.body_object_agent.q_table.get(operation_id, {}):
+                        select_properties = self.body_object_agent.get_action(
+                            operation_id, mime
                         )
-                    }
-            else:
-                parameters = None
-                body = None
-
-            # Assign header token if header agent is enabled and header is assigned
-            header = {"Authorization": select_header} if select_header else None
+                        deconstructed_body = self._deconstruct_body(body_properties)
+                        if select_properties and deconstructed_body:
+                            new_bodies_properties = {
+                                prop: deconstructed_body[prop]
+                                for prop in deconstructed_body
+                                if prop in select_properties
+                            }
+                            body[mime] = new_bodies_properties
+                        else:
+                            body[mime] = None
+                        select_body_properties[mime] = select_properties
+                    # If mime not in Q-table, leave body[mime] as-is (already has generated value)
+        lap("body_object_agent")
 
-            # Use body agent to select properties based on assigned parameters for body
-            select_body_properties = {}
-            if body:
-                for mime, body_properties in body.items():
-                    if type(body_properties) == dict:
-                        # Only call body_object_agent if mime type is in its Q-table
-                        if mime in self.body_object_agent.q_table.get(operation_id, {}):
-                            select_properties = self.body_object_agent.get_action(
-                                operation_id, mime
-                            )
-                            deconstructed_body = self._deconstruct_body(body_properties)
-                            if select_properties and deconstructed_body:
-                                new_bodies_properties = {
-                                    prop: deconstructed_body[prop]
-                                    for prop in deconstructed_body
-                                    if prop in select_properties
-                                }
-                                body[mime] = new_bodies_properties
-                            else:
-                                body[mime] = None
-                            select_body_properties[mime] = select_properties
-                        # If mime not in Q-table, leave body[mime] as-is (already has generated value)
-
-            # Mutate operation values
-            mutate_operation = random.random() < self.mutation_rate
-            mutated_parameter_names = False
-            operation_props = self.operation_graph.operation_nodes[
-                operation_id
-            ].operation_properties
-            if mutate_operation:
-                avail_primitives = sum(
-                    len(v) for v in self.successful_primitives.values()
-                )
-                use_mutator = random.random() < 0.8 or (
-                    avail_primitives == 0 and operation_id not in complete_body_mappings
-                )
-                specific_method = None
+        # Mutate operation values
+        mutate_operation = random.random() < self.mutation_rate
+        mutated_parameter_names = False
+        specific_method = None
+        operation_props = self.operation_graph.operation_nodes[
+            operation_id
+        ].operation_properties
+        if mutate_operation:
+            avail_primitives = sum(
+                len(v) for v in self.successful_primitives.values()
+            )
+            use_mutator = random.random() < 0.8 or (
+                avail_primitives == 0 and operation_id not in complete_body_mappings
+            )
 
-                if use_mutator:
+            if use_mutator:
+                (
+                    parameters,
+                    body,
+                    header,
+                    specific_method,
+                    mutated_parameter_names,
+                ) = self.mutate_values(operation_props, parameters, body, header)
+            else:
+                if random.random() < 0.2 and avail_primitives > 0:
+                    parameters, body = self.assign_random_from_primitives(
+                        parameters, body, operation_id
+                    )
+                elif operation_id in complete_body_mappings:
+                    body = self.assign_random_complete_body(
+                        body, operation_id, complete_body_mappings
+                    )
+                else:
                     (
                         parameters,
                         body,
                         header,
                         specific_method,
                         mutated_parameter_names,
-                    ) = self.mutate_values(operation_props, parameters, body, header)
-                else:
-                    if random.random() < 0.2 and avail_primitives > 0:
-                        parameters, body = self.assign_random_from_primitives(
-                            parameters, body, operation_id
-                        )
-                    elif operation_id in complete_body_mappings:
-                        body = self.assign_random_complete_body(
-                            body, operation_id, complete_body_mappings
-                        )
-                    else:
-                        (
-                            parameters,
-                            body,
-                            header,
-                            specific_method,
-                            mutated_parameter_names,
-                        ) = self.mutate_values(
-                            operation_props, parameters, body, header
-                        )
+                    ) = self.mutate_values(
+                        operation_props, parameters, body, header
+                    )
+        lap("mutation")
+
+        return OperationStep(
+            operation_id=operation_id,
+            operation_props=operation_props,
+            select_params=select_params,
+            select_header=select_header,
+            data_source=data_source,
+            select_values=select_values,
+            dependency_type=dependency_type,
+            parameter_dependencies=parameter_dependencies,
+            request_body_dependencies=request_body_dependencies,
+            unconstructed_body=unconstructed_body,
+            select_body_properties=select_body_properties,
+            parameters=parameters,
+            body=body,
+            header=header,
+            specific_method=specific_method,
+            mutate_operation=mutate_operation,
+            mutated_parameter_names=mutated_parameter_names,
+        )
 
-                response = self.send_operation(
-                    operation_props, parameters, body, header, specific_method
-                )
-            else:
-                response = self.send_operation(
-                    operation_props, parameters, body, header
-                )
+    def send_step(self, step: OperationStep) -> requests.Response | None:
+        sent_at = time.perf_counter()
+        response = self.send_operation(
+            step.operation_props,
+            step.parameters,
+            step.body,
+            step.header,
+            step.specific_method,
+        )
+        step.latency = time.perf_counter() - sent_at
+        self.phase_timer.record("http_dispatch", step.latency)
+        return response
+
+    def learn_step(self, step: OperationStep, response) -> None:
+        """Apply the Q-table updates and success/error bookkeeping for one request."""
+        operation_id = step.operation_id
+        self.run_stats.record_request(step.latency)
+        lap = self.phase_timer.laps()
+        select_params = step.select_params
+        select_header = step.select_header
+        data_source = step.data_source
+        select_values = step.select_values
+        dependency_type = step.dependency_type
+        parameter_dependencies = step.parameter_dependencies
+        request_body_dependencies = step.request_body_dependencies
+        unconstructed_body = step.unconstructed_body
+        select_body_properties = step.select_body_properties
+        parameters = step.parameters
+        body = step.body
+        mutate_operation = step.mutate_operation
+        mutated_parameter_names = step.mutated_parameter_names
+
+        self.apply_undocumented_matches(self.undocumented_matcher.completed())
+
+        # If invalid response do not process
+        if response is None:
+            return
 
-            # If invalid response do not process
-            if response is None:
-                continue
+        # Only update table when using table values (so not mutated)
+        if not mutate_operation:
+            self.operation_agent.update_q_table(
+                operation_id, self.determine_bad_response_reward(response)
+            )
 
-            # Only update table when using table values (so not mutated)
-            if not mutate_operation:
-                self.operation_agent.update_q_table(
-                    operation_id, self.determine_bad_response_reward(response)
-                )
+            curr_Q_param, curr_Q_mime = self.parameter_agent.get_Q_curr(
+                operation_id, select_params
+            )
+            next_Q_param, next_Q_mime = self.parameter_agent.get_Q_next(
+                operation_id
+            )
+            curr_Q_body, next_Q_body = 0, 0
+            if select_body_properties:
+                for mime, select_properties in select_body_properties.items():
+                    curr_Q_body += self.body_object_agent.get_Q_curr(
+                        operation_id, mime, select_properties
+                    )
+                    next_Q_body += self.body_object_agent.get_Q_next(
+                        operation_id, mime
+                    )
 
-                curr_Q_param, curr_Q_mime = self.parameter_agent.get_Q_curr(
-                    operation_id, select_params
-                )
-                next_Q_param, next_Q_mime = self.parameter_agent.get_Q_next(
-                    operation_id
-                )
-                curr_Q_body, next_Q_body = 0, 0
-                if select_body_properties:
-                    for mime, select_properties in select_body_properties.items():
-                        curr_Q_body += self.body_object_agent.get_Q_curr(
-                            operation_id, mime, select_properties
-                        )
-                        next_Q_body += self.body_object_agent.get_Q_next(
-                            operation_id, mime
-                        )
+            curr_Q_data = self.data_source_agent.get_Q_curr(
+                operation_id, data_source
+            )
+            next_Q_data = self.data_source_agent.get_Q_next(operation_id)
 
-                curr_Q_data = self.data_source_agent.get_Q_curr(
-                    operation_id, data_source
+            curr_Q_header, next_Q_header = 0, 0
+            if CONFIG.enable_header_agent:
+                curr_Q_header += self.header_agent.get_Q_curr(
+                    operation_id, select_header
                 )
-                next_Q_data = self.data_source_agent.get_Q_next(operation_id)
-
-                curr_Q_header, next_Q_header = 0, 0
-                if CONFIG.enable_header_agent:
-                    curr_Q_header += self.header_agent.get_Q_curr(
-                        operation_id, select_header
-                    )
-                    next_Q_header += self.header_agent.get_Q_next(operation_id)
+                next_Q_header += self.header_agent.get_Q_next(operation_id)
 
-                processed_value_action, used_dependent_params, used_dependent_body = (
-                    None,
-                    None,
-                    None,
+            processed_value_action, used_dependent_params, used_dependent_body = (
+                None,
+                None,
+                None,
+            )
+            (
+                curr_Q_value_params,
+                curr_Q_value_body,
+                next_Q_value_params,
+                next_Q_value_body,
+                curr_Q_dependency_params,
+                curr_Q_dependency_body,
+                next_Q_dependency_params,
+                next_Q_dependency_body,
+            ) = ([], [], [], [], [], [], [], [])
+            if data_source == "LLM" and select_values is not None:
+                processed_value_action = ValueAction(
+                    param_mappings=parameters,
+                    body_mappings=select_values.body_mappings,
                 )
-                (
-                    curr_Q_value_params,
-                    curr_Q_value_body,
-                    next_Q_value_params,
-                    next_Q_value_body,
-                    curr_Q_dependency_params,
-                    curr_Q_dependency_body,
-                    next_Q_dependency_params,
-                    next_Q_dependency_body,
-                ) = ([], [], [], [], [], [], [], [])
-                if data_source == "LLM" and select_values is not None:
-                    processed_value_action = ValueAction(
-                        param_mappings=parameters,
-                        body_mappings=select_values.body_mappings,
+                curr_Q_value_params, curr_Q_value_body = (
+                    self.value_agent.get_Q_curr(
+                        operation_id, processed_value_action
                     )
-                    curr_Q_value_params, curr_Q_value_body = (
-                        self.value_agent.get_Q_curr(
-                            operation_id, processed_value_action
-                        )
-                    )
-                    next_Q_value_params, next_Q_value_body = (
-                        self.value_agent.get_Q_next(
-                            operation_id, processed_value_action
-                        )
+                )
+                next_Q_value_params, next_Q_value_body = (
+                    self.value_agent.get_Q_next(
+                        operation_id, processed_value_action
                     )
-                elif data_source == "DEPENDENCY" and (
-                    dependency_type == "EXPLORE" or dependency_type == "BEST"
+                )
+            elif data_source == "DEPENDENCY" and (
+                dependency_type == "EXPLORE" or dependency_type == "BEST"
+            ):
+                used_dependent_params = {}
+                if (
+                    parameter_dependencies
+                    and select_params.req_params
+                    and parameters
                 ):
-                    used_dependent_params = {}
-                    if (
-                        parameter_dependencies
-                        and select_params.req_params
-                        and parameters
-                    ):
-                        for parameter in parameters:
-                            if (
-                                parameter in select_params.req_params
-                                and parameter in parameter_dependencies
-                            ):
-                                used_dependent_params[parameter] = (
-                                    parameter_dependencies[parameter]
-                                )
-                    used_dependent_body = {}
-                    if (
-                        request_body_dependencies
-                        and unconstructed_body
-                        and select_params.mime_type
-                        and select_params.mime_type in select_body_properties
-                        and select_body_properties[select_params.mime_type]
-                    ):
-                        for body_param in unconstructed_body:
-                            if (
-                                body_param
-                                in select_body_properties[select_params.mime_type]
-                                and body_param in request_body_dependencies
-                            ):
-                                used_dependent_body[body_param] = (
-                                    request_body_dependencies[body_param]
-                                )
-                    curr_Q_dependency_params, curr_Q_dependency_body = (
-                        self.dependency_agent.get_Q_curr(
-                            operation_id, used_dependent_params, used_dependent_body
-                        )
+                    for parameter in parameters:
+                        if (
+                            parameter in select_params.req_params
+                            and parameter in parameter_dependencies
+                        ):
+                            used_dependent_params[parameter] = (
+                                parameter_dependencies[parameter]
+                            )
+                used_dependent_body = {}
+                if (
+                    request_body_dependencies
+                    and unconstructed_body
+                    and select_params.mime_type
+                    and select_params.mime_type in select_body_properties
+                    and select_body_properties[select_params.mime_type]
+                ):
+                    for body_param in unconstructed_body:
+                        if (
+                            body_param
+                            in select_body_properties[select_params.mime_type]
+                            and body_param in request_body_dependencies
+                        ):
+                            used_dependent_body[body_param] = (
+                                request_body_dependencies[body_param]
+                            )
+                curr_Q_dependency_params, curr_Q_dependency_body = (
+                    self.dependency_agent.get_Q_curr(
+                        operation_id, used_dependent_params, used_dependent_body
                     )
-                    next_Q_dependency_params, next_Q_dependency_body = (
-                        self.dependency_agent.get_Q_next(
-                            operation_id, used_dependent_params, used_dependent_body
-                        )
+                )
+                next_Q_dependency_params, next_Q_dependency_body = (
+                    self.dependency_agent.get_Q_next(
+                        operation_id, used_dependent_params, used_dependent_body
                     )
-                elif data_source == "DEPENDENCY" and dependency_type == "RANDOM":
-                    if not 200 <= response.status_code < 300:
-                        continue
-                    if parameter_dependencies:
-                        for (
-                            parameter,
-                            dependency_info,
-                        ) in parameter_dependencies.items():
-                            dependent_operation = dependency_info["dependent_operation"]
-                            dependency_location = dependency_info["in_value"]
-                            dependent_val = dependency_info["dependent_val"]
+                )
+            elif data_source == "DEPENDENCY" and dependency_type == "RANDOM":
+                if not 200 <= response.status_code < 300:
+                    return
+                new_response_dependency = False
+                if parameter_dependencies:
+                    for (
+                        parameter,
+                        dependency_info,
+                    ) in parameter_dependencies.items():
+                        dependent_operation = dependency_info["dependent_operation"]
+                        dependency_location = dependency_info["in_value"]
+                        dependent_val = dependency_info["dependent_val"]
+                        new_response_dependency |= (
                             self.dependency_agent.add_new_dependency(
                                 operation_id,
                                 "params",
@@ -1378,14 +1597,16 @@ class QLearning:
                                 dependency_location,
                                 dependent_val,
                             )
-                    if request_body_dependencies:
-                        for (
-                            body_param,
-                            dependency_info,
-                        ) in request_body_dependencies.items():
-                            dependent_operation = dependency_info["dependent_operation"]
-                            dependency_location = dependency_info["in_value"]
-                            dependent_val = dependency_info["dependent_val"]
+                        )
+                if request_body_dependencies:
+                    for (
+                        body_param,
+                        dependency_info,
+                    ) in request_body_dependencies.items():
+                        dependent_operation = dependency_info["dependent_operation"]
+                        dependency_location = dependency_info["in_value"]
+                        dependent_val = dependency_info["dependent_val"]
+                        new_response_dependency |= (
                             self.dependency_agent.add_new_dependency(
                                 operation_id,
                                 "body",
@@ -1394,226 +1615,244 @@ class QLearning:
                                 dependency_location,
                                 dependent_val,
                             )
+                        )
+                if new_response_dependency:
+                    self.response_harvester.invalidate()
+
+            # Calculate combined error through value decomposition
+            Q_target = (
+                next_Q_data
+                + next_Q_param
+                + next_Q_mime
+                + next_Q_body
+                + next_Q_header
+                + sum(next_Q_value_params)
+                + sum(next_Q_value_body)
+                + sum(next_Q_dependency_params)
+                + sum(next_Q_dependency_body)
+            )
+            Q_curr = (
+                curr_Q_data
+                + curr_Q_param
+                + curr_Q_mime
+                + curr_Q_body
+                + curr_Q_header
+                + sum(curr_Q_value_params)
+                + sum(curr_Q_value_body)
+                + sum(curr_Q_dependency_params)
+                + sum(curr_Q_dependency_body)
+            )
+            td_error = (
+                self.determine_good_response_reward(response)
+                + self.gamma * Q_target
+                - Q_curr
+            )
 
-                # Calculate combined error through value decomposition
-                Q_target = (
-                    next_Q_data
-                    + next_Q_param
-                    + next_Q_mime
-                    + next_Q_body
-                    + next_Q_header
-                    + sum(next_Q_value_params)
-                    + sum(next_Q_value_body)
-                    + sum(next_Q_dependency_params)
-                    + sum(next_Q_dependency_body)
-                )
-                Q_curr = (
-                    curr_Q_data
-                    + curr_Q_param
-                    + curr_Q_mime
-                    + curr_Q_body
-                    + curr_Q_header
-                    + sum(curr_Q_value_params)
-                    + sum(curr_Q_value_body)
-                    + sum(curr_Q_dependency_params)
-                    + sum(curr_Q_dependency_body)
+            # Update Q-tables
+            self.parameter_agent.update_Q_item(
+                operation_id, select_params, td_error
+            )
+            if select_body_properties:
+                for mime, select_properties in select_body_properties.items():
+                    self.body_object_agent.update_Q_item(
+                        operation_id, mime, select_properties, td_error
+                    )
+
+            self.data_source_agent.update_Q_item(
+                operation_id, data_source, td_error
+            )
+
+            if CONFIG.enable_header_agent:
+                self.header_agent.update_Q_item(
+                    operation_id, select_header, td_error
                 )
-                td_error = (
-                    self.determine_good_response_reward(response)
-                    + self.gamma * Q_target
-                    - Q_curr
+
+            if data_source == "LLM" and processed_value_action is not None:
+                self.value_agent.update_Q_item(
+                    operation_id, processed_value_action, td_error
                 )
 
-                # Update Q-tables
-                self.parameter_agent.update_Q_item(
-                    operation_id, select_params, td_error
+            elif data_source == "DEPENDENCY" and (
+                dependency_type == "EXPLORE" or dependency_type == "BEST"
+            ):
+                self.dependency_agent.update_Q_item(
+                    operation_id,
+                    used_dependent_params,
+                    used_dependent_body,
+                    td_error,
                 )
-                if select_body_properties:
-                    for mime, select_properties in select_body_properties.items():
-                        self.body_object_agent.update_Q_item(
-                            operation_id, mime, select_properties, td_error
-                        )
 
-                self.data_source_agent.update_Q_item(
-                    operation_id, data_source, td_error
+        lap("q_updates")
+
+        # Update successful parameters to use for future operation dependencies
+        if response is not None and response.ok and not mutated_parameter_names:
+            # print("Successful response!")
+            if parameters and self.successful_parameters[operation_id]:
+                for param_key, param_val in parameters.items():
+                    # Buckets skip values they already hold.
+                    if param_key in self.successful_parameters[operation_id]:
+                        self._keep_successful(
+                            "params", operation_id, param_key, [param_val]
+                        )
+            if body and self.successful_bodies[operation_id]:
+                for mime, body_properties in body.items():
+                    deconstructed_body = self._deconstruct_body(body_properties)
+                    if deconstructed_body:
+                        for prop_name, prop_val in deconstructed_body.items():
+                            if prop_name in self.successful_bodies[operation_id]:
+                                self._keep_successful(
+                                    "body", operation_id, prop_name, [prop_val]
+                                )
+            if (
+                response.content
+                and self.successful_responses[operation_id] is not None
+            ):
+                lap("successful_values")
+                harvested = self.response_harvester.harvest(
+                    operation_id, response.content
                 )
+                lap("response_harvest")
+
+                if harvested is not None and harvested.has_objects:
+                    for response_prop in harvested.properties:
+                        response_vals = harvested.values.get(response_prop, [])
+                        if response_prop in self.successful_responses[operation_id]:
+                            self._keep_successful(
+                                "response", operation_id, response_prop, response_vals
+                            )
+                        else:
+                            self.successful_responses[operation_id][
+                                response_prop
+                            ] = self._value_bucket(
+                                operation_id, f"response.{response_prop}"
+                            )
+                            self._keep_successful(
+                                "response", operation_id, response_prop, response_vals
+                            )
+                            self.undocumented_matcher.submit(
+                                operation_id, response_prop
+                            )
 
-                if CONFIG.enable_header_agent:
-                    self.header_agent.update_Q_item(
-                        operation_id, select_header, td_error
+                elif harvested is not None:
+                    if operation_id not in self.successful_primitives:
+                        self.successful_primitives[operation_id] = (
+                            self._value_bucket(operation_id, "primitives")
+                        )
+                    self.successful_primitives[operation_id].extend(
+                        harvested.primitives
                     )
 
-                if data_source == "LLM" and processed_value_action is not None:
-                    self.value_agent.update_Q_item(
-                        operation_id, processed_value_action, td_error
+        if response is not None:
+            self.responses[response.status_code] += 1
+            self.run_stats.record_status(operation_id, response.status_code)
+            if operation_id not in self.operation_response_counter:
+                self.operation_response_counter[operation_id] = {
+                    response.status_code: 1
+                }
+            elif (
+                response.status_code
+                not in self.operation_response_counter[operation_id]
+            ):
+                self.operation_response_counter[operation_id][
+                    response.status_code
+                ] = 1
+            else:
+                self.operation_response_counter[operation_id][
+                    response.status_code
+                ] += 1
+
+            if 500 <= response.status_code < 600:
+                if operation_id not in self.errors:
+                    self.errors[operation_id] = 1
+                else:
+                    self.errors[operation_id] += 1
+
+                data_signature = {
+                    "parameters": parameters,
+                    "body": body,
+                    "operation_id": operation_id,
+                }
+                if operation_id not in self.unique_errors:
+                    self.unique_errors[operation_id] = self._value_bucket(
+                        operation_id, "errors", errors=True
                     )
+                known_errors = len(self.unique_errors[operation_id])
+                self.unique_errors[operation_id].append(data_signature)
+                self.run_stats.record_unique_errors(
+                    len(self.unique_errors[operation_id]) - known_errors
+                )
 
-                elif data_source == "DEPENDENCY" and (
-                    dependency_type == "EXPLORE" or dependency_type == "BEST"
-                ):
-                    self.dependency_agent.update_Q_item(
+                if CONFIG.errors.cluster:
+                    fingerprint, error_class = classify_error(
                         operation_id,
-                        used_dependent_params,
-                        used_dependent_body,
-                        td_error,
+                        response.status_code,
+                        response.text,
+                        parameters,
+                        body,
+                        CONFIG.errors.max_message_length,
                     )
+                    if fingerprint not in self.error_classes:
+                        error_class["example"] = data_signature
+                        self.error_classes[fingerprint] = error_class
+                    self.error_class_counts[fingerprint] = (
+                        self.error_class_counts.get(fingerprint, 0) + 1
+                    )
+        lap("bookkeeping")
 
-            # Update successful parameters to use for future operation dependencies
-            if response is not None and response.ok and not mutated_parameter_names:
-                # print("Successful response!")
-                if parameters and self.successful_parameters[operation_id]:
-                    for param_key, param_val in parameters.items():
-                        if (
-                            param_key in self.successful_parameters[operation_id]
-                            and param_val
-                            not in self.successful_parameters[operation_id][param_key]
-                        ):
-                            self.successful_parameters[operation_id][param_key].append(
-                                param_val
-                            )
-                if body and self.successful_bodies[operation_id]:
-                    for mime, body_properties in body.items():
-                        deconstructed_body = self._deconstruct_body(body_properties)
-                        if deconstructed_body:
-                            for prop_name, prop_val in deconstructed_body.items():
-                                if (
-                                    prop_name in self.successful_bodies[operation_id]
-                                    and prop_val
-                                    not in self.successful_bodies[operation_id][
-                                        prop_name
-                                    ]
-                                ):
-                                    self.successful_bodies[operation_id][
-                                        prop_name
-                                    ].append(prop_val)
-                if (
-                    response.content
-                    and self.successful_responses[operation_id] is not None
-                ):
-                    try:
-                        response_content = json.loads(response.content)
-                    except json.JSONDecodeError:
-                        print("Error decoding JSON response content")
-                        print("Response content: ", response.content)
-                        response_content = None
+    def execute_operations(self):
 
-                    deconstructed_response: Dict[str, List] = {}
-                    self._deconstruct_response(response_content, deconstructed_response)
+        start_time = time.time()
 
-                    if deconstructed_response:
-                        for (
-                            response_prop,
-                            response_vals,
-                        ) in deconstructed_response.items():
-                            if response_prop in self.successful_responses[operation_id]:
-                                for response_val in response_vals:
-                                    if (
-                                        response_val
-                                        not in self.successful_responses[operation_id][
-                                            response_prop
-                                        ]
-                                    ):
-                                        self.successful_responses[operation_id][
-                                            response_prop
-                                        ].append(response_val)
-                            else:
-                                self.successful_responses[operation_id][
-                                    response_prop
-                                ] = response_vals
-                                if (
-                                    self.dependency_agent.add_undocumented_responses(
-                                        operation_id, response_prop
-                                    )
-                                    and "DEPENDENCY"
-                                    not in self.data_source_agent.available_data_sources
-                                ):
-                                    self.data_source_agent.initialize_dependency_source()
+        complete_body_mappings = self.determine_complete_body_mappings()
 
-                    else:
-                        if operation_id not in self.successful_primitives:
-                            self.successful_primitives[operation_id] = []
-                        if isinstance(response_content, list):
-                            for item in response_content:
-                                if item not in self.successful_primitives[operation_id]:
-                                    self.successful_primitives[operation_id].append(
-                                        item
-                                    )
-                        elif (
-                            response_content
-                            not in self.successful_primitives[operation_id]
-                        ):
-                            self.successful_primitives[operation_id].append(
-                                response_content
-                            )
+        epsilon_decay_rate = self._epsilon_decay_rate()
 
-            if response is not None:
-                self.responses[response.status_code] += 1
-                if operation_id not in self.operation_response_counter:
-                    self.operation_response_counter[operation_id] = {
-                        response.status_code: 1
-                    }
-                elif (
-                    response.status_code
-                    not in self.operation_response_counter[operation_id]
-                ):
-                    self.operation_response_counter[operation_id][
-                        response.status_code
-                    ] = 1
-                else:
-                    self.operation_response_counter[operation_id][
-                        response.status_code
-                    ] += 1
+        while time.time() - start_time < self.time_duration:
+            self.epsilon_decay(epsilon_decay_rate)
 
-                if 500 <= response.status_code < 600:
-                    if operation_id not in self.errors:
-                        self.errors[operation_id] = 1
-                    else:
-                        self.errors[operation_id] += 1
-
-                    data_signature = {
-                        "parameters": parameters,
-                        "body": body,
-                        "operation_id": operation_id,
-                    }
-                    if operation_id not in self.unique_errors:
-                        self.unique_errors[operation_id] = [data_signature]
-                    elif data_signature not in self.unique_errors[operation_id]:
-                        self.unique_errors[operation_id].append(data_signature)
-
-    def tui_output(self, start_time, operation_id):
-
-        unique_processed_200s = set()
-        for operation_idx, status_codes in self.operation_response_counter.items():
-            for status_code in status_codes:
-                if status_code // 100 == 2:
-                    unique_processed_200s.add(operation_idx)
-        not_hit_operations = set()
-        for operation_idx in self.operation_graph.operation_nodes.keys():
-            if operation_idx not in unique_processed_200s:
-                not_hit_operations.add(operation_idx)
-
-        unique_errors = 0
-        for operation_idx in self.unique_errors:
-            unique_errors += len(self.unique_errors[operation_idx])
-
-        print(
-            "========================================================================="
-        )
-        print(f"Attempting operation: {operation_id}")
-        print(f"Status Code Counter: {dict(self.responses)}")
-        print(f"Number of unique server errors: {unique_errors}")
-        print(f"Number of successful operations: {len(unique_processed_200s)}")
-        print(
-            f"Percentage of successful operations: {len(unique_processed_200s) / max(len(self.operation_graph.operation_nodes), 1) * 100:.2f}%"
-        )
-        print(
-            "Time remaining: ",
-            max(round(self.time_duration - (time.time() - start_time), 3), 0.01),
-        )
-        print(
-            "Percentage of time elapsed: ",
-            str(round((time.time() - start_time) / self.time_duration * 100, 2)) + "%",
-        )
+            step = self.prepare_step(complete_body_mappings, start_time)
+            while self._wait_to_send(step, start_time):
+                response = self.send_step(step)
+                if self.defer_rate_limited(step, response):
+                    if step.rate_limited <= self.RATE_LIMIT_RESENDS:
+                        continue
+                    break
+                self.learn_step(step, response)
+                for hook in self.step_hooks:
+                    hook()
+                break
+
+        self.elapsed_time = time.time() - start_time
 
     def run(self):
-        self.execute_operations()
+        if CONFIG.sharding.workers > 1:
+            ShardCoordinator(self, CONFIG.sharding).run()
+        else:
+            self.run_local()
+
+    def run_local(self):
+        concurrency = CONFIG.request_generation.concurrency
+        self.run_stats.start(time.time())
+        dashboard = None
+        if self.show_progress:
+            dashboard = Dashboard(self.run_stats, CONFIG.dashboard.refresh_seconds)
+            dashboard.start()
+        metrics_server = None
+        if CONFIG.profiling.metrics_port:
+            try:
+                metrics_server = serve_metrics(
+                    self.phase_timer, CONFIG.profiling.metrics_port
+                )
+            except OSError as e:
+                print(f"Could not serve metrics on port {CONFIG.profiling.metrics_port}: {e}")
+        try:
+            if concurrency > 1:
+                AsyncExecutionEngine(self, concurrency).run()
+            else:
+                self.execute_operations()
+        finally:
+            self.apply_undocumented_matches(self.undocumented_matcher.flush())
+            if dashboard is not None:
+                dashboard.stop()
+            if metrics_server is not None:
+                metrics_server.shutdown()
@@ -0,0 +1,226 @@
+import bisect
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Upper bounds (seconds) of the phase histogram buckets; the last bucket is +Inf.
+BUCKET_BOUNDS = (
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+_BUCKET_LABELS = [repr(bound) for bound in BUCKET_BOUNDS] + ["+Inf"]
+
+
+def _no_lap(phase: str) -> None:
+    pass
+
+
+class PhaseTimer:
+    """
+    Time spent per phase of the Q-learning loop, as histograms.
+
+    ``phases`` maps a phase name to ``{"count", "sum", "buckets"}`` where ``buckets``
+    maps an upper bound label to the number of spans that fell into it. Only
+    numbers are stored, so sharded workers merge it like the other counters.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.phases: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, phase: str, seconds: float) -> None:
+        label = _BUCKET_LABELS[bisect.bisect_left(BUCKET_BOUNDS, seconds)]
+        with self._lock:
+            histogram = self.phases.get(phase)
+            if histogram is None:
+                histogram = {"count": 0, "sum": 0.0, "buckets": {}}
+                self.phases[phase] = histogram
+            histogram["count"] += 1
+            histogram["sum"] += seconds
+            histogram["buckets"][label] = histogram["buckets"].get(label, 0) + 1
+
+    def laps(self) -> Callable[[str], None]:
+        """
+        Returns ``lap(phase)``, which records the time since the previous lap (or
+        since this call) under ``phase``.
+        """
+        if not self.enabled:
+            return _no_lap
+        last = time.perf_counter()
+
+        def lap(phase: str) -> None:
+            nonlocal last
+            now = time.perf_counter()
+            self.record(phase, now - last)
+            last = now
+
+        return lap
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per phase: count, total and mean time, and p50/p99 (bucket upper bounds)."""
+        summary = {}
+        with self._lock:
+            phases = {
+                phase: (histogram["count"], histogram["sum"], dict(histogram["buckets"]))
+                for phase, histogram in self.phases.items()
+            }
+        for phase, (count, total, buckets) in sorted(
+            phases.items(), key=lambda item: -item[1][1]
+        ):
+            summary[phase] = {
+                "count": count,
+                "total_seconds": round(total, 6),
+                "mean_ms": round(total / max(count, 1) * 1000, 4),
+                "p50_ms": _bucket_quantile(buckets, count, 0.5),
+                "p99_ms": _bucket_quantile(buckets, count, 0.99),
+                "buckets": {
+                    label: buckets[label] for label in _BUCKET_LABELS if label in buckets
+                },
+            }
+        return summary
+
+    def openmetrics(self) -> str:
+        lines = [
+            "# TYPE autoresttest_phase_seconds histogram",
+            "# UNIT autoresttest_phase_seconds seconds",
+            "# HELP autoresttest_phase_seconds Time spent per phase of the Q-learning loop.",
+        ]
+        with self._lock:
+            for phase, histogram in sorted(self.phases.items()):
+                cumulative = 0
+                for label in _BUCKET_LABELS:
+                    cumulative += histogram["buckets"].get(label, 0)
+                    lines.append(
+                        f'autoresttest_phase_seconds_bucket{{phase="{phase}",le="{label}"}} {cumulative}'
+                    )
+                lines.append(
+                    f'autoresttest_phase_seconds_count{{phase="{phase}"}} {histogram["count"]}'
+                )
+                lines.append(
+                    f'autoresttest_phase_seconds_sum{{phase="{phase}"}} {histogram["sum"]}'
+                )
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def _bucket_quantile(buckets: Dict[str, int], count: int, fraction: float) -> float:
+    if not count:
+        return 0.0
+    target = fraction * count
+    cumulative = 0
+    for bound, label in zip(BUCKET_BOUNDS, _BUCKET_LABELS):
+        cumulative += buckets.get(label, 0)
+        if cumulative >= target:
+            return bound * 1000
+    return float("inf")
+
+
+def serve_metrics(timer: PhaseTimer, port: int) -> ThreadingHTTPServer:
+    """Serve ``timer`` as OpenMetrics text at ``/metrics`` on a daemon thread."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            payload = timer.openmetrics().encode("utf-8")
+            self.send_response(200)
+            self.send_header(
+                "Content-Type",
+                "application/openmetrics-text; version=1.0.0; charset=utf-8",
+            )
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+    threading.Thread(
+        target=server.serve_forever, name="autoresttest-metrics", daemon=True
+    ).start()
+    return server
+
+
+# Helper threads that only wait; sampling them would bury the loop's own stacks.
+_IDLE_THREADS = {"autoresttest-dashboard", "autoresttest-metrics"}
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of every thread each ``interval`` seconds and counts them
+    in the folded format read by flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="autoresttest-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                name = names.get(thread_id, str(thread_id))
+                if thread_id == own_id or name in _IDLE_THREADS:
+                    continue
+                stack: List[str] = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(
+                        f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+                    )
+                    frame = frame.f_back
+                stack.append(name)
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def write_folded(self, path: Path) -> None:
+        with path.open("w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def top_functions(self, limit: int = 15) -> List[tuple[str, int]]:
+        """Functions by the number of samples in which they were executing."""
+        leaves: Counter = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return leaves.most_common(limit)
+
+
+__all__ = ["PhaseTimer", "SamplingProfiler", "serve_metrics"]
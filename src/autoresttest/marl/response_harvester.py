@@ -0,0 +1,269 @@
+import json
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from json.decoder import scanstring
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, Optional, Set
+
+from autoresttest.utils.value_store import value_key
+
+if TYPE_CHECKING:
+    from autoresttest.agents import DependencyAgent
+    from autoresttest.config.config import ResponseHarvestConfig
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_SCALAR = re.compile(r"[^,\]}\s]*")
+_STRUCTURE = re.compile(r'["\[\]{}]')
+_decoder = json.JSONDecoder()
+
+
+class _Truncated(Exception):
+    """The scanned prefix of a body ended inside a value."""
+
+
+@dataclass
+class HarvestedResponse:
+    """Values harvested from one response body."""
+
+    # Values per property, limited to what the dependency graph consumes.
+    values: Dict[str, List[Any]] = field(default_factory=dict)
+    # Every property name seen (within the depth cap), so undocumented ones are still discovered.
+    properties: Dict[str, None] = field(default_factory=dict)
+    # Top-level items of a body that holds no objects (e.g. a list of ids); empty
+    # once any object is seen, on both the parsed and the streamed path.
+    primitives: List[Any] = field(default_factory=list)
+    has_objects: bool = False
+    _keys: Dict[str, Set[bytes]] = field(default_factory=lambda: defaultdict(set))
+
+
+class ResponseHarvester:
+    """
+    Extracts the response values later requests can depend on.
+
+    The properties each operation must keep are read from the dependency agent's
+    Q-table (edges of the operation graph plus dependencies discovered at run time).
+    Other properties keep only a few scalar samples, for random dependency exploration.
+    Bodies up to ``stream_threshold`` bytes are parsed with ``json.loads``; larger
+    bodies are scanned in place, up to ``max_bytes``, and only the wanted values are
+    decoded, so a multi-megabyte list response never becomes a Python object tree.
+    """
+
+    def __init__(
+        self,
+        dependency_agent: "DependencyAgent",
+        settings: "ResponseHarvestConfig",
+    ) -> None:
+        self.dependency_agent = dependency_agent
+        self.settings = settings
+        self._needed: Optional[Dict[str, FrozenSet[str]]] = None
+        self.stats = {"bodies": 0, "streamed": 0, "truncated": 0}
+
+    def invalidate(self) -> None:
+        """Call after dependencies are added so the needed properties are recomputed."""
+        self._needed = None
+
+    def needed_properties(self, operation_id: str) -> FrozenSet[str]:
+        if self._needed is None:
+            needed: Dict[str, Set[str]] = defaultdict(set)
+            for operation_props in self.dependency_agent.q_table.values():
+                for param_values in operation_props.values():
+                    for dependent_values in param_values.values():
+                        for dependent_op, locations in dependent_values.items():
+                            needed[dependent_op].update(locations.get("response", {}))
+            self._needed = {
+                dependent_op: frozenset(props) for dependent_op, props in needed.items()
+            }
+        return self._needed.get(operation_id, frozenset())
+
+    def harvest(self, operation_id: str, content: bytes) -> Optional[HarvestedResponse]:
+        """Harvested values, or ``None`` when the body is not JSON."""
+        self.stats["bodies"] += 1
+        needed = self.needed_properties(operation_id)
+        harvested = HarvestedResponse()
+        if len(content) <= self.settings.stream_threshold:
+            try:
+                document = json.loads(content)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                print("Error decoding JSON response content")
+                print("Response content: ", content)
+                return None
+            self._walk(document, 0, needed, harvested)
+            if not harvested.has_objects:
+                harvested.primitives = (
+                    document[: self.settings.max_array_items]
+                    if isinstance(document, list)
+                    else [document]
+                )
+            return harvested
+
+        self.stats["streamed"] += 1
+        text = content[: self.settings.max_bytes].decode("utf-8", errors="ignore")
+        try:
+            start = _WHITESPACE.match(text, 0).end()
+            self._scan(text, start, 0, needed, harvested, top=True)
+        except (_Truncated, ValueError):
+            # Keep what was harvested before the byte cap (or a malformed region).
+            self.stats["truncated"] += 1
+        if harvested.has_objects:
+            # Top-level primitives are only kept for bodies without objects, as when parsed.
+            harvested.primitives = []
+        return harvested
+
+    def _limit(self, prop: str, container: bool, needed: FrozenSet[str]) -> int:
+        if not self.settings.needed_only or prop in needed:
+            return self.settings.max_values_per_property
+        if container:
+            return 0
+        return self.settings.exploration_samples
+
+    def _collect(
+        self, prop: str, value: Any, needed: FrozenSet[str], harvested: HarvestedResponse
+    ) -> None:
+        limit = self._limit(prop, isinstance(value, (dict, list)), needed)
+        if len(harvested.values.get(prop, ())) >= limit:
+            return
+        key = value_key(value)
+        if key not in harvested._keys[prop]:
+            harvested._keys[prop].add(key)
+            harvested.values.setdefault(prop, []).append(value)
+
+    def _walk(
+        self, value: Any, depth: int, needed: FrozenSet[str], harvested: HarvestedResponse
+    ) -> None:
+        if depth > self.settings.max_depth:
+            return
+        if isinstance(value, dict):
+            harvested.has_objects = True
+            for prop, item in value.items():
+                harvested.properties[prop] = None
+                self._collect(prop, item, needed, harvested)
+                self._walk(item, depth + 1, needed, harvested)
+        elif isinstance(value, list):
+            for item in value[: self.settings.max_array_items]:
+                self._walk(item, depth + 1, needed, harvested)
+
+    # Streaming scan: each method takes the index of a value and returns the index after it.
+
+    def _scan(
+        self,
+        text: str,
+        idx: int,
+        depth: int,
+        needed: FrozenSet[str],
+        harvested: HarvestedResponse,
+        top: bool = False,
+    ) -> int:
+        if idx >= len(text):
+            raise _Truncated
+        char = text[idx]
+        if depth > self.settings.max_depth:
+            return self._skip(text, idx)
+        if char == "{":
+            harvested.has_objects = True
+            return self._scan_object(text, idx, depth, needed, harvested)
+        if char == "[" and not (top and depth):
+            return self._scan_array(text, idx, depth, needed, harvested, top)
+        if top:
+            # The body itself or an item of a top-level array.
+            value, end = _decoder.raw_decode(text, idx)
+            harvested.primitives.append(value)
+            self._walk(value, depth, needed, harvested)
+            return end
+        return self._skip(text, idx)
+
+    def _scan_object(
+        self,
+        text: str,
+        idx: int,
+        depth: int,
+        needed: FrozenSet[str],
+        harvested: HarvestedResponse,
+    ) -> int:
+        idx = _WHITESPACE.match(text, idx + 1).end()
+        if text.startswith("}", idx):
+            return idx + 1
+        while True:
+            if not text.startswith('"', idx):
+                raise _Truncated
+            prop, idx = scanstring(text, idx + 1)
+            idx = _WHITESPACE.match(text, idx).end()
+            if not text.startswith(":", idx):
+                raise _Truncated
+            idx = _WHITESPACE.match(text, idx + 1).end()
+            if idx >= len(text):
+                raise _Truncated
+            harvested.properties[prop] = None
+
+            collected = len(harvested.values.get(prop, ()))
+            if collected < self._limit(prop, text[idx] in "{[", needed):
+                # Decode just this value; nested properties are taken from the decoded object.
+                value, idx = _decoder.raw_decode(text, idx)
+                self._collect(prop, value, needed, harvested)
+                self._walk(value, depth + 1, needed, harvested)
+            else:
+                idx = self._scan(text, idx, depth + 1, needed, harvested)
+
+            idx = _WHITESPACE.match(text, idx).end()
+            if text.startswith(",", idx):
+                idx = _WHITESPACE.match(text, idx + 1).end()
+            elif text.startswith("}", idx):
+                return idx + 1
+            else:
+                raise _Truncated
+
+    def _scan_array(
+        self,
+        text: str,
+        idx: int,
+        depth: int,
+        needed: FrozenSet[str],
+        harvested: HarvestedResponse,
+        top: bool,
+    ) -> int:
+        idx = _WHITESPACE.match(text, idx + 1).end()
+        if text.startswith("]", idx):
+            return idx + 1
+        count = 0
+        while True:
+            if count < self.settings.max_array_items:
+                idx = self._scan(text, idx, depth + 1, needed, harvested, top=top)
+            elif depth == 0:
+                # Nothing after the body's own array is needed, so stop reading.
+                return len(text)
+            else:
+                idx = self._skip(text, idx)
+            count += 1
+            idx = _WHITESPACE.match(text, idx).end()
+            if text.startswith(",", idx):
+                idx = _WHITESPACE.match(text, idx + 1).end()
+            elif text.startswith("]", idx):
+                return idx + 1
+            else:
+                raise _Truncated
+
+    @staticmethod
+    def _skip(text: str, idx: int) -> int:
+        """Index after the value at ``idx``, without decoding it."""
+        if idx >= len(text):
+            raise _Truncated
+        char = text[idx]
+        if char == '"':
+            return scanstring(text, idx + 1)[1]
+        if char not in "{[":
+            return _SCALAR.match(text, idx).end()
+        nesting = 0
+        while True:
+            match = _STRUCTURE.search(text, idx)
+            if match is None:
+                raise _Truncated
+            char = match.group()
+            if char == '"':
+                idx = scanstring(text, match.end())[1]
+                continue
+            idx = match.end()
+            nesting += 1 if char in "{[" else -1
+            if nesting == 0:
+                return idx
+
+
+__all__ = ["HarvestedResponse", "ResponseHarvester"]
@@ -0,0 +1,143 @@
+import threading
+import time
+from collections import Counter, deque
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    from .marl import QLearning
+
+# Recent requests kept for the latency percentiles and the current request rate.
+LATENCY_WINDOW = 2048
+
+
+class RunStatistics:
+    """
+    Progress of request generation, updated in O(1) per request by the learning loop
+    and read by the dashboard thread through ``snapshot``.
+    """
+
+    def __init__(self, total_operations: int, time_duration: float) -> None:
+        self.total_operations = total_operations
+        self.time_duration = time_duration
+        self.start_time = time.time()
+        self.current_operation: Optional[str] = None
+        self.total_requests = 0
+        self.status_counts: Counter = Counter()
+        self.successful_operations: set[str] = set()
+        self.unique_server_errors = 0
+        self._recent: deque[tuple[float, float]] = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def start(self, start_time: float) -> None:
+        self.start_time = start_time
+
+    def record_request(self, latency: float) -> None:
+        with self._lock:
+            self.total_requests += 1
+            self._recent.append((time.time(), latency))
+
+    def record_status(self, operation_id: str, status_code: int) -> None:
+        with self._lock:
+            self.status_counts[status_code] += 1
+            if status_code // 100 == 2:
+                self.successful_operations.add(operation_id)
+
+    def record_unique_errors(self, added: int) -> None:
+        if added:
+            with self._lock:
+                self.unique_server_errors += added
+
+    def rebuild(self, q_learning: "QLearning") -> None:
+        """Recount from the learner's state, after it was replaced by a sharded merge."""
+        with self._lock:
+            self.status_counts = Counter(q_learning.responses)
+            self.successful_operations = {
+                operation_id
+                for operation_id, status_codes in q_learning.operation_response_counter.items()
+                if any(status_code // 100 == 2 for status_code in status_codes)
+            }
+            self.unique_server_errors = sum(
+                len(errors) for errors in q_learning.unique_errors.values()
+            )
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.time()
+            elapsed = now - self.start_time
+            recent = list(self._recent)
+            snapshot = {
+                "current_operation": self.current_operation,
+                "status_counts": dict(self.status_counts),
+                "unique_server_errors": self.unique_server_errors,
+                "successful_operations": len(self.successful_operations),
+                "total_operations": self.total_operations,
+                "total_requests": self.total_requests,
+                "elapsed": elapsed,
+                "time_remaining": max(self.time_duration - elapsed, 0.0),
+            }
+        latencies = sorted(latency for _, latency in recent)
+        window = now - recent[0][0] if recent else 0.0
+        snapshot["requests_per_second"] = snapshot["total_requests"] / max(elapsed, 1e-9)
+        snapshot["recent_requests_per_second"] = (
+            len(recent) / window if window > 0 else 0.0
+        )
+        snapshot["latency_p50"] = _percentile(latencies, 0.5)
+        snapshot["latency_p99"] = _percentile(latencies, 0.99)
+        return snapshot
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Dashboard:
+    """Prints a ``RunStatistics`` snapshot every ``refresh_seconds`` on a daemon thread."""
+
+    def __init__(self, stats: RunStatistics, refresh_seconds: float = 1.0) -> None:
+        self.stats = stats
+        self.refresh_seconds = max(refresh_seconds, 0.05)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="autoresttest-dashboard", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.render()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.refresh_seconds):
+            self.render()
+
+    def render(self) -> None:
+        snapshot = self.stats.snapshot()
+        total_operations = max(snapshot["total_operations"], 1)
+        time_duration = max(self.stats.time_duration, 1e-9)
+        lines = [
+            "=========================================================================",
+            f"Attempting operation: {snapshot['current_operation']}",
+            f"Status Code Counter: {snapshot['status_counts']}",
+            f"Number of unique server errors: {snapshot['unique_server_errors']}",
+            f"Number of successful operations: {snapshot['successful_operations']}",
+            f"Percentage of successful operations: {snapshot['successful_operations'] / total_operations * 100:.2f}%",
+            f"Requests sent: {snapshot['total_requests']} "
+            f"({snapshot['requests_per_second']:.2f}/s overall, "
+            f"{snapshot['recent_requests_per_second']:.2f}/s recent)",
+            f"Latency p50: {snapshot['latency_p50'] * 1000:.1f} ms, "
+            f"p99: {snapshot['latency_p99'] * 1000:.1f} ms",
+            f"Time remaining: {max(round(snapshot['time_remaining'], 3), 0.01)}",
+            f"Percentage of time elapsed: {min(snapshot['elapsed'] / time_duration, 1) * 100:.2f}%",
+        ]
+        # One write per refresh, so output from other threads is not interleaved mid-block.
+        print("\n".join(lines), flush=True)
+
+
+__all__ = ["Dashboard", "RunStatistics"]
@@ -0,0 +1,153 @@
+import random
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    from autoresttest.utils import ValueBucket
+    from .marl import QLearning
+
+# (location, operation_id, parameter or property, value)
+PoolDraw = tuple[str, str, Any, Any]
+
+
+class FenwickTree:
+    """Prefix sums over a growable list of non-negative integer weights."""
+
+    def __init__(self) -> None:
+        self._tree = [0]
+        self._weights: list[int] = []
+        self.total = 0
+
+    def __len__(self) -> int:
+        return len(self._weights)
+
+    def weight(self, index: int) -> int:
+        return self._weights[index]
+
+    def prefix(self, index: int) -> int:
+        """Sum of the first ``index`` weights."""
+        total = 0
+        while index > 0:
+            total += self._tree[index]
+            index -= index & -index
+        return total
+
+    def append(self, weight: int) -> int:
+        position = len(self._weights) + 1
+        # The new node covers the weights (position - lowbit, position].
+        covered = self.prefix(position - 1) - self.prefix(position - (position & -position))
+        self._tree.append(covered + weight)
+        self._weights.append(weight)
+        self.total += weight
+        return position - 1
+
+    def update(self, index: int, weight: int) -> None:
+        delta = weight - self._weights[index]
+        if not delta:
+            return
+        self._weights[index] = weight
+        self.total += delta
+        position = index + 1
+        while position < len(self._tree):
+            self._tree[position] += delta
+            position += position & -position
+
+    def find(self, target: int) -> int:
+        """Index ``i`` with ``prefix(i) <= target < prefix(i + 1)``, for ``0 <= target < total``."""
+        position = 0
+        step = 1 << (len(self._weights).bit_length() - 1) if self._weights else 0
+        while step:
+            following = position + step
+            if following < len(self._tree) and self._tree[following] <= target:
+                position = following
+                target -= self._tree[following]
+            step >>= 1
+        return position
+
+
+class SuccessfulValuePool:
+    """
+    Draws a value uniformly among all successful values of the operations other
+    than the current one, without listing them. Operations are weighted by their
+    number of stored values in one Fenwick tree, and each operation's value
+    buckets by their size in another, so a draw and a bucket size change are both
+    O(log n). ``QLearning`` reports size changes through ``update``.
+    """
+
+    def __init__(self) -> None:
+        self._operations = FenwickTree()
+        self._operation_ids: list[str] = []
+        self._operation_index: dict[str, int] = {}
+        self._buckets: list[FenwickTree] = []
+        self._bucket_entries: list[list[tuple[str, Any, "ValueBucket"]]] = []
+        self._bucket_index: dict[tuple[str, str, Any], tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return self._operations.total
+
+    def update(
+        self, location: str, operation_id: str, key: Any, bucket: "ValueBucket"
+    ) -> None:
+        """Record the current size of the bucket holding ``operation_id``'s values for ``key``."""
+        position = self._bucket_index.get((location, operation_id, key))
+        if position is None:
+            operation_idx = self._operation_index.get(operation_id)
+            if operation_idx is None:
+                operation_idx = self._operations.append(0)
+                self._operation_ids.append(operation_id)
+                self._operation_index[operation_id] = operation_idx
+                self._buckets.append(FenwickTree())
+                self._bucket_entries.append([])
+            bucket_idx = self._buckets[operation_idx].append(0)
+            self._bucket_entries[operation_idx].append((location, key, bucket))
+            position = (operation_idx, bucket_idx)
+            self._bucket_index[(location, operation_id, key)] = position
+        operation_idx, bucket_idx = position
+        self._bucket_entries[operation_idx][bucket_idx] = (location, key, bucket)
+        buckets = self._buckets[operation_idx]
+        buckets.update(bucket_idx, len(bucket))
+        self._operations.update(operation_idx, buckets.total)
+
+    def rebuild(self, q_learning: "QLearning") -> None:
+        """Re-index the learner's stores, after they were replaced by a sharded merge."""
+        self.__init__()
+        for location, stores in (
+            ("params", q_learning.successful_parameters),
+            ("body", q_learning.successful_bodies),
+            ("response", q_learning.successful_responses),
+        ):
+            for operation_id, operation_values in stores.items():
+                for key, bucket in (operation_values or {}).items():
+                    if bucket:
+                        self.update(location, operation_id, key, bucket)
+
+    def size(self, exclude: Optional[str] = None) -> int:
+        """Number of values stored for operations other than ``exclude``."""
+        excluded_idx = self._operation_index.get(exclude) if exclude else None
+        if excluded_idx is None:
+            return self._operations.total
+        return self._operations.total - self._operations.weight(excluded_idx)
+
+    def sample(self, exclude: Optional[str] = None) -> Optional[PoolDraw]:
+        """A uniformly drawn value not stored for ``exclude``, or ``None`` if there is none."""
+        excluded_weight, excluded_start = 0, 0
+        excluded_idx = self._operation_index.get(exclude) if exclude else None
+        if excluded_idx is not None:
+            excluded_weight = self._operations.weight(excluded_idx)
+            excluded_start = self._operations.prefix(excluded_idx)
+        remaining = self._operations.total - excluded_weight
+        if remaining <= 0:
+            return None
+        target = random.randrange(remaining)
+        if target >= excluded_start:
+            target += excluded_weight
+
+        operation_idx = self._operations.find(target)
+        target -= self._operations.prefix(operation_idx)
+        buckets = self._buckets[operation_idx]
+        bucket_idx = buckets.find(target)
+        offset = target - buckets.prefix(bucket_idx)
+        location, key, bucket = self._bucket_entries[operation_idx][bucket_idx]
+        return location, self._operation_ids[operation_idx], key, bucket[offset]
+
+
+__all__ = ["FenwickTree", "PoolDraw", "SuccessfulValuePool"]
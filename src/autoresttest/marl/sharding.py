@@ -0,0 +1,379 @@
+import copy
+import multiprocessing
+import random
+import time
+from collections import defaultdict
+from collections.abc import Mapping, MutableMapping
+from typing import TYPE_CHECKING, Any, Dict, List
+
+import numpy as np
+
+from autoresttest.agents.action_table import LazyActionTable
+from autoresttest.transport import close_http_sessions, get_rate_limiter
+
+if TYPE_CHECKING:
+    from autoresttest.config.config import ShardingConfig
+    from .marl import QLearning
+
+# Q-tables: numeric changes since the last merge are summed across workers.
+LEARNED_STATE = (
+    "operation",
+    "parameter",
+    "body_object",
+    "data_source",
+    "header",
+    "value",
+    "dependency",
+)
+# Collections of observed values: merged by union.
+COLLECTED_STATE = (
+    "data_sources",
+    "successful_parameters",
+    "successful_bodies",
+    "successful_responses",
+    "successful_primitives",
+    "unique_errors",
+)
+# Records per key (an error class and its example): the first worker's record is kept
+# whole, since combining two workers' records would describe no real response.
+KEYED_STATE = ("error_classes",)
+# Counters: changes since the last merge are summed, new keys start at zero.
+COUNTED_STATE = (
+    "responses",
+    "operation_response_counter",
+    "errors",
+    "error_class_counts",
+    "phase_timings",
+    "rate_limit",
+)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def merge_learned(base: Any, values: List[Any]) -> Any:
+    """
+    Merge worker copies of a Q-table into ``base``.
+
+    Numeric leaves become ``base + sum(value - base)``. Keys or list items
+    that are not in ``base`` are taken from the first worker that has them.
+    """
+    if not values:
+        return copy.deepcopy(base)
+
+    if isinstance(base, LazyActionTable):
+        # Unassigned combinations hold the default on every worker; merge only the rest.
+        table = copy.deepcopy(base)
+        lazy_values = [value for value in values if isinstance(value, LazyActionTable)]
+        assigned = dict.fromkeys(base.assigned())
+        for value in lazy_values:
+            assigned.update(dict.fromkeys(value.assigned()))
+        for key in assigned:
+            key_values = [value[key] for value in lazy_values if key in value]
+            table[key] = (
+                merge_learned(base[key], key_values)
+                if key in base
+                else copy.deepcopy(key_values[0])
+            )
+        return table
+
+    if isinstance(base, Mapping):
+        merged: Dict[Any, Any] = {}
+        for key, base_value in base.items():
+            key_values = [
+                value[key]
+                for value in values
+                if isinstance(value, Mapping) and key in value
+            ]
+            merged[key] = merge_learned(base_value, key_values)
+        for value in values:
+            if not isinstance(value, Mapping):
+                continue
+            for key in value:
+                if key in merged:
+                    continue
+                key_values = [
+                    other[key]
+                    for other in values
+                    if isinstance(other, Mapping) and key in other
+                ]
+                if all(isinstance(key_value, Mapping) for key_value in key_values):
+                    merged[key] = merge_learned({}, key_values)
+                else:
+                    merged[key] = copy.deepcopy(key_values[0])
+        if isinstance(base, MutableMapping) and not isinstance(base, dict):
+            # Keep the table's storage type (e.g. array-backed action tables).
+            table = copy.deepcopy(base)
+            table.update(merged)
+            return table
+        return merged
+
+    if isinstance(base, list):
+        lists = [value for value in values if isinstance(value, list)]
+        merged_list = [
+            merge_learned(item, [value[idx] for value in lists if idx < len(value)])
+            for idx, item in enumerate(base)
+        ]
+        longest = max((len(value) for value in lists), default=0)
+        for idx in range(len(base), longest):
+            first = next(value for value in lists if idx < len(value))
+            merged_list.append(copy.deepcopy(first[idx]))
+        return merged_list
+
+    if _is_number(base):
+        return base + sum(value - base for value in values if _is_number(value))
+
+    for value in values:
+        if value != base:
+            return copy.deepcopy(value)
+    return copy.deepcopy(base)
+
+
+def _union_into(target: Any, source: Any) -> Any:
+    if isinstance(target, dict) and isinstance(source, Mapping):
+        for key, value in source.items():
+            if key in target:
+                target[key] = _union_into(target[key], value)
+            else:
+                target[key] = copy.deepcopy(value)
+        return target
+    if isinstance(target, list) and isinstance(source, list):
+        for item in source:
+            if item not in target:
+                target.append(copy.deepcopy(item))
+        return target
+    return target
+
+
+def merge_collected(base: Any, values: List[Any]) -> Any:
+    """Union worker collections into ``base``; lists keep first-seen order without duplicates."""
+    merged = copy.deepcopy(base)
+    for value in values:
+        merged = _union_into(merged, value)
+    return merged
+
+
+def merge_first_seen(base: Mapping, values: List[Mapping]) -> Dict[Any, Any]:
+    """Keys of ``base`` keep their record; new keys take the first worker's record unchanged."""
+    merged = copy.deepcopy(dict(base))
+    for value in values:
+        for key, record in value.items():
+            if key not in merged:
+                merged[key] = copy.deepcopy(record)
+    return merged
+
+
+def merge_counts(base: Mapping, values: List[Mapping]) -> Dict[Any, Any]:
+    """Add each worker's counter changes since ``base``."""
+    keys = dict.fromkeys(list(base) + [key for value in values for key in value])
+    merged: Dict[Any, Any] = {}
+    for key in keys:
+        base_value = base.get(key)
+        key_values = [value[key] for value in values if key in value]
+        if isinstance(base_value, Mapping) or (
+            base_value is None and key_values and isinstance(key_values[0], Mapping)
+        ):
+            merged[key] = merge_counts(base_value or {}, key_values)
+        else:
+            start = base_value or 0
+            merged[key] = start + sum(value - start for value in key_values)
+    return merged
+
+
+def merge_state(base: Dict[str, Any], states: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge worker snapshots taken by ``capture_state`` against the last merged snapshot."""
+    merged: Dict[str, Any] = {}
+    for name in LEARNED_STATE:
+        merged[name] = merge_learned(base[name], [state[name] for state in states])
+    for name in COLLECTED_STATE:
+        merged[name] = merge_collected(base[name], [state[name] for state in states])
+    for name in KEYED_STATE:
+        merged[name] = merge_first_seen(base[name], [state[name] for state in states])
+    for name in COUNTED_STATE:
+        merged[name] = merge_counts(base[name], [state[name] for state in states])
+    return merged
+
+
+def capture_state(q_learning: "QLearning") -> Dict[str, Any]:
+    return {
+        "operation": q_learning.operation_agent.q_table,
+        "parameter": q_learning.parameter_agent.q_table,
+        "body_object": q_learning.body_object_agent.q_table,
+        "data_source": q_learning.data_source_agent.q_table,
+        "header": q_learning.header_agent.q_table,
+        "value": q_learning.value_agent.q_table,
+        "dependency": q_learning.dependency_agent.q_table,
+        "data_sources": q_learning.data_source_agent.available_data_sources,
+        "successful_parameters": q_learning.successful_parameters,
+        "successful_bodies": q_learning.successful_bodies,
+        "successful_responses": q_learning.successful_responses,
+        "successful_primitives": q_learning.successful_primitives,
+        "unique_errors": q_learning.unique_errors,
+        "error_classes": q_learning.error_classes,
+        "error_class_counts": q_learning.error_class_counts,
+        "phase_timings": q_learning.phase_timer.phases,
+        "responses": dict(q_learning.responses),
+        "operation_response_counter": q_learning.operation_response_counter,
+        "errors": q_learning.errors,
+        "rate_limit": dict(get_rate_limiter().stats),
+    }
+
+
+def apply_state(
+    q_learning: "QLearning", state: Dict[str, Any], shard: List[str] | None = None
+) -> None:
+    operation_table = state["operation"]
+    if shard is not None:
+        operation_table = {
+            operation_id: q_value
+            for operation_id, q_value in operation_table.items()
+            if operation_id in shard
+        }
+    q_learning.operation_agent.q_table = operation_table
+    q_learning.parameter_agent.q_table = state["parameter"]
+    q_learning.body_object_agent.q_table = state["body_object"]
+    q_learning.data_source_agent.q_table = state["data_source"]
+    q_learning.header_agent.q_table = state["header"]
+    q_learning.value_agent.q_table = state["value"]
+    q_learning.dependency_agent.q_table = state["dependency"]
+    q_learning.response_harvester.invalidate()
+    q_learning.data_source_agent.available_data_sources = state["data_sources"]
+    q_learning.successful_parameters = state["successful_parameters"]
+    q_learning.successful_bodies = state["successful_bodies"]
+    q_learning.successful_responses = state["successful_responses"]
+    q_learning.successful_primitives = state["successful_primitives"]
+    q_learning.unique_errors = state["unique_errors"]
+    q_learning.error_classes = state["error_classes"]
+    q_learning.error_class_counts = state["error_class_counts"]
+    q_learning.phase_timer.phases = state["phase_timings"]
+    q_learning.responses = defaultdict(int, state["responses"])
+    q_learning.operation_response_counter = state["operation_response_counter"]
+    q_learning.errors = state["errors"]
+    get_rate_limiter().stats.update(state["rate_limit"])
+    q_learning.run_stats.rebuild(q_learning)
+    q_learning.dependency_agent.rebuild_availability(q_learning)
+    q_learning.successful_pool.rebuild(q_learning)
+
+
+def assign_shards(q_learning: "QLearning", workers: int, mode: str) -> List[List[str]]:
+    """
+    Split the operations round-robin across workers.
+
+    In ``overlapping`` mode a worker also gets the operations its own operations
+    depend on, so it can produce the values it consumes.
+    """
+    operation_ids = list(q_learning.operation_agent.q_table.keys())
+    shards = [operation_ids[idx::workers] for idx in range(workers)]
+    if mode == "overlapping":
+        operation_nodes = q_learning.operation_graph.operation_nodes
+        for shard in shards:
+            for operation_id in list(shard):
+                for edge in operation_nodes[operation_id].outgoing_edges:
+                    dependent_id = edge.destination.operation_id
+                    if dependent_id not in shard and dependent_id in operation_ids:
+                        shard.append(dependent_id)
+    return [shard for shard in shards if shard]
+
+
+class ShardCoordinator:
+    """
+    Runs the Q-learning loop in forked worker processes, one per operation shard.
+
+    Every ``merge_interval`` seconds each worker sends its state and waits; the
+    coordinator merges all states against the previous merge and sends the
+    result back. The final merge is applied to the parent ``QLearning`` so the
+    report and Q-table outputs are produced exactly as in a single-process run.
+    """
+
+    def __init__(self, q_learning: "QLearning", config: "ShardingConfig") -> None:
+        self.q_learning = q_learning
+        self.workers = config.workers
+        self.merge_interval = config.merge_interval
+        self.mode = config.mode
+
+    def run(self) -> None:
+        if "fork" not in multiprocessing.get_all_start_methods():
+            print(
+                "Sharded workers require the 'fork' start method; running in a single process."
+            )
+            self.q_learning.run_local()
+            return
+
+        shards = assign_shards(self.q_learning, self.workers, self.mode)
+        if len(shards) < 2:
+            self.q_learning.run_local()
+            return
+
+        context = multiprocessing.get_context("fork")
+        start_time = time.time()
+        connections = {}
+        processes = []
+        for worker_idx, shard in enumerate(shards):
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(
+                target=self._worker,
+                args=(worker_idx, shard, child_conn, random.randrange(2**32)),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            connections[worker_idx] = parent_conn
+            processes.append(process)
+        print(
+            f"Started {len(shards)} sharded workers ({self.mode}) over "
+            f"{sum(len(shard) for shard in shards)} operation assignments."
+        )
+
+        base = copy.deepcopy(capture_state(self.q_learning))
+        merges = 0
+        while connections:
+            messages = {}
+            for worker_idx, conn in list(connections.items()):
+                try:
+                    messages[worker_idx] = conn.recv()
+                except EOFError:
+                    print(f"Sharded worker {worker_idx} exited without reporting.")
+                    del connections[worker_idx]
+
+            base = merge_state(base, [state for _, state in messages.values()])
+            merges += 1
+
+            for worker_idx, (kind, _) in messages.items():
+                if kind == "sync":
+                    connections[worker_idx].send(base)
+                else:
+                    connections.pop(worker_idx).close()
+
+        for process in processes:
+            process.join()
+
+        apply_state(self.q_learning, base)
+        self.q_learning.elapsed_time = time.time() - start_time
+        print(f"Merged sharded worker state {merges} times.")
+
+    def _worker(self, worker_idx: int, shard: List[str], conn, seed: int) -> None:
+        q_learning = self.q_learning
+        # Pooled connections belong to the parent process.
+        close_http_sessions()
+        random.seed(seed)
+        np.random.seed(seed % 2**32)
+        q_learning.show_progress = q_learning.show_progress and worker_idx == 0
+        apply_state(q_learning, capture_state(q_learning), shard)
+
+        last_merge = time.time()
+
+        def sync_hook() -> None:
+            nonlocal last_merge
+            if time.time() - last_merge < self.merge_interval:
+                return
+            conn.send(("sync", capture_state(q_learning)))
+            apply_state(q_learning, conn.recv(), shard)
+            last_merge = time.time()
+
+        q_learning.step_hooks.append(sync_hook)
+        try:
+            q_learning.run_local()
+        finally:
+            conn.send(("final", capture_state(q_learning)))
+            conn.close()
@@ -25,6 +25,7 @@ from .generator_prompts import (
     FIX_JSON_OBJ,
     IDENTIFY_AUTHENTICATION_GEN_PROMPT,
     INFORMED_VALUE_AGENT_PROMPT,
+    UPSTREAM_RESPONSES_PROMPT,
     PARAMETER_NECESSITY_PROMPT,
     PARAMETER_REQUIREMENTS_PROMPT,
     PARAMETERS_GEN_PROMPT,
@@ -36,6 +37,7 @@ from .generator_prompts import (
     VALUE_AGENT_PARAMS_FEWSHOT_PROMPT,
     get_informed_agent_body_prompt,
     get_informed_agent_params_prompt,
+    get_upstream_responses_prompt,
     get_value_agent_body_prompt,
     get_value_agent_params_prompt,
     template_gen_prompt,
@@ -71,6 +73,7 @@ __all__ = [
     "IDENTIFY_AUTHENTICATION_GEN_PROMPT",
     "IDENTIFY_AUTHENTICATION_SYSTEM_MESSAGE",
     "INFORMED_VALUE_AGENT_PROMPT",
+    "UPSTREAM_RESPONSES_PROMPT",
     "MESSAGE_HEADER",
     "PARAMETER_CONSTRAINT_IDENTIFICATION_PREFIX",
     "PARAMETER_NECESSITY_PROMPT",
@@ -86,6 +89,7 @@ __all__ = [
     "VALUE_AGENT_PARAMS_FEWSHOT_PROMPT",
     "get_informed_agent_body_prompt",
     "get_informed_agent_params_prompt",
+    "get_upstream_responses_prompt",
     "get_value_agent_body_prompt",
     "get_value_agent_params_prompt",
     "template_gen_prompt",
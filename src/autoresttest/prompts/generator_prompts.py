@@ -70,6 +70,10 @@ To better inform your generation, here is a list of [replace_type] that you gene
 Status codes that indicate a successful operation are of the form 2XX. Status codes that indicate a failed operation are of the form 4XX or 5XX. Use the responses to determine if the values you generated were correct or incorrect. You only need to consider server responses that indicate problems with parameter values, and not anything else.
 """
 
+UPSTREAM_RESPONSES_PROMPT = """
+The following successful responses come from other operations of this API that this operation depends on. Where a [replace_type] refers to a resource or value returned below (for example an identifier), prefer generating values that reuse it.
+"""
+
 VALUE_AGENT_PARAMS_FEWSHOT_PROMPT = """
 EXAMPLE 1
 SPECIFICATION:
@@ -333,3 +337,8 @@ def get_informed_agent_body_prompt() -> str:
 
 def get_informed_agent_params_prompt() -> str:
     return INFORMED_VALUE_AGENT_PROMPT.replace("[replace_type]", "parameters")
+
+def get_upstream_responses_prompt(is_request_body: bool) -> str:
+    return UPSTREAM_RESPONSES_PROMPT.replace(
+        "[replace_type]", "request body property" if is_request_body else "parameter"
+    )
@@ -1,6 +1,9 @@
+from .parse_cache import ParsedSpecification, spec_fingerprint
 from .specification_parser import LenientResolvingParser, SpecificationParser
 
 __all__ = [
     "LenientResolvingParser",
+    "ParsedSpecification",
     "SpecificationParser",
+    "spec_fingerprint",
 ]
@@ -0,0 +1,105 @@
+"""On-disk cache of parsed specifications, keyed by the content of the spec and its references."""
+
+import hashlib
+import logging
+import os
+import pickle
+import re
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import unquote, urlparse
+
+from autoresttest.config import PROJECT_ROOT, get_config
+from autoresttest.models import OperationProperties
+
+CONFIG = get_config()
+
+SPEC_CACHE_DIR = PROJECT_ROOT / "cache" / "specs"
+
+# Bump when parse_specification or the models change shape so stale entries are ignored.
+PARSE_CACHE_VERSION = 1
+
+# External references: "$ref": "other.yaml#/components/..." (JSON or YAML, quoted or not).
+_EXTERNAL_REF = re.compile(r"""["']?\$ref["']?\s*:\s*["']?([^"'\s#,}]+)""")
+
+
+@dataclass
+class ParsedSpecification:
+    operations: Dict[str, OperationProperties]
+    server_url: Optional[str]
+    server_url_error: Optional[str]
+    title: Optional[str]
+
+
+def _referenced_files(spec_path: Path) -> List[Path]:
+    """The spec file followed by every local file reachable through external ``$ref``s."""
+    pending = [spec_path.resolve()]
+    seen: List[Path] = []
+    while pending:
+        path = pending.pop()
+        if path in seen or not path.is_file():
+            continue
+        seen.append(path)
+        try:
+            text = path.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            continue
+        for target in _EXTERNAL_REF.findall(text):
+            parsed = urlparse(target)
+            if parsed.scheme not in ("", "file"):
+                # Remote references are not tracked; set parse_cache = false if they change.
+                continue
+            pending.append((path.parent / unquote(parsed.path)).resolve())
+    return seen
+
+
+def spec_fingerprint(spec_path: str | os.PathLike) -> str:
+    """Hash of the spec, the local files it references, and the parser settings."""
+    digest = hashlib.sha256()
+    digest.update(
+        f"v{PARSE_CACHE_VERSION}|{CONFIG.recursion_limit}|{CONFIG.strict_validation}".encode()
+    )
+    root = Path(spec_path).resolve()
+    for path in sorted(_referenced_files(root)):
+        digest.update(os.path.relpath(path, root.parent).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _cache_path(fingerprint: str) -> Path:
+    return SPEC_CACHE_DIR / f"{fingerprint}.bin"
+
+
+def load_parsed_spec(fingerprint: str) -> Optional[ParsedSpecification]:
+    path = _cache_path(fingerprint)
+    if not path.exists():
+        return None
+    try:
+        parsed = pickle.loads(zlib.decompress(path.read_bytes()))
+    except Exception as exc:  # corrupt or written by an incompatible version
+        logging.warning("Ignoring unreadable spec parse cache %s: %s", path, exc)
+        return None
+    return parsed if isinstance(parsed, ParsedSpecification) else None
+
+
+def store_parsed_spec(fingerprint: str, parsed: ParsedSpecification) -> None:
+    SPEC_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = _cache_path(fingerprint)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_bytes(
+        zlib.compress(pickle.dumps(parsed, protocol=pickle.HIGHEST_PROTOCOL))
+    )
+    os.replace(tmp_path, path)
+
+
+__all__ = [
+    "ParsedSpecification",
+    "SPEC_CACHE_DIR",
+    "spec_fingerprint",
+    "load_parsed_spec",
+    "store_parsed_spec",
+]
@@ -1,6 +1,8 @@
+import copy
 import json
 import logging
 import os
+import pickle
 import re
 from pathlib import Path
 from typing import Any, Dict, List, Set
@@ -21,6 +23,13 @@ from autoresttest.models import (
     to_dict_helper,
 )
 
+from .parse_cache import (
+    ParsedSpecification,
+    load_parsed_spec,
+    spec_fingerprint,
+    store_parsed_spec,
+)
+
 
 def json_spec_output(output_directory: Path, file_name: str, spec: Dict):
     """
@@ -88,6 +97,9 @@ class LenientResolvingParser(ResolvingParser):
 class SpecificationParser:
     """
     Class to parse a specification file and return a dictionary of all the operations and their properties.
+
+    When ``[spec].parse_cache`` is enabled, the parsed operations, server URL and title
+    are cached on disk keyed by ``spec_fingerprint``; a warm start never runs prance.
     """
 
     def __init__(self, spec_path=None, spec_name=None):
@@ -96,15 +108,45 @@ class SpecificationParser:
         if spec_path is None:
             raise ValueError("No specification path provided.")
 
-        self.resolving_parser = self._build_resolving_parser(spec_path)
-        if self.resolving_parser.specification is None:
-            raise ValueError("An error occurred during Prance specification parsing.")
+        self._resolving_parser = None
+        self._fingerprint: str | None = None
+        self._parsed: ParsedSpecification | None = None
+        if CONFIG.spec.parse_cache:
+            try:
+                self._fingerprint = spec_fingerprint(spec_path)
+                self._parsed = load_parsed_spec(self._fingerprint)
+            except OSError as exc:
+                logging.warning("Spec parse cache unavailable: %s", exc)
+                self._fingerprint = None
+        self.from_cache = self._parsed is not None
+
+        if self._parsed is None:
+            if self.resolving_parser.specification is None:
+                raise ValueError(
+                    "An error occurred during Prance specification parsing."
+                )
+            if self._fingerprint is not None:
+                # Written now: with a cached graph, parse_specification may never run.
+                self._store_parse_cache(self._parse_operations())
 
         self.directory_path = (
             "specs/aratrl-openapi/"  # DEPRECATED - NOT USED IN EXECUTION
         )
         self.all_specs = {}
 
+    @property
+    def resolving_parser(self):
+        # Built on first use so a parse cache hit skips prance entirely.
+        if self._resolving_parser is None:
+            self._resolving_parser = self._build_resolving_parser(self.spec_path)
+        return self._resolving_parser
+
+    @resolving_parser.setter
+    def resolving_parser(self, parser) -> None:
+        self._resolving_parser = parser
+        self._parsed = None
+        self._fingerprint = None
+
     def _build_resolving_parser(self, spec_path):
         parser_cls = (
             ResolvingParser if CONFIG.strict_validation else LenientResolvingParser
@@ -121,6 +163,10 @@ class SpecificationParser:
         """
         Extract the server URL from the specification file.
         """
+        if self._parsed is not None:
+            if self._parsed.server_url is None:
+                raise ValueError(self._parsed.server_url_error)
+            return self._parsed.server_url
         spec = self.resolving_parser.specification
         if spec is None:
             raise ValueError("Specification not initialized successfully.")
@@ -139,6 +185,8 @@ class SpecificationParser:
         """
         Extract the title of the API from the specification file.
         """
+        if self._parsed is not None:
+            return self._parsed.title
         spec = self.resolving_parser.specification
         if spec is None:
             return None
@@ -432,6 +480,31 @@ class SpecificationParser:
 
         The key of the dictionary is the operationId and the value is an OperationProperties object.
         """
+        if self._parsed is not None:
+            return copy.deepcopy(self._parsed.operations)
+        return self._parse_operations()
+
+    def _store_parse_cache(
+        self, operation_collection: Dict[str, OperationProperties]
+    ) -> None:
+        try:
+            server_url, server_url_error = self.get_api_url(), None
+        except ValueError as exc:
+            server_url, server_url_error = None, str(exc)
+        parsed = ParsedSpecification(
+            operations=copy.deepcopy(operation_collection),
+            server_url=server_url,
+            server_url_error=server_url_error,
+            title=self.get_api_title(),
+        )
+        try:
+            store_parsed_spec(self._fingerprint, parsed)
+        except (OSError, TypeError, AttributeError, pickle.PicklingError) as exc:
+            logging.warning("Could not write the spec parse cache: %s", exc)
+            return
+        self._parsed = parsed
+
+    def _parse_operations(self) -> Dict[str, OperationProperties]:
         supported_methods = {"get", "post", "put", "delete", "head", "options", "patch"}
         operation_collection = {}
         seen_ids: Set[str] = set()
@@ -0,0 +1,23 @@
+"""HTTP transport helpers shared by the agents, request generator, and ablations."""
+
+from .in_process import ASGIAdapter, WSGIAdapter, load_app
+from .rate_limiter import RateLimiter, TokenBucket, get_rate_limiter
+from .session import (
+    close_http_sessions,
+    get_http_method,
+    get_http_session,
+    session_key,
+)
+
+__all__ = [
+    "ASGIAdapter",
+    "close_http_sessions",
+    "get_http_method",
+    "get_http_session",
+    "get_rate_limiter",
+    "RateLimiter",
+    "session_key",
+    "TokenBucket",
+    "WSGIAdapter",
+    "load_app",
+]
@@ -0,0 +1,368 @@
+"""Requests adapters that call a Python ASGI or WSGI app in-process instead of over a socket."""
+
+import asyncio
+import concurrent.futures
+import importlib
+import io
+import os
+import sys
+import threading
+import traceback
+from http import HTTPStatus
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote_to_bytes, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# (status code, reason, headers, body)
+AppResponse = Tuple[int, str, List[Tuple[str, str]], bytes]
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def load_app(path: str, app_dir: str = "") -> Any:
+    """Import ``module:attribute`` (the attribute may be dotted), like uvicorn and gunicorn."""
+    module_name, _, attribute = path.partition(":")
+    if not module_name or not attribute:
+        raise ValueError(
+            f"[transport].app must look like 'module:attribute', got {path!r}"
+        )
+    if app_dir and app_dir not in sys.path:
+        sys.path.insert(0, app_dir)
+    app: Any = importlib.import_module(module_name)
+    for name in attribute.split("."):
+        app = getattr(app, name)
+    if not callable(app):
+        raise TypeError(f"[transport].app {path!r} is not an ASGI or WSGI callable")
+    return app
+
+
+def _build_response(
+    request: requests.PreparedRequest, adapter: BaseAdapter, result: AppResponse
+) -> requests.Response:
+    status_code, reason, headers, body = result
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = reason
+    response.headers = CaseInsensitiveDict()
+    for name, value in headers:
+        # Repeated headers are folded the way urllib3 folds them for the socket path.
+        if name in response.headers:
+            response.headers[name] = f"{response.headers[name]}, {value}"
+        else:
+            response.headers[name] = value
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.raw = io.BytesIO(body)
+    response._content = body
+    response._content_consumed = True
+    response.url = request.url or ""
+    response.request = request
+    response.connection = adapter
+    return response
+
+
+def _request_parts(request: requests.PreparedRequest) -> Tuple[Any, bytes]:
+    body = request.body or b""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    elif not isinstance(body, bytes):
+        # Streamed bodies (file-like objects or generators).
+        body = body.read() if hasattr(body, "read") else b"".join(body)
+    return urlsplit(request.url or ""), body
+
+
+def _reason(status: int) -> str:
+    try:
+        return HTTPStatus(status).phrase
+    except ValueError:
+        return ""
+
+
+def _server_error() -> AppResponse:
+    # What a server in front of the app answers when the app raises.
+    traceback.print_exc()
+    return (
+        500,
+        "Internal Server Error",
+        [("Content-Type", "text/plain; charset=utf-8")],
+        b"Internal Server Error",
+    )
+
+
+class WSGIAdapter(BaseAdapter):
+    """Calls a WSGI app with an environ built from each prepared request."""
+
+    def __init__(self, app: Callable[..., Any]) -> None:
+        super().__init__()
+        self.app = app
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream=False,
+        timeout=None,
+        verify=True,
+        cert=None,
+        proxies=None,
+    ) -> requests.Response:
+        return _build_response(request, self, self._call(request))
+
+    def _call(self, request: requests.PreparedRequest) -> AppResponse:
+        parts, body = _request_parts(request)
+        environ: Dict[str, Any] = {
+            "REQUEST_METHOD": request.method or "GET",
+            "SCRIPT_NAME": "",
+            "PATH_INFO": unquote_to_bytes(parts.path or "/").decode("latin-1"),
+            "QUERY_STRING": parts.query,
+            "SERVER_NAME": parts.hostname or "localhost",
+            "SERVER_PORT": str(parts.port or _DEFAULT_PORTS.get(parts.scheme, 80)),
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "REMOTE_ADDR": "127.0.0.1",
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": parts.scheme or "http",
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        for name, value in request.headers.items():
+            key = name.upper().replace("-", "_")
+            if key == "CONTENT_TYPE":
+                environ["CONTENT_TYPE"] = value
+            elif key != "CONTENT_LENGTH":
+                key = f"HTTP_{key}"
+                environ[key] = f"{environ[key]},{value}" if key in environ else value
+
+        started: List[Any] = []
+        chunks: List[bytes] = []
+
+        def start_response(status: str, headers: List[Tuple[str, str]], exc_info=None):
+            if exc_info and started:
+                raise exc_info[1].with_traceback(exc_info[2])
+            started[:] = [status, headers]
+            return chunks.append
+
+        try:
+            result = self.app(environ, start_response)
+            try:
+                for chunk in result:
+                    if chunk:
+                        chunks.append(chunk)
+            finally:
+                close = getattr(result, "close", None)
+                if close is not None:
+                    close()
+        except Exception:
+            return _server_error()
+        if not started:
+            return _server_error()
+
+        status, headers = started
+        code, _, reason = status.partition(" ")
+        return int(code), reason, list(headers), b"".join(chunks)
+
+    def close(self) -> None:
+        pass
+
+
+class ASGIAdapter(BaseAdapter):
+    """
+    Runs an ASGI app on an event loop owned by a daemon thread, so the app's
+    lifespan state and async clients live on one loop for the whole run. Calls
+    from several sender threads are scheduled onto that loop and run concurrently.
+    """
+
+    def __init__(self, app: Callable[..., Any]) -> None:
+        super().__init__()
+        self.app = app
+        self.state: Dict[str, Any] = {}
+        self._pid = os.getpid()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="autoresttest-asgi", daemon=True
+        )
+        self._thread.start()
+        self._shutdown: Optional[asyncio.Event] = None
+        self._lifespan: Optional["asyncio.Future[Any]"] = None
+        self._run(self._startup())
+
+    def _run(self, coroutine, timeout: Optional[float] = None) -> Any:
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result(timeout)
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream=False,
+        timeout=None,
+        verify=True,
+        cert=None,
+        proxies=None,
+    ) -> requests.Response:
+        if isinstance(timeout, tuple):
+            timeout = timeout[1]
+        future = asyncio.run_coroutine_threadsafe(self._call(request), self._loop)
+        try:
+            result = future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise requests.exceptions.ReadTimeout(
+                f"ASGI app did not respond within {timeout}s", request=request
+            )
+        return _build_response(request, self, result)
+
+    async def _startup(self) -> None:
+        self._shutdown = asyncio.Event()
+        started = self._loop.create_future()
+        sent_startup = False
+
+        async def receive() -> Dict[str, Any]:
+            nonlocal sent_startup
+            if not sent_startup:
+                sent_startup = True
+                return {"type": "lifespan.startup"}
+            await self._shutdown.wait()
+            return {"type": "lifespan.shutdown"}
+
+        async def send(message: Dict[str, Any]) -> None:
+            if message["type"] == "lifespan.startup.failed":
+                print(f"ASGI app failed to start: {message.get('message', '')}")
+            if message["type"].startswith("lifespan.startup") and not started.done():
+                started.set_result(None)
+
+        scope = {
+            "type": "lifespan",
+            "asgi": {"version": "3.0", "spec_version": "2.0"},
+            "state": self.state,
+        }
+        self._lifespan = asyncio.ensure_future(self.app(scope, receive, send))
+        # Apps without lifespan support raise or return right away; that is allowed.
+        await asyncio.wait(
+            [started, self._lifespan], return_when=asyncio.FIRST_COMPLETED
+        )
+        if self._lifespan.done() and not self._lifespan.cancelled():
+            self._lifespan.exception()
+
+    async def _stop(self) -> None:
+        if self._shutdown is not None:
+            self._shutdown.set()
+        if self._lifespan is not None and not self._lifespan.done():
+            await asyncio.wait([self._lifespan], timeout=5)
+
+    async def _call(self, request: requests.PreparedRequest) -> AppResponse:
+        parts, body = _request_parts(request)
+        raw_path = parts.path or "/"
+        headers_in = [
+            (name.lower().encode("latin-1"), value.encode("latin-1", "replace"))
+            for name, value in request.headers.items()
+        ]
+        if body and "Content-Length" not in request.headers:
+            headers_in.append((b"content-length", str(len(body)).encode()))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.3"},
+            "http_version": "1.1",
+            "method": request.method or "GET",
+            "scheme": parts.scheme or "http",
+            "path": unquote_to_bytes(raw_path).decode("utf-8", "replace"),
+            "raw_path": raw_path.encode("latin-1", "replace"),
+            "query_string": parts.query.encode("latin-1", "replace"),
+            "root_path": "",
+            "headers": headers_in,
+            "client": ("127.0.0.1", 0),
+            "server": (
+                parts.hostname or "localhost",
+                parts.port or _DEFAULT_PORTS.get(parts.scheme, 80),
+            ),
+            "state": dict(self.state),
+        }
+
+        status: Optional[int] = None
+        headers: List[Tuple[str, str]] = []
+        chunks: List[bytes] = []
+        request_sent = False
+        response_done = asyncio.Event()
+
+        async def receive() -> Dict[str, Any]:
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await response_done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers.extend(
+                    (name.decode("latin-1"), value.decode("latin-1"))
+                    for name, value in message.get("headers", [])
+                )
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    response_done.set()
+
+        try:
+            await self.app(scope, receive, send)
+        except Exception:
+            if status is None:
+                return _server_error()
+        finally:
+            response_done.set()
+        if status is None:
+            return _server_error()
+        return status, _reason(status), headers, b"".join(chunks)
+
+    def close(self) -> None:
+        # Shared by every pooled session; closing one session must not stop the app.
+        pass
+
+    def shutdown(self) -> None:
+        """Run the app's lifespan shutdown and stop the event loop."""
+        # Forked shard workers inherit the loop but not its thread.
+        if self._pid != os.getpid() or not self._loop.is_running():
+            return
+        try:
+            self._run(self._stop(), timeout=10)
+        except Exception as e:
+            print(f"Error shutting down ASGI app: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+_adapter: Optional[BaseAdapter] = None
+_adapter_pid: Optional[int] = None
+_adapter_lock = threading.Lock()
+
+
+def get_in_process_adapter(mode: str, app_path: str, app_dir: str = "") -> BaseAdapter:
+    """The adapter shared by every pooled session, created on first use in each process."""
+    global _adapter, _adapter_pid
+    with _adapter_lock:
+        if _adapter is None or _adapter_pid != os.getpid():
+            app = load_app(app_path, app_dir)
+            _adapter = ASGIAdapter(app) if mode == "asgi" else WSGIAdapter(app)
+            _adapter_pid = os.getpid()
+        return _adapter
+
+
+def close_in_process_adapter() -> None:
+    global _adapter
+    with _adapter_lock:
+        if isinstance(_adapter, ASGIAdapter):
+            _adapter.shutdown()
+        _adapter = None
+
+
+__all__ = [
+    "ASGIAdapter",
+    "WSGIAdapter",
+    "close_in_process_adapter",
+    "get_in_process_adapter",
+    "load_app",
+]
@@ -0,0 +1,266 @@
+"""Per-host token buckets that pace requests and learn limits from rate-limit headers."""
+
+import email.utils
+import threading
+import time
+from typing import Dict, List, Optional, Set
+
+import requests
+
+from autoresttest.config import get_config
+
+from .session import session_key
+
+CONFIG = get_config()
+
+
+class TokenBucket:
+    """
+    Token bucket with an optional hard block (e.g. from ``Retry-After``).
+
+    A rate of ``0`` means unpaced: only blocks delay requests.
+    """
+
+    def __init__(self, rate: float = 0.0, capacity: float = 1.0) -> None:
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        if self.rate > 0:
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Seconds until a request may be sent, without consuming a token."""
+        self._refill(now)
+        wait = max(0.0, self.blocked_until - now)
+        if self.rate > 0 and self.tokens < 1:
+            wait = max(wait, (1 - self.tokens) / self.rate)
+        return wait
+
+    def consume(self, now: float) -> None:
+        self._refill(now)
+        if self.rate > 0:
+            self.tokens -= 1
+
+    def set_rate(self, rate: float, capacity: Optional[float] = None) -> None:
+        self._refill(time.monotonic())
+        self.rate = max(0.0, rate)
+        if capacity is not None:
+            self.capacity = max(1.0, capacity)
+            self.tokens = min(self.tokens, self.capacity)
+
+    def block(self, until: float) -> None:
+        self.blocked_until = max(self.blocked_until, until)
+
+
+def _parse_retry_after(value: str | None) -> Optional[float]:
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_date.timestamp() - time.time())
+
+
+def _parse_number(value: str | None) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value.strip())
+    except ValueError:
+        return None
+
+
+def _header(response: requests.Response, *names: str) -> str | None:
+    for name in names:
+        value = response.headers.get(name)
+        if value is not None:
+            return value
+    return None
+
+
+class RateLimiter:
+    """
+    Shared pacing for every request sent to the SUT.
+
+    Each host has a token bucket (unpaced unless ``requests_per_second`` is set
+    or a limit is learned from ``X-RateLimit-*`` headers). Each operation has its
+    own bucket so a ``Retry-After`` or 429 only blocks the operation that was
+    rejected while the others keep going.
+
+    The limiter never sleeps. ``acquire`` either takes a token or says how long to
+    wait, and the caller decides whether to wait or send something else meanwhile.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, TokenBucket] = {}
+        self._operations: Dict[str, TokenBucket] = {}
+        # Operations that are paced or were blocked: the only ones that can be throttled.
+        self._throttled: Set[str] = set()
+        self._consecutive_429: Dict[str, int] = {}
+        self.stats: Dict[str, float] = {
+            "throttled_seconds": 0.0,
+            "rate_limited_responses": 0,
+        }
+
+    def _host_bucket(self, url: str) -> TokenBucket:
+        key = session_key(url)
+        bucket = self._hosts.get(key)
+        if bucket is None:
+            bucket = TokenBucket(
+                CONFIG.rate_limit.requests_per_second, CONFIG.rate_limit.burst
+            )
+            self._hosts[key] = bucket
+        return bucket
+
+    def _operation_bucket(self, operation_id: str) -> TokenBucket:
+        bucket = self._operations.get(operation_id)
+        if bucket is None:
+            bucket = TokenBucket(
+                CONFIG.rate_limit.operation_overrides.get(operation_id, 0.0),
+                CONFIG.rate_limit.burst,
+            )
+            self._operations[operation_id] = bucket
+            if bucket.rate > 0:
+                self._throttled.add(operation_id)
+        return bucket
+
+    def _buckets(self, url: str, operation_id: str | None) -> List[TokenBucket]:
+        buckets = [self._host_bucket(url)]
+        if operation_id is not None:
+            buckets.append(self._operation_bucket(operation_id))
+        return buckets
+
+    def delay(self, url: str, operation_id: str | None = None) -> float:
+        """Seconds the next request for this host/operation would have to wait."""
+        if not CONFIG.rate_limit.enabled:
+            return 0.0
+        now = time.monotonic()
+        with self._lock:
+            return max(bucket.delay(now) for bucket in self._buckets(url, operation_id))
+
+    def acquire(self, url: str, operation_id: str | None = None) -> float:
+        """
+        Take a token and return ``0`` if a request may be sent now; otherwise return
+        the seconds to wait (at most ``max_wait``) without taking one.
+        """
+        if not CONFIG.rate_limit.enabled:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            buckets = self._buckets(url, operation_id)
+            wait = max(bucket.delay(now) for bucket in buckets)
+            if wait <= 0:
+                for bucket in buckets:
+                    bucket.consume(now)
+                return 0.0
+        return min(wait, CONFIG.rate_limit.max_wait)
+
+    def record_wait(self, seconds: float) -> None:
+        """Count time a caller spent waiting for ``acquire``."""
+        with self._lock:
+            self.stats["throttled_seconds"] += seconds
+
+    def throttled_operations(self) -> Dict[str, float]:
+        """Seconds until each throttled operation may be sent, ignoring the host bucket."""
+        if not CONFIG.rate_limit.enabled:
+            return {}
+        now = time.monotonic()
+        delays: Dict[str, float] = {}
+        with self._lock:
+            for operation_id in list(self._throttled):
+                bucket = self._operations[operation_id]
+                delay = bucket.delay(now)
+                if delay > 0:
+                    delays[operation_id] = delay
+                elif bucket.rate <= 0:
+                    # The block expired and nothing paces the operation.
+                    self._throttled.discard(operation_id)
+        return delays
+
+    def observe(
+        self,
+        url: str,
+        operation_id: str | None,
+        response: requests.Response,
+        backoff: float = 1.0,
+    ) -> Optional[float]:
+        """
+        Learn from a response's rate-limit headers. Returns the block applied, if any.
+        """
+        if not CONFIG.rate_limit.enabled:
+            return None
+        max_wait = CONFIG.rate_limit.max_wait
+        retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+        limit = _parse_number(_header(response, "X-RateLimit-Limit", "RateLimit-Limit"))
+        remaining = _parse_number(
+            _header(response, "X-RateLimit-Remaining", "RateLimit-Remaining")
+        )
+        reset = _parse_number(_header(response, "X-RateLimit-Reset", "RateLimit-Reset"))
+        if reset is not None and reset > 1e9:
+            # Epoch timestamp rather than seconds until reset.
+            reset = max(0.0, reset - time.time())
+
+        scope = operation_id if operation_id is not None else session_key(url)
+        now = time.monotonic()
+        blocked_for = None
+        with self._lock:
+            host_bucket = self._host_bucket(url)
+
+            if remaining is not None and reset is not None:
+                if remaining <= 0:
+                    blocked_for = min(reset, max_wait)
+                    host_bucket.block(now + blocked_for)
+                elif reset > 0:
+                    # Spread the remaining quota over the rest of the window.
+                    host_bucket.set_rate(
+                        remaining / reset,
+                        min(CONFIG.rate_limit.burst, limit or remaining),
+                    )
+
+            if response.status_code == 429:
+                self.stats["rate_limited_responses"] += 1
+                consecutive = self._consecutive_429.get(scope, 0) + 1
+                self._consecutive_429[scope] = consecutive
+                if retry_after is None:
+                    retry_after = backoff * (2 ** (consecutive - 1))
+                blocked_for = max(blocked_for or 0.0, min(retry_after, max_wait))
+                if operation_id is not None:
+                    self._operation_bucket(operation_id).block(now + blocked_for)
+                    self._throttled.add(operation_id)
+                else:
+                    host_bucket.block(now + blocked_for)
+            else:
+                self._consecutive_429.pop(scope, None)
+                if retry_after is not None and response.status_code == 503:
+                    blocked_for = min(retry_after, max_wait)
+                    host_bucket.block(now + blocked_for)
+        return blocked_for
+
+
+_rate_limiter = RateLimiter()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide rate limiter."""
+    return _rate_limiter
+
+
+__all__ = [
+    "TokenBucket",
+    "RateLimiter",
+    "get_rate_limiter",
+]
@@ -0,0 +1,101 @@
+"""
+Pooled keep-alive HTTP sessions shared by every component that talks to the SUT.
+With ``[transport].mode`` set to "asgi" or "wsgi", the sessions call the SUT's app
+in-process instead of opening sockets.
+"""
+
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from typing import Callable, Dict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from autoresttest.config import get_config
+
+from .in_process import close_in_process_adapter, get_in_process_adapter
+
+CONFIG = get_config()
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def session_key(url: str) -> str:
+    """Sessions are pooled per scheme and host, so every path of an API shares one pool."""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def _build_session() -> requests.Session:
+    http_config = CONFIG.http
+    transport_config = CONFIG.transport
+    session = requests.Session()
+
+    # Only retry connection failures: read/status retries would replay requests the SUT
+    # already processed and hide the status codes the agents learn from.
+    retries = Retry(
+        total=http_config.max_retries,
+        connect=http_config.max_retries,
+        read=0,
+        status=0,
+        redirect=None,
+        backoff_factor=http_config.backoff_factor,
+        raise_on_status=False,
+    )
+    if transport_config.mode == "http":
+        adapter = HTTPAdapter(
+            pool_connections=http_config.pool_connections,
+            pool_maxsize=http_config.pool_maxsize,
+            max_retries=retries,
+        )
+    else:
+        # Every URL is answered by the configured app, whatever host the spec names.
+        adapter = get_in_process_adapter(
+            transport_config.mode, transport_config.app, transport_config.app_dir
+        )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    if not http_config.keep_alive:
+        session.headers["Connection"] = "close"
+
+    # Module-level requests calls never carried cookies between requests; keep it that way
+    # so fuzzing results do not depend on Set-Cookie headers from earlier responses.
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def get_http_session(url: str) -> requests.Session:
+    """Return the pooled session responsible for the host of the given URL."""
+    key = session_key(url)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _build_session()
+            _sessions[key] = session
+        return session
+
+
+def get_http_method(url: str, http_method: str) -> Callable[..., requests.Response]:
+    """Drop-in replacement for ``getattr(requests, http_method)`` using the pooled session."""
+    return getattr(get_http_session(url), http_method.lower())
+
+
+def close_http_sessions() -> None:
+    """Close every pooled session and release their connections."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+    close_in_process_adapter()
+
+
+__all__ = [
+    "get_http_session",
+    "get_http_method",
+    "close_http_sessions",
+    "session_key",
+]
@@ -8,6 +8,7 @@ from .utils import (
     construct_db_dir,
     get_graph_cache_path,
     get_q_table_cache_path,
+    get_value_checkpoint_path,
     CACHE_ROOT,
     Q_TABLE_CACHE_DIR,
     GRAPH_CACHE_DIR,
@@ -18,11 +19,13 @@ from .utils import (
     get_body_object_combinations,
     get_body_params,
     get_combinations,
+    get_combination_space,
     get_object_shallow_mappings,
     make_param_key,
     param_key_to_label,
     label_to_param_key,
     get_param_combinations,
+    get_param_combination_space,
     get_params,
     get_request_body_params,
     get_required_body_params,
@@ -35,8 +38,23 @@ from .utils import (
     dispatch_request,
     get_accept_header,
 )
+from .checkpoint import ValueTableCheckpoint
+from .combination_space import CombinationSpace
+from .dispatch_plan import OperationDispatchPlan
+from .embedding_store import EmbeddingStore, get_embedding_store
+from .value_store import ValueBucket, store_stats
+from .error_clusters import classify_error, normalize_error_message
 
 __all__ = [
+    "OperationDispatchPlan",
+    "ValueTableCheckpoint",
+    "CombinationSpace",
+    "EmbeddingStore",
+    "get_embedding_store",
+    "ValueBucket",
+    "store_stats",
+    "classify_error",
+    "normalize_error_message",
     "INPUT_COST_PER_TOKEN",
     "OUTPUT_COST_PER_TOKEN",
     "EmbeddingModel",
@@ -46,6 +64,7 @@ __all__ = [
     "construct_db_dir",
     "get_graph_cache_path",
     "get_q_table_cache_path",
+    "get_value_checkpoint_path",
     "CACHE_ROOT",
     "Q_TABLE_CACHE_DIR",
     "GRAPH_CACHE_DIR",
@@ -56,11 +75,13 @@ __all__ = [
     "get_body_object_combinations",
     "get_body_params",
     "get_combinations",
+    "get_combination_space",
     "get_object_shallow_mappings",
     "make_param_key",
     "param_key_to_label",
     "label_to_param_key",
     "get_param_combinations",
+    "get_param_combination_space",
     "get_params",
     "get_request_body_params",
     "get_required_body_params",
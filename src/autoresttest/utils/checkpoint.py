@@ -0,0 +1,92 @@
+"""Append-only checkpoint of per-operation value tables, so interrupted generation can resume."""
+
+import os
+import pickle
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+_LENGTH = struct.Struct("<I")
+
+
+class ValueTableCheckpoint:
+    """
+    Each finished operation's value table is appended as a length-prefixed pickle
+    record ``(operation_id, operation_hash, table, responses)`` and flushed to disk
+    right away. The probe responses are kept so operations that depend on a
+    completed one still see its responses after a resume. A record cut short by a
+    crash is dropped on load. Records whose operation hash no longer matches the
+    specification are ignored, so modified operations are generated again.
+    """
+
+    def __init__(
+        self, path: Path, operation_hashes: Optional[Dict[str, str]] = None
+    ) -> None:
+        self.path = path
+        self.operation_hashes = operation_hashes or {}
+        self.completed: set[str] = set()
+        # Probe responses of the completed operations, filled by load().
+        self.responses: Dict[str, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[str, Any]:
+        """Tables of the operations completed by earlier runs, latest record winning."""
+        tables: Dict[str, Any] = {}
+        if not self.path.exists():
+            return tables
+        valid_bytes = 0
+        with self.path.open("rb") as fh:
+            while True:
+                header = fh.read(_LENGTH.size)
+                if len(header) < _LENGTH.size:
+                    break
+                (length,) = _LENGTH.unpack(header)
+                payload = fh.read(length)
+                if len(payload) < length:
+                    break
+                try:
+                    operation_id, operation_hash, table, *rest = pickle.loads(payload)
+                except Exception:
+                    break
+                valid_bytes = fh.tell()
+                if operation_hash != self.operation_hashes.get(operation_id):
+                    continue
+                tables[operation_id] = table
+                # Records written before responses were kept have none.
+                self.responses[operation_id] = rest[0] if rest else []
+        if valid_bytes < self.path.stat().st_size:
+            # Drop the torn tail so new records are appended after the last good one.
+            with self.path.open("r+b") as fh:
+                fh.truncate(valid_bytes)
+        self.completed.update(tables)
+        return tables
+
+    def record(
+        self, operation_id: str, table: Any, responses: Optional[List[Any]] = None
+    ) -> None:
+        payload = pickle.dumps(
+            (
+                operation_id,
+                self.operation_hashes.get(operation_id),
+                table,
+                list(responses or []),
+            ),
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("ab") as fh:
+                fh.write(_LENGTH.pack(len(payload)) + payload)
+                fh.flush()
+                os.fsync(fh.fileno())
+            self.completed.add(operation_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.path.unlink(missing_ok=True)
+            self.completed.clear()
+            self.responses.clear()
+
+
+__all__ = ["ValueTableCheckpoint"]
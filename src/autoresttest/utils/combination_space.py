@@ -0,0 +1,136 @@
+"""Combination action spaces addressed by rank instead of materialized as tuples."""
+
+import bisect
+import math
+import sys
+from collections.abc import Sequence
+from typing import Any, Iterator, List, Optional, Tuple
+
+
+def unrank_combination(n: int, k: int, rank: int) -> List[int]:
+    """Indices of the ``rank``-th k-subset of ``range(n)`` in lexicographic order."""
+    indices: List[int] = []
+    candidate = 0
+    for position in range(k):
+        while True:
+            count = math.comb(n - candidate - 1, k - position - 1)
+            if rank < count:
+                break
+            rank -= count
+            candidate += 1
+        indices.append(candidate)
+        candidate += 1
+    return indices
+
+
+def rank_combination(n: int, indices: Sequence[int]) -> int:
+    """Lexicographic rank of the ascending ``indices`` among subsets of ``range(n)`` of that size."""
+    k = len(indices)
+    rank = 0
+    previous = -1
+    for position, idx in enumerate(indices):
+        for skipped in range(previous + 1, idx):
+            rank += math.comb(n - skipped - 1, k - position - 1)
+        previous = idx
+    return rank
+
+
+class CombinationSpace(Sequence):
+    """
+    The required items followed by a subset of the optional items, for a list of
+    (size, ranks) segments in order. ``ranks`` is ``None`` when every subset of that
+    size is included, otherwise a sorted list of lexicographic subset ranks.
+    Combinations are unranked when indexed and ranked back by ``index``, so only
+    the sampled ranks are stored. At most ``limit`` combinations are exposed.
+    """
+
+    def __init__(
+        self,
+        required: Sequence[Any],
+        optional: Sequence[Any],
+        segments: List[Tuple[int, Optional[List[int]]]],
+        limit: int = 0,
+    ) -> None:
+        self.required = tuple(required)
+        self.optional = list(optional)
+        self._positions = {item: idx for idx, item in enumerate(self.optional)}
+        self._sizes = [size for size, _ in segments]
+        self._ranks = [ranks for _, ranks in segments]
+        self._starts: List[int] = []
+        total = 0
+        for size, ranks in segments:
+            self._starts.append(total)
+            total += (
+                math.comb(len(self.optional), size) if ranks is None else len(ranks)
+            )
+        self._length = min(total, limit) if limit else total
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, idx):  # type: ignore[override]
+        if isinstance(idx, slice):
+            return [self[position] for position in range(*idx.indices(self._length))]
+        if idx < 0:
+            idx += self._length
+        if not 0 <= idx < self._length:
+            raise IndexError("combination index out of range")
+        segment = bisect.bisect_right(self._starts, idx) - 1
+        offset = idx - self._starts[segment]
+        ranks = self._ranks[segment]
+        rank = offset if ranks is None else ranks[offset]
+        indices = unrank_combination(len(self.optional), self._sizes[segment], rank)
+        return self.required + tuple(self.optional[position] for position in indices)
+
+    def __iter__(self) -> Iterator[Tuple[Any, ...]]:
+        for idx in range(self._length):
+            yield self[idx]
+
+    def __contains__(self, action: object) -> bool:
+        return self._find(action) is not None
+
+    def index(self, action: Any, start: int = 0, stop: Optional[int] = None) -> int:
+        idx = self._find(action)
+        if idx is None or idx < start or (stop is not None and idx >= stop):
+            raise ValueError(f"{action!r} is not in the combination space")
+        return idx
+
+    def _find(self, action: object) -> Optional[int]:
+        required_count = len(self.required)
+        if not isinstance(action, tuple) or action[:required_count] != self.required:
+            return None
+        indices = []
+        for item in action[required_count:]:
+            try:
+                position = self._positions.get(item)
+            except TypeError:
+                return None
+            if position is None or (indices and position <= indices[-1]):
+                return None
+            indices.append(position)
+        rank = rank_combination(len(self.optional), indices)
+        for segment, size in enumerate(self._sizes):
+            if size != len(indices):
+                continue
+            ranks = self._ranks[segment]
+            if ranks is None:
+                offset = rank
+            else:
+                offset = bisect.bisect_left(ranks, rank)
+                if offset == len(ranks) or ranks[offset] != rank:
+                    continue
+            idx = self._starts[segment] + offset
+            return idx if idx < self._length else None
+        return None
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the space itself (not the items it combines)."""
+        total = sys.getsizeof(self.optional) + sys.getsizeof(self._positions)
+        for ranks in self._ranks:
+            if ranks is not None:
+                total += sys.getsizeof(ranks) + sum(sys.getsizeof(rank) for rank in ranks)
+        return total
+
+
+__all__ = ["CombinationSpace", "rank_combination", "unrank_combination"]
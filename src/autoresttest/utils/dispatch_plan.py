@@ -0,0 +1,106 @@
+import re
+from typing import Any, Dict, Optional, Tuple
+
+from autoresttest.config import get_config
+from autoresttest.models import OperationProperties, ParameterKey
+
+from .utils import get_accept_header
+
+CONFIG = get_config()
+
+_PATH_PLACEHOLDER = re.compile(r"\{([^}]+)\}")
+
+_QUERY, _PATH, _HEADER, _COOKIE = range(4)
+_BUCKETS = {"path": _PATH, "header": _HEADER, "cookie": _COOKIE}
+
+
+class OperationDispatchPlan:
+    """
+    Everything about sending an operation that does not depend on the chosen values:
+    parameter locations, the path template, the Accept header, and the static headers.
+    Compile once per operation and call ``bind`` for each request.
+    """
+
+    def __init__(
+        self,
+        operation_properties: OperationProperties,
+        static_headers: Optional[Dict[str, str]] = None,
+    ):
+        self.operation_id = operation_properties.operation_id
+        self.http_method = operation_properties.http_method.lower()
+        self.endpoint_path = operation_properties.endpoint_path
+        self.accept = get_accept_header(operation_properties.responses)
+        self.static_headers = dict(
+            CONFIG.static_headers if static_headers is None else static_headers
+        )
+
+        # Literal path segments interleaved with placeholder names.
+        pieces = _PATH_PLACEHOLDER.split(self.endpoint_path)
+        self._path_literals = pieces[0::2]
+        self._path_names = pieces[1::2]
+
+        # Same resolution as split_parameter_values: explicit location on the key,
+        # else the parameter's "in"; unknown or None locations are sent as query.
+        self._locations: Dict[ParameterKey, Tuple[int, str]] = {}
+        self._name_fallback: Dict[str, ParameterKey] = {}
+        for parameter_key, parameter_properties in (
+            operation_properties.parameters or {}
+        ).items():
+            name, in_value = parameter_key
+            in_value = in_value or parameter_properties.in_value
+            self._locations[parameter_key] = (_BUCKETS.get(in_value, _QUERY), name)
+            self._name_fallback.setdefault(name, parameter_key)
+
+    def split(
+        self, provided_values: Optional[Dict[Any, Any]]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+        """Equivalent to ``split_parameter_values`` for this operation's parameters."""
+        buckets: Tuple[Dict[str, Any], ...] = ({}, {}, {}, {})
+        if not provided_values:
+            return buckets[_PATH], buckets[_QUERY], buckets[_HEADER], buckets[_COOKIE]
+
+        for key, value in provided_values.items():
+            if value is None:
+                continue
+            location = self._locations.get(key)
+            if location is None and not isinstance(key, tuple):
+                # Fallback: match by name when provided without location
+                fallback_key = self._name_fallback.get(key)
+                if fallback_key is not None:
+                    location = self._locations[fallback_key]
+            if location is None:
+                continue
+            bucket, name = location
+            buckets[bucket][name] = value
+
+        return buckets[_PATH], buckets[_QUERY], buckets[_HEADER], buckets[_COOKIE]
+
+    def render_path(self, path_params: Dict[str, Any]) -> str:
+        if not self._path_names:
+            return self.endpoint_path
+        parts = [self._path_literals[0]]
+        for name, literal in zip(self._path_names, self._path_literals[1:]):
+            parts.append(str(path_params[name]) if name in path_params else "{" + name + "}")
+            parts.append(literal)
+        return "".join(parts)
+
+    def bind(
+        self,
+        parameters: Optional[Dict[Any, Any]],
+        header: Optional[Dict[str, str]] = None,
+    ) -> Tuple[str, Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+        """
+        Returns the endpoint path, query parameters, headers, and cookies for one request.
+        Headers are the operation's header parameters, then the static headers, then ``header``.
+        """
+        path_params, query_params, header_params, cookie_params = self.split(
+            parameters
+        )
+        headers = header_params
+        headers.update(self.static_headers)
+        if header:
+            headers.update(header)
+        return self.render_path(path_params), query_params, headers, cookie_params
+
+
+__all__ = ["OperationDispatchPlan"]
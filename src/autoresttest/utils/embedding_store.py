@@ -0,0 +1,159 @@
+"""Read-only word vectors stored as memory-mapped NumPy files, shared across processes."""
+
+import hashlib
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+from autoresttest.config import PROJECT_ROOT
+
+EMBEDDING_CACHE_DIR = PROJECT_ROOT / "cache" / "embeddings"
+
+# Words are stored as fixed-width UTF-8 so the index itself can be memory-mapped.
+# Longer tokens (URLs, long numbers) never match a parameter name and are dropped.
+MAX_WORD_BYTES = 32
+
+_WORDS_FILE = "words.npy"
+_VECTORS_FILE = "vectors.npy"
+
+
+class EmbeddingStore:
+    """
+    Word vectors in ``directory``: a sorted ``words.npy`` index and a ``vectors.npy``
+    matrix with one row per word. Both are opened with ``mmap_mode="r"`` on first
+    lookup, so nothing is read until a word is needed and concurrent runs share
+    the pages through the OS page cache. Supports ``word in store`` and
+    ``store[word]`` like gensim's ``KeyedVectors``.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self._words: np.ndarray | None = None
+        self._vectors: np.ndarray | None = None
+        self.open_seconds = 0.0
+
+    @staticmethod
+    def exists(directory: Path) -> bool:
+        return (directory / _WORDS_FILE).exists() and (
+            directory / _VECTORS_FILE
+        ).exists()
+
+    def _open(self) -> None:
+        start_time = time.perf_counter()
+        self._words = np.load(self.directory / _WORDS_FILE, mmap_mode="r")
+        self._vectors = np.load(self.directory / _VECTORS_FILE, mmap_mode="r")
+        self.open_seconds = time.perf_counter() - start_time
+
+    def _index(self, word: str) -> int:
+        if self._words is None:
+            self._open()
+        assert self._words is not None
+        key = word.encode("utf-8")
+        if len(key) > MAX_WORD_BYTES or not len(self._words):
+            return -1
+        idx = int(np.searchsorted(self._words, key))
+        if idx < len(self._words) and self._words[idx] == key:
+            return idx
+        return -1
+
+    def __contains__(self, word: object) -> bool:
+        return isinstance(word, str) and self._index(word) >= 0
+
+    def __getitem__(self, word: str) -> np.ndarray:
+        idx = self._index(word)
+        if idx < 0:
+            raise KeyError(word)
+        assert self._vectors is not None
+        return np.array(self._vectors[idx])
+
+    def __len__(self) -> int:
+        if self._words is None:
+            self._open()
+        assert self._words is not None
+        return len(self._words)
+
+    def prune(self, words: Iterable[str], directory: Path) -> "EmbeddingStore":
+        """Write a store holding only ``words`` (those present here) to ``directory``."""
+        present = sorted({word for word in words if word in self})
+        vectors = (
+            np.stack([self[word] for word in present])
+            if present
+            else np.zeros((0, self.dimensions), dtype=np.float32)
+        )
+        write_embedding_store(directory, present, vectors)
+        return EmbeddingStore(directory)
+
+    @property
+    def dimensions(self) -> int:
+        if self._vectors is None:
+            self._open()
+        assert self._vectors is not None
+        return int(self._vectors.shape[1])
+
+
+def write_embedding_store(
+    directory: Path, words: Iterable[str], vectors: np.ndarray
+) -> None:
+    """Write a store atomically; if another process finished first, keep theirs."""
+    encoded = [word.encode("utf-8") for word in words]
+    keep = [idx for idx, key in enumerate(encoded) if len(key) <= MAX_WORD_BYTES]
+    order = sorted(keep, key=lambda idx: encoded[idx])
+    word_array = np.array([encoded[idx] for idx in order], dtype=f"S{MAX_WORD_BYTES}")
+    vector_array = np.ascontiguousarray(vectors[order], dtype=np.float32)
+
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = directory.with_name(f"{directory.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir()
+    np.save(tmp_dir / _WORDS_FILE, word_array)
+    np.save(tmp_dir / _VECTORS_FILE, vector_array)
+    try:
+        os.replace(tmp_dir, directory)
+    except OSError:
+        if not EmbeddingStore.exists(directory):
+            raise
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def get_embedding_store(model_name: str) -> EmbeddingStore:
+    """
+    Open the store for a gensim model, converting it on first use. The conversion
+    loads the full model once; every later run only memory-maps the files.
+    """
+    directory = EMBEDDING_CACHE_DIR / model_name
+    if not EmbeddingStore.exists(directory):
+        from gensim.downloader import load
+
+        print(f"Converting {model_name} to a memory-mapped embedding store...")
+        start_time = time.perf_counter()
+        model = load(model_name)
+        write_embedding_store(directory, model.index_to_key, model.vectors)
+        print(
+            f"Embedding store written to {directory} in {time.perf_counter() - start_time:.2f}s"
+        )
+    return EmbeddingStore(directory)
+
+
+def get_pruned_embedding_store(
+    model_name: str, words: Iterable[str]
+) -> EmbeddingStore:
+    """Store restricted to ``words``, cached by a hash of the word set."""
+    vocabulary = sorted(set(words))
+    digest = hashlib.sha256("\n".join(vocabulary).encode("utf-8")).hexdigest()[:16]
+    directory = EMBEDDING_CACHE_DIR / f"{model_name}-pruned-{digest}"
+    if EmbeddingStore.exists(directory):
+        return EmbeddingStore(directory)
+    return get_embedding_store(model_name).prune(vocabulary, directory)
+
+
+__all__ = [
+    "EMBEDDING_CACHE_DIR",
+    "EmbeddingStore",
+    "get_embedding_store",
+    "get_pruned_embedding_store",
+    "write_embedding_store",
+]
@@ -0,0 +1,101 @@
+"""Grouping of server errors into failure classes by a fingerprint of the response."""
+
+import hashlib
+import json
+import re
+from typing import Any, Dict, Optional, Tuple
+
+from .value_store import value_shape
+
+# Keys whose values usually carry the error message or stack trace in JSON error bodies.
+_MESSAGE_KEYS = (
+    "message",
+    "error",
+    "detail",
+    "details",
+    "exception",
+    "title",
+    "trace",
+    "stacktrace",
+    "stack",
+)
+_MAX_SCAN_CHARS = 4096
+
+_UUID = re.compile(
+    r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.I
+)
+_HEX = re.compile(r"\b0x[0-9a-f]+\b|\b[0-9a-f]{16,}\b", re.I)
+_NUMBER = re.compile(r"\d+(\.\d+)?")
+_QUOTED = re.compile(r"'[^'\n]{0,200}'|\"[^\"\n]{0,200}\"")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _message_text(response_text: str) -> str:
+    text = response_text[:_MAX_SCAN_CHARS]
+    try:
+        content = json.loads(text)
+    except ValueError:
+        return text
+    if isinstance(content, dict):
+        parts = [
+            (
+                content[key]
+                if isinstance(content[key], str)
+                else json.dumps(content[key], sort_keys=True, default=str)
+            )
+            for key in _MESSAGE_KEYS
+            if key in content
+        ]
+        if parts:
+            return " ".join(parts)
+    return json.dumps(value_shape(content))
+
+
+def normalize_error_message(response_text: str, max_length: int = 300) -> str:
+    """
+    Error message or stack trace with the request-specific parts (ids, numbers,
+    quoted input values, line numbers) masked, so errors caused by the same
+    fault compare equal.
+    """
+    text = _message_text(response_text or "")
+    text = _UUID.sub("<uuid>", text)
+    text = _HEX.sub("<hex>", text)
+    text = _QUOTED.sub("<str>", text)
+    text = _NUMBER.sub("<n>", text)
+    return _WHITESPACE.sub(" ", text).strip()[:max_length]
+
+
+def classify_error(
+    operation_id: str,
+    status_code: int,
+    response_text: Optional[str],
+    parameters: Optional[Dict[Any, Any]],
+    body: Optional[Dict[str, Any]],
+    max_message_length: int = 300,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Fingerprint of a server error and the failure class it identifies: the operation,
+    status code, normalized message, and the shape (names and types, not values)
+    of the inputs that triggered it.
+    """
+    input_shape = {
+        "parameters": sorted(
+            "|".join("" if part is None else str(part) for part in key)
+            if isinstance(key, tuple)
+            else str(key)
+            for key in (parameters or {})
+        ),
+        "body": {mime: value_shape(value) for mime, value in (body or {}).items()},
+    }
+    error_class = {
+        "operation_id": operation_id,
+        "status_code": status_code,
+        "message": normalize_error_message(response_text or "", max_message_length),
+        "input_shape": input_shape,
+    }
+    encoded = json.dumps(error_class, sort_keys=True, default=str)
+    fingerprint = hashlib.blake2b(encoded.encode("utf-8"), digest_size=8).hexdigest()
+    return fingerprint, error_class
+
+
+__all__ = ["classify_error", "normalize_error_message"]
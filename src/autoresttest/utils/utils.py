@@ -3,9 +3,9 @@ import hashlib
 import json
 import math
 import random
-import time
 from typing import Iterable, Dict, List, Any, Optional, Tuple, Set, cast
 import itertools
+import time
 from pathlib import Path
 
 from gensim.downloader import load
@@ -16,10 +16,18 @@ from dotenv import load_dotenv
 
 from autoresttest.config import get_config
 from autoresttest.specification import SpecificationParser
+from autoresttest.transport import get_rate_limiter
 from autoresttest.models import ParameterKey, ParameterProperties, SchemaProperties
 from autoresttest.prompts.generator_prompts import FIX_JSON_OBJ
 from autoresttest.prompts.system_prompts import FIX_JSON_SYSTEM_MESSAGE
 
+from .combination_space import CombinationSpace
+from .embedding_store import (
+    EmbeddingStore,
+    get_embedding_store,
+    get_pruned_embedding_store,
+)
+
 load_dotenv()
 CONFIG = get_config()
 
@@ -78,6 +86,15 @@ def get_param_combinations(
     return get_combinations(param_list, required=required_params, seed=seed)
 
 
+def get_param_combination_space(
+    operation_parameters: Dict[ParameterKey, ParameterProperties],
+    required_params: Optional[Set[ParameterKey]] = None,
+    seed: Optional[str] = None,
+) -> CombinationSpace:
+    param_list = get_params(operation_parameters)
+    return get_combination_space(param_list, required=required_params, seed=seed)
+
+
 def get_body_combinations(
     operation_body: Dict[str, SchemaProperties],
 ) -> Dict[str, List[Tuple[str]]]:
@@ -97,6 +114,14 @@ def get_body_object_combinations(
     )
 
 
+def _combination_rng(seed: Optional[str]) -> random.Random:
+    """Seeded RNG for reproducible combination sampling."""
+    if seed:
+        seed_int = int(hashlib.md5(seed.encode()).hexdigest(), 16) % (2**32)
+        return random.Random(seed_int)
+    return random.Random(CONFIG.combination_seed)
+
+
 def get_combinations(
     arr: Iterable[Any],
     required: Optional[Set[Any]] = None,
@@ -126,12 +151,7 @@ def get_combinations(
     max_total = CONFIG.max_total_combinations
     base_samples = CONFIG.base_samples_per_size
 
-    # Seeded RNG for reproducibility
-    if seed:
-        seed_int = int(hashlib.md5(seed.encode()).hexdigest(), 16) % (2**32)
-        rng = random.Random(seed_int)
-    else:
-        rng = random.Random(CONFIG.combination_seed)
+    rng = _combination_rng(seed)
 
     combinations: Set[Tuple[Any, ...]] = set()
     n_optional = len(optional)
@@ -179,6 +199,57 @@ def get_combinations(
     return result
 
 
+def get_combination_space(
+    arr: Iterable[Any],
+    required: Optional[Set[Any]] = None,
+    seed: Optional[str] = None,
+) -> CombinationSpace:
+    """
+    Lazy counterpart of ``get_combinations``: the same sizes and sample counts, kept
+    as subset ranks and unranked on access.
+
+    Combinations are ordered by size, then by lexicographic rank over the optional
+    parameters in their original order, and sampled sizes draw ranks rather than
+    index lists. The combinations kept at the ``max_total_combinations`` cap and the
+    sampled ones can therefore differ from ``get_combinations``; both are
+    reproducible for a given seed.
+    """
+    arr = list(arr) if arr is not None else []
+    required = required or set()
+    optional = [p for p in arr if p not in required]
+    required_tuple = tuple(p for p in arr if p in required)  # Preserve order
+
+    max_optional_size = CONFIG.max_combinations
+    base_samples = CONFIG.base_samples_per_size
+    rng = _combination_rng(seed)
+    n_optional = len(optional)
+
+    # Required-only first; None means every subset of that size.
+    segments: List[Tuple[int, Optional[List[int]]]] = [(0, None)]
+    if n_optional <= max_optional_size:
+        segments.extend((size, None) for size in range(1, n_optional + 1))
+    else:
+        for size in range(1, max_optional_size + 1):
+            samples_for_size = max(10, int(base_samples / (size**0.7)))
+            total_possible = math.comb(n_optional, size)
+            if total_possible <= samples_for_size:
+                segments.append((size, None))
+                continue
+            sampled: Set[int] = set()
+            attempts = 0
+            max_attempts = samples_for_size * 20
+            while len(sampled) < samples_for_size and attempts < max_attempts:
+                sampled.add(rng.randrange(total_possible))
+                attempts += 1
+            segments.append((size, sorted(sampled)))
+        # All parameters.
+        segments.append((n_optional, None))
+
+    return CombinationSpace(
+        required_tuple, optional, segments, limit=CONFIG.max_total_combinations
+    )
+
+
 def get_params(
     operation_parameters: Dict[ParameterKey, ParameterProperties],
 ) -> List[ParameterKey]:
@@ -508,10 +579,16 @@ def dispatch_request(
     max_retries: int = 3,
     base_delay: float = 1.0,
     accept: str | None = None,
+    operation_id: str | None = None,
+    paced: bool = True,
 ):
     """
     Send a request with sensible handling for the provided body and MIME type key (if any).
-    Includes automatic retry with exponential backoff for rate-limited (429) responses.
+    Requests are paced by the shared rate limiter, which learns from Retry-After and
+    X-RateLimit-* headers; rate-limited (429) responses are retried up to max_retries
+    times once the limiter allows it (base_delay is the backoff used without headers).
+    Pass ``paced=False`` when the caller already took the limiter's token, as the
+    learning loop does so that it waits while scheduling rather than while sending.
     """
     params = params or {}
     headers = header.copy() if header is not None else {}
@@ -519,8 +596,15 @@ def dispatch_request(
     if accept:
         headers.setdefault("Accept", accept)
 
+    rate_limiter = get_rate_limiter()
     response = None
     for attempt in range(max_retries + 1):
+        while paced or attempt:
+            wait = rate_limiter.acquire(full_url, operation_id)
+            if wait <= 0:
+                break
+            time.sleep(wait)
+            rate_limiter.record_wait(wait)
         response = _dispatch_request_inner(
             select_method, full_url, params, body, headers.copy(), cookies
         )
@@ -528,19 +612,14 @@ def dispatch_request(
         if response is None:
             return None
 
-        # Handle rate limiting (429) with exponential backoff + jitter
-        if response.status_code == 429:
-            if attempt < max_retries:
-                # Exponential backoff: 1s, 2s, 4s + random jitter (0-1s)
-                delay = base_delay * (2**attempt) + random.uniform(0, 1)
-                retry_after = response.headers.get("Retry-After")
-                if retry_after and retry_after.isdigit():
-                    delay = max(delay, int(retry_after))
-                print(
-                    f"Rate limited (429). Retrying in {delay:.1f}s (attempt {attempt + 1}/{max_retries})"
-                )
-                time.sleep(delay)
-                continue
+        blocked_for = rate_limiter.observe(
+            full_url, operation_id, response, backoff=base_delay
+        )
+        if response.status_code == 429 and attempt < max_retries:
+            print(
+                f"Rate limited (429). Retrying in {blocked_for or 0:.1f}s (attempt {attempt + 1}/{max_retries})"
+            )
+            continue
 
         return response
 
@@ -578,10 +657,61 @@ OUTPUT_COST_PER_TOKEN = {
 
 
 class EmbeddingModel:
+    """
+    Word embeddings used for semantic parameter matching. Vectors are only loaded on
+    the first encode, so runs that reuse a cached graph usually never touch them.
+    With ``[embeddings].backend = "mmap"`` they come from a memory-mapped store
+    shared by every process instead of a full in-memory gensim model.
+    """
+
     def __init__(self):
-        self.model: KeyedVectors = cast(KeyedVectors, load("glove-wiki-gigaword-50"))
+        self._model: KeyedVectors | EmbeddingStore | None = None
+        self._full_store: EmbeddingStore | None = None
+        self._restricted_words: Set[str] = set()
         self.threshold = 0.8
         self._embedding_cache: Dict[str, Optional[np.ndarray]] = {}
+        self.load_seconds = 0.0
+
+    @property
+    def model(self) -> KeyedVectors | EmbeddingStore:
+        if self._model is None:
+            start_time = time.perf_counter()
+            embeddings_config = CONFIG.embeddings
+            if embeddings_config.backend == "mmap":
+                self._full_store = get_embedding_store(embeddings_config.model)
+                self._model = self._full_store
+            else:
+                self._model = cast(KeyedVectors, load(embeddings_config.model))
+            self.load_seconds = time.perf_counter() - start_time
+            print(
+                f"Loaded {embeddings_config.model} embeddings ({embeddings_config.backend}) "
+                f"in {self.load_seconds:.2f}s"
+            )
+        return self._model
+
+    def restrict_vocabulary(self, words: Iterable[str]) -> None:
+        """
+        With ``[embeddings].prune_to_spec``, serve ``words`` from a store holding only
+        those words; other words still fall back to the full store.
+        """
+        embeddings_config = CONFIG.embeddings
+        if not embeddings_config.prune_to_spec or embeddings_config.backend != "mmap":
+            return
+        self._restricted_words = set(words)
+        self._model = get_pruned_embedding_store(
+            embeddings_config.model, self._restricted_words
+        )
+
+    def _lookup(self, word: str) -> Optional[np.ndarray]:
+        model = self.model
+        if word in model:
+            return model[word]
+        if self._restricted_words and word not in self._restricted_words:
+            if self._full_store is None:
+                self._full_store = get_embedding_store(CONFIG.embeddings.model)
+            if word in self._full_store:
+                return self._full_store[word]
+        return None
 
     def encode_sentence_or_word(self, thing: str) -> Optional[np.ndarray]:
         if thing in self._embedding_cache:
@@ -589,7 +719,9 @@ class EmbeddingModel:
 
         words = thing.split(" ")
         word_vectors: list[np.ndarray] = [
-            self.model[word] for word in words if word in self.model
+            vector
+            for vector in (self._lookup(word) for word in words)
+            if vector is not None
         ]
         result = np.mean(word_vectors, axis=0) if word_vectors else None
         self._embedding_cache[thing] = result
@@ -628,6 +760,11 @@ def get_graph_cache_path(spec_name: str) -> Path:
     return GRAPH_CACHE_DIR / spec_name
 
 
+def get_value_checkpoint_path(spec_name: str) -> Path:
+    construct_db_dir()
+    return Q_TABLE_CACHE_DIR / f"{spec_name}.values.ckpt"
+
+
 def construct_basic_token(token):
     username = token.get("username")
     password = token.get("password")
@@ -0,0 +1,208 @@
+"""Capped, deduplicated collections of the values observed while testing."""
+
+import hashlib
+import json
+import random
+from collections import OrderedDict
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+
+def _canonical(value: Any) -> Any:
+    """JSON-like form of ``value`` in which dicts and sets no longer depend on order."""
+    if isinstance(value, Mapping):
+        items = [(_canonical(key), _canonical(item)) for key, item in value.items()]
+        return {"{}": sorted(items, key=repr)}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return {"set": sorted((_canonical(item) for item in value), key=repr)}
+    return value
+
+
+def value_key(value: Any) -> bytes:
+    """Hash of the canonical JSON of ``value``, used for membership tests."""
+    encoded = json.dumps(
+        _canonical(value), sort_keys=True, separators=(",", ":"), default=repr
+    )
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).digest()
+
+
+# Evicted values are remembered, up to this many per slot of capacity, so a value the API
+# keeps returning is not admitted and evicted over and over.
+_REMEMBERED_PER_SLOT = 4
+
+
+def value_shape(value: Any) -> Any:
+    """Coarse structure of ``value``: its type and, for objects, its keys."""
+    if isinstance(value, Mapping):
+        return ("object", tuple(sorted(map(str, value))))
+    if isinstance(value, (list, tuple)):
+        return ("array", value_shape(value[0]) if value else None)
+    return type(value).__name__
+
+
+class ValueBucket(list):
+    """
+    List of distinct values with hashed membership, so ``value in bucket`` does not
+    compare against every stored value.
+
+    With a ``capacity``, the bucket stops growing once full. ``"reservoir"`` eviction
+    keeps a uniform sample of every distinct value seen; ``"diverse"`` evicts from
+    the most common value shape so rarer shapes (other types, other object keys)
+    survive. Evicted values are appended to ``spill_path`` as JSON lines, tagged
+    with ``label``, when set. ``seen`` counts the values admitted as new; the hashes
+    of the latest evicted values are kept in a bounded filter so they are not
+    admitted as new again.
+    """
+
+    def __init__(
+        self,
+        values: Iterable[Any] = (),
+        capacity: int = 0,
+        eviction: str = "reservoir",
+        spill_path: Optional[Path] = None,
+        label: str = "",
+        seen: int = 0,
+        evicted: int = 0,
+        evicted_keys: Iterable[bytes] = (),
+    ) -> None:
+        super().__init__()
+        self.capacity = capacity
+        self.eviction = eviction
+        self.spill_path = spill_path
+        self.label = label
+        self.seen = 0
+        self.evicted = 0
+        self._keys: dict[bytes, int] = {}
+        self._evicted_keys: OrderedDict[bytes, None] = OrderedDict()
+        # For "diverse" eviction: the slots holding each shape, and each slot's shape
+        # and position in that list, kept current on every write.
+        self._shape_slots: dict[Any, list[int]] = {}
+        self._slot_shapes: list[tuple[Any, int]] = []
+        for value in values:
+            self.append(value)
+        for key in evicted_keys:
+            self._remember(key)
+        self.seen = max(seen, self.seen)
+        self.evicted += evicted
+
+    def __reduce__(self):
+        return (
+            self.__class__,
+            (
+                list(self),
+                self.capacity,
+                self.eviction,
+                self.spill_path,
+                self.label,
+                self.seen,
+                self.evicted,
+                list(self._evicted_keys),
+            ),
+        )
+
+    def __contains__(self, value: object) -> bool:
+        return value_key(value) in self._keys
+
+    def append(self, value: Any) -> None:
+        key = value_key(value)
+        if key in self._keys or key in self._evicted_keys:
+            return
+        self.seen += 1
+        if not self.capacity or len(self) < self.capacity:
+            self._keys[key] = len(self)
+            self._add_shape(len(self), value)
+            super().append(value)
+            return
+        idx = self._eviction_index()
+        if idx is None:
+            self._spill(value)
+            self._remember(key)
+            return
+        old_key = value_key(self[idx])
+        self._spill(self[idx])
+        del self._keys[old_key]
+        self._remember(old_key)
+        self._remove_shape(idx)
+        self._keys[key] = idx
+        self._add_shape(idx, value)
+        super().__setitem__(idx, value)
+
+    def extend(self, values: Iterable[Any]) -> None:
+        for value in values:
+            self.append(value)
+
+    def _eviction_index(self) -> Optional[int]:
+        """Slot to overwrite with the newest value, or ``None`` to drop the value instead."""
+        if self.eviction == "diverse":
+            return random.choice(max(self._shape_slots.values(), key=len))
+        # Algorithm R: the n-th distinct value is kept with probability capacity / n.
+        idx = random.randrange(self.seen)
+        return idx if idx < self.capacity else None
+
+    def _add_shape(self, idx: int, value: Any) -> None:
+        if self.eviction != "diverse":
+            return
+        shape = value_shape(value)
+        slots = self._shape_slots.setdefault(shape, [])
+        if idx == len(self._slot_shapes):
+            self._slot_shapes.append((shape, len(slots)))
+        else:
+            self._slot_shapes[idx] = (shape, len(slots))
+        slots.append(idx)
+
+    def _remove_shape(self, idx: int) -> None:
+        if self.eviction != "diverse":
+            return
+        shape, position = self._slot_shapes[idx]
+        slots = self._shape_slots[shape]
+        last = slots.pop()
+        if last != idx:
+            slots[position] = last
+            self._slot_shapes[last] = (shape, position)
+        elif not slots:
+            del self._shape_slots[shape]
+
+    def _remember(self, key: bytes) -> None:
+        self._evicted_keys[key] = None
+        if len(self._evicted_keys) > self.capacity * _REMEMBERED_PER_SLOT:
+            self._evicted_keys.popitem(last=False)
+
+    def _spill(self, value: Any) -> None:
+        self.evicted += 1
+        if self.spill_path is None:
+            return
+        self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.spill_path.open("a", encoding="utf-8") as fh:
+            record = {"key": self.label, "value": value}
+            fh.write(json.dumps(record, default=repr) + "\n")
+
+    # Writes other than append would bypass the key index.
+    def _unsupported(self, *args, **kwargs):
+        raise TypeError("ValueBucket only supports append and extend")
+
+    __setitem__ = __delitem__ = __iadd__ = insert = remove = pop = _unsupported
+    sort = reverse = clear = _unsupported
+
+
+def store_stats(*collections: Any) -> dict[str, int]:
+    """Retained, distinct-seen, and evicted value counts over nested stores."""
+    stats = {"retained": 0, "seen": 0, "evicted": 0}
+    pending = list(collections)
+    while pending:
+        item = pending.pop()
+        if isinstance(item, ValueBucket):
+            stats["retained"] += len(item)
+            stats["seen"] += item.seen
+            stats["evicted"] += item.evicted
+        elif isinstance(item, Mapping):
+            pending.extend(item.values())
+        elif isinstance(item, list):
+            stats["retained"] += len(item)
+            stats["seen"] += len(item)
+    return stats
+
+
+__all__ = ["ValueBucket", "store_stats", "value_key", "value_shape"]
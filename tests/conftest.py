@@ -0,0 +1,46 @@
+"""Helpers shared by the agent tests."""
+
+import random
+
+LOCATIONS = ["params", "body", "response"]
+
+
+def random_dependency_table(
+    rng: random.Random,
+    operations: list[str],
+    dependent_params: list[str],
+    min_body: int = 0,
+    dependent_ops: int = 2,
+    max_dependent_params: int = 2,
+) -> dict:
+    """
+    A DependencyAgent Q-table: each operation has one to three query parameters and
+    ``min_body`` to three body properties, each depending on ``dependent_ops`` other
+    operations through up to ``max_dependent_params`` names per location, all at 0.
+    """
+    table: dict = {}
+    for operation_id in operations:
+        table[operation_id] = {"params": {}, "body": {}}
+        others = [op for op in operations if op != operation_id]
+        for param_location, count in (
+            ("params", rng.randint(1, 3)),
+            ("body", rng.randint(min_body, 3)),
+        ):
+            for idx in range(count):
+                param = (
+                    (f"p{idx}", "query") if param_location == "params" else f"b{idx}"
+                )
+                table[operation_id][param_location][param] = {
+                    dependent_op: {
+                        location: {
+                            dependent_param: 0
+                            for dependent_param in rng.sample(
+                                dependent_params,
+                                rng.randint(0, max_dependent_params),
+                            )
+                        }
+                        for location in LOCATIONS
+                    }
+                    for dependent_op in rng.sample(others, dependent_ops)
+                }
+    return table
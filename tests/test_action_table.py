@@ -0,0 +1,189 @@
+"""
+Array action tables behave like the dicts they replace; lazy action tables expose only
+assigned Q-values unless every combination is asked for.
+"""
+
+import itertools
+import json
+import pickle
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from autoresttest.agents import ParameterAgent
+from autoresttest.agents.action_table import (
+    ArrayActionTable,
+    LazyActionTable,
+    count_zeros,
+    max_q,
+    random_action,
+)
+from autoresttest.models import ParameterProperties
+from autoresttest.utils import CombinationSpace
+
+OPTIONAL = [(f"opt{idx}", "query") for idx in range(6)]
+
+
+def _parameter_agent(required: set, table) -> ParameterAgent:
+    """A parameter agent whose only operation has ``required`` plus the optional parameters."""
+    parameters = {
+        key: ParameterProperties(name=key[0], in_value=key[1], required=key in required)
+        for key in sorted(required) + OPTIONAL
+    }
+    operation = SimpleNamespace(
+        operation_properties=SimpleNamespace(parameters=parameters)
+    )
+    graph = SimpleNamespace(operation_nodes={"op": operation})
+    agent = ParameterAgent(graph)  # type: ignore[arg-type]
+    agent.q_table = {"op": {"params": table, "body": {}}}
+    return agent
+
+
+def _combinations(required: set) -> list:
+    keys = sorted(required) + OPTIONAL
+    combinations = [
+        combination
+        for size in range(1, len(keys) + 1)
+        for combination in itertools.combinations(keys, size)
+    ]
+    random.Random(len(keys)).shuffle(combinations)
+    return combinations
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_array_best_action_matches_the_dict_scan(seed: int) -> None:
+    rng = random.Random(seed)
+    required = {("id", "path")} if seed % 2 else set()
+    dict_table: dict = {}
+    array_table = ArrayActionTable(required=required)
+    for combination in _combinations(required) + ["None"]:
+        # Few distinct values, so ties between feasible and infeasible actions are common.
+        value = rng.choice([0, 0.0, 0.5, 1.0, -1.0])
+        dict_table[combination] = value
+        array_table[combination] = value
+
+    dict_agent = _parameter_agent(required, dict_table)
+    array_agent = _parameter_agent(required, array_table)
+    for _ in range(50):
+        assert array_agent.get_best_action("op") == dict_agent.get_best_action("op")
+        assert array_agent.get_Q_next("op") == dict_agent.get_Q_next("op")
+        action = dict_agent.get_random_action("op")
+        reward = rng.choice([-1, 1, 2])
+        dict_agent.update_q_table("op", action, reward)
+        array_agent.update_q_table("op", action, reward)
+    assert list(array_table.items()) == list(dict_table.items())
+
+
+def test_array_ties_resolve_to_the_first_inserted_action() -> None:
+    required = {("id", "path")}
+    table = ArrayActionTable(
+        [(("a", "query"),), (("id", "path"),), (("b", "query"), ("id", "path"))],
+        required=required,
+    )
+    table["None"] = 0
+    assert table.best_action() == (("id", "path"),)
+    assert table.best_action(feasible_only=False) == (("a", "query"),)
+
+    table[(("b", "query"), ("id", "path"))] = 1.0
+    table[(("id", "path"),)] = 1.0
+    assert table.best_action() == (("id", "path"),)
+    # Removing an action keeps the insertion order of the rest.
+    del table[(("id", "path"),)]
+    assert table.best_action() == (("b", "query"), ("id", "path"))
+    assert list(table) == [(("a", "query"),), (("b", "query"), ("id", "path")), "None"]
+    assert ArrayActionTable(required=required).best_action() is None
+    assert ArrayActionTable([("a",)], required=required).best_action() is None
+
+
+def test_array_random_action_matches_the_dict() -> None:
+    actions = _combinations(set()) + ["None"]
+    dict_table = {action: 0.0 for action in actions}
+    array_table = ArrayActionTable(actions)
+    random.seed(3)
+    from_dict = [random_action(dict_table) for _ in range(200)]
+    random.seed(3)
+    from_array = [random_action(array_table) for _ in range(200)]
+    assert from_array == from_dict
+    assert len(set(from_array)) > 50
+
+
+def test_array_table_keeps_int_values_through_output() -> None:
+    actions = [(("a", "query"),), (("b", "query"),)]
+    dict_table: dict = {action: 0.0 for action in actions}
+    array_table = ArrayActionTable(actions)
+    for table in (dict_table, array_table):
+        table["None"] = 0
+        table[actions[1]] = 2
+        table[actions[0]] += 0.5
+
+    assert type(array_table["None"]) is int
+    assert type(array_table[actions[1]]) is int
+    assert max_q(array_table) == max_q(dict_table) == 2
+    # q_tables.json writes str(action) keys, as output_q_table does.
+    output = json.dumps({str(action): value for action, value in array_table.items()})
+    assert output == json.dumps(
+        {str(action): value for action, value in dict_table.items()}
+    )
+    assert output.endswith('"None": 0}') and "0.5" in output
+    # Sharded workers send tables between processes by pickling them.
+    restored = pickle.loads(pickle.dumps(array_table))
+    assert list(restored.items()) == list(dict_table.items())
+    assert type(restored["None"]) is int
+
+
+class CountingSpace(CombinationSpace):
+    """Counts unranked combinations, to show which walks touch the whole space."""
+
+    unranked = 0
+
+    def __getitem__(self, idx):  # type: ignore[override]
+        CountingSpace.unranked += 1
+        return super().__getitem__(idx)
+
+
+def _space(optional: int = 12) -> CountingSpace:
+    items = [f"p{idx}" for idx in range(optional)]
+    return CountingSpace(("id",), items, [(size, None) for size in range(optional + 1)])
+
+
+def test_iteration_yields_assigned_actions_in_order() -> None:
+    space = _space()
+    table = LazyActionTable(space)
+    table[space[40]] = 1.5
+    table["None"] = 0
+    table[space[3]] = -1.0
+    table[space[40]] = 2.0
+
+    first, second = space[3], space[40]
+    CountingSpace.unranked = 0
+    assert list(table) == [first, second, "None"]
+    assert dict(table.items()) == {first: -1.0, second: 2.0, "None": 0}
+    assert CountingSpace.unranked == 4
+    # The mapping still covers every combination.
+    assert len(table) == len(space) + 1
+    assert table[space[100]] == 0.0
+    assert list(table.iter_all()) == list(space) + ["None"]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_count_zeros_matches_a_full_walk(seed: int) -> None:
+    rng = random.Random(seed)
+    space = _space(8)
+    table = LazyActionTable(space)
+    for _ in range(200):
+        table[space[rng.randrange(len(space))]] = rng.choice([0, 0.0, 1.0, -2.0])
+    expected = sum(1 for action in table.iter_all() if table[action] == 0)
+    assert count_zeros(table) == expected
+
+
+def test_json_output_lists_assigned_actions_only() -> None:
+    space = _space(20)
+    table = LazyActionTable(space)
+    action = space[7]
+    table[action] = 0.25
+
+    CountingSpace.unranked = 0
+    output = json.dumps({str(action): value for action, value in table.items()})
+    assert CountingSpace.unranked == 1
+    assert json.loads(output) == {str(action): 0.25}
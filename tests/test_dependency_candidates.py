@@ -0,0 +1,183 @@
+"""Indexed dependency selection must match a scan of the Q-table over the available sources."""
+
+import random
+
+import pytest
+
+from autoresttest.agents import DependencyAgent
+from conftest import LOCATIONS, random_dependency_table
+
+OPERATIONS = [f"op{idx}" for idx in range(6)]
+DEPENDENT_PARAMS = ["id", "name", "owner", "status", "tag"]
+
+
+def _random_table(rng: random.Random) -> dict:
+    return random_dependency_table(
+        rng,
+        OPERATIONS,
+        DEPENDENT_PARAMS,
+        min_body=1,
+        dependent_ops=3,
+        max_dependent_params=3,
+    )
+
+
+def _available(agent: DependencyAgent, operation_id: str, param_location: str, param):
+    """Available candidates of one parameter, in Q-table order."""
+    return [
+        (dependent_op, location, dependent_param, value)
+        for dependent_op, locations in agent.q_table[operation_id][param_location][
+            param
+        ].items()
+        for location, dependent_params in locations.items()
+        for dependent_param, value in dependent_params.items()
+        if (location, dependent_op, dependent_param) in agent.available_sources
+    ]
+
+
+def _scan_best(agent: DependencyAgent, operation_id: str):
+    best = {}
+    for param_location in ("params", "body"):
+        for param in agent.q_table[operation_id][param_location]:
+            choice = (None, None, None, float("-inf"))
+            for candidate in _available(agent, operation_id, param_location, param):
+                if candidate[3] > choice[3]:
+                    choice = candidate
+            best[param] = choice
+    return best
+
+
+def _as_tuples(mapping: dict) -> dict:
+    return {
+        param: (
+            info["dependent_operation"],
+            info["in_value"],
+            info["dependent_val"],
+            info["value"],
+        )
+        for param, info in mapping.items()
+    }
+
+
+def _random_update(rng: random.Random, agent: DependencyAgent, operation_id: str):
+    used = {}
+    param_location = rng.choice(["params", "body"])
+    for param, dependents in agent.q_table[operation_id][param_location].items():
+        dependent_op = rng.choice(list(dependents))
+        names = [
+            name for values in dependents[dependent_op].values() for name in values
+        ]
+        if names:
+            used[param] = {
+                "dependent_operation": dependent_op,
+                "dependent_val": rng.choice(names),
+            }
+    params = used if param_location == "params" else None
+    body = used if param_location == "body" else None
+    if rng.random() < 0.5:
+        agent.update_Q_item(operation_id, params, body, rng.uniform(-2.0, 2.0))
+    else:
+        agent.update_q_table(operation_id, params, body, rng.choice([-1.0, 0.5, 2.0]))
+
+
+@pytest.mark.parametrize("seed", range(15))
+def test_best_action_matches_scan(seed: int) -> None:
+    rng = random.Random(seed)
+    agent = DependencyAgent(None, alpha=0.3)  # type: ignore[arg-type]
+    agent.q_table = _random_table(rng)
+
+    for _ in range(400):
+        operation_id = rng.choice(OPERATIONS)
+        step = rng.random()
+        if step < 0.15:
+            agent.mark_available(
+                rng.choice(LOCATIONS),
+                rng.choice(OPERATIONS),
+                rng.choice(DEPENDENT_PARAMS),
+            )
+        elif step < 0.7:
+            _random_update(rng, agent, operation_id)
+        elif step < 0.8:
+            agent.add_new_dependency(
+                operation_id,
+                "body",
+                f"b{rng.randint(0, 4)}",
+                rng.choice([op for op in OPERATIONS if op != operation_id]),
+                rng.choice(LOCATIONS),
+                rng.choice(DEPENDENT_PARAMS),
+            )
+
+        _, best_params, best_body = agent.get_best_action(operation_id, None)
+        assert {**_as_tuples(best_params), **_as_tuples(best_body)} == _scan_best(
+            agent, operation_id
+        )
+
+
+def test_random_action_draws_only_available_candidates() -> None:
+    rng = random.Random(3)
+    agent = DependencyAgent(None)  # type: ignore[arg-type]
+    agent.q_table = _random_table(rng)
+    for _ in range(20):
+        agent.mark_available(
+            rng.choice(LOCATIONS), rng.choice(OPERATIONS), rng.choice(DEPENDENT_PARAMS)
+        )
+
+    for operation_id in OPERATIONS:
+        drawn: dict = {}
+        for _ in range(300):
+            _, random_params, random_body = agent.get_random_action(operation_id, None)
+            for param, choice in {
+                **_as_tuples(random_params),
+                **_as_tuples(random_body),
+            }.items():
+                drawn.setdefault(param, set()).add(choice[:3])
+        for param_location in ("params", "body"):
+            for param in agent.q_table[operation_id][param_location]:
+                expected = {
+                    candidate[:3]
+                    for candidate in _available(
+                        agent, operation_id, param_location, param
+                    )
+                }
+                assert drawn[param] == (expected or {(None, None, None)})
+
+
+def test_rebuilt_availability_follows_stores() -> None:
+    rng = random.Random(11)
+    agent = DependencyAgent(None)  # type: ignore[arg-type]
+    agent.q_table = _random_table(rng)
+    operation_id = OPERATIONS[0]
+    agent.get_best_action(operation_id, None)
+
+    dependents = agent.q_table[operation_id]["params"][("p0", "query")]
+    dependent_op = next(iter(dependents))
+    dependent_param = next(
+        (name for name in dependents[dependent_op]["response"]), None
+    )
+    if dependent_param is None:
+        pytest.skip("seed produced no response dependency")
+    stores = {dependent_op: {dependent_param: ["value"]}}
+
+    class Learner:
+        successful_parameters: dict = {}
+        successful_bodies: dict = {}
+        successful_responses = stores
+
+    agent.rebuild_availability(Learner())  # type: ignore[arg-type]
+    assert agent.available_sources == {("response", dependent_op, dependent_param)}
+    assert {
+        **_as_tuples(agent.get_best_action(operation_id, None)[1]),
+        **_as_tuples(agent.get_best_action(operation_id, None)[2]),
+    } == _scan_best(agent, operation_id)
+
+
+def test_new_dependency_reports_only_new_response_entries() -> None:
+    agent = DependencyAgent(None)  # type: ignore[arg-type]
+    agent.q_table = {"op0": {"params": {}, "body": {}}}
+    param = ("p0", "query")
+
+    # Only a new response entry changes what the response harvester must keep.
+    assert agent.add_new_dependency("op0", "params", param, "op1", "response", "id")
+    assert not agent.add_new_dependency("op0", "params", param, "op1", "response", "id")
+    assert not agent.add_new_dependency("op0", "params", param, "op1", "body", "name")
+    assert not agent.add_new_dependency("op0", "body", "b0", "op1", "other", "id")
@@ -0,0 +1,97 @@
+"""Undocumented response properties are matched off the learning thread against a frozen index."""
+
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from autoresttest.agents import DependencyAgent, ParameterEmbeddingIndex
+from autoresttest.marl.dependency_matcher import UndocumentedResponseMatcher
+
+VECTORS = {
+    "id": [1.0, 0.0, 0.0],
+    "userid": [0.9, 0.1, 0.0],
+    "name": [0.0, 1.0, 0.0],
+    "owner": [0.0, 0.2, 1.0],
+}
+
+
+class TableEmbeddings:
+    """An embedding model answering from ``VECTORS``; ``boom`` fails to encode."""
+
+    @staticmethod
+    def handle_word_cases(name: str) -> str:
+        return name.lower()
+
+    def encode_sentence_or_word(self, name: str):
+        if name == "boom":
+            raise RuntimeError("embedding service unavailable")
+        vector = VECTORS.get(name)
+        return None if vector is None else np.array(vector)
+
+
+def _agent() -> DependencyAgent:
+    graph = SimpleNamespace(
+        embedding_model=TableEmbeddings(),
+        dependency_comparator=SimpleNamespace(threshold=0.8),
+    )
+    agent = DependencyAgent(graph)  # type: ignore[arg-type]
+    agent.q_table = {
+        "getUser": {"params": {("id", "path"): {}}, "body": {"name": {}}},
+        "createPet": {"params": {}, "body": {"owner": {}}},
+    }
+    return agent
+
+
+def test_snapshots_ignore_later_additions() -> None:
+    index = ParameterEmbeddingIndex(TableEmbeddings())
+    index.add("getUser", "params", ("id", "path"), "id")
+    snapshot = index.snapshot()
+    assert index.snapshot() is snapshot
+
+    index.add("listUsers", "params", ("userId", "query"), "userId")
+    index.add("getPet", "params", ("id", "path"), "id")
+    assert snapshot.match("id", 0.8) == [("getUser", "params", ("id", "path"))]
+    assert index.match("id", 0.8) == [
+        ("getUser", "params", ("id", "path")),
+        ("getPet", "params", ("id", "path")),
+        ("listUsers", "params", ("userId", "query")),
+    ]
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_index_is_only_built_on_the_learning_thread(background: bool) -> None:
+    agent = _agent()
+    build_threads = []
+    build_index = agent.parameter_index
+
+    def parameter_index() -> ParameterEmbeddingIndex:
+        build_threads.append(threading.current_thread())
+        return build_index()
+
+    agent.parameter_index = parameter_index  # type: ignore[method-assign]
+    matcher = UndocumentedResponseMatcher(agent, background=background)
+    matcher.submit("listUsers", "userId")
+    # A sharded merge replaces the Q-table while the property is still queued.
+    agent.q_table = {"getPet": {"params": {("owner", "query"): {}}, "body": {}}}
+    matcher.submit("listUsers", "owner")
+
+    assert matcher.flush() == [
+        ("listUsers", "userId", [("getUser", "params", ("id", "path"))]),
+        ("listUsers", "owner", [("getPet", "params", ("owner", "query"))]),
+    ]
+    assert build_threads == [threading.main_thread()] * 2
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_matching_errors_reach_the_learning_thread(background: bool) -> None:
+    matcher = UndocumentedResponseMatcher(_agent(), background=background)
+    with pytest.raises(RuntimeError, match="embedding service unavailable"):
+        matcher.submit("listUsers", "boom")
+        matcher.flush()
+
+    matcher.submit("listUsers", "name")
+    assert matcher.flush() == [
+        ("listUsers", "name", [("getUser", "body", "name")]),
+    ]
@@ -0,0 +1,99 @@
+"""Value tables are generated in waves that respect dependencies without serializing cycles."""
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from autoresttest.graph import RequestGenerator
+
+
+def _nodes(edges: dict[str, list[str]]) -> dict:
+    return {
+        operation_id: SimpleNamespace(
+            outgoing_edges=[
+                SimpleNamespace(destination=SimpleNamespace(operation_id=destination))
+                for destination in destinations
+            ]
+        )
+        for operation_id, destinations in edges.items()
+    }
+
+
+def _reachable(edges: dict[str, list[str]], start: str) -> set[str]:
+    seen, frontier = {start}, [start]
+    while frontier:
+        for destination in edges[frontier.pop()]:
+            if destination in edges and destination not in seen:
+                seen.add(destination)
+                frontier.append(destination)
+    return seen
+
+
+def test_chain_gives_one_wave_per_level() -> None:
+    waves = RequestGenerator.dependency_waves(
+        _nodes({"create": [], "read": ["create"], "update": ["read"], "list": []})
+    )
+    assert waves == [["create", "list"], ["read"], ["update"]]
+
+
+def test_mutual_dependencies_share_a_wave() -> None:
+    operations = [f"op{idx}" for idx in range(40)]
+    # Shared "id"/"name" parameters link almost every pair in both directions.
+    edges = {
+        operation_id: [other for other in operations if other != operation_id]
+        for operation_id in operations
+    }
+    edges["report"] = ["op0"]
+    waves = RequestGenerator.dependency_waves(_nodes(edges))
+    assert waves == [operations, ["report"]]
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_waves_respect_dependencies_outside_cycles(seed: int) -> None:
+    rng = random.Random(seed)
+    operations = [f"op{idx}" for idx in range(30)]
+    edges = {
+        operation_id: rng.sample(operations, rng.randint(0, 3))
+        for operation_id in operations
+    }
+    waves = RequestGenerator.dependency_waves(_nodes(edges))
+    wave_of = {
+        operation_id: idx for idx, wave in enumerate(waves) for operation_id in wave
+    }
+
+    assert sorted(wave_of) == sorted(operations)
+    assert all(wave == sorted(wave, key=operations.index) for wave in waves)
+    reachable = {
+        operation_id: _reachable(edges, operation_id) for operation_id in edges
+    }
+    for operation_id, destinations in edges.items():
+        for destination in destinations:
+            if operation_id in reachable[destination]:
+                # Same cycle: nothing can go first, so both share a wave.
+                assert wave_of[destination] == wave_of[operation_id]
+            else:
+                assert wave_of[destination] < wave_of[operation_id]
+    # Every later wave waits on the previous one through some member of its cycle.
+    for operation_id, idx in wave_of.items():
+        if idx:
+            component = {
+                other
+                for other in reachable[operation_id]
+                if operation_id in reachable[other]
+            }
+            assert any(
+                wave_of[destination] == idx - 1
+                for member in component
+                for destination in edges[member]
+            )
+
+
+def test_long_chains_do_not_recurse() -> None:
+    operations = [f"op{idx}" for idx in range(5000)]
+    edges = {
+        operation_id: [operations[idx - 1]] if idx else []
+        for idx, operation_id in enumerate(operations)
+    }
+    edges[operations[0]] = [operations[-1]]
+    assert RequestGenerator.dependency_waves(_nodes(edges)) == [operations]
@@ -0,0 +1,111 @@
+"""Each fault behind a server error is one failure class, where exact deduplication keeps every variant."""
+
+import json
+import random
+
+import pytest
+
+from autoresttest.utils import classify_error
+from autoresttest.utils.error_clusters import normalize_error_message
+
+# (operation, status, message template, parameter names, body property names)
+FAULTS = [
+    ("getUser", 500, "User {id} not found in shard {n}", ["id"], []),
+    ("getUser", 500, "NullPointerException at UserService.java:{n}", ["id"], []),
+    (
+        "createUser",
+        500,
+        "duplicate key value '{name}' violates constraint",
+        [],
+        ["name"],
+    ),
+    ("createUser", 503, "upstream timeout after {n}ms", [], ["name", "age"]),
+    ("listUsers", 500, "Traceback: KeyError {id} at 0x{hex}", ["limit", "page"], []),
+]
+
+
+def _server_error(rng: random.Random, fault) -> tuple:
+    operation_id, status, template, parameter_names, body_names = fault
+    message = template.format(
+        id=rng.randrange(10**6),
+        n=rng.randrange(1000),
+        name=f"user{rng.randrange(100)}",
+        hex=f"{rng.getrandbits(64):016x}",
+    )
+    parameters = {(name, "query"): rng.randrange(50) for name in parameter_names}
+    body = (
+        {"application/json": {name: rng.randrange(50) for name in body_names}}
+        if body_names
+        else None
+    )
+    response_text = json.dumps({"message": message, "status": status})
+    return operation_id, status, response_text, parameters or None, body
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_each_fault_is_one_class_among_many_unique_errors(seed: int) -> None:
+    rng = random.Random(seed)
+    unique_errors: list = []
+    error_classes: dict = {}
+    error_class_counts: dict = {}
+    fault_of_class: dict = {}
+    faults_hit = set()
+
+    for _ in range(300):
+        fault = rng.randrange(len(FAULTS))
+        faults_hit.add(fault)
+        operation_id, status, response_text, parameters, body = _server_error(
+            rng, FAULTS[fault]
+        )
+        data_signature = {
+            "parameters": parameters,
+            "body": body,
+            "operation_id": operation_id,
+        }
+        # The exact deduplication QLearning did before classes existed.
+        if data_signature not in unique_errors:
+            unique_errors.append(data_signature)
+
+        fingerprint, error_class = classify_error(
+            operation_id, status, response_text, parameters, body
+        )
+        if fingerprint not in error_classes:
+            error_class["example"] = data_signature
+            error_classes[fingerprint] = error_class
+        error_class_counts[fingerprint] = error_class_counts.get(fingerprint, 0) + 1
+        assert fault_of_class.setdefault(fingerprint, fault) == fault
+
+    # Random values make most errors unique, but each fault is a single class.
+    assert len(error_classes) == len(faults_hit)
+    assert len(error_classes) < len(unique_errors)
+    assert sum(error_class_counts.values()) == 300
+    for error_class in error_classes.values():
+        assert error_class["example"] in unique_errors
+
+
+def test_messages_mask_request_specific_values() -> None:
+    first = normalize_error_message(
+        '{"message": "Order 1234 for \'alice\' failed (id 5f0c8e9a-1b2c-4d5e-8f90-123456789abc)"}'
+    )
+    second = normalize_error_message(
+        '{"message": "Order 77 for \'bob\' failed (id 0a1b2c3d-4e5f-4a6b-8c7d-9e0f1a2b3c4d)"}'
+    )
+    assert first == second == "Order <n> for <str> failed (id <uuid>)"
+
+
+def test_input_shape_and_status_separate_classes() -> None:
+    text = '{"message": "boom"}'
+    base, _ = classify_error(
+        "createUser", 500, text, None, {"application/json": {"a": 1}}
+    )
+    same, _ = classify_error(
+        "createUser", 500, text, None, {"application/json": {"a": 9}}
+    )
+    other_shape, _ = classify_error(
+        "createUser", 500, text, None, {"application/json": {"a": 1, "b": 2}}
+    )
+    other_status, _ = classify_error(
+        "createUser", 502, text, None, {"application/json": {"a": 1}}
+    )
+    assert base == same
+    assert len({base, other_shape, other_status}) == 3
@@ -0,0 +1,300 @@
+"""The incremental exploration counters must always agree with a full Q-table scan."""
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from autoresttest.agents import (
+    BaseAgent,
+    BodyObjAgent,
+    DataSourceAgent,
+    DependencyAgent,
+    HeaderAgent,
+    OperationAgent,
+    ParameterAction,
+    ParameterAgent,
+    ValueAgent,
+)
+from autoresttest.agents.action_table import create_action_table, random_action
+from autoresttest.utils import (
+    get_combination_space,
+    get_combinations,
+    get_param_combination_space,
+    get_param_combinations,
+)
+from conftest import LOCATIONS, random_dependency_table
+
+OPERATIONS = [f"op{idx}" for idx in range(5)]
+DEPENDENT_PARAMS = ["id", "name", "owner", "status"]
+
+
+def _random_table(rng: random.Random) -> dict:
+    return random_dependency_table(rng, OPERATIONS, DEPENDENT_PARAMS)
+
+
+def _random_mapping(rng: random.Random, agent: DependencyAgent, operation_id: str):
+    """A used dependency for one random parameter of each kind, as QLearning passes them."""
+    params, body = {}, {}
+    for param_location, used in (("params", params), ("body", body)):
+        candidates = [
+            (param, dependent_op, dependent_param)
+            for param, dependents in agent.q_table[operation_id][param_location].items()
+            for dependent_op, locations in dependents.items()
+            for dependent_params in locations.values()
+            for dependent_param in dependent_params
+        ]
+        if candidates:
+            param, dependent_op, dependent_param = rng.choice(candidates)
+            used[param] = {
+                "dependent_operation": dependent_op,
+                "dependent_val": dependent_param,
+            }
+    return params or None, body or None
+
+
+def _assert_counters_match(agent: BaseAgent, operations=OPERATIONS) -> None:
+    for operation_id in operations:
+        zeros, total = agent._scan_zeros(operation_id)
+        assert agent.number_of_zeros(operation_id) == zeros
+        assert agent.exploration_state(operation_id) == (zeros, total - zeros)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_counters_match_full_scan(seed: int) -> None:
+    rng = random.Random(seed)
+    agent = DependencyAgent(None, alpha=0.5)  # type: ignore[arg-type]
+    agent.q_table = _random_table(rng)
+    # Build every counter first, so later steps go through the incremental updates.
+    _assert_counters_match(agent)
+
+    for _ in range(300):
+        operation_id = rng.choice(OPERATIONS)
+        step = rng.random()
+        if step < 0.35:
+            params, body = _random_mapping(rng, agent, operation_id)
+            # Powers of two keep the sums exact, so entries can return to exactly 0.
+            td_error = rng.choice([-2.0, -1.0, 0.0, 1.0, 2.0])
+            agent.update_Q_item(operation_id, params, body, td_error)
+        elif step < 0.6:
+            params, body = _random_mapping(rng, agent, operation_id)
+            agent.update_q_table(
+                operation_id, params, body, rng.choice([-1.0, 0.0, 2.0])
+            )
+        elif step < 0.9:
+            param_location = rng.choice(["params", "body"])
+            operation_param = (
+                (f"p{rng.randint(0, 4)}", "query")
+                if param_location == "params"
+                else f"b{rng.randint(0, 3)}"
+            )
+            agent.add_new_dependency(
+                operation_id,
+                param_location,
+                operation_param,
+                rng.choice([op for op in OPERATIONS if op != operation_id]),
+                rng.choice(LOCATIONS),
+                rng.choice(DEPENDENT_PARAMS + ["extra"]),
+            )
+        else:
+            param_location = rng.choice(["params", "body"])
+            params = list(agent.q_table[operation_id][param_location])
+            if params:
+                agent.add_undocumented_responses(
+                    rng.choice(OPERATIONS),
+                    rng.choice(DEPENDENT_PARAMS),
+                    matches=[(operation_id, param_location, rng.choice(params))],
+                )
+        if rng.random() < 0.2:
+            _assert_counters_match(agent)
+
+    _assert_counters_match(agent)
+
+
+def test_counters_follow_a_replaced_table() -> None:
+    rng = random.Random(7)
+    agent = DependencyAgent(None)  # type: ignore[arg-type]
+    agent.q_table = _random_table(rng)
+    _assert_counters_match(agent)
+    # Loading a cached table or applying a sharded merge swaps the table object.
+    agent.q_table = _random_table(rng)
+    _assert_counters_match(agent)
+
+
+# Powers of two keep the sums exact, so entries can return to exactly 0.
+TD_ERRORS = [-2.0, -1.0, 0.0, 1.0, 2.0]
+REWARDS = [-1.0, 0.0, 2.0]
+BACKENDS = ["dict", "array", "lazy"]
+
+
+def _graph() -> SimpleNamespace:
+    return SimpleNamespace(
+        operation_nodes={operation_id: None for operation_id in OPERATIONS},
+        operation_edges=[],
+    )
+
+
+def _run_steps(agent: BaseAgent, seed: int, step) -> None:
+    """Applies ``step(rng, operation_id)`` at random, checking the counters as it goes."""
+    rng = random.Random(seed)
+    _assert_counters_match(agent)
+    for _ in range(300):
+        step(rng, rng.choice(OPERATIONS))
+        if rng.random() < 0.2:
+            _assert_counters_match(agent)
+    _assert_counters_match(agent)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_operation_agent_counters_match_full_scan(seed: int) -> None:
+    agent = OperationAgent(_graph(), alpha=0.5)  # type: ignore[arg-type]
+    agent.initialize_q_table()
+
+    def step(rng: random.Random, operation_id: str) -> None:
+        if rng.random() < 0.6:
+            agent.update_Q_item(operation_id, rng.choice(TD_ERRORS))
+        else:
+            agent.update_q_table(operation_id, rng.choice(REWARDS))
+
+    _run_steps(agent, seed, step)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_data_source_agent_counters_match_full_scan(seed: int) -> None:
+    agent = DataSourceAgent(_graph(), alpha=0.5)  # type: ignore[arg-type]
+    agent.initialize_q_table()
+    sources = ["LLM", "DEPENDENCY", "DEFAULT"]
+
+    def step(rng: random.Random, operation_id: str) -> None:
+        draw = rng.random()
+        if draw < 0.5:
+            agent.update_Q_item(
+                operation_id, rng.choice(sources), rng.choice(TD_ERRORS)
+            )
+        elif draw < 0.95:
+            agent.update_q_table(operation_id, rng.choice(sources), rng.choice(REWARDS))
+        else:
+            # Adds a source to every operation once the graph gains dependencies.
+            agent.initialize_dependency_source()
+
+    _run_steps(agent, seed, step)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_header_agent_counters_match_full_scan(seed: int) -> None:
+    rng = random.Random(seed)
+    agent = HeaderAgent(_graph(), alpha=0.5)  # type: ignore[arg-type]
+    tokens = [f"token{idx}" for idx in range(4)]
+    agent.q_table = {
+        operation_id: [[token, 0] for token in rng.sample(tokens, rng.randint(0, 4))]
+        + [[None, 0]]
+        for operation_id in OPERATIONS
+    }
+
+    def step(rng: random.Random, operation_id: str) -> None:
+        token = rng.choice(tokens + [None])
+        if rng.random() < 0.6:
+            agent.update_Q_item(operation_id, token, rng.choice(TD_ERRORS))
+        else:
+            agent.update_q_table(operation_id, token, rng.choice(REWARDS))
+
+    _run_steps(agent, seed, step)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_value_agent_counters_match_full_scan(seed: int) -> None:
+    rng = random.Random(seed)
+    agent = ValueAgent(_graph(), alpha=0.5)  # type: ignore[arg-type]
+    agent.q_table = {
+        operation_id: {
+            "params": {
+                (f"p{idx}", "query"): [[value, 0] for value in range(rng.randint(1, 4))]
+                for idx in range(rng.randint(0, 3))
+            },
+            "body": {
+                "application/json": [
+                    [{"name": f"n{value}"}, 0] for value in range(rng.randint(0, 3))
+                ]
+            },
+        }
+        for operation_id in OPERATIONS
+    }
+
+    def step(rng: random.Random, operation_id: str) -> None:
+        action = agent.get_random_action(operation_id)
+        if rng.random() < 0.6:
+            agent.update_Q_item(operation_id, action, rng.choice(TD_ERRORS))
+        else:
+            agent.update_q_table(operation_id, action, rng.choice(REWARDS))
+
+    _run_steps(agent, seed, step)
+
+
+def _parameter_table(backend: str, operation_id: str, optional: int) -> dict:
+    """ParameterAgent.initialize_q_table for one operation with ``optional`` parameters."""
+    parameters = {
+        (f"p{idx}", "query"): SimpleNamespace(required=False) for idx in range(optional)
+    }
+    combinations = (
+        get_param_combination_space if backend == "lazy" else get_param_combinations
+    )
+    params = create_action_table(
+        backend, combinations(parameters, required_params=set(), seed=operation_id)
+    )
+    params["None"] = 0
+    return {"params": params, "body": {"application/json": 0, "None": 0}}
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("seed", range(5))
+def test_parameter_agent_counters_match_full_scan(backend: str, seed: int) -> None:
+    rng = random.Random(seed)
+    agent = ParameterAgent(_graph(), alpha=0.5)  # type: ignore[arg-type]
+    agent.q_table = {
+        operation_id: _parameter_table(backend, operation_id, rng.randint(0, 5))
+        for operation_id in OPERATIONS
+    }
+
+    def step(rng: random.Random, operation_id: str) -> None:
+        action = agent.get_random_action(operation_id)
+        if rng.random() < 0.1:
+            action = ParameterAction(req_params=None, mime_type=None)
+        if rng.random() < 0.6:
+            agent.update_Q_item(operation_id, action, rng.choice(TD_ERRORS))
+        else:
+            agent.update_q_table(operation_id, action, rng.choice(REWARDS))
+
+    _run_steps(agent, seed, step)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("seed", range(5))
+def test_body_obj_agent_counters_match_full_scan(backend: str, seed: int) -> None:
+    rng = random.Random(seed)
+    agent = BodyObjAgent(_graph(), alpha=0.5)  # type: ignore[arg-type]
+    combinations = get_combination_space if backend == "lazy" else get_combinations
+    agent.q_table = {}
+    for operation_id in OPERATIONS:
+        agent.q_table[operation_id] = {}
+        for mime in rng.sample(
+            ["application/json", "application/xml"], rng.randint(0, 2)
+        ):
+            properties = [f"f{idx}" for idx in range(rng.randint(1, 5))]
+            table = create_action_table(
+                backend, combinations(properties, seed=f"{operation_id}:{mime}")
+            )
+            table["None"] = 0.0
+            agent.q_table[operation_id][mime] = table
+
+    def step(rng: random.Random, operation_id: str) -> None:
+        if not agent.q_table[operation_id]:
+            return
+        mime = rng.choice(list(agent.q_table[operation_id]))
+        action = random_action(agent.q_table[operation_id][mime])
+        action = action if isinstance(action, tuple) else None
+        if rng.random() < 0.6:
+            agent.update_Q_item(operation_id, mime, action, rng.choice(TD_ERRORS))
+        else:
+            agent.update_q_table(operation_id, mime, action, rng.choice(REWARDS))
+
+    _run_steps(agent, seed, step)
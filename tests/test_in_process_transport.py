@@ -0,0 +1,135 @@
+"""The in-process adapters answer like a server would: status, reason, headers, and body."""
+
+import json
+
+import pytest
+import requests
+
+from autoresttest.transport import ASGIAdapter, WSGIAdapter
+
+
+def _echo(method: str, path: str, query: str, headers: dict, body: bytes) -> bytes:
+    return json.dumps(
+        {
+            "method": method,
+            "path": path,
+            "query": query,
+            "token": headers.get("x-token"),
+            "content_type": headers.get("content-type"),
+            "body": json.loads(body) if body else None,
+        }
+    ).encode()
+
+
+def wsgi_app(environ, start_response):
+    if environ["PATH_INFO"] == "/boom":
+        raise RuntimeError("app failure")
+    body = environ["wsgi.input"].read(int(environ.get("CONTENT_LENGTH") or 0))
+    headers = {
+        "x-token": environ.get("HTTP_X_TOKEN"),
+        "content-type": environ.get("CONTENT_TYPE"),
+    }
+    start_response(
+        "201 Created",
+        [
+            ("Content-Type", "application/json"),
+            ("Set-Cookie", "a=1"),
+            ("Set-Cookie", "b=2"),
+        ],
+    )
+    return [
+        _echo(
+            environ["REQUEST_METHOD"],
+            environ["PATH_INFO"],
+            environ["QUERY_STRING"],
+            headers,
+            body,
+        )
+    ]
+
+
+class LifespanApp:
+    """An ASGI app that records its lifespan events and streams its response body."""
+
+    def __init__(self) -> None:
+        self.events: list[str] = []
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                self.events.append(message["type"])
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                else:
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["path"] == "/boom":
+            raise RuntimeError("app failure")
+        message = await receive()
+        headers = {name.decode(): value.decode() for name, value in scope["headers"]}
+        body = _echo(
+            scope["method"],
+            scope["path"],
+            scope["query_string"].decode(),
+            headers,
+            message["body"],
+        )
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 201,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"set-cookie", b"a=1"),
+                    (b"set-cookie", b"b=2"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body[:5], "more_body": True})
+        await send({"type": "http.response.body", "body": body[5:]})
+
+
+@pytest.fixture(params=["wsgi", "asgi"])
+def session(request):
+    if request.param == "asgi":
+        app = LifespanApp()
+        adapter = ASGIAdapter(app)
+    else:
+        adapter = WSGIAdapter(wsgi_app)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    yield session
+    session.close()
+    if request.param == "asgi":
+        adapter.shutdown()
+        assert app.events == ["lifespan.startup", "lifespan.shutdown"]
+
+
+def test_request_and_response_round_trip(session) -> None:
+    response = session.post(
+        "http://sut.example/items/a%20b?tag=x&tag=y",
+        json={"name": "widget", "count": 2},
+        headers={"X-Token": "secret"},
+    )
+    assert response.status_code == 201
+    assert response.reason == "Created"
+    assert response.ok
+    assert response.headers["content-type"] == "application/json"
+    # Repeated headers are folded as urllib3 folds them on the socket path.
+    assert response.headers["Set-Cookie"] == "a=1, b=2"
+    assert response.json() == {
+        "method": "POST",
+        "path": "/items/a b",
+        "query": "tag=x&tag=y",
+        "token": "secret",
+        "content_type": "application/json",
+        "body": {"name": "widget", "count": 2},
+    }
+
+
+def test_app_errors_become_server_errors(session) -> None:
+    response = session.get("http://sut.example/boom")
+    assert response.status_code == 500
+    assert not response.ok
+    assert response.content == b"Internal Server Error"
@@ -0,0 +1,150 @@
+"""An incremental graph rebuild from a cached graph matches a full rebuild of the new spec."""
+
+import hashlib
+import pickle
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from autoresttest.graph import OperationGraph
+from autoresttest.models import (
+    OperationProperties,
+    ParameterProperties,
+    SimilarityValue,
+)
+
+NAMES = ["id", "petId", "name", "owner", "ownerId", "tag", "status", "limit", "page"]
+
+
+def _similarity(name: str, other: str) -> float:
+    digest = hashlib.sha256(f"{min(name, other)}|{max(name, other)}".encode())
+    return 1.0 if name == other else int(digest.hexdigest()[:4], 16) / 0xFFFF
+
+
+class NameComparator:
+    """Compares parameter names through a fixed similarity, counting the comparisons."""
+
+    threshold = 0.8
+
+    def __init__(self) -> None:
+        self.operations: dict = {}
+        self.comparisons = 0
+
+    def build_embedding_matrix(self, operations: dict) -> None:
+        self.operations = operations
+
+    def compare_operations(self, operation_id: str, dependent_operation_id: str):
+        self.comparisons += 1
+        similar, closest = {}, []
+        dependent = self.operations[dependent_operation_id].parameters
+        for key in self.operations[operation_id].parameters:
+            for dependent_key in dependent:
+                similarity = _similarity(key[0], dependent_key[0])
+                value = SimilarityValue(dependent_key, "params", similarity)
+                if similarity > self.threshold:
+                    similar.setdefault(key, []).append(value)
+                elif similarity > 0.4:
+                    closest.append((key, value))
+        return similar, closest
+
+
+def _operation(operation_id: str, names: list[str]) -> OperationProperties:
+    return OperationProperties(
+        operation_id=operation_id,
+        endpoint_path=f"/{operation_id}",
+        http_method="GET",
+        parameters={
+            (name, "query"): ParameterProperties(name=name, in_value="query")
+            for name in names
+        },
+    )
+
+
+def _build(operations: dict, previous: dict | None = None):
+    parser = SimpleNamespace(parse_specification=lambda: dict(operations))
+    graph = OperationGraph("spec.yaml", "spec", parser, None)  # type: ignore[arg-type]
+    graph.dependency_comparator = NameComparator()  # type: ignore[assignment]
+    graph.create_graph(previous=previous)
+    return graph
+
+
+def _cached(graph: OperationGraph) -> dict:
+    # What generate_graph stores in shelve, read back as fresh objects.
+    return pickle.loads(
+        pickle.dumps(
+            {
+                "edges": graph.operation_edges,
+                "nodes": graph.operation_nodes,
+                "operation_hashes": graph.operation_hashes,
+                "settings": graph.comparison_settings(),
+            }
+        )
+    )
+
+
+def _edges(edges) -> list:
+    return [
+        (
+            edge.source.operation_id,
+            edge.destination.operation_id,
+            edge.similar_parameters,
+        )
+        for edge in edges
+    ]
+
+
+def _summary(graph: OperationGraph) -> tuple:
+    return (
+        _edges(graph.operation_edges),
+        {
+            operation_id: (_edges(node.outgoing_edges), _edges(node.tentative_edges))
+            for operation_id, node in graph.operation_nodes.items()
+        },
+    )
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_incremental_rebuild_matches_a_full_rebuild(seed: int) -> None:
+    rng = random.Random(seed)
+    operations = {
+        f"op{idx}": _operation(f"op{idx}", rng.sample(NAMES, rng.randint(1, 3)))
+        for idx in range(8)
+    }
+    cached = _cached(_build(operations))
+
+    edited = dict(operations)
+    modified, removed = rng.sample(sorted(operations), 2)
+    edited[modified] = _operation(modified, rng.sample(NAMES, rng.randint(1, 3)))
+    del edited[removed]
+    edited["added"] = _operation("added", rng.sample(NAMES, 2))
+
+    full = _build(edited)
+    incremental = _build(edited, previous=cached)
+    assert _summary(incremental) == _summary(full)
+    assert incremental.operation_hashes == full.operation_hashes
+
+
+def test_only_pairs_touching_changes_are_compared() -> None:
+    operations = {
+        f"op{idx}": _operation(f"op{idx}", [NAMES[idx], NAMES[idx + 1]])
+        for idx in range(6)
+    }
+    full = _build(operations)
+    assert full.dependency_comparator.comparisons == 6 * 5
+
+    unchanged = _build(operations, previous=_cached(full))
+    assert unchanged.dependency_comparator.comparisons == 0
+    assert _summary(unchanged) == _summary(full)
+
+    edited = {**operations, "op2": _operation("op2", ["limit"])}
+    incremental = _build(edited, previous=_cached(full))
+    rows_with_tentatives = {
+        operation_id
+        for operation_id, node in full.operation_nodes.items()
+        if node.tentative_edges and operation_id != "op2"
+    }
+    # op2's row and column, plus the rows that kept only their top candidates.
+    expected = 5 + 5 + 4 * len(rows_with_tentatives)
+    assert incremental.dependency_comparator.comparisons == expected
+    assert _summary(incremental) == _summary(_build(edited))
@@ -0,0 +1,189 @@
+"""
+The rate limiter reports waits instead of sleeping and tracks only throttled operations;
+the scheduling loops resend 429 responses instead of learning from them and steer the
+operation choice away from throttled operations.
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from autoresttest.agents import OperationAgent
+from autoresttest.marl.async_engine import AsyncExecutionEngine
+from autoresttest.marl.marl import QLearning
+from autoresttest.transport import RateLimiter, get_rate_limiter, session_key
+
+URL = "http://api.example.com/v1/users"
+
+
+def _response(status: int, **headers: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers)
+    return response
+
+
+def test_session_key_groups_by_scheme_and_host() -> None:
+    assert session_key(URL) == session_key("HTTP://API.example.com/other?x=1")
+    assert session_key(URL) != session_key("https://api.example.com/v1/users")
+
+
+def test_acquire_returns_the_wait_without_sleeping() -> None:
+    limiter = RateLimiter()
+    assert limiter.acquire(URL, "getUser") == 0
+    limiter.observe(URL, None, _response(503, **{"Retry-After": "30"}))
+
+    start = time.monotonic()
+    wait = limiter.acquire(URL, "getUser")
+    assert time.monotonic() - start < 1
+    assert 29 < wait <= 30
+    # A paused host holds back every operation, including ones never throttled.
+    assert limiter.acquire(URL, "listUsers") > 29
+
+
+def test_throttled_operations_lists_only_blocked_operations() -> None:
+    limiter = RateLimiter()
+    for operation_id in ("getUser", "listUsers", "createUser"):
+        assert limiter.acquire(URL, operation_id) == 0
+    limiter.observe(URL, "createUser", _response(429, **{"Retry-After": "5"}))
+
+    delays = limiter.throttled_operations()
+    assert list(delays) == ["createUser"]
+    assert 4 < delays["createUser"] <= 5
+    assert limiter.acquire(URL, "getUser") == 0
+    assert limiter.acquire(URL, "createUser") > 4
+
+
+def test_expired_blocks_are_forgotten() -> None:
+    limiter = RateLimiter()
+    limiter.observe(URL, "createUser", _response(429, **{"Retry-After": "0.01"}))
+    assert "createUser" in limiter.throttled_operations()
+    time.sleep(0.02)
+    assert limiter.throttled_operations() == {}
+    assert limiter._throttled == set()
+
+
+class ScriptedLearner:
+    """The parts of QLearning the scheduling loops call, answering from a script."""
+
+    RATE_LIMIT_RESENDS = QLearning.RATE_LIMIT_RESENDS
+    reserve_send = QLearning.reserve_send
+    defer_rate_limited = QLearning.defer_rate_limited
+    _wait_to_send = QLearning._wait_to_send
+    execute_operations = QLearning.execute_operations
+
+    def __init__(self, operation_id: str, statuses) -> None:
+        self.api_url = "http://scripted.example.com"
+        self.time_duration = 0.3
+        self.step_hooks: list = []
+        self.operation_id = operation_id
+        self.statuses = statuses
+        self.sends = 0
+        self.prepared: list[SimpleNamespace] = []
+        self.learned: list[tuple[SimpleNamespace, int]] = []
+
+    def determine_complete_body_mappings(self) -> dict:
+        return {}
+
+    def _epsilon_decay_rate(self) -> float:
+        return 0.0
+
+    def epsilon_decay(self, epsilon_decay_rate: float) -> None:
+        pass
+
+    def prepare_step(self, complete_body_mappings, start_time) -> SimpleNamespace:
+        step = SimpleNamespace(operation_id=self.operation_id, rate_limited=0)
+        self.prepared.append(step)
+        return step
+
+    def send_step(self, step):
+        response = _response(self.statuses(self.sends), **{"Retry-After": "0.01"})
+        self.sends += 1
+        # dispatch_request lets the limiter observe every response.
+        get_rate_limiter().observe(self.api_url, step.operation_id, response)
+        return response
+
+    def learn_step(self, step, response) -> None:
+        self.learned.append((step, response.status_code))
+
+
+def _run(learner: ScriptedLearner, concurrency: int) -> None:
+    if concurrency > 1:
+        AsyncExecutionEngine(learner, concurrency).run()  # type: ignore[arg-type]
+    else:
+        learner.execute_operations()
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_rate_limited_steps_are_resent_not_learned(concurrency: int) -> None:
+    learner = ScriptedLearner(
+        f"resent{concurrency}", lambda sends: 429 if sends < 2 else 200
+    )
+    _run(learner, concurrency)
+
+    statuses = [status for _, status in learner.learned]
+    assert statuses and set(statuses) == {200}
+    # The steps answered with 429 were learned from their resent response.
+    assert sum(step.rate_limited for step, _ in learner.learned) == 2
+    assert learner.learned[0][0] in learner.prepared[:2]
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_steps_rate_limited_past_the_resends_are_dropped(concurrency: int) -> None:
+    learner = ScriptedLearner(f"dropped{concurrency}", lambda sends: 429)
+    _run(learner, concurrency)
+
+    assert learner.learned == []
+    finished = [step for step in learner.prepared if step.rate_limited]
+    assert any(
+        step.rate_limited == QLearning.RATE_LIMIT_RESENDS + 1 for step in finished
+    )
+    assert all(
+        step.rate_limited <= QLearning.RATE_LIMIT_RESENDS + 1 for step in finished
+    )
+
+
+class ThrottleAwareLearner:
+    """QLearning's operation choice over a bare operation agent."""
+
+    _avoid_throttled = QLearning._avoid_throttled
+
+    def __init__(self, q_values: dict, epsilon: float) -> None:
+        graph = SimpleNamespace(operation_nodes=dict.fromkeys(q_values))
+        self.operation_agent = OperationAgent(graph, epsilon=epsilon)  # type: ignore[arg-type]
+        self.operation_agent.q_table = dict(q_values)
+
+
+@pytest.fixture
+def limiter(monkeypatch) -> RateLimiter:
+    """A fresh limiter, free of the blocks other tests left on the shared one."""
+    limiter = RateLimiter()
+    monkeypatch.setattr("autoresttest.marl.marl.get_rate_limiter", lambda: limiter)
+    return limiter
+
+
+def _throttle(limiter: RateLimiter, operation_id: str, seconds: str) -> None:
+    limiter.observe(URL, operation_id, _response(429, **{"Retry-After": seconds}))
+
+
+def test_throttled_operations_are_swapped_by_the_agents_own_choice(limiter) -> None:
+    q_values = {"getUser": 5.0, "listUsers": 2.0, "createUser": 1.0}
+    _throttle(limiter, "getUser", "30")
+
+    greedy = ThrottleAwareLearner(q_values, epsilon=0.0)
+    assert greedy._avoid_throttled("listUsers") == "listUsers"
+    assert greedy._avoid_throttled("getUser") == "listUsers"
+
+    # Exploration still reaches every operation that can be sent right away.
+    exploring = ThrottleAwareLearner(q_values, epsilon=1.0)
+    drawn = {exploring._avoid_throttled("getUser") for _ in range(200)}
+    assert drawn == {"listUsers", "createUser"}
+
+
+def test_when_everything_is_throttled_the_first_to_free_up_is_chosen(limiter) -> None:
+    _throttle(limiter, "getUser", "30")
+    _throttle(limiter, "listUsers", "10")
+    learner = ThrottleAwareLearner({"getUser": 5.0, "listUsers": 1.0}, epsilon=0.0)
+    assert learner._avoid_throttled("getUser") == "listUsers"
@@ -0,0 +1,65 @@
+"""The SQLite response cache keeps its bounds without recounting the table on every write."""
+
+import random
+import sqlite3
+
+import pytest
+
+from autoresttest.llm.cache import ResponseCache, SQLiteResponseCache
+
+
+def _table_totals(path) -> tuple[int, int]:
+    with sqlite3.connect(str(path)) as connection:
+        return connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+
+
+def test_base_cache_is_abstract() -> None:
+    with pytest.raises(TypeError):
+        ResponseCache()  # type: ignore[abstract]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_tracked_totals_match_the_table(tmp_path, seed: int) -> None:
+    rng = random.Random(seed)
+    path = tmp_path / "cache.sqlite"
+    cache = SQLiteResponseCache(path, max_bytes=3000, max_entries=40)
+    for _ in range(600):
+        key = f"key{rng.randrange(80)}"
+        if rng.random() < 0.7:
+            # Replacing a key changes its size without adding an entry.
+            cache.set("engine", key, "x" * rng.randint(1, 120))
+        else:
+            cache.get("engine", key)
+        entries, total_bytes = _table_totals(path)
+        assert (cache._entries, cache._total_bytes) == (entries, total_bytes)
+        assert entries <= 40 and total_bytes <= 3000
+    cache.close()
+
+
+def test_recount_picks_up_other_writers(tmp_path) -> None:
+    path = tmp_path / "cache.sqlite"
+    cache = SQLiteResponseCache(path, max_entries=10)
+    other = SQLiteResponseCache(path)
+    for idx in range(20):
+        other.set("engine", f"other{idx}", "value")
+    for idx in range(SQLiteResponseCache.RECOUNT_EVERY):
+        cache.set("engine", f"key{idx % 5}", "value")
+    assert _table_totals(path)[0] == 10
+    cache.close()
+    other.close()
+
+
+def test_existing_entries_are_counted_on_open(tmp_path) -> None:
+    path = tmp_path / "cache.sqlite"
+    cache = SQLiteResponseCache(path)
+    for idx in range(12):
+        cache.set("engine", f"key{idx}", "value")
+    cache.close()
+
+    reopened = SQLiteResponseCache(path, max_entries=5)
+    reopened.set("engine", "new", "value")
+    assert _table_totals(path)[0] == 5
+    assert reopened.get("engine", "new") == "value"
+    reopened.close()
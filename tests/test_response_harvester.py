@@ -0,0 +1,127 @@
+"""The streamed scan of large bodies harvests what json.loads plus a walk would."""
+
+import json
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from autoresttest.config.config import ResponseHarvestConfig
+from autoresttest.marl.response_harvester import ResponseHarvester
+
+# getPets consumes "id" and "owner" from listPets responses.
+DEPENDENCIES = {
+    "getPets": {
+        "params": {
+            ("petId", "path"): {"listPets": {"response": {"id": 0.0, "owner": 0.0}}}
+        }
+    }
+}
+NAMES = ["id", "owner", "name", "tags", "status", "meta"]
+
+
+def _harvester(streamed: bool, **settings) -> ResponseHarvester:
+    # A threshold of -1 streams every body; a huge one parses every body.
+    threshold = -1 if streamed else 1 << 40
+    config = ResponseHarvestConfig(stream_threshold=threshold, **settings)
+    agent = SimpleNamespace(q_table=DEPENDENCIES)
+    return ResponseHarvester(agent, config)  # type: ignore[arg-type]
+
+
+def _harvest(streamed: bool, body: bytes, **settings):
+    harvester = _harvester(streamed, **settings)
+    harvested = harvester.harvest("listPets", body)
+    return harvester, harvested
+
+
+def _summary(harvested) -> tuple:
+    return (
+        harvested.values,
+        list(harvested.properties),
+        harvested.primitives,
+        harvested.has_objects,
+    )
+
+
+def _document(rng: random.Random, depth: int = 0):
+    kind = rng.random() if depth < 5 else 1.0
+    if kind < 0.35:
+        return {
+            rng.choice(NAMES): _document(rng, depth + 1)
+            for _ in range(rng.randint(0, 4))
+        }
+    if kind < 0.55:
+        return [_document(rng, depth + 1) for _ in range(rng.randint(0, 6))]
+    return rng.choice(
+        [rng.randint(-5, 50), f"value-{rng.randint(0, 20)}", None, True, 1.5, 'a"b']
+    )
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_streamed_and_parsed_paths_agree(seed: int) -> None:
+    rng = random.Random(seed)
+    document = _document(rng)
+    if seed % 3 == 0:
+        # A top-level list mixing objects and primitives.
+        document = [_document(rng) for _ in range(rng.randint(1, 8))] + [5, "x"]
+    settings = {
+        "max_depth": rng.randint(1, 6),
+        "max_array_items": rng.randint(1, 8),
+        "max_values_per_property": rng.randint(1, 5),
+        "exploration_samples": rng.randint(0, 2),
+    }
+    body = json.dumps(document, indent=rng.choice([None, 2])).encode()
+
+    _, parsed = _harvest(False, body, **settings)
+    harvester, streamed = _harvest(True, body, **settings)
+    assert _summary(streamed) == _summary(parsed)
+    assert harvester.stats["streamed"] == 1
+
+
+@pytest.mark.parametrize("streamed", [False, True])
+def test_mixed_top_level_arrays_keep_no_primitives(streamed: bool) -> None:
+    _, harvested = _harvest(streamed, b'[{"a": 1}, 5]')
+    assert harvested.primitives == []
+    assert harvested.has_objects
+    assert harvested.values == {"a": [1]}
+
+    _, harvested = _harvest(streamed, b'[5, [6, 7], "x"]')
+    assert harvested.primitives == [5, [6, 7], "x"]
+    assert not harvested.has_objects
+
+
+def test_truncated_bodies_keep_the_values_before_the_cut() -> None:
+    items = [{"id": idx, "owner": f"owner-{idx}"} for idx in range(100)]
+    body = json.dumps(items).encode()
+    cut = body.index(b'{"id": 40')
+
+    harvester, harvested = _harvest(True, body[: cut + 12])
+    assert harvester.stats["truncated"] == 1
+    assert harvested.values["id"] == list(range(41))
+    assert harvested.values["owner"] == [f"owner-{idx}" for idx in range(40)]
+    assert harvested.primitives == []
+
+
+def test_max_bytes_caps_the_streamed_scan() -> None:
+    items = [{"id": idx} for idx in range(1000)]
+    body = json.dumps(items).encode()
+    max_bytes = len(json.dumps(items[:100]))
+
+    harvester, harvested = _harvest(
+        True, body, max_bytes=max_bytes, max_values_per_property=1000
+    )
+    assert harvester.stats["truncated"] == 1
+    assert 90 <= len(harvested.values["id"]) <= 100
+    assert harvested.values["id"] == list(range(len(harvested.values["id"])))
+
+    _, parsed = _harvest(False, body, max_values_per_property=1000)
+    assert parsed.values["id"] == list(range(1000))
+
+
+@pytest.mark.parametrize("streamed", [False, True])
+def test_properties_below_the_depth_cap_are_not_harvested(streamed: bool) -> None:
+    body = json.dumps({"id": {"owner": {"name": {"status": 1}}}, "tags": [1]}).encode()
+    _, harvested = _harvest(streamed, body, max_depth=1)
+    assert list(harvested.properties) == ["id", "owner", "tags"]
+    assert harvested.values["id"] == [{"owner": {"name": {"status": 1}}}]
+    assert "name" not in harvested.values
@@ -0,0 +1,44 @@
+"""Parallel multi-specification runs configure each worker like the sequential path."""
+
+import multiprocessing
+from pathlib import Path
+
+import pytest
+
+from autoresttest import autoresttest as cli
+from autoresttest.autoresttest import AutoRestTest
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="the patched run_spec only reaches workers that are forked",
+)
+@pytest.mark.parametrize("profile", [False, True])
+def test_workers_run_with_the_callers_options(monkeypatch, tmp_path, profile) -> None:
+    summaries: list = []
+
+    def run_spec(self, spec_name: str, ext: str) -> dict:
+        return {
+            "Specification": spec_name,
+            "Status": "completed",
+            "Options": (self.quiet, self.profile),
+        }
+
+    monkeypatch.setattr(cli, "construct_db_dir", lambda: None)
+    monkeypatch.setattr(cli, "ensure_output_dir", lambda spec_name: tmp_path)
+    monkeypatch.setattr(
+        cli,
+        "output_run_summary",
+        lambda results, wall_clock: summaries.append(results) or tmp_path,
+    )
+    monkeypatch.setattr(AutoRestTest, "run_spec", run_spec)
+    monkeypatch.setattr(
+        AutoRestTest,
+        "spec_files",
+        lambda self: [Path("specs/pets.yaml"), Path("specs/users.yaml")],
+    )
+
+    AutoRestTest(spec_dir=tmp_path, quiet=True, profile=profile).run_all(workers=2)
+    (results,) = summaries
+    assert sorted(result["Specification"] for result in results) == ["pets", "users"]
+    assert [result["Options"] for result in results] == [(True, profile)] * 2
@@ -0,0 +1,118 @@
+"""Worker snapshots merge into one state: learned deltas add up, records are never spliced."""
+
+import copy
+
+from autoresttest.agents.action_table import ArrayActionTable, LazyActionTable
+from autoresttest.marl.sharding import (
+    COLLECTED_STATE,
+    COUNTED_STATE,
+    KEYED_STATE,
+    LEARNED_STATE,
+    merge_collected,
+    merge_counts,
+    merge_first_seen,
+    merge_learned,
+    merge_state,
+)
+from autoresttest.utils import CombinationSpace
+
+
+def _state(**values) -> dict:
+    names = LEARNED_STATE + COLLECTED_STATE + KEYED_STATE + COUNTED_STATE
+    state = {name: {} for name in names}
+    state.update(copy.deepcopy(values))
+    return state
+
+
+def test_merge_learned_adds_each_workers_change() -> None:
+    base = {"getUser": 1.0, "listUsers": {"params": 0.0, "tries": [0, 1]}}
+    first = {"getUser": 1.5, "listUsers": {"params": 2.0, "tries": [1, 1, 7]}}
+    second = {"getUser": 0.5, "listUsers": {"params": 1.0, "tries": [0, 3]}, "new": 4}
+
+    merged = merge_learned(base, [first, second])
+    assert merged == {
+        "getUser": 1.0,
+        "listUsers": {"params": 3.0, "tries": [1, 3, 7]},
+        "new": 4,
+    }
+    # The inputs are left untouched.
+    assert base == {"getUser": 1.0, "listUsers": {"params": 0.0, "tries": [0, 1]}}
+
+
+def test_merge_learned_keeps_action_table_storage() -> None:
+    base = ArrayActionTable([("a",), ("b",)])
+    first, second = copy.deepcopy(base), copy.deepcopy(base)
+    first[("a",)] = 1.0
+    second[("a",)] = 2.0
+    second[("c",)] = 5
+    merged = merge_learned(base, [first, second])
+    assert isinstance(merged, ArrayActionTable)
+    assert dict(merged.items()) == {("a",): 3.0, ("b",): 0.0, ("c",): 5}
+
+    space = CombinationSpace((), ["x", "y", "z"], [(size, None) for size in range(4)])
+    lazy = LazyActionTable(space)
+    first, second = copy.deepcopy(lazy), copy.deepcopy(lazy)
+    first[space[2]] = 1.0
+    second[space[2]] = 0.5
+    second[space[5]] = -1.0
+    merged = merge_learned(lazy, [first, second])
+    assert isinstance(merged, LazyActionTable)
+    assert dict(merged.items()) == {space[2]: 1.5, space[5]: -1.0}
+
+
+def test_merge_collected_unions_without_duplicates() -> None:
+    base = {"getUser": {"id": [1, 2]}}
+    first = {"getUser": {"id": [2, 3], "name": ["ann"]}}
+    second = {"getUser": {"id": [4, 1]}, "listUsers": {"limit": [10]}}
+    assert merge_collected(base, [first, second]) == {
+        "getUser": {"id": [1, 2, 3, 4], "name": ["ann"]},
+        "listUsers": {"limit": [10]},
+    }
+
+
+def test_merge_counts_adds_changes_since_the_last_merge() -> None:
+    base = {"200": 10, "per_operation": {"getUser": {"500": 1}}}
+    first = {"200": 14, "per_operation": {"getUser": {"500": 3}}, "404": 1}
+    second = {"200": 11, "per_operation": {"getUser": {"500": 1, "400": 2}}}
+    assert merge_counts(base, [first, second]) == {
+        "200": 15,
+        "per_operation": {"getUser": {"500": 3, "400": 2}},
+        "404": 1,
+    }
+
+
+def _error_class(message: str, example: dict) -> dict:
+    return {
+        "operation_id": "createUser",
+        "status_code": 500,
+        "message": message,
+        "input_shape": {"parameters": [], "body": {}},
+        "example": example,
+    }
+
+
+def test_workers_hitting_the_same_error_class_keep_one_real_example() -> None:
+    known = _error_class("known", {"body": {"name": "a"}})
+    base = _state(error_classes={"old": known}, error_class_counts={"old": 2})
+    first_example = {"parameters": {"id": 1}, "body": {"name": "x"}}
+    second_example = {"parameters": {"limit": 5}, "body": {"age": 9}}
+    first = _state(
+        error_classes={
+            "old": known,
+            "shared": _error_class("boom", first_example),
+        },
+        error_class_counts={"old": 3, "shared": 2},
+    )
+    second = _state(
+        error_classes={
+            "shared": _error_class("boom", second_example),
+            "old": _error_class("known", {"body": {"name": "other"}}),
+        },
+        error_class_counts={"old": 2, "shared": 4},
+    )
+
+    merged = merge_state(base, [first, second])
+    assert merged["error_classes"]["shared"]["example"] == first_example
+    assert merged["error_classes"]["old"] == known
+    assert merged["error_class_counts"] == {"old": 3, "shared": 6}
+    assert merge_first_seen({}, [second["error_classes"]]) == second["error_classes"]
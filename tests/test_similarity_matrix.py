@@ -0,0 +1,165 @@
+"""The embedding-matrix comparison must build the same graph as the per-pair cosine path."""
+
+import random
+
+import numpy as np
+import pytest
+
+from autoresttest.graph.generate_graph import OperationGraph
+from autoresttest.models import (
+    OperationProperties,
+    ParameterProperties,
+    ResponseProperties,
+    SchemaProperties,
+)
+from autoresttest.utils import EmbeddingModel
+
+BASE_WORDS = ["user", "id", "name", "pet", "owner", "status", "tag", "order", "price"]
+# Near-synonyms land above the 0.8 threshold; "zzkey" has no embedding at all.
+SYNONYMS = {"identifier": "id", "title": "name", "state": "status", "label": "tag"}
+WORDS = BASE_WORDS + list(SYNONYMS) + ["count", "zzkey"]
+
+
+def _model(seed: int) -> EmbeddingModel:
+    rng = np.random.default_rng(seed)
+    vectors = {
+        word: rng.normal(size=50).astype(np.float32) for word in BASE_WORDS + ["count"]
+    }
+    for word, base in SYNONYMS.items():
+        vectors[word] = (vectors[base] + rng.normal(scale=0.3, size=50)).astype(
+            np.float32
+        )
+    model = EmbeddingModel()
+    # A word-to-vector mapping stands in for the loaded gensim or mmap store.
+    model._model = vectors  # type: ignore[assignment]
+    return model
+
+
+def _name(rng: random.Random) -> str:
+    words = rng.sample(WORDS, rng.randint(1, 2))
+    return words[0] + "".join(word.capitalize() for word in words[1:])
+
+
+def _schema(rng: random.Random) -> SchemaProperties:
+    return SchemaProperties(
+        type="object",
+        properties={_name(rng): SchemaProperties(type="string") for _ in range(3)},
+    )
+
+
+def synthetic_operations(count: int, seed: int) -> dict[str, OperationProperties]:
+    rng = random.Random(seed)
+    operations = {}
+    for idx in range(count):
+        parameters = {}
+        for _ in range(rng.randint(0, 3)):
+            name = _name(rng)
+            location = rng.choice(["query", "path"])
+            parameters[(name, location)] = ParameterProperties(
+                name=name, in_value=location
+            )
+        request_body = (
+            {"application/json": _schema(rng)} if rng.random() < 0.5 else None
+        )
+        responses = {
+            "200": ResponseProperties(
+                status_code=200,
+                content={
+                    "application/json": SchemaProperties(
+                        type="array", items=_schema(rng)
+                    )
+                },
+            )
+        }
+        operation_id = f"op{idx}"
+        operations[operation_id] = OperationProperties(
+            operation_id=operation_id,
+            endpoint_path=f"/op{idx}",
+            http_method="get",
+            parameters=parameters,
+            request_body=request_body,
+            responses=responses,
+        )
+    return operations
+
+
+def _graph(operations, model: EmbeddingModel) -> OperationGraph:
+    graph = OperationGraph("spec.yaml", "spec", None, model)  # type: ignore[arg-type]
+    for operation_properties in operations.values():
+        graph.add_operation_node(operation_properties)
+    return graph
+
+
+def _per_pair_graph(operations, model: EmbeddingModel) -> OperationGraph:
+    """The loop before the embedding matrix: compare_cosine on every ordered pair."""
+    graph = _graph(operations, model)
+    comparator = graph.dependency_comparator
+    for operation_id, operation_properties in operations.items():
+        for dependent_operation_id, dependent_properties in operations.items():
+            if operation_id == dependent_operation_id:
+                continue
+            similar, next_closest = comparator.compare_cosine(
+                operation_properties, dependent_properties
+            )
+            graph.update_operation_dependencies(
+                operation_id, dependent_operation_id, similar, next_closest
+            )
+        node = graph.operation_nodes[operation_id]
+        if node.tentative_edges and not node.outgoing_edges:
+            node.outgoing_edges = node.tentative_edges
+    return graph
+
+
+def _edges(edges) -> list:
+    """Edges without their similarities, which are compared separately with a tolerance."""
+    return [
+        (
+            edge.source.operation_id,
+            edge.destination.operation_id,
+            {
+                parameter: [(value.dependent_val, value.in_value) for value in values]
+                for parameter, values in edge.similar_parameters.items()
+            },
+        )
+        for edge in edges
+    ]
+
+
+def _similarities(edges) -> list[float]:
+    return [
+        value.similarity
+        for edge in edges
+        for values in edge.similar_parameters.values()
+        for value in values
+    ]
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_matrix_path_builds_the_same_graph(seed: int) -> None:
+    operations = synthetic_operations(25, seed)
+    expected = _per_pair_graph(operations, _model(seed))
+    graph = _graph(operations, _model(seed))
+    graph.determine_dependencies(operations)
+
+    assert graph.dependency_comparator._matrix is not None
+    assert _edges(graph.operation_edges) == _edges(expected.operation_edges)
+    assert _similarities(graph.operation_edges) == pytest.approx(
+        _similarities(expected.operation_edges), abs=1e-5
+    )
+    assert _similarities(graph.operation_edges)
+    for operation_id, node in graph.operation_nodes.items():
+        expected_node = expected.operation_nodes[operation_id]
+        assert _edges(node.outgoing_edges) == _edges(expected_node.outgoing_edges)
+        assert _edges(node.tentative_edges) == _edges(expected_node.tentative_edges)
+
+
+def test_specs_without_embeddings_have_no_edges() -> None:
+    operations = synthetic_operations(5, 0)
+    model = EmbeddingModel()
+    model._model = {}  # type: ignore[assignment]
+    graph = _graph(operations, model)
+    graph.determine_dependencies(operations)
+    assert graph.operation_edges == []
+    assert _edges(graph.operation_edges) == _edges(
+        _per_pair_graph(operations, model).operation_edges
+    )
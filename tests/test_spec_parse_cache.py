@@ -0,0 +1,116 @@
+"""A warm start from the spec parse cache yields what parsing through prance does."""
+
+import pytest
+
+from autoresttest.specification import SpecificationParser
+from autoresttest.specification import parse_cache
+from autoresttest.specification import specification_parser as parser_module
+
+SPEC = """\
+openapi: 3.0.0
+info:
+  title: Pet Store
+  version: "1.0"
+servers:
+  - url: http://pets.example.com/v1
+paths:
+  /pets/{petId}:
+    get:
+      operationId: getPet
+      parameters:
+        - name: petId
+          in: path
+          required: true
+          schema:
+            type: integer
+      responses:
+        "200":
+          description: A pet
+          content:
+            application/json:
+              schema:
+                $ref: "schemas.yaml#/Pet"
+  /pets:
+    post:
+      operationId: createPet
+      requestBody:
+        content:
+          application/json:
+            schema:
+              $ref: "schemas.yaml#/Pet"
+      responses:
+        "201":
+          description: Created
+"""
+
+SCHEMAS = """\
+Pet:
+  type: object
+  required: [name]
+  properties:
+    name:
+      type: string
+    tag:
+      type: string
+"""
+
+
+@pytest.fixture
+def spec_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(parse_cache, "SPEC_CACHE_DIR", tmp_path / "cache")
+    (tmp_path / "schemas.yaml").write_text(SCHEMAS)
+    path = tmp_path / "openapi.yaml"
+    path.write_text(SPEC)
+    return path
+
+
+def _use_parse_cache(monkeypatch, enabled: bool) -> None:
+    config = parser_module.CONFIG
+    monkeypatch.setattr(
+        parser_module,
+        "CONFIG",
+        config.model_copy(
+            update={"spec": config.spec.model_copy(update={"parse_cache": enabled})}
+        ),
+    )
+
+
+def _parse(spec_path) -> tuple:
+    parser = SpecificationParser(str(spec_path))
+    return (
+        parser.from_cache,
+        parser.parse_specification(),
+        parser.get_api_url(),
+        parser.get_api_title(),
+    )
+
+
+def test_warm_start_matches_a_prance_parse(spec_path, monkeypatch) -> None:
+    _use_parse_cache(monkeypatch, False)
+    _, operations, url, title = _parse(spec_path)
+    assert set(operations) == {"getPet", "createPet"}
+
+    _use_parse_cache(monkeypatch, True)
+    assert _parse(spec_path) == (False, operations, url, title)
+
+    def no_prance(self, path):
+        raise AssertionError("a warm start must not run prance")
+
+    monkeypatch.setattr(SpecificationParser, "_build_resolving_parser", no_prance)
+    assert _parse(spec_path) == (True, operations, url, title)
+
+
+def test_editing_a_referenced_file_misses_the_cache(spec_path, monkeypatch) -> None:
+    _use_parse_cache(monkeypatch, True)
+    _, operations, _, _ = _parse(spec_path)
+
+    schemas = spec_path.parent / "schemas.yaml"
+    schemas.write_text(SCHEMAS + "    age:\n      type: integer\n")
+    from_cache, edited, _, _ = _parse(spec_path)
+    assert not from_cache
+    body = edited["createPet"].request_body["application/json"]
+    assert set(body.properties) == {"name", "tag", "age"}
+    assert edited != operations
+
+    _use_parse_cache(monkeypatch, False)
+    assert _parse(spec_path)[1] == edited
@@ -0,0 +1,153 @@
+"""Value generation resumed from a checkpoint ends where an uninterrupted run would."""
+
+import pickle
+
+import pytest
+import requests
+
+from autoresttest.graph import RequestGenerator
+from autoresttest.graph import request_generator as request_generator_module
+from autoresttest.graph.generate_graph import OperationEdge, OperationNode
+from autoresttest.models import OperationProperties, RequestData, RequestResponse
+from autoresttest.utils.checkpoint import ValueTableCheckpoint
+
+HASHES = {"listPets": "h-list", "getPet": "h-get"}
+
+
+def _checkpoint(tmp_path, hashes=HASHES) -> ValueTableCheckpoint:
+    return ValueTableCheckpoint(tmp_path / "values.ckpt", dict(hashes))
+
+
+def test_torn_tail_is_truncated_and_appending_continues(tmp_path) -> None:
+    checkpoint = _checkpoint(tmp_path)
+    checkpoint.record("listPets", {"params": {}, "body": {"a": 1}})
+    good_size = checkpoint.path.stat().st_size
+    checkpoint.record("getPet", {"params": {}, "body": {"b": 2}})
+    # A crash in the middle of the second record.
+    with checkpoint.path.open("r+b") as fh:
+        fh.truncate(checkpoint.path.stat().st_size - 3)
+
+    resumed = _checkpoint(tmp_path)
+    assert resumed.load() == {"listPets": {"params": {}, "body": {"a": 1}}}
+    assert resumed.completed == {"listPets"}
+    assert resumed.path.stat().st_size == good_size
+
+    resumed.record("getPet", {"params": {}, "body": {"b": 3}})
+    assert _checkpoint(tmp_path).load() == {
+        "listPets": {"params": {}, "body": {"a": 1}},
+        "getPet": {"params": {}, "body": {"b": 3}},
+    }
+
+
+def test_records_of_changed_operations_are_skipped(tmp_path) -> None:
+    checkpoint = _checkpoint(tmp_path)
+    checkpoint.record("listPets", {"params": {}, "body": {}}, ["list-response"])
+    checkpoint.record("getPet", {"params": {}, "body": {}}, ["get-response"])
+
+    resumed = _checkpoint(tmp_path, {**HASHES, "getPet": "h-get-modified"})
+    assert list(resumed.load()) == ["listPets"]
+    assert resumed.completed == {"listPets"}
+    assert resumed.responses == {"listPets": ["list-response"]}
+
+
+def test_records_without_responses_still_load(tmp_path) -> None:
+    payload = pickle.dumps(("listPets", "h-list", {"params": {}, "body": {}}))
+    checkpoint = _checkpoint(tmp_path)
+    checkpoint.path.write_bytes(len(payload).to_bytes(4, "little") + payload)
+    assert checkpoint.load() == {"listPets": {"params": {}, "body": {}}}
+    assert checkpoint.responses == {"listPets": []}
+
+
+class RecordingValueGenerator:
+    """Stands in for the LLM: the body it proposes names the upstream responses it saw."""
+
+    seen: dict = {}
+
+    def __init__(self, operation_properties: OperationProperties) -> None:
+        self.operation_id = operation_properties.operation_id
+
+    def generate_informed_value_agent_params(
+        self, num_values, responses, upstream_responses
+    ):
+        return {}
+
+    def generate_informed_value_agent_body(
+        self, num_values, responses, upstream_responses
+    ):
+        texts = [upstream.response_text for upstream in upstream_responses]
+        self.seen[self.operation_id] = texts
+        return {"application/json": [{"upstream": texts}]}
+
+    generate_value_agent_params = generate_value_agent_body = None
+
+
+def _nodes() -> dict:
+    nodes = {
+        operation_id: OperationNode(
+            OperationProperties(
+                operation_id=operation_id,
+                endpoint_path=f"/{operation_id}",
+                http_method="GET",
+            )
+        )
+        for operation_id in HASHES
+    }
+    # getPet reads the pet ids that listPets returns.
+    nodes["getPet"].outgoing_edges.append(
+        OperationEdge(nodes["getPet"], nodes["listPets"], {})
+    )
+    return nodes
+
+
+def _probe(node: OperationNode, **_) -> RequestResponse:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = f'[{{"id": "{node.operation_id}-1"}}]'.encode()
+    return RequestResponse(
+        request=RequestData(
+            endpoint_path=node.operation_properties.endpoint_path,
+            http_method="GET",
+            parameters=None,
+            request_body=None,
+            operation_properties=node.operation_properties,
+        ),
+        response=response,
+        response_text=response.text,
+    )
+
+
+def _generate(tmp_path, operation_ids) -> dict:
+    """Value tables for ``operation_ids`` in dependency order, resuming the checkpoint."""
+    nodes = _nodes()
+    generator = RequestGenerator(None, "http://sut.example")  # type: ignore[arg-type]
+    generator.create_and_send_request = _probe  # type: ignore[method-assign]
+    generator.value_checkpoint = _checkpoint(tmp_path)
+    parameter_mappings = generator.value_checkpoint.load()
+    responses: dict = {}
+    for operation_id in operation_ids:
+        generator._generate_operation_values(
+            nodes[operation_id], parameter_mappings, responses
+        )
+    return parameter_mappings
+
+
+@pytest.fixture(autouse=True)
+def recording_generator(monkeypatch):
+    RecordingValueGenerator.seen = {}
+    monkeypatch.setattr(
+        request_generator_module, "SmartValueGenerator", RecordingValueGenerator
+    )
+
+
+def test_resumed_run_matches_an_uninterrupted_one(tmp_path) -> None:
+    uninterrupted = _generate(tmp_path / "full", ["listPets", "getPet"])
+    full_seen = dict(RecordingValueGenerator.seen)
+    assert full_seen["getPet"] == ['[{"id": "listPets-1"}]']
+
+    # The first run stops after listPets; the second resumes from its checkpoint.
+    _generate(tmp_path / "resumed", ["listPets"])
+    RecordingValueGenerator.seen = {}
+    resumed = _generate(tmp_path / "resumed", ["listPets", "getPet"])
+    assert list(RecordingValueGenerator.seen) == ["getPet"]
+    assert RecordingValueGenerator.seen["getPet"] == full_seen["getPet"]
+    assert resumed == uninterrupted
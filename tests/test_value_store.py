@@ -0,0 +1,90 @@
+"""Capped value buckets must keep their indexes in step with the stored values."""
+
+import pickle
+import random
+from collections import Counter
+
+import pytest
+
+from autoresttest.utils import ValueBucket
+from autoresttest.utils.value_store import value_key, value_shape
+
+
+def _random_value(rng: random.Random):
+    kind = rng.random()
+    if kind < 0.5:
+        return rng.randrange(200)
+    if kind < 0.7:
+        return f"name-{rng.randrange(100)}"
+    if kind < 0.9:
+        return {"id": rng.randrange(100), "tag": rng.choice(["a", "b"])}
+    return [rng.randrange(10) for _ in range(rng.randint(0, 2))]
+
+
+def _assert_indexes_match(bucket: ValueBucket) -> None:
+    assert {value_key(value): idx for idx, value in enumerate(bucket)} == bucket._keys
+    if bucket.eviction == "diverse":
+        shapes = Counter(value_shape(value) for value in bucket)
+        assert {
+            shape: len(slots) for shape, slots in bucket._shape_slots.items()
+        } == shapes
+        for shape, slots in bucket._shape_slots.items():
+            for position, idx in enumerate(slots):
+                assert bucket._slot_shapes[idx] == (shape, position)
+                assert value_shape(bucket[idx]) == shape
+
+
+@pytest.mark.parametrize("eviction", ["reservoir", "diverse"])
+@pytest.mark.parametrize("seed", range(10))
+def test_indexes_follow_evictions(eviction: str, seed: int) -> None:
+    rng = random.Random(seed)
+    random.seed(seed)
+    bucket = ValueBucket(capacity=20, eviction=eviction)
+    for _ in range(2000):
+        bucket.append(_random_value(rng))
+        if rng.random() < 0.05:
+            _assert_indexes_match(bucket)
+    _assert_indexes_match(bucket)
+    assert len(bucket) == 20
+    assert bucket.seen - bucket.evicted == len(bucket)
+
+
+def test_diverse_eviction_takes_the_most_common_shape() -> None:
+    random.seed(0)
+    bucket = ValueBucket(range(8), capacity=10, eviction="diverse")
+    bucket.extend(["a", {"id": 1}])
+    bucket.append(8)
+    assert "a" in bucket and {"id": 1} in bucket
+    assert Counter(map(type, bucket)) == {int: 8, str: 1, dict: 1}
+
+
+@pytest.mark.parametrize("eviction", ["reservoir", "diverse"])
+def test_evicted_values_are_not_admitted_again(eviction: str) -> None:
+    random.seed(1)
+    bucket = ValueBucket(capacity=5, eviction=eviction)
+    bucket.extend(range(15))
+    assert bucket.seen == 15
+    # The API keeps returning the same values; none of them count as new.
+    for _ in range(3):
+        bucket.extend(range(15))
+    assert bucket.seen == 15
+    assert bucket.evicted == 10
+
+
+def test_evicted_filter_is_bounded() -> None:
+    bucket = ValueBucket(capacity=5)
+    bucket.extend(range(1000))
+    assert len(bucket._evicted_keys) == 20
+    # The oldest evictions are forgotten and may be admitted again.
+    assert len({value_key(value) for value in range(1000)} - set(bucket._keys)) > 20
+
+
+def test_pickling_keeps_the_indexes() -> None:
+    random.seed(2)
+    bucket = ValueBucket(capacity=10, eviction="diverse", label="op.id")
+    bucket.extend(_random_value(random.Random(2)) for _ in range(100))
+    copy = pickle.loads(pickle.dumps(bucket))
+    assert list(copy) == list(bucket)
+    assert (copy.seen, copy.evicted) == (bucket.seen, bucket.evicted)
+    assert copy._evicted_keys == bucket._evicted_keys
+    _assert_indexes_match(copy)